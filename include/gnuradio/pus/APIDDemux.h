@@ -0,0 +1,58 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_PUS_APIDDEMUX_H
+#define INCLUDED_PUS_APIDDEMUX_H
+
+#include <gnuradio/pus/api.h>
+#include <gnuradio/block.h>
+
+namespace gr {
+  namespace pus {
+
+    /*!
+     * \brief Routes Space Packets to one output per Application Process ID
+     * \ingroup pus
+     *
+     * Packets whose APID is in \p apid_list are published on the matching `out<i>` port (or
+     * `out` when a single APID is given), the rest on `other`. For every APID the block counts
+     * packets and bytes, and checks the packet sequence count for gaps and duplicates.
+     */
+    class PUS_API APIDDemux : virtual public gr::block
+    {
+     public:
+      typedef std::shared_ptr<APIDDemux> sptr;
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of pus::APIDDemux.
+       *
+       * To avoid accidental use of raw pointers, pus::APIDDemux's
+       * constructor is in a private implementation
+       * class. pus::APIDDemux::make is the public interface for
+       * creating new instances.
+       */
+      static sptr make(std::vector<uint16_t> apid_list);
+
+      /*!
+       * \brief Returns the counters of \p apid as a dictionary
+       *
+       * Keys: packets, bytes, lost (packets missing from the sequence count), gaps (number of
+       * discontinuities), duplicates (repeated or older sequence counts), last_sequence_count and
+       * bytes_per_second (between the first and the last packet received).
+       */
+      virtual pmt::pmt_t getStatistics(uint16_t apid) = 0;
+
+      /*!
+       * \brief Clears the counters of every APID
+       */
+      virtual void resetStatistics() = 0;
+    };
+
+  } // namespace pus
+} // namespace gr
+
+#endif /* INCLUDED_PUS_APIDDEMUX_H */
@@ -18,4 +18,12 @@ static const pmt::pmt_t PMT_EVENT = pmt::intern("event");
 static const pmt::pmt_t PMT_IN_MSG = pmt::intern("in_msg");
 static const pmt::pmt_t PMT_VC = pmt::intern("vc");
 static const pmt::pmt_t PMT_FWD = pmt::intern("fwd");
+static const pmt::pmt_t PMT_OFFSETS = pmt::intern("offsets");
+static const pmt::pmt_t PMT_OTHER = pmt::intern("other");
+static const pmt::pmt_t PMT_HEADER = pmt::intern("pus_header");
+static const pmt::pmt_t PMT_TICK = pmt::intern("tick");
+static const pmt::pmt_t PMT_CLOCK = pmt::intern("clock");
+static const pmt::pmt_t PMT_TIME = pmt::intern("time");
+static const pmt::pmt_t PMT_ADVANCE = pmt::intern("advance");
+static const pmt::pmt_t PMT_REAL_TIME = pmt::intern("real_time");
 #endif /* B4AE609D_6687_4998_809D_482441F2B6F9 */
@@ -10,9 +10,11 @@
 #ifndef ECSS_SERVICES_CRCHELPER_HPP
 #define ECSS_SERVICES_CRCHELPER_HPP
 
+#include <gnuradio/pus/api.h>
 #include <gnuradio/pus/Definitions/ECSS_Definitions.h>
 #include <vector>
 #include <cstdint>
+#include <cstddef>
 #include <etl/vector.h>
 
 namespace gr {
@@ -20,7 +22,7 @@ namespace gr {
   
    typedef etl::vector<uint8_t, ECSSMaxMessageSize> MessageArray; 
      
-   class CRCHelper {
+   class PUS_API CRCHelper {
 	/**
 	 * CRC16 calculation helper class
 	 * This class declares a function which calculates the CRC16 checksum of the given data.
@@ -35,15 +37,39 @@ namespace gr {
 	 * @author (class code & dox) Grigoris Pavlakis <grigpavl@ece.auth.gr>
 	 */
 
-	// TODO: Change this to hardware implementation or a trusted software one
     public:
 
+	/**
+	 * Initial value of the shift register (ECSS-E-ST-70-41C, Annex B - CRC and ISO checksum)
+	 */
+	static constexpr uint16_t CRCInitialValue = 0xFFFFU;
+
+	/**
+	 * CRC16-CCITT generator polynomial (as specified in standard)
+	 */
+	static constexpr uint16_t CRCPolynomial = 0x1021U;
+
+	/**
+	 * Table-driven CRC calculation over a raw span of bytes.
+	 *
+	 * The data is processed eight bytes at a time using precomputed slice-by-8 tables, with a
+	 * byte-wise tail. The result is bit-identical to the bit-at-a-time CRC16/CCITT algorithm.
+	 * Passing the result of a previous call as \p shiftReg chains the calculation, so a CRC can be
+	 * computed incrementally over several non-contiguous spans.
+	 *
+	 * @param  data (pointer to the data to be checksummed)
+	 * @param  length (number of bytes to be checksummed)
+	 * @param  shiftReg (initial value, or the result of the previous span)
+	 * @return the CRC16 checksum of the input data
+	 */
+	static uint16_t calculateCRC(const uint8_t* data, size_t length, uint16_t shiftReg = CRCInitialValue);
+
 	/**
 	 * Actual CRC calculation function.
 	 * @param  message (pointer to the data to be checksummed)
 	 * @return the CRC16 checksum of the input data
 	 */
-	static uint16_t calculateMessageCRC(MessageArray& message);
+	static uint16_t calculateMessageCRC(const MessageArray& message);
 
 	/**
 	 * Actual CRC calculation function with init register option.
@@ -51,16 +77,23 @@ namespace gr {
 	 * @param  shiftReg (initial value)
 	 * @return the CRC16 checksum of the input data
 	 */
-	static uint16_t calculateMessageCRC(MessageArray& message, uint16_t shiftReg) ;
+	static uint16_t calculateMessageCRC(const MessageArray& message, uint16_t shiftReg);
 	
 	/**
 	 * CRC validation function. Make sure the passed message actually contains a CRC checksum
 	 * appended at the very end!
 	 * @param  message (pointer to the data to be validated)
+	 * @return 0 when the data is valid, a nonzero uint16 when the data is corrupted
+	 */
+	static uint16_t validateMessageCRC(const MessageArray& message);
+
+	/**
+	 * CRC validation function over a raw span of bytes, with the CRC checksum appended at the end.
+	 * @param  data (pointer to the data to be validated)
 	 * @param  length (in bytes, plus 2 bytes for the CRC checksum)
 	 * @return 0 when the data is valid, a nonzero uint16 when the data is corrupted
 	 */
-	static uint16_t validateMessageCRC(MessageArray& message);
+	static uint16_t validateCRC(const uint8_t* data, size_t length);
 
    };
   } // namespace pus
@@ -681,6 +681,15 @@ namespace gr {
 	
 	void reportError(Message& message,AcceptanceErrorType errorCode);
 
+	/**
+	 * Report a failed acceptance of a request that has not been parsed into a Message
+	 *
+	 * @param serviceType The service type read from the request header
+	 * @param messageType The message type read from the request header
+	 * @param errorCode The error's code
+	 */
+	void reportError(uint8_t serviceType, uint8_t messageType, AcceptanceErrorType errorCode);
+
 	void reportError(Message& message,ExecutionStartErrorType errorCode);
 	/**
 	 * Report a failure about the progress of the execution of a request
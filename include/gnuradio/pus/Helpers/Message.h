@@ -11,10 +11,13 @@
 #define INCLUDED_PUS_MESSAGE_H
 
 #include <vector>
+#include <gnuradio/pus/api.h>
 #include <gnuradio/pus/Definitions/ECSS_Definitions.h>
 #include <gnuradio/pus/Definitions/macros.h>
 #include <gnuradio/pus/Time/TimeGetter.h>
 #include <gnuradio/pus/Helpers/CRCHelper.h>
+#include <gnuradio/pus/Helpers/MessageStorage.h>
+#include <gnuradio/pus/Helpers/PacketHeader.h>
 #include <etl/string.h>
 #include <cstring>
 #include <iostream>
@@ -28,11 +31,24 @@
  namespace gr {
   namespace pus {
   
-   class Message {
+   class PUS_API Message {
      private:
-	MessageArray messageArray;
+	MessageStorage messageArray;
 
 	uint16_t messageReadPosition = 0;
+
+	// Decoded headers, either attached at ingress or decoded on first use
+	mutable PacketHeader messageHeader;
+
+	/**
+	 * Makes room for writing \p size bytes at the current position and advances the position
+	 * past the \p count bytes that fit. Bytes that would go beyond ECSSMaxMessageSize are
+	 * dropped.
+	 *
+	 * @param count Set to the number of bytes that can actually be written
+	 * @return Where the bytes have to be written
+	 */
+	uint8_t* appendSpan(size_t size, size_t& count);
     
      public:
 	enum PacketType {
@@ -42,66 +58,86 @@
         
         Message();
         Message(MessageArray& inMessageData);
+        Message(const uint8_t* inMessageData, size_t size);
+        Message(const Message& other);
+        Message(Message&& other) = default;
         ~Message();
+
+        Message& operator=(const Message& other);
+        Message& operator=(Message&& other) = default;
+
+	/**
+	 * Number of deep copies (copy construction or copy assignment) of any Message made so far.
+	 * Moves are not counted.
+	 */
+	static size_t copyCount();
 						
 	void setMessageReadPosition(uint16_t position) { messageReadPosition = position;};
-	uint16_t getMessageReadPosition() { return messageReadPosition;};
-	uint16_t getMessageSize() { return messageArray.size();};
+	uint16_t getMessageReadPosition() const { return messageReadPosition;};
+	uint16_t getMessageSize() const { return messageArray.size();};
 			
-	uint8_t  getMessageVersion() { return (messageArray.size() >= CCSDSPrimaryHeaderSize) ? messageArray[0] >> 5 : 0; };
-	enum     PacketType getMessagePacketType() {
-			if (messageArray.size() >= CCSDSPrimaryHeaderSize) 
-				return ((messageArray[0] & 0x10) == 0) ? Message::TM : Message::TC;
-			else
-				return Message::TM; 
+	// The header fields are read from the decoded headers, see getMessageHeader()
+	uint8_t  getMessageVersion() const { return getMessageHeader().version; };
+	enum     PacketType getMessagePacketType() const {
+			return getMessageHeader().packetType ? Message::TC : Message::TM;
 			};
-	bool     getMessageSecondaryHeaderFlag() { 
+	bool     getMessageSecondaryHeaderFlag() const { 
 			if (messageArray.size() >= CCSDSPrimaryHeaderSize) 
 				return (messageArray[0] & 0x08) ;
 			else
 				return false; 
 			};
 
-	uint16_t getMessageApplicationId() { return (messageArray.size() >= CCSDSPrimaryHeaderSize) ? 
-						((messageArray[0] << 8) | messageArray[1]) & static_cast<uint16_t>(0x07ff) : 0; };
-	uint8_t  getMessageSequenceFlags() { return static_cast<uint8_t>(((messageArray[2] << 8) | messageArray[3]) >> 14); };
-	uint16_t getMessagePacketSequenceCount() { return (messageArray.size() >= CCSDSPrimaryHeaderSize) ? 
-						(((messageArray[2] << 8) | messageArray[3]) & (~0xc000U)) : 0; };
+	uint16_t getMessageApplicationId() const { return getMessageHeader().applicationId; };
+	uint8_t  getMessageSequenceFlags() const { return getMessageHeader().sequenceFlags; };
+	uint16_t getMessagePacketSequenceCount() const { return getMessageHeader().sequenceCount; };
 
-	uint16_t getMessagePacketDataLength() { return (messageArray.size() >= CCSDSPrimaryHeaderSize) ? (messageArray[4] << 8) | messageArray[5] : 0;};
+	uint16_t getMessagePacketDataLength() const { return getMessageHeader().packetDataLength; };
 
 	// 7.4.3.1 Telemetry packet secondary header / 7.4.4.1 Telecommand packet secondary header
-	uint8_t  getMessagePUSVersion() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
-						messageArray[6] >> 4 : 0; };
+	uint8_t  getMessagePUSVersion() const { return getMessageHeader().pusVersion; };
 	void     setMessagePUSVersion();
 
-	uint8_t  getMessageSCTimeRef() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
-						messageArray[6] & 0x0f : 0; };
-	uint8_t  getMessageAckFlags() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
-						messageArray[6] & 0x0f : 0; };
+	uint8_t  getMessageSCTimeRef() const { return getMessageHeader().ackFlags; };
+	uint8_t  getMessageAckFlags() const { return getMessageHeader().ackFlags; };
 	// The service and message IDs are 8 bits (5.3.1b, 5.3.3.1d)
-	uint8_t  getMessageServiceType() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
-						messageArray[7] : 0; };
+	uint8_t  getMessageServiceType() const { return getMessageHeader().serviceType; };
 	void     setMessageServiceType(uint8_t serviceType);	
 					
-	uint8_t  getMessageType() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
-						messageArray[8] : 0; };
+	uint8_t  getMessageType() const { return getMessageHeader().messageType; };
         void     setMessageType(uint8_t messageType);
         
 	//> 7.4.3.1b
-	uint16_t getMessageTypeCounter() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
-						(messageArray[9] << 8) | messageArray[10] : 0; };
-	uint16_t getMessageDestinationId() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
+	uint16_t getMessageTypeCounter() const { return getMessageHeader().sourceId; };
+	uint16_t getMessageDestinationId() const { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
 						(messageArray[11] << 8) + messageArray[12] : 0; };
-	uint16_t getMessageSourceId() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize) ? 
-						(messageArray[9] << 8) + messageArray[10] : 0; };
+	uint16_t getMessageSourceId() const { return getMessageHeader().sourceId; };
 
-	uint16_t getMessageCRC() { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize+ECSSSecondaryTCCRCSize) ? 
+	uint16_t getMessageCRC() const { return (messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize+ECSSSecondaryTCCRCSize) ? 
 						(messageArray[messageArray.size()-2] << 8) + messageArray[messageArray.size()-1] : 0; };
 							
-	MessageArray& getMessageData() { return messageArray; };
-	uint8_t* getMessageRawData() { return messageArray.data(); };
+	MessageStorage& getMessageData() { messageHeader.decoded = 0; return messageArray; };
+	const MessageStorage& getMessageData() const { return messageArray; };
+	uint8_t* getMessageRawData() { messageHeader.decoded = 0; return messageArray.data(); };
+	const uint8_t* getMessageRawData() const { return messageArray.data(); };
       	void setMessageData(MessageArray& inMessageData);
+      	void setMessageData(const uint8_t* inMessageData, size_t size);
+
+	/**
+	 * Decoded headers of the message. They are decoded from the message bytes the first time,
+	 * unless they were attached with setMessageHeader().
+	 */
+	const PacketHeader& getMessageHeader() const {
+		if (!messageHeader.decoded)
+			messageHeader.decode(messageArray.data(), messageArray.size());
+		return messageHeader;
+	};
+
+	/**
+	 * Attaches the already decoded headers of the message, e.g. the ones decoded at ingress
+	 * by ServicesPool, so that they are not decoded again
+	 */
+	void setMessageHeader(const PacketHeader& header) { messageHeader = header; messageHeader.decoded = 1; };
 	
 	/**
 	 * Compare the message type to an expected one. An unexpected message type will throw an
@@ -109,12 +145,12 @@
 	 *
 	 * @return True if the message is of correct type, false if not
 	 */
-	bool assertType(Message::PacketType expectedPacketType, uint8_t expectedServiceType, uint8_t expectedMessageType);
+	bool assertType(Message::PacketType expectedPacketType, uint8_t expectedServiceType, uint8_t expectedMessageType) const;
 	/**
 	 * Alias for Message::assertType(Message::TC, \p expectedServiceType, \p
 	 * expectedMessageType)
 	 */
-	bool assertTC(uint8_t expectedServiceType, uint8_t expectedMessageType)  {
+	bool assertTC(uint8_t expectedServiceType, uint8_t expectedMessageType) const {
 		return assertType(TC, expectedServiceType, expectedMessageType);
 	}
 
@@ -122,7 +158,7 @@
 	 * Alias for Message::assertType(Message::TM, \p expectedServiceType, \p
 	 * expectedMessageType)
 	 */
-	bool assertTM(uint8_t expectedServiceType, uint8_t expectedMessageType)  {
+	bool assertTM(uint8_t expectedServiceType, uint8_t expectedMessageType) const {
 		return assertType(TM, expectedServiceType, expectedMessageType);
 	}
 	
@@ -415,7 +451,8 @@
 	 * Appends a byte array to the message
 	 */
 	void appendUint8Array(MessageArray& value);
-	void appendUint8Array(uint8_t* value, size_t size);		
+	void appendUint8Array(const MessageStorage& value);
+	void appendUint8Array(const uint8_t* value, size_t size);		
 	/**
 	 * Appends 1 byte to the message
 	 */
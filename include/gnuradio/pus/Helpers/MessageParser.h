@@ -15,6 +15,7 @@
 #include <gnuradio/block.h>
 #include <gnuradio/pus/Time/TimeProvider.h>
 #include <gnuradio/pus/Helpers/Message.h>
+#include <gnuradio/pus/Definitions/pmt_constants.h>
 #include <gnuradio/pus/Time/TimeProvider.h>
 
 namespace gr {
@@ -42,6 +43,25 @@ namespace gr {
       TimeProvider* d_timeprovider;
       
       void counter_inc() { d_counter++; if(d_counter > 16383) d_counter = 0;};
+
+      /**
+       * Returns an empty message backed by a buffer of the MessageStorage pool with room for
+       * \p size bytes, ready to have a report built into it
+       */
+      Message newReport(size_t size);
+
+      /**
+       * Appends the primary header, the TM secondary header and the time stamp of a report.
+       *
+       * The constant part of the headers is pre-encoded once per (APID, time reference, service,
+       * subtype, destination) and cached, only the counters and the length are patched in.
+       *
+       * @return the CRC register after the packet ID, to chain the CRC of the report from it
+       */
+      uint16_t appendReportHeader(Message& message, uint16_t apid, uint16_t packetSequenceCounter,
+			uint16_t packetDataLength, uint8_t scTimeRef, uint8_t serviceType,
+			uint8_t messageType, uint16_t messageTypeCounter, uint16_t destinationId,
+			const etl::vector<uint8_t, ECSSMaxTimeField>& stamp);
       
      public:
       static MessageParser* getInstance();
@@ -51,6 +71,14 @@ namespace gr {
 /***************************************************************************************/
 
       Message ParseMessageCommand(MessageArray& in_data);
+      Message ParseMessageCommand(const uint8_t* data, size_t size);
+
+      /**
+       * Parses a TC received in a PDU. When \p meta holds the headers decoded at ingress (see
+       * headerToPMT()), and they match the packet bytes, they are attached to the message
+       * instead of being decoded again.
+       */
+      Message ParseMessageCommand(const pmt::pmt_t& meta, const uint8_t* data, size_t size);
       Message CreateMessageReport(uint8_t scTimeRef, uint8_t serviceType, 
 			uint8_t messageType, uint16_t messageTypeCounter,
 			uint16_t destinationId, MessageArray& payload); 	
@@ -71,6 +99,18 @@ namespace gr {
 /***************************************************************************************/
 			
       uint16_t getApplicationId() { return d_apid;};	
+
+      /**
+       * Encodes decoded packet headers as PDU metadata, to be stored under PMT_HEADER
+       */
+      static pmt::pmt_t headerToPMT(const PacketHeader& header);
+
+      /**
+       * Reads the packet headers stored under PMT_HEADER in the \p meta dictionary
+       *
+       * @return false when \p meta carries no decoded headers
+       */
+      static bool headerFromPMT(const pmt::pmt_t& meta, PacketHeader& header);
       
      // void closeMessage(Message& message);	
       
@@ -78,12 +118,12 @@ namespace gr {
       
      // std::vector<uint8_t> parseUpToEndfromMessage(Message& message);
           
-      bool assertTC(Message request, uint8_t expectedServiceType, uint8_t expectedMessageType)  {
+      bool assertTC(const Message& request, uint8_t expectedServiceType, uint8_t expectedMessageType)  {
 		return request.assertType(Message::TC, expectedServiceType, expectedMessageType);
 	}
 
 
-      bool assertTM(Message request, uint8_t expectedServiceType, uint8_t expectedMessageType)  {
+      bool assertTM(const Message& request, uint8_t expectedServiceType, uint8_t expectedMessageType)  {
 		return request.assertType(Message::TM, expectedServiceType, expectedMessageType);
 	}
     };
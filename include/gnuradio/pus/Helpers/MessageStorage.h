@@ -0,0 +1,123 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+#ifndef INCLUDED_PUS_MESSAGESTORAGE_H
+#define INCLUDED_PUS_MESSAGESTORAGE_H
+
+#include <gnuradio/pus/api.h>
+#include <gnuradio/pus/Definitions/ECSS_Definitions.h>
+#include <cstdint>
+#include <cstddef>
+
+namespace gr {
+  namespace pus {
+
+   /**
+    * Byte storage of a Message, sized to the packet it holds.
+    *
+    * Packets up to InlineCapacity bytes are kept inside the object. Larger packets are moved to
+    * a heap block taken from a pool of power of two size classes (up to ECSSMaxMessageSize), so
+    * that a stored 13-byte TC no longer carries a full ECSSMaxMessageSize buffer, and copying a
+    * message only copies the bytes it actually holds.
+    *
+    * The interface follows the subset of etl::vector used by Message. Writes past
+    * ECSSMaxMessageSize are ignored.
+    */
+   class PUS_API MessageStorage {
+     public:
+	/**
+	 * Bytes stored inside the object before switching to a pooled heap block
+	 */
+	static const uint16_t InlineCapacity = 48U;
+
+	typedef uint8_t* iterator;
+	typedef const uint8_t* const_iterator;
+
+	MessageStorage() {}
+	MessageStorage(const uint8_t* data, size_t size) { assign(data, data + size); }
+	MessageStorage(const MessageStorage& other);
+	MessageStorage(MessageStorage&& other) noexcept;
+	~MessageStorage();
+
+	MessageStorage& operator=(const MessageStorage& other);
+	MessageStorage& operator=(MessageStorage&& other) noexcept;
+
+	size_t size() const { return d_size; };
+	bool empty() const { return d_size == 0; };
+	size_t capacity() const { return d_capacity; };
+	size_t max_size() const { return ECSSMaxMessageSize; };
+	bool full() const { return d_size == ECSSMaxMessageSize; };
+
+	uint8_t* data() { return isInline() ? d_inline : d_heap; };
+	const uint8_t* data() const { return isInline() ? d_inline : d_heap; };
+
+	uint8_t& operator[](size_t i) { return data()[i]; };
+	const uint8_t& operator[](size_t i) const { return data()[i]; };
+
+	iterator begin() { return data(); };
+	iterator end() { return data() + d_size; };
+	const_iterator begin() const { return data(); };
+	const_iterator end() const { return data() + d_size; };
+
+	void clear() { d_size = 0; };
+
+	/**
+	 * Makes room for at least \p size bytes, up to ECSSMaxMessageSize
+	 */
+	void reserve(size_t size);
+
+	void push_back(uint8_t value)
+	{
+		if (d_size == d_capacity) {
+			if (d_size == ECSSMaxMessageSize)
+				return;
+			reserve(d_size + 1U);
+		}
+		data()[d_size++] = value;
+	}
+
+	/**
+	 * Grows or shrinks the contents to \p size bytes, up to ECSSMaxMessageSize. New bytes are
+	 * left uninitialized, so that the caller can fill them with a single copy.
+	 */
+	void resize(size_t size);
+
+	/**
+	 * Replaces the contents with the bytes in [\p first, \p last)
+	 */
+	void assign(const uint8_t* first, const uint8_t* last);
+
+	/**
+	 * Bytes held in heap blocks by all the MessageStorage objects, not counting the blocks
+	 * cached by the pool
+	 */
+	static size_t heapBytesInUse();
+
+	/**
+	 * Number of blocks the pool had to take from the heap because none was cached
+	 */
+	static size_t heapAllocations();
+
+     private:
+	bool isInline() const { return d_capacity == InlineCapacity; };
+
+	/**
+	 * Releases the heap block, if any, and goes back to the inline buffer. Only the first
+	 * InlineCapacity bytes are kept, the callers either hold no more or replace them.
+	 */
+	void shrink();
+
+	union {
+		uint8_t d_inline[InlineCapacity];
+		uint8_t* d_heap;
+	};
+	uint16_t d_size = 0;
+	uint16_t d_capacity = InlineCapacity;
+   };
+
+  } // namespace pus
+} // namespace gr
+#endif // INCLUDED_PUS_MESSAGESTORAGE_H
@@ -0,0 +1,70 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+#ifndef INCLUDED_PUS_PDUBATCH_H
+#define INCLUDED_PUS_PDUBATCH_H
+
+#include <gnuradio/pus/api.h>
+#include <gnuradio/pus/Definitions/pmt_constants.h>
+#include <cstdint>
+#include <functional>
+#include <vector>
+
+namespace gr {
+  namespace pus {
+
+    /**
+     * Helpers for batched PDUs.
+     *
+     * A batch carries several Space Packets in a single message, so that a block pays the
+     * message dispatch cost once per batch instead of once per packet. Two formats are accepted:
+     *
+     * - (meta . #[u8vector u8vector ...]) : a PMT vector holding one u8vector per packet
+     * - (meta . u8vector) with an `offsets` u32vector in the meta dictionary : the packets are
+     *   concatenated in a single blob, and `offsets` holds the start of each of them
+     *
+     * Batches are always emitted in the vector format. A regular (meta . u8vector) PDU is
+     * handled as a single packet, so blocks stay compatible with unbatched flowgraphs.
+     */
+    class PUS_API PDUBatch
+    {
+     public:
+	/**
+	 * Checks whether \p pdu is a batch in any of the accepted formats
+	 */
+	static bool isBatch(const pmt::pmt_t& pdu);
+
+	/**
+	 * Calls \p handler once per packet of \p pdu, as a (meta . u8vector) PDU.
+	 *
+	 * A PDU that is not a batch is passed to \p handler unchanged.
+	 *
+	 * @return the number of packets handed to \p handler
+	 */
+	static size_t forEach(const pmt::pmt_t& pdu, const std::function<void(pmt::pmt_t)>& handler);
+
+	/**
+	 * Calls \p handler once per packet of \p pdu with a pointer to the packet data, without
+	 * copying it. \p v_data is the u8vector of the packet when it exists on its own, or
+	 * PMT_NIL when the packet is a slice of a concatenated blob.
+	 *
+	 * A PDU that is not a batch is handled as a single packet.
+	 *
+	 * @return the number of packets handed to \p handler
+	 */
+	static size_t forEachSpan(const pmt::pmt_t& pdu,
+			const std::function<void(pmt::pmt_t meta, pmt::pmt_t v_data, const uint8_t* data, size_t size)>& handler);
+
+	/**
+	 * Builds a batch PDU in the vector format from a list of u8vectors
+	 */
+	static pmt::pmt_t make(const pmt::pmt_t& meta, const std::vector<pmt::pmt_t>& packets);
+    };
+
+  } // namespace pus
+} // namespace gr
+
+#endif /* INCLUDED_PUS_PDUBATCH_H */
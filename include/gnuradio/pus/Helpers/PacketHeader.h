@@ -0,0 +1,61 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+#ifndef INCLUDED_PUS_PACKETHEADER_H
+#define INCLUDED_PUS_PACKETHEADER_H
+
+#include <gnuradio/pus/Definitions/ECSS_Definitions.h>
+#include <cstdint>
+#include <cstddef>
+
+namespace gr {
+  namespace pus {
+
+   /**
+    * Decoded CCSDS primary header and PUS secondary header of a packet.
+    *
+    * The header is decoded once, when the packet enters the flowgraph, and then travels with it:
+    * attached to a Message in-process, and as PDU metadata between blocks (see
+    * MessageParser::headerToPMT()). Downstream services read the fields from here instead of
+    * extracting them again from the packet bytes.
+    *
+    * The layout is fixed, so that the structure can be carried as a PMT blob.
+    */
+   struct PacketHeader {
+	uint16_t applicationId = 0;
+	uint16_t sequenceCount = 0;
+	uint16_t packetDataLength = 0;
+	// Source ID of a TC, message type counter of a TM
+	uint16_t sourceId = 0;
+	uint8_t version = 0;
+	uint8_t packetType = 0;
+	uint8_t sequenceFlags = 0;
+	uint8_t pusVersion = 0;
+	// Acknowledgement flags of a TC, spacecraft time reference status of a TM
+	uint8_t ackFlags = 0;
+	uint8_t serviceType = 0;
+	uint8_t messageType = 0;
+	// Set when the fields hold the header of the packet
+	uint8_t decoded = 0;
+
+	/**
+	 * Decodes the headers of the packet in \p data. Packets shorter than the primary and the
+	 * TC secondary headers leave the missing fields to zero, as the Message getters do.
+	 */
+	void decode(const uint8_t* data, size_t size);
+
+	/**
+	 * Checks that the fields hold the headers of the packet in \p data, e.g. before trusting
+	 * headers received as PDU metadata. Only the secondary header flag is not compared.
+	 */
+	bool matches(const uint8_t* data, size_t size) const;
+   };
+
+   static_assert(sizeof(PacketHeader) == 16, "PacketHeader is carried as a fixed-size PMT blob");
+
+  } // namespace pus
+} // namespace gr
+#endif // INCLUDED_PUS_PACKETHEADER_H
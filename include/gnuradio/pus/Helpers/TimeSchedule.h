@@ -0,0 +1,158 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+#ifndef ECSS_TIMESCHEDULE_H
+#define ECSS_TIMESCHEDULE_H
+
+#include <gnuradio/pus/api.h>
+#include <gnuradio/pus/Definitions/ECSS_Definitions.h>
+#include <gnuradio/pus/Helpers/Message.h>
+#include <gnuradio/pus/Time/TimeStamp.h>
+#include <chrono>
+#include <cstddef>
+#include <map>
+#include <unordered_map>
+
+namespace gr {
+ namespace pus {
+/**
+ * Time-based schedule of the ST[11] service, holding the activities ordered by their release time.
+ *
+ * The activities are kept in a tree keyed on the release time, so inserting, deleting or
+ * time-shifting one activity costs O(log n), and the activities due at a given time are always at
+ * its beginning. Activities with the same release time keep their insertion order. The capacity is
+ * set at run time.
+ *
+ * A hash index on the request ID points to the activities in the tree, so the requests by ID look
+ * up each activity in constant time.
+ */
+    class PUS_API TimeSchedule {
+    public:
+	/**
+	 * @brief Request identifier of the received packet
+	 *
+	 * @details The request identifier consists of the application process ID, the packet
+	 * sequence count and the source ID, all defined in the ECSS standard.
+	 */
+	struct RequestID {
+		uint16_t applicationID = 0; ///< Application process ID
+		uint16_t sequenceCount = 0; ///< Packet sequence count
+		uint16_t sourceID = 0;       ///< Packet source ID
+
+		bool operator!=(const RequestID& rightSide) const {
+			return (sequenceCount != rightSide.sequenceCount) or (applicationID != rightSide.applicationID) or
+			       (sourceID != rightSide.sourceID);
+		}
+
+		bool operator==(const RequestID& rightSide) const {
+			return !(*this != rightSide);
+		}
+	};
+
+	/**
+	 * @brief Instances of activities to run in the schedule
+	 *
+	 * @details All scheduled activities must contain the request they exist for, their release
+	 * time and the corresponding request identifier.
+	 *
+	 * @todo If we decide to use sub-schedules, the ID of that has to be defined
+	 * @todo If groups are used, then the group ID has to be defined here
+	 */
+	struct ScheduledActivity {
+		Message request;                         ///< Hold the received command request
+		RequestID requestID;                     ///< Request ID, characteristic of the definition
+		Time::DefaultCUC requestReleaseTime{0}; ///< Keep the command release time
+	};
+
+	typedef std::multimap<Time::DefaultCUC, ScheduledActivity> Activities;
+	typedef Activities::iterator iterator;
+	typedef Activities::const_iterator const_iterator;
+
+	explicit TimeSchedule(size_t capacity = ECSSMaxNumberOfTimeSchedActivities) : d_capacity(capacity) {}
+	~TimeSchedule() = default;
+
+	size_t capacity() const { return d_capacity; }
+	size_t size() const { return activities.size(); }
+	bool empty() const { return activities.empty(); }
+	size_t available() const { return d_capacity - activities.size(); }
+
+	const_iterator begin() const { return activities.begin(); }
+	const_iterator end() const { return activities.end(); }
+
+	/**
+	 * Inserts an activity after the ones with the same release time
+	 *
+	 * @return false if the schedule is full
+	 */
+	bool insert(ScheduledActivity&& activity);
+
+	/**
+	 * Returns the activity of \p requestID, or end(). If several activities have the same
+	 * request ID, returns the first one to be released.
+	 */
+	iterator find(const RequestID& requestID);
+
+	void erase(iterator activity);
+
+	/**
+	 * Moves an activity \p offset later, or earlier for a negative offset
+	 */
+	void shift(iterator activity, std::chrono::seconds offset);
+
+	/**
+	 * Moves all the activities \p offset later, or earlier for a negative offset. The order of
+	 * the activities does not change, so the tree is rebuilt in linear time.
+	 */
+	void shiftAll(std::chrono::seconds offset);
+
+	void clear();
+
+	/**
+	 * Release time of the first activity, or Time::DefaultCUC::max() if the schedule is empty
+	 */
+	Time::DefaultCUC nextReleaseTime() const;
+
+	/**
+	 * Removes all the activities due at \p currentTime and passes them to \p release, in
+	 * release time order
+	 *
+	 * @return the number of released activities
+	 */
+	template <typename Release>
+	size_t releaseDue(Time::DefaultCUC currentTime, Release release) {
+		size_t released = 0;
+		while (!activities.empty() && activities.begin()->first <= currentTime) {
+			removeFromIndex(activities.begin());
+			auto node = activities.extract(activities.begin());
+			release(node.mapped());
+			released++;
+		}
+		return released;
+	}
+
+    private:
+	struct IndexEntry {
+		iterator activity;
+		// Order of the activities with the same release time, as in the tree
+		uint64_t insertion;
+	};
+
+	size_t d_capacity;
+	Activities activities;
+	std::unordered_multimap<uint64_t, IndexEntry> index;
+	uint64_t d_insertions = 0;
+
+	static uint64_t indexKey(const RequestID& requestID) {
+		return (static_cast<uint64_t>(requestID.applicationID) << 32U) |
+		       (static_cast<uint64_t>(requestID.sequenceCount) << 16U) | requestID.sourceID;
+	}
+
+	void addToIndex(iterator activity);
+	void removeFromIndex(iterator activity);
+   };
+  } // namespace pus
+} // namespace gr
+#endif
@@ -0,0 +1,152 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+#ifndef ECSS_TIMESCHEDULEJOURNAL_H
+#define ECSS_TIMESCHEDULEJOURNAL_H
+
+#include <gnuradio/pus/api.h>
+#include <gnuradio/pus/Helpers/TimeSchedule.h>
+#include <chrono>
+#include <cstddef>
+#include <string>
+#include <vector>
+
+namespace gr {
+ namespace pus {
+/**
+ * Persistent journal of a TimeSchedule, so the ST[11] schedule survives a restart of the flowgraph.
+ *
+ * The changes of the schedule are appended to a binary journal file as insert, delete, shift,
+ * shift-all, reset and release records. The records are buffered in memory and written, with a
+ * single fdatasync, when flush() is called, so recording a change never waits for the disk. A
+ * compacted snapshot of the schedule is written next to the journal, in <path>.snapshot, and the
+ * journal is emptied.
+ *
+ * On open(), the snapshot and then the journal are memory mapped and replayed into the schedule.
+ * A truncated or corrupted record at the end of the journal, left by a crash during a write, is
+ * discarded. The journal holds the generation of the snapshot it applies to, so the journal of an
+ * interrupted compaction is not replayed twice.
+ *
+ * The records are written in host byte order, the files are not meant to be moved across hosts.
+ */
+    class PUS_API TimeScheduleJournal {
+    public:
+	enum Operation : uint8_t {
+		Insert = 1,
+		Delete = 2,
+		Shift = 3,
+		ShiftAll = 4,
+		Reset = 5,
+		Release = 6
+	};
+
+	/**
+	 * @param compactionSize journal size, in bytes, from which compact() is due. The journal is
+	 * also allowed to grow up to the size of the snapshot.
+	 */
+	explicit TimeScheduleJournal(size_t compactionSize = 1024 * 1024) : d_compaction_size(compactionSize) {}
+	~TimeScheduleJournal();
+
+	TimeScheduleJournal(const TimeScheduleJournal&) = delete;
+	TimeScheduleJournal& operator=(const TimeScheduleJournal&) = delete;
+
+	/**
+	 * Loads the snapshot and the journal at \p path into \p schedule, and opens the journal
+	 * to record the next changes. The activities that \p schedule cannot hold are counted in
+	 * dropped().
+	 *
+	 * @return false if the files cannot be read or created
+	 */
+	bool open(const std::string& path, TimeSchedule& schedule);
+
+	/**
+	 * Flushes the pending records and closes the journal
+	 */
+	void close();
+
+	bool isOpen() const { return d_fd >= 0; }
+
+	void recordInsert(const TimeSchedule::ScheduledActivity& activity);
+	void recordDelete(const TimeSchedule::RequestID& requestID);
+	void recordShift(const TimeSchedule::RequestID& requestID, std::chrono::seconds offset);
+	void recordShiftAll(std::chrono::seconds offset);
+	void recordReset();
+	/**
+	 * Records the release of all the activities due at \p currentTime
+	 */
+	void recordRelease(Time::DefaultCUC currentTime);
+
+	/**
+	 * Writes the pending records to the journal and waits for them to reach the disk
+	 *
+	 * @return false if the records could not be written
+	 */
+	bool flush();
+
+	/**
+	 * The journal has grown enough to be replaced by a snapshot
+	 */
+	bool compactionDue() const;
+
+	/**
+	 * Writes a snapshot of \p schedule and empties the journal. The snapshot is written to a
+	 * temporary file and renamed, so a crash leaves either the old or the new snapshot.
+	 *
+	 * @return false if the snapshot could not be written, the journal is kept then
+	 */
+	bool compact(const TimeSchedule& schedule);
+
+	/**
+	 * Bytes of records not written yet
+	 */
+	size_t pending() const { return d_buffer.size(); }
+
+	/**
+	 * Size of the journal file, in bytes
+	 */
+	size_t journalSize() const { return d_journal_size; }
+
+	/**
+	 * Number of records replayed by the last open(), from the snapshot and the journal
+	 */
+	size_t replayed() const { return d_replayed; }
+
+	/**
+	 * Number of activities the last open() could not insert into the schedule, e.g. because
+	 * it has a smaller capacity than when they were recorded. They are not counted in
+	 * replayed().
+	 */
+	size_t dropped() const { return d_dropped; }
+
+    private:
+	size_t d_compaction_size;
+	std::string d_path;
+	int d_fd = -1;
+	uint32_t d_generation = 0;
+	size_t d_journal_size = 0;
+	size_t d_snapshot_size = 0;
+	size_t d_replayed = 0;
+	size_t d_dropped = 0;
+	std::vector<uint8_t> d_buffer;
+
+	void beginRecord(std::vector<uint8_t>& buffer, Operation operation);
+	void endRecord(std::vector<uint8_t>& buffer, size_t start);
+	void appendActivity(std::vector<uint8_t>& buffer, const TimeSchedule::ScheduledActivity& activity);
+
+	/**
+	 * Replays the records of a mapped file into \p schedule
+	 *
+	 * @return the size of the valid records
+	 */
+	size_t replay(const uint8_t* records, size_t size, TimeSchedule& schedule);
+
+	bool loadSnapshot(TimeSchedule& schedule);
+	bool loadJournal(TimeSchedule& schedule);
+	bool resetJournal();
+   };
+  } // namespace pus
+} // namespace gr
+#endif
@@ -0,0 +1,67 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+#ifndef INCLUDED_PUS_VERIFICATIONREPORT_H
+#define INCLUDED_PUS_VERIFICATIONREPORT_H
+
+#include <gnuradio/pus/api.h>
+#include <gnuradio/pus/Definitions/pmt_constants.h>
+#include <gnuradio/pus/Helpers/Message.h>
+#include <cstdint>
+#include <cstddef>
+
+namespace gr {
+  namespace pus {
+
+   /**
+    * Verification report request, as sent by the services to ST[01] on their `ver` port.
+    *
+    * A TM[1,x] report only holds the request ID of the TC (packet ID and packet sequence
+    * control), plus an error code and a step ID for some of the reports. Instead of a copy of
+    * the whole TC, the services send a fixed-size record:
+    *
+    *   (meta . u8vector[8])
+    *
+    * where meta is a shared `{req: messageType}` dictionary, built once per report type, and the
+    * u8vector holds the request ID (4 bytes), the error code (2 bytes, big endian), the step ID
+    * and the report type. Publishing a report costs a single data allocation.
+    *
+    * The (meta . TC) format, with the `req`, `error_type` and `step_id` keys in meta, is still
+    * accepted by ST[01].
+    */
+   struct PUS_API VerificationReport {
+	inline static const size_t Size = 8;
+
+	// First four bytes of the TC: packet ID and packet sequence control
+	uint8_t requestId[4] = { 0, 0, 0, 0 };
+	uint16_t errorCode = 0;
+	uint8_t stepId = 0;
+	// TM[1,x] report to generate, one of RequestVerificationService::MessageType
+	uint8_t messageType = 0;
+
+	/**
+	 * Builds the verification report PDU of the TC in \p request
+	 */
+	static pmt::pmt_t toPDU(uint8_t messageType, const uint8_t* request, size_t size,
+				uint16_t errorCode = 0, uint8_t stepId = 0);
+
+	static pmt::pmt_t toPDU(uint8_t messageType, const Message& request, uint16_t errorCode = 0,
+				uint8_t stepId = 0)
+	{
+		return toPDU(messageType, request.getMessageRawData(), request.getMessageSize(), errorCode, stepId);
+	}
+
+	/**
+	 * Reads a verification report PDU built by toPDU()
+	 *
+	 * @return false if \p pdu is not in the fixed-size format
+	 */
+	static bool fromPDU(const pmt::pmt_t& pdu, VerificationReport& report);
+   };
+
+  } // namespace pus
+} // namespace gr
+#endif // INCLUDED_PUS_VERIFICATIONREPORT_H
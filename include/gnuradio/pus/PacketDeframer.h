@@ -0,0 +1,70 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_PUS_PACKETDEFRAMER_H
+#define INCLUDED_PUS_PACKETDEFRAMER_H
+
+#include <gnuradio/pus/api.h>
+#include <gnuradio/sync_block.h>
+
+namespace gr {
+  namespace pus {
+
+    /*!
+     * \brief Extracts Space Packets from a byte stream and publishes them as PDUs
+     * \ingroup pus
+     *
+     * The input is a stream of unpacked bytes (e.g. the output of a demodulator). Packets are
+     * located either by an attached sync marker placed in front of each packet, or by KISS
+     * (0xC0) or asynchronous HDLC (0x7E) frame delimiters. The stream is scanned with memchr(),
+     * so the cost per byte is that of the C library search routine instead of a per-byte state
+     * machine.
+     *
+     * Each candidate packet is checked against the CCSDS packet data length field and,
+     * optionally, the packet CRC before being published on the `out` port as a
+     * (meta . u8vector) PDU, ready for the Services Pool.
+     */
+    class PUS_API PacketDeframer : virtual public gr::sync_block
+    {
+     public:
+      typedef std::shared_ptr<PacketDeframer> sptr;
+
+      enum Framing : int {
+	SyncMarker = 0,
+	KISS = 1,
+	HDLC = 2
+      };
+
+      /*!
+       * \brief Return a shared_ptr to a new instance of pus::PacketDeframer.
+       *
+       * To avoid accidental use of raw pointers, pus::PacketDeframer's
+       * constructor is in a private implementation
+       * class. pus::PacketDeframer::make is the public interface for
+       * creating new instances.
+       *
+       * \param framing one of SyncMarker, KISS or HDLC
+       * \param syncMarker the attached sync marker, only used with SyncMarker framing
+       * \param checkCRC drop the packets whose CRC field does not match
+       */
+      static sptr make(int framing = SyncMarker, uint32_t syncMarker = 0x1ACFFC1DU, bool checkCRC = true);
+
+      /*!
+       * \brief Number of packets published so far
+       */
+      virtual uint64_t packetCount() const = 0;
+
+      /*!
+       * \brief Number of candidate packets rejected by the length or CRC checks so far
+       */
+      virtual uint64_t droppedCount() const = 0;
+    };
+
+  } // namespace pus
+} // namespace gr
+
+#endif /* INCLUDED_PUS_PACKETDEFRAMER_H */
@@ -11,11 +11,16 @@
 #ifndef ECSS_SERVICES_SERVICE_HPP
 #define ECSS_SERVICES_SERVICE_HPP
 
+#include <atomic>
+#include <condition_variable>
 #include <cstdint>
+#include <functional>
+#include <mutex>
 #include <gnuradio/pus/api.h>
 #include <gnuradio/block.h>
 #include <gnuradio/pus/Helpers/MessageParser.h>
 #include <gnuradio/pus/Helpers/ErrorHandler.h>
+#include <gnuradio/pus/Helpers/PDUBatch.h>
 #include <gnuradio/pus/Definitions/pmt_constants.h>
 
 /**
@@ -35,9 +40,33 @@
    
    class Service : virtual public gr::block
    {
+    public:
+	/**
+	 * Thread that runs the timer ticks of a service
+	 */
+	enum TimerExecution : uint8_t {
+		// Ticks are posted to the block message queue and run on the block thread, serialized
+		// with the message handlers
+		BlockThread = 0,
+		// Ticks run on the TimeProvider executor of the service, concurrently with the message
+		// handlers
+		TimerThread = 1
+	};
+
     private:
 	uint16_t messageTypeCounter = 0;
 
+	// Ticks received from the TimeProvider and not yet run on the block thread
+	std::atomic<uint32_t> d_pending_ticks{0};
+
+	// Signals the TimeProvider executor when the block thread has run the pending ticks
+	std::mutex d_tick_mutex;
+	std::condition_variable d_ticks_run;
+	// The block thread is running the tick messages, so the executor can wait for them
+	bool d_block_ticking = false;
+
+	void waitTicksRun();
+
     protected:	
 	
 	MessageParser* d_message_parser;
@@ -120,12 +149,37 @@
 	 */
 	void execute(Message& message);
 
+	/**
+	 * Registers the timer tick of this service in the TimeProvider
+	 *
+	 * With BlockThread, each tick from the TimeProvider is counted and a single message is posted
+	 * to the `tick` input port of the block, so \p handler runs on the block thread and never
+	 * concurrently with handle_msg(). Ticks that arrive while the block is busy are run back to
+	 * back once the message is handled, none is dropped.
+	 *
+	 * With the simulated clock of the TimeProvider, and while the block is started, a tick only
+	 * completes once the block thread has run it. TimeProvider::advanceTime() then waits for the
+	 * block, and \p handler reads the time of its own tick.
+	 *
+	 * Must be called from the constructor, after serviceType is set.
+	 */
+	void addTimerHandler(std::function<void(TimeProvider*)> handler, TimerExecution execution = BlockThread);
+
+	/**
+	 * Removes the timer tick of this service from the TimeProvider. Once it returns, no more
+	 * ticks are posted to the block.
+	 */
+	void removeTimerHandler();
+
 	/**
 	 * Default protected constructor for this Service
 	 */
 	Service() = default;
 
     public:
+	bool start() override;
+	bool stop() override;
+
 	/**
 	 * @brief Unimplemented copy constructor
 	 *
@@ -272,6 +272,30 @@ namespace Time {
 		return (year % 400) == 0;
 	}
 
+	/**
+	 * Returns the number of days from 1 January 1970 to a date of the Gregorian calendar, negative for
+	 * earlier dates.
+	 *
+	 * The calendar is shifted to start on 1 March, so that the leap day is the last day of the year, and
+	 * the days are counted in closed form from 400-year eras, instead of walking the years and months.
+	 *
+	 * @param year the year as it used in Gregorian calendar
+	 * @param month the month as it used in Gregorian calendar (1-12 inclusive)
+	 * @param day the day as it used in Gregorian calendar (1-31 inclusive)
+	 */
+	constexpr int64_t daysFromCivil(int64_t year, uint8_t month, uint8_t day) {
+		year -= (month <= 2) ? 1 : 0;
+		const int64_t era = ((year >= 0) ? year : year - 399) / 400;
+		const int64_t yearOfEra = year - era * 400;
+		const int64_t dayOfYear = (153 * ((month > 2) ? month - 3 : month + 9) + 2) / 5 + day - 1;
+		const int64_t dayOfEra = yearOfEra * 365 + yearOfEra / 4 - yearOfEra / 100 + dayOfYear;
+		return era * 146097 + dayOfEra - 719468;
+	}
+
+	static_assert(daysFromCivil(1970, 1, 1) == 0);
+	static_assert(daysFromCivil(1958, 1, 1) == -4383);
+	static_assert(daysFromCivil(2000, 3, 1) == 11017);
+
 	/**
  	* A time shift for scheduled activities measured in seconds
  	*/
@@ -20,7 +20,14 @@
 #include <gnuradio/pus/Time/UTCTimestamp.h>
 
 #include <gnuradio/pus/Definitions/ECSS_Definitions.h>
+#include <array>
 #include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <vector>
 #include <etl/vector.h>
 #include "etl/map.h"
 
@@ -36,14 +43,59 @@ class TimeProviderDestroyer;
      */
     class PUS_API TimeProvider
     {
-     
+     public:
+      typedef std::chrono::steady_clock Clock;
+
+      inline static const size_t ExecutionHistogramBins = 24;
+
+      /**
+      * @brief Timing of the timer callbacks
+      *
+      * @details Jitter is the delay between the deadline of a callback and the moment its tick
+      * is dispatched. A tick overruns when it is dispatched while the previous tick of the same
+      * callback is still running or waiting. Bin i of the execution histogram counts the
+      * callbacks that ran for [2^i, 2^(i+1)) microseconds, bin 0 also holds the shorter ones.
+      * Wakeups counts the times the timer thread woke up, for any reason.
+      */
+      struct TimerStatistics {
+	uint64_t wakeups = 0;
+	uint64_t ticks = 0;
+	int64_t lastJitterUs = 0;
+	int64_t maxJitterUs = 0;
+	int64_t totalJitterUs = 0;
+	uint64_t overruns = 0;
+	uint64_t executions = 0;
+	int64_t lastExecutionUs = 0;
+	int64_t maxExecutionUs = 0;
+	int64_t totalExecutionUs = 0;
+	std::array<uint64_t, ExecutionHistogramBins> executionHistogram{};
+
+	int64_t meanJitterUs() const { return ticks ? totalJitterUs / static_cast<int64_t>(ticks) : 0; };
+	int64_t meanExecutionUs() const { return executions ? totalExecutionUs / static_cast<int64_t>(executions) : 0; };
+      };
+
      private:
+      /**
+      * Runs the ticks of one callback on its own thread, so that a slow callback only delays
+      * itself
+      */
+      class HandlerExecutor;
+
+      struct TimerHandler {
+	// Zero follows the timer resolution
+	long periodMs = 0;
+	long phaseMs = 0;
+	Clock::time_point deadline;
+	std::shared_ptr<HandlerExecutor> executor;
+      };
+
       /**
       * @brief Hold the list of timer callbacks
       *
-      * @details The callbacks in this list are executed each second.
+      * @details Each callback runs at its own period, every timer resolution by default. The
+      * timer thread sleeps until the earliest deadline instead of polling.
       */
-      etl::map<uint16_t, std::function<void(TimeProvider*)>, ECSSMaxNumberOfCallbackFunctions> handlers;
+      etl::map<uint16_t, TimerHandler, ECSSMaxNumberOfCallbackFunctions> handlers;
 
       static TimeProvider* inst_timeprovider;
       static TimeProviderDestroyer inst_timeproviderdestroyer;
@@ -60,12 +112,38 @@ class TimeProviderDestroyer;
       long d_resolution = 1; 
       long d_newresolution = 1;     
 
+      // Current time as a DefaultCUC T-field, published by the timer thread
+      std::atomic<uint32_t> d_cuc{ 0 };
+      // With the simulated clock, time only moves with advanceTime(), and the time points of
+      // the deadlines count from the Unix epoch
+      std::atomic<bool> d_simulated{ false };
+      std::atomic<int64_t> d_simulated_ms{ 0 };
+      // Seconds from the Unix epoch to Time::Epoch, updated by config()
+      std::atomic<int64_t> d_epoch_unix_seconds{ 0 };
+
       gr::thread::thread d_thread;
       std::atomic<bool> d_finished;    
       bool d_status;
       bool d_suspend;
+
+      // Guards the handlers and the timer thread statistics
+      std::mutex d_mutex;
+      std::condition_variable d_wakeup;
+      bool d_rescheduled = false;
+      // Phases are counted from the first whole second after the thread started
+      Clock::time_point d_origin;
+      TimerStatistics d_statistics;
     
       void run();
+      void publishCurrentTime();
+      int64_t currentUnixSeconds() const;
+      Clock::time_point now() const;
+      Clock::time_point nextSecond(Clock::time_point now) const;
+      void restartDeadlines();
+      void dispatchTicks(Clock::time_point now, std::vector<std::shared_ptr<HandlerExecutor>>* ticked = nullptr);
+      long handlerPeriodMs(const TimerHandler& handler) const;
+      Clock::time_point firstDeadline(const TimerHandler& handler, Clock::time_point now) const;
+      void reschedule();
        // Overloading these to start and stop the internal thread that
       // periodically produces the message.
       bool start();
@@ -77,9 +155,15 @@ class TimeProviderDestroyer;
       UTCTimestamp getCurrentTimeUTC();  
 	/**
 	 * Returns the current time as CCSDS 301.0-B-4
-	 * @note
+	 * @note The value is encoded by the timer thread every millisecond, and published for all
+	 * the callers, so that time-stamping a report only loads it.
 	 */
-      uint32_t  getCurrentTimeDefaultCUC();
+      uint32_t  getCurrentTimeDefaultCUC() { return d_cuc.load(std::memory_order_relaxed); };
+
+	/**
+	 * Converts seconds from the Unix epoch to a DefaultCUC T-field, from the current Time::Epoch
+	 */
+      static uint32_t toDefaultCUC(time_t unixSeconds);
       bool config(float resolution, uint8_t mode, bool p_field, uint16_t epoch_year, uint8_t epoch_month, uint8_t epoch_day);
  
       inline long getTimerResolutionMs() {return d_resolution;};
@@ -93,12 +177,57 @@ class TimeProviderDestroyer;
 	    CUC_LVL2 = 2,
 	    CDS = 4                
       }; 
+
+	/**
+	 * Switches to the simulated clock, set to \p unixMs milliseconds from the Unix epoch
+	 *
+	 * The simulated time does not follow the wall clock, it only moves with advanceTime(). The
+	 * callbacks tick from the next simulated second, as they do from the next wall clock second.
+	 */
+      void setSimulatedTime(int64_t unixMs);
+
+	/**
+	 * Switches back to the wall clock
+	 */
+      void setRealTime();
+
+      bool isSimulatedTime() { return d_simulated; };
+
+	/**
+	 * Moves the simulated time \p milliseconds forward, as fast as the callbacks run
+	 *
+	 * The time steps from deadline to deadline, and each step waits for the ticks it posted to
+	 * run, so that a callback reads the time of its deadline. Must not be called from a
+	 * callback.
+	 *
+	 * @return false if the simulated clock is not in use
+	 */
+      bool advanceTime(int64_t milliseconds);
       
 
       
       void addHandler(uint16_t serviceType, std::function<void(TimeProvider*)> handler);
+
+	/**
+	 * Adds a callback running every \p periodMs milliseconds, \p phaseMs after the period
+	 * boundaries. A zero period follows the timer resolution.
+	 */
+      void addHandler(uint16_t serviceType, std::function<void(TimeProvider*)> handler, long periodMs,
+      		      long phaseMs = 0);
+
+	/**
+	 * Removes a callback, waiting for its running tick to finish. Must not be called from the
+	 * callback itself.
+	 */
       void removeHandler(uint16_t serviceType);
 
+	/**
+	 * Timing of all the callbacks, or of the callback of \p serviceType
+	 */
+      TimerStatistics getTimerStatistics();
+      TimerStatistics getTimerStatistics(uint16_t serviceType);
+      void resetTimerStatistics();
+
     };
     
 
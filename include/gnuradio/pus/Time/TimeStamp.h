@@ -407,18 +407,11 @@ TimeStamp<BaseBytes, FractionBytes, Num, Denom>::TimeStamp(const UTCTimestamp& t
 			;//ErrorHandler::reportInternalError(ErrorHandler::TimeStampOutOfBounds);
 		}
 	};
-	for (int year = Time::Epoch.year; year < timestamp.year+1900; ++year) {
-		secondsAdd((Time::isLeapYear(year) ? 366 : 365) * Time::SecondsPerDay);
-	}
-
-	for (int month = Time::Epoch.month; month < timestamp.month+1; ++month) {
-		secondsAdd(Time::DaysOfMonth[month - 1] * Time::SecondsPerDay);
-		if ((month == 2U) && Time::isLeapYear(timestamp.year+1900)) {
-			secondsAdd(Time::SecondsPerDay);
-		}
-	}
+	// The timestamp holds the fields of std::tm, years from 1900 and months from 0
+	const int64_t days = Time::daysFromCivil(timestamp.year + 1900, timestamp.month + 1, timestamp.day) -
+	                     Time::daysFromCivil(Time::Epoch.year, Time::Epoch.month, Time::Epoch.day);
 
-	secondsAdd((timestamp.day - Time::Epoch.day) * Time::SecondsPerDay);
+	secondsAdd(static_cast<TAICounter_t>(days) * Time::SecondsPerDay);
 	secondsAdd(timestamp.hour * Time::SecondsPerHour);
 	secondsAdd(timestamp.minute * Time::SecondsPerMinute);
 	secondsAdd(timestamp.second);
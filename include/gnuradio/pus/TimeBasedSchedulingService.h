@@ -73,8 +73,13 @@ namespace gr {
        * constructor is in a private implementation
        * class. pus::TimeBasedSchedulingService::make is the public interface for
        * creating new instances.
+       *
+       * \param capacity Maximum number of activities in the schedule
+       * \param journal_file Journal to keep the schedule across restarts, none if empty. The
+       * schedule is reloaded from it, and from journal_file.snapshot, on start up.
        */
-      static sptr make();
+      static sptr make(uint32_t capacity = ECSSMaxNumberOfTimeSchedActivities,
+                       const std::string& journal_file = "");
     };
 
   } // namespace pus
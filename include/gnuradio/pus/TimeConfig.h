@@ -44,6 +44,25 @@ namespace gr {
       virtual UTCTimestamp getCurrentTimeUTC() = 0; 
 
       virtual uint32_t  getCurrentTimeDefaultCUC() = 0;
+
+      /*!
+       * \brief Switches the TimeProvider to simulated time, set to \p unixMs milliseconds
+       * from the Unix epoch
+       *
+       * The simulated time can also be driven from the `clock` message port, with the
+       * (time . unixMs), (advance . ms) and (real_time . #t) pairs.
+       */
+      virtual void setSimulatedTime(int64_t unixMs) = 0;
+
+      /*!
+       * \brief Moves the simulated time \p milliseconds forward, running all the timer ticks
+       * on the way. Returns false if the simulated time is not in use.
+       */
+      virtual bool advanceTime(int64_t milliseconds) = 0;
+
+      virtual void setRealTime() = 0;
+
+      virtual bool isSimulatedTime() = 0;
     };
 
   } // namespace pus
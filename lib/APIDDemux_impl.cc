@@ -0,0 +1,147 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/io_signature.h>
+#include "APIDDemux_impl.h"
+#include <gnuradio/pus/Helpers/PDUBatch.h>
+
+namespace gr {
+  namespace pus {
+
+    APIDDemux::sptr
+    APIDDemux::make(std::vector<uint16_t> apid_list)
+    {
+      return gnuradio::make_block_sptr<APIDDemux_impl>(
+        apid_list);
+    }
+
+
+    /*
+     * The private constructor
+     */
+    APIDDemux_impl::APIDDemux_impl(std::vector<uint16_t> apid_list)
+      : gr::block("APIDDemux",
+              gr::io_signature::make(0, 0, 0),
+              gr::io_signature::make(0, 0, 0))
+    {
+        message_port_register_in(PMT_IN);
+        set_msg_handler(PMT_IN,
+                    [this](pmt::pmt_t msg) { PDUBatch::forEach(msg, [this](pmt::pmt_t pdu) { this->handle_msg(pdu); }); });
+        message_port_register_out(PMT_OTHER);
+
+        for (auto& entry : d_apids)
+        	entry.port = PMT_OTHER;
+
+        if(apid_list.size() > 1){
+            for(uint16_t i = 0; i < apid_list.size(); i++){
+                pmt::pmt_t port = pmt::intern("out" + std::to_string(i));
+                message_port_register_out(port);
+                if(apid_list[i] < NumberOfAPIDs && d_apids[apid_list[i]].port == PMT_OTHER)
+                    d_apids[apid_list[i]].port = port;
+            }
+        }else{
+            message_port_register_out(PMT_OUT);
+            if(apid_list.size() == 1 && apid_list[0] < NumberOfAPIDs)
+                d_apids[apid_list[0]].port = PMT_OUT;
+        }
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    APIDDemux_impl::~APIDDemux_impl()
+    {
+    }
+
+    pmt::pmt_t APIDDemux_impl::getStatistics(uint16_t apid)
+    {
+        pmt::pmt_t stats = pmt::make_dict();
+        if (apid >= NumberOfAPIDs)
+        	return stats;
+
+        std::lock_guard<std::mutex> lock(d_mutex);
+        const APIDEntry& entry = d_apids[apid];
+        double elapsed = std::chrono::duration<double>(entry.last - entry.first).count();
+
+        stats = pmt::dict_add(stats, pmt::intern("packets"), pmt::from_uint64(entry.packets));
+        stats = pmt::dict_add(stats, pmt::intern("bytes"), pmt::from_uint64(entry.bytes));
+        stats = pmt::dict_add(stats, pmt::intern("lost"), pmt::from_uint64(entry.lost));
+        stats = pmt::dict_add(stats, pmt::intern("gaps"), pmt::from_uint64(entry.gaps));
+        stats = pmt::dict_add(stats, pmt::intern("duplicates"), pmt::from_uint64(entry.duplicates));
+        stats = pmt::dict_add(stats, pmt::intern("last_sequence_count"), pmt::from_long(entry.lastSequenceCount));
+        stats = pmt::dict_add(stats, pmt::intern("bytes_per_second"),
+        			pmt::from_double(elapsed > 0 ? entry.bytes / elapsed : 0.0));
+        return stats;
+    }
+
+    void APIDDemux_impl::resetStatistics()
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        for (auto& entry : d_apids) {
+        	pmt::pmt_t port = entry.port;
+        	entry = APIDEntry();
+        	entry.port = port;
+        }
+    }
+
+    void APIDDemux_impl::handle_msg(pmt::pmt_t pdu)
+    {
+        // make sure PDU data is formed properly
+        if (!(pmt::is_pair(pdu))) {
+            GR_LOG_NOTICE(d_logger, "received unexpected PMT (non-pair)");
+            return;
+        }
+
+        pmt::pmt_t v_data = pmt::cdr(pdu);
+        if (!pmt::is_u8vector(v_data)) {
+            GR_LOG_WARN(d_logger, "Error: the input data is not a u8vector");
+            return;
+        }
+
+        size_t size = 0;
+        const uint8_t* data = pmt::u8vector_elements(v_data, size);
+        if (size < CCSDSPrimaryHeaderSize) {
+            GR_LOG_WARN(d_logger, "Error: the input data size is invalid");
+            return;
+        }
+
+        uint16_t apid = ((data[0] << 8U) | data[1]) & 0x07FFU;
+        uint16_t sequenceCount = ((data[2] << 8U) | data[3]) & 0x3FFFU;
+        Clock::time_point now = Clock::now();
+        pmt::pmt_t port;
+        {
+            std::lock_guard<std::mutex> lock(d_mutex);
+            APIDEntry& entry = d_apids[apid];
+
+            if (!entry.seen) {
+            	entry.seen = true;
+            	entry.first = now;
+            	entry.lastSequenceCount = sequenceCount;
+            } else {
+            	uint16_t delta = (sequenceCount - entry.lastSequenceCount) & (SequenceCountModulus - 1U);
+            	// A count that does not move forward is a repeated (or late) packet
+            	if (delta == 0 || delta >= SequenceCountModulus / 2U) {
+            		entry.duplicates++;
+            	} else {
+            		if (delta > 1) {
+            			entry.gaps++;
+            			entry.lost += delta - 1U;
+            		}
+            		entry.lastSequenceCount = sequenceCount;
+            	}
+            }
+            entry.packets++;
+            entry.bytes += size;
+            entry.last = now;
+            port = entry.port;
+        }
+
+        message_port_pub(port, pdu);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -0,0 +1,76 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_PUS_APIDDEMUX_IMPL_H
+#define INCLUDED_PUS_APIDDEMUX_IMPL_H
+
+#include <gnuradio/pus/APIDDemux.h>
+#include <gnuradio/pus/Definitions/pmt_constants.h>
+#include <gnuradio/pus/Definitions/ECSS_Definitions.h>
+#include <array>
+#include <chrono>
+#include <mutex>
+
+namespace gr {
+  namespace pus {
+
+    class APIDDemux_impl : public APIDDemux
+    {
+     public:
+      /**
+       * Number of APIDs addressable by the 11-bit field of the primary header
+       */
+      static const uint16_t NumberOfAPIDs = 2048U;
+
+      /**
+       * Modulus of the 14-bit packet sequence count
+       */
+      static const uint16_t SequenceCountModulus = 16384U;
+
+     private:
+      typedef std::chrono::steady_clock Clock;
+
+      struct APIDEntry {
+	pmt::pmt_t port;
+	bool seen = false;
+	uint16_t lastSequenceCount = 0;
+	uint64_t packets = 0;
+	uint64_t bytes = 0;
+	uint64_t lost = 0;
+	uint64_t gaps = 0;
+	uint64_t duplicates = 0;
+	Clock::time_point first;
+	Clock::time_point last;
+      };
+
+      /**
+       * Output port and counters of each APID, indexed directly by the APID
+       */
+      std::array<APIDEntry, NumberOfAPIDs> d_apids;
+
+      std::mutex d_mutex;
+
+     public:
+      APIDDemux_impl(std::vector<uint16_t> apid_list);
+      ~APIDDemux_impl();
+
+      pmt::pmt_t getStatistics(uint16_t apid) override;
+      void resetStatistics() override;
+
+    /**
+     * @brief Updates the counters of the packet APID and publishes it on its port
+     *
+     * @param pdu (meta . u8vector) PDU holding a Space Packet
+     */
+      void handle_msg(pmt::pmt_t pdu);
+
+    };
+
+  } // namespace pus
+} // namespace gr
+
+#endif /* INCLUDED_PUS_APIDDEMUX_IMPL_H */
@@ -45,7 +45,7 @@ namespace gr {
         	
         message_port_register_in(PMT_IN);
         set_msg_handler(PMT_IN,
-                    [this](pmt::pmt_t msg) { this->handle_msg(msg); });
+                    [this](pmt::pmt_t msg) { PDUBatch::forEach(msg, [this](pmt::pmt_t pdu) { this->handle_msg(pdu); }); });
         message_port_register_out(PMT_OUT);
         message_port_register_out(PMT_VER);
 
@@ -78,10 +78,10 @@ namespace gr {
 
         // extract data
         if (pmt::is_u8vector(v_data)) {
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-                Message message  = d_message_parser->ParseMessageCommand(in_data);
+                Message message  = d_message_parser->ParseMessageCommand(meta, data, size);
           
                 if(serviceType == message.getMessageServiceType()){
                     switch (message.getMessageType()) {
@@ -8,64 +8,92 @@
  * SPDX-License-Identifier: GPL-3.0-or-later
  */
  #include <gnuradio/pus/Helpers/CRCHelper.h>
+ #include <array>
 
 namespace gr {
   namespace pus {
-  
 
-uint16_t CRCHelper::calculateMessageCRC(MessageArray& message) {
-	// shift register contains all 1's initially (ECSS-E-ST-70-41C, Annex B - CRC and ISO checksum)
-	uint16_t shiftReg = 0xFFFFU;
+namespace {
 
-	// CRC16-CCITT generator polynomial (as specified in standard)
-	uint16_t polynomial = 0x1021U;
+typedef std::array<std::array<uint16_t, 256>, 8> CRCTables;
 
-	for (uint32_t i = 0; i < message.size(); i++) {
-		// "copy" (XOR w/ existing contents) the current msg bits into the MSB of the shift register
-		shiftReg ^= (message[i] << 8U);
+/**
+ * Builds the slice-by-8 lookup tables at compile time.
+ *
+ * crcTables[0][b] is the CRC register after shifting byte b through an all-zero register
+ * (the classic byte-wise table). crcTables[k][b] is the contribution of byte b when it is
+ * followed by k more bytes, i.e. crcTables[k-1][b] advanced through one zero byte.
+ */
+constexpr CRCTables makeCRCTables() {
+	CRCTables tables{};
 
+	for (uint16_t b = 0; b < 256; b++) {
+		uint16_t shiftReg = static_cast<uint16_t>(b << 8U);
 		for (int j = 0; j < 8; j++) {
-			// if the MSB is set, the bitwise AND gives 1
 			if ((shiftReg & 0x8000U) != 0U) {
-				// toss out of the register the MSB and divide (XOR) its content with the generator
-				shiftReg = ((shiftReg << 1U) ^ polynomial);
+				shiftReg = static_cast<uint16_t>((shiftReg << 1U) ^ CRCHelper::CRCPolynomial);
 			} else {
-				// just toss out the MSB and make room for a new bit
-				shiftReg <<= 1U;
+				shiftReg = static_cast<uint16_t>(shiftReg << 1U);
 			}
 		}
+		tables[0][b] = shiftReg;
 	}
-	return shiftReg;
+
+	for (size_t k = 1; k < tables.size(); k++) {
+		for (uint16_t b = 0; b < 256; b++) {
+			uint16_t previous = tables[k - 1][b];
+			tables[k][b] = static_cast<uint16_t>((previous << 8U) ^ tables[0][previous >> 8U]);
+		}
+	}
+
+	return tables;
 }
 
-uint16_t CRCHelper::calculateMessageCRC(MessageArray& message, uint16_t shiftReg) {
+constexpr CRCTables crcTables = makeCRCTables();
 
-	// CRC16-CCITT generator polynomial (as specified in standard)
-	uint16_t polynomial = 0x1021U;
+} // namespace
 
-	for (uint32_t i = 0; i < message.size(); i++) {
-		// "copy" (XOR w/ existing contents) the current msg bits into the MSB of the shift register
-		shiftReg ^= (message[i] << 8U);
+uint16_t CRCHelper::calculateCRC(const uint8_t* data, size_t length, uint16_t shiftReg) {
+	// Slice-by-8: the register only overlaps the first two bytes of each block,
+	// the remaining six are looked up directly
+	while (length >= 8) {
+		shiftReg = crcTables[7][data[0] ^ (shiftReg >> 8U)] ^
+			   crcTables[6][data[1] ^ (shiftReg & 0xFFU)] ^
+			   crcTables[5][data[2]] ^
+			   crcTables[4][data[3]] ^
+			   crcTables[3][data[4]] ^
+			   crcTables[2][data[5]] ^
+			   crcTables[1][data[6]] ^
+			   crcTables[0][data[7]];
+		data += 8;
+		length -= 8;
+	}
 
-		for (int j = 0; j < 8; j++) {
-			// if the MSB is set, the bitwise AND gives 1
-			if ((shiftReg & 0x8000U) != 0U) {
-				// toss out of the register the MSB and divide (XOR) its content with the generator
-				shiftReg = ((shiftReg << 1U) ^ polynomial);
-			} else {
-				// just toss out the MSB and make room for a new bit
-				shiftReg <<= 1U;
-			}
-		}
+	// Byte-wise tail
+	while (length-- > 0) {
+		shiftReg = static_cast<uint16_t>((shiftReg << 8U) ^ crcTables[0][(shiftReg >> 8U) ^ *data++]);
 	}
 
 	return shiftReg;
 }
 
-uint16_t CRCHelper::validateMessageCRC(MessageArray& message) {
+uint16_t CRCHelper::calculateMessageCRC(const MessageArray& message) {
+	return calculateCRC(message.data(), message.size(), CRCInitialValue);
+}
+
+uint16_t CRCHelper::calculateMessageCRC(const MessageArray& message, uint16_t shiftReg) {
+	return calculateCRC(message.data(), message.size(), shiftReg);
+}
+
+uint16_t CRCHelper::validateMessageCRC(const MessageArray& message) {
 	return calculateMessageCRC(message);
 	// CRC result of a correct msg w/checksum appended is 0
 }
 
+uint16_t CRCHelper::validateCRC(const uint8_t* data, size_t length) {
+	return calculateCRC(data, length, CRCInitialValue);
+	// CRC result of a correct msg w/checksum appended is 0
+}
+
   } // namespace pus
 } // namespace gr
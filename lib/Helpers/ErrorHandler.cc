@@ -37,8 +37,13 @@ namespace gr {
     {
        // 	Services.requestVerification.failAcceptanceVerification(message, errorCode);
        
+       reportError(message.getMessageServiceType(), message.getMessageType(), errorCode);
+    }
+
+    void ErrorHandler::reportError(uint8_t serviceType, uint8_t messageType, AcceptanceErrorType errorCode)
+    {
        printf("Acceptance Error [%u,%u]: %u\n",
-                            (uint16_t)message.getMessageServiceType(), (uint16_t)message.getMessageType(),
+                            (uint16_t)serviceType, (uint16_t)messageType,
                              (uint16_t)errorCode);	
     }
     
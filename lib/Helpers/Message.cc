@@ -9,12 +9,21 @@
  */
  
 #include <gnuradio/pus/Helpers/Message.h>
+#include <algorithm>
+#include <atomic>
 #include <cstring>
+#include <functional>
 #include <iostream>
 
 namespace gr {
   namespace pus {
 
+    namespace {
+
+    std::atomic<size_t> messageCopies{ 0 };
+
+    } // namespace
+
     /*
      * The public constructors
      */
@@ -25,27 +34,62 @@ namespace gr {
     
     Message::Message(MessageArray& inMessageData): Message()
     {
-	messageArray.clear();
-	messageArray = inMessageData; 
+	messageArray.assign(inMessageData.data(), inMessageData.data() + inMessageData.size());
+    }
+
+    Message::Message(const uint8_t* inMessageData, size_t size): Message()
+    {
+	messageArray.assign(inMessageData, inMessageData + size);
     }
 
     void Message::setMessageData(MessageArray& inMessageData)  /// REMOVE
     {
-	messageArray.clear();
-	messageArray = inMessageData; 
+	messageHeader.decoded = 0;
+	messageArray.assign(inMessageData.data(), inMessageData.data() + inMessageData.size());
+    }
+
+    void Message::setMessageData(const uint8_t* inMessageData, size_t size)
+    {
+	messageHeader.decoded = 0;
+	messageArray.assign(inMessageData, inMessageData + size);
     }
         
+    Message::Message(const Message& other)
+      : messageArray(other.messageArray),
+        messageReadPosition(other.messageReadPosition),
+        messageHeader(other.messageHeader)
+    {
+	messageCopies++;
+    }
+
+    Message& Message::operator=(const Message& other)
+    {
+	if (this != &other) {
+		messageArray = other.messageArray;
+		messageReadPosition = other.messageReadPosition;
+		messageHeader = other.messageHeader;
+		messageCopies++;
+	}
+	return *this;
+    }
+
+    size_t Message::copyCount()
+    {
+	return messageCopies;
+    }
+
     Message::~Message()
     {
 	messageArray.clear();
     }
     
-    bool Message::assertType(Message::PacketType expectedPacketType, uint8_t expectedServiceType, uint8_t expectedMessageType) 
+    bool Message::assertType(Message::PacketType expectedPacketType, uint8_t expectedServiceType, uint8_t expectedMessageType) const
     {
 	bool status = true;
+	const PacketHeader& header = getMessageHeader();
 
-	if ((getMessagePacketType() != expectedPacketType) || (getMessageServiceType() != expectedServiceType) ||
-		    (getMessageType() != expectedMessageType)) {
+	if ((header.packetType != expectedPacketType) || (header.serviceType != expectedServiceType) ||
+		    (header.messageType != expectedMessageType)) {
 		status = false;
 	}
 
@@ -54,35 +98,36 @@ namespace gr {
     
     void Message::setMessagePUSVersion()
     {
-      if(messageArray.size() >= ECSSSecondaryTMHeaderSize)
-      		messageArray[0] = ECSSPUSVersion << 4U;
+      messageHeader.decoded = 0;
+      if(messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize)
+      		messageArray[6] = (ECSSPUSVersion << 4U) | (messageArray[6] & 0x0fU);
     }    
 
     void Message::setMessageServiceType(uint8_t serviceType)
     {
-      if(messageArray.size() >= ECSSSecondaryTMHeaderSize)
-      		messageArray[1] = serviceType;
+      messageHeader.decoded = 0;
+      if(messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize)
+      		messageArray[7] = serviceType;
     }  
     
     void Message::setMessageType(uint8_t messageType)
     {
-      if(messageArray.size() >= ECSSSecondaryTMHeaderSize)
-      		messageArray[2] = messageType;
+      messageHeader.decoded = 0;
+      if(messageArray.size() >= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize)
+      		messageArray[8] = messageType;
     } 
 
     bool Message::readString(std::string& string, uint16_t maxChars) { ///// REVISAR ***************************************************
-	std::vector<uint8_t> p;
-	
-	uint16_t i = 0;
-	
-	for(; i < maxChars; i++, messageReadPosition++){
-		if(messageArray[messageReadPosition] == 0)
-			break;
-		p.push_back(messageArray[messageReadPosition]);
-	}
-	messageReadPosition += maxChars - i;
+	// The string ends at the first zero byte, and the whole field is skipped
+	size_t available = (messageReadPosition < messageArray.size()) ? messageArray.size() - messageReadPosition : 0;
+	const char* first = reinterpret_cast<const char*>(messageArray.data() + messageReadPosition);
+	size_t length = std::min<size_t>(maxChars, available);
+	const void* end = std::memchr(first, 0, length);
+	if(end != nullptr)
+		length = static_cast<const char*>(end) - first;
 
-	string.assign(p.begin(), p.end());
+	string.assign(first, length);
+	messageReadPosition += maxChars;
 	return true;
     }  
     bool Message::readString(std::string& string) {     ///// REVISAR ***************************************************
@@ -99,21 +144,20 @@ namespace gr {
 	if((messageReadPosition + size) > messageArray.size()){
 		return false; 
 	}
-	for(uint16_t i = 0; i < size; i++)
-		array[i] = readUint8();
+	std::memcpy(array, messageArray.data() + messageReadPosition, size);
+	messageReadPosition += size;
 
 	return true;
 	
     }
     
 MessageArray Message::readMessageArray(uint16_t size){
-	MessageArray byteArray;
-	
 	if((messageReadPosition + size) < messageArray.size() and size < ECSSMaxMessageSize){
-		for(uint16_t i = 0; i < size; i++)
-			byteArray.push_back(readUint8());
+		const uint8_t* first = messageArray.data() + messageReadPosition;
+		messageReadPosition += size;
+		return MessageArray(first, first + size);
 	}
-	return byteArray;
+	return MessageArray();
 }
 
 /******************************************************************************************************************/
@@ -174,8 +218,7 @@ uint8_t Message::readByte() {
     }
 
     void Message::appendString(const etl::istring& string) {
-	for(auto chr: string)
-		appendUint8(static_cast<uint8_t>(chr));
+	appendUint8Array(reinterpret_cast<const uint8_t*>(string.data()), string.size());
     }
 
     void Message::appendOctetString(const etl::istring& string) {
@@ -188,12 +231,13 @@ uint8_t Message::readByte() {
     }
 
     void Message::appendFixedString(const etl::istring& string) {
-	for(auto chr: string)
-		appendByte(static_cast<uint8_t>(chr));
+	appendUint8Array(reinterpret_cast<const uint8_t*>(string.data()), string.size());
     }
 
 /******************************************************************************************************************/
 void Message::appendByte(uint8_t value) {
+	if(messageReadPosition < CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize)
+		messageHeader.decoded = 0;
 	if(messageReadPosition >= messageArray.size())
 		messageArray.push_back(value); 
 	else
@@ -202,15 +246,17 @@ void Message::appendByte(uint8_t value) {
 }
 
 void Message::appendHalfword(uint16_t value) {
-	appendByte(static_cast<uint8_t>((value >> 8) & 0xFF));
-	appendByte(static_cast<uint8_t>(value & 0xFF));
+	const uint8_t bytes[] = { static_cast<uint8_t>((value >> 8) & 0xFF),
+				  static_cast<uint8_t>(value & 0xFF) };
+	appendUint8Array(bytes, sizeof(bytes));
 }
 
 void Message::appendWord(uint32_t value) {
-	appendByte(static_cast<uint8_t>((value >> 24) & 0xFF));
-	appendByte(static_cast<uint8_t>((value >> 16) & 0xFF));
-	appendByte(static_cast<uint8_t>((value >> 8) & 0xFF));
-	appendByte(static_cast<uint8_t>(value & 0xFF));
+	const uint8_t bytes[] = { static_cast<uint8_t>((value >> 24) & 0xFF),
+				  static_cast<uint8_t>((value >> 16) & 0xFF),
+				  static_cast<uint8_t>((value >> 8) & 0xFF),
+				  static_cast<uint8_t>(value & 0xFF) };
+	appendUint8Array(bytes, sizeof(bytes));
 }
 
 
@@ -232,34 +278,48 @@ MessageArray Message::readMessageSubData(uint16_t start, uint16_t end){
 /******************************************************************************************************************/
 
     void Message::appendString(std::string& string, uint16_t maxChars) {///// REVISAR ***************************************************
-	std::vector<uint8_t> p(string.begin(), string.end());
-	uint8_t zero = 0;
-	
-	for(uint16_t i = p.size(); i < maxChars; i++){
-		p.push_back(zero);
+	appendUint8Array(reinterpret_cast<const uint8_t*>(string.data()), string.size());
+
+	// Pad the field with zeros up to maxChars
+	if(string.size() < maxChars){
+		size_t count = 0;
+		uint8_t* span = appendSpan(maxChars - string.size(), count);
+		std::memset(span, 0, count);
 	}
-	
-	appendUint8Array(p.data(), p.size());
     }
 
     void Message::appendUint8Array(MessageArray& value) {
-	for(size_t i = 0; i < value.size(); i++){
-		if(messageReadPosition >= messageArray.size())
-			messageArray.push_back(value[i]); 
-		else
-			messageArray[messageReadPosition] = value[i];
-		messageReadPosition++;
-	}
+	appendUint8Array(value.data(), value.size());
     } 
 
-    void Message::appendUint8Array(uint8_t* value, size_t size) {
-	for(size_t i = 0; i < size; i++){
-		if(messageReadPosition >= messageArray.size())
-			messageArray.push_back(value[i]); 
-		else
-			messageArray[messageReadPosition] = value[i];
-		messageReadPosition++;
-	}
+    void Message::appendUint8Array(const MessageStorage& value) {
+	appendUint8Array(value.data(), value.size());
+    } 
+
+    void Message::appendUint8Array(const uint8_t* value, size_t size) {
+	// Bytes of this message may move when it grows, they are found again from their offset
+	const uint8_t* first = messageArray.data();
+	bool aliased = !std::less<const uint8_t*>()(value, first) &&
+		       std::less<const uint8_t*>()(value, first + messageArray.size());
+	size_t source = aliased ? static_cast<size_t>(value - first) : 0;
+
+	size_t count = 0;
+	uint8_t* span = appendSpan(size, count);
+	std::memmove(span, aliased ? messageArray.data() + source : value, count);
+    } 
+
+    uint8_t* Message::appendSpan(size_t size, size_t& count) {
+	// Existing bytes from the current position on are overwritten, the rest is added at the
+	// end, as appendByte() does one byte at a time
+	size_t offset = std::min<size_t>(messageReadPosition, messageArray.size());
+	if(offset < CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize)
+		messageHeader.decoded = 0;
+	count = std::min(size, messageArray.max_size() - offset);
+	if(offset + count > messageArray.size())
+		messageArray.resize(offset + count);
+
+	messageReadPosition = offset + count;
+	return messageArray.data() + offset;
     } 
 
   } /* namespace pus */
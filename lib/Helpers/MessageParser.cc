@@ -10,10 +10,63 @@
 
 #include <gnuradio/io_signature.h>
 #include <gnuradio/pus/Helpers/MessageParser.h>
+#include <array>
+#include <cstring>
 
 namespace gr {
   namespace pus {
 
+    namespace {
+
+    // Primary header and TM secondary header of a report, without the time stamp
+    const size_t ReportHeaderSize = CCSDSPrimaryHeaderSize + ECSSSecondaryTMHeaderSize;
+    // Direct-mapped cache of header templates, one per thread that builds reports
+    const size_t ReportTemplateCacheSize = 64U;
+
+    struct ReportTemplate {
+	uint64_t key = 0;
+	bool valid = false;
+	uint8_t header[ReportHeaderSize];
+	// CRC register after the constant packet ID
+	uint16_t crcSeed = CRCHelper::CRCInitialValue;
+    };
+
+    const ReportTemplate& reportTemplate(uint16_t apid, uint8_t scTimeRef, uint8_t serviceType,
+			uint8_t messageType, uint16_t destinationId)
+    {
+	thread_local std::array<ReportTemplate, ReportTemplateCacheSize> cache;
+
+	uint64_t key = (static_cast<uint64_t>(apid & 0x07FFU) << 36U) | (static_cast<uint64_t>(scTimeRef & 0x0FU) << 32U) |
+		       (static_cast<uint64_t>(serviceType) << 24U) | (static_cast<uint64_t>(messageType) << 16U) |
+		       destinationId;
+	ReportTemplate& entry = cache[(key ^ (key >> 16U) ^ (key >> 29U)) % ReportTemplateCacheSize];
+	if (entry.valid && entry.key == key)
+		return entry;
+
+	uint16_t packetId = (apid & 0x07FFU) | (1U << 11U);             // Secondary header flag
+
+	entry.header[0] = packetId >> 8U;
+	entry.header[1] = packetId & 0xFFU;
+	entry.header[2] = 3U << 6U;                                      // Unsegmented
+	entry.header[3] = 0;
+	entry.header[4] = 0;
+	entry.header[5] = 0;
+	entry.header[6] = (ECSSPUSVersion << 4U) | (scTimeRef & 0x0FU);
+	entry.header[7] = serviceType;
+	entry.header[8] = messageType;
+	entry.header[9] = 0;
+	entry.header[10] = 0;
+	entry.header[11] = destinationId >> 8U;
+	entry.header[12] = destinationId & 0xFFU;
+	entry.crcSeed = CRCHelper::calculateCRC(entry.header, 2);
+	entry.key = key;
+	entry.valid = true;
+
+	return entry;
+    }
+
+    } // namespace
+
     MessageParser* MessageParser::inst_messageparser = NULL;
     
     MessageParser::MessageParser() 
@@ -46,16 +99,55 @@ namespace gr {
 
     Message MessageParser::ParseMessageCommand(MessageArray& in_data) 
     {
-    	if(in_data.size() <= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize)
+    	return ParseMessageCommand(in_data.data(), in_data.size());
+    }
+
+    Message MessageParser::ParseMessageCommand(const uint8_t* data, size_t size) 
+    {
+    	if(size <= CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize)
     	    return Message();
     	    
-    	Message message = Message(in_data);
+    	Message message = Message(data, size);
     	
 	message.setMessageReadPosition(CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize);
 	
 	return message;
     }
 
+    Message MessageParser::ParseMessageCommand(const pmt::pmt_t& meta, const uint8_t* data, size_t size) 
+    {
+    	PacketHeader header;
+    	// Metadata passed through from another packet must not stand for this one
+    	if(!headerFromPMT(meta, header) || header.packetDataLength + CCSDSPrimaryHeaderSize + 1U != size ||
+    	   !header.matches(data, size))
+    	    return ParseMessageCommand(data, size);
+
+    	// The packet was already validated at ingress
+    	Message message = Message(data, size);
+    	message.setMessageHeader(header);
+	message.setMessageReadPosition(CCSDSPrimaryHeaderSize+ECSSSecondaryTCHeaderSize);
+
+	return message;
+    }
+
+    pmt::pmt_t MessageParser::headerToPMT(const PacketHeader& header)
+    {
+    	return pmt::make_blob(&header, sizeof(PacketHeader));
+    }
+
+    bool MessageParser::headerFromPMT(const pmt::pmt_t& meta, PacketHeader& header)
+    {
+    	if(!pmt::is_dict(meta))
+    	    return false;
+
+    	pmt::pmt_t blob = pmt::dict_ref(meta, PMT_HEADER, pmt::PMT_NIL);
+    	if(!pmt::is_blob(blob) || pmt::blob_length(blob) != sizeof(PacketHeader))
+    	    return false;
+
+    	std::memcpy(&header, pmt::blob_data(blob), sizeof(PacketHeader));
+    	return header.decoded != 0;
+    }
+
     Message MessageParser::CreateMessageReport(uint8_t scTimeRef, uint8_t serviceType, 
 			uint8_t messageType, uint16_t messageTypeCounter,
 			uint16_t destinationId, MessageArray& payload) 
@@ -71,14 +163,7 @@ namespace gr {
 			uint8_t messageType, uint16_t messageTypeCounter,
 			uint16_t destinationId) 
     {
-	MessageArray data;
 	etl::vector<uint8_t, ECSSMaxTimeField> stamp = TimeProvider::getInstance()->getCurrentTimeStamp();
-	
-        // Parts of the header
-	uint16_t packetId = d_apid;
-	packetId |= (1U << 11U);                                              // Secondary header flag
-	packetId |= (0U); // Ignore-MISRA
-	uint16_t packetSequenceControl = d_counter | (3U << 14U);
 	uint16_t packetDataLength = stamp.size() + ECSSSecondaryTMHeaderSize - 1;
 
 	if (packetDataLength > CCSDSMaxMessageSize) {
@@ -86,34 +171,10 @@ namespace gr {
 		return empty_message;
 	}
 
-	data.resize(CCSDSPrimaryHeaderSize + packetDataLength + 1);
-	
-	// Compile the header
-	data[0] = packetId >> 8U;
-	data[1] = packetId & 0xffU;
-	data[2] = packetSequenceControl >> 8U;
-	data[3] = packetSequenceControl & 0xffU;
-	data[4] = packetDataLength >> 8U;
-	data[5] = packetDataLength & 0xffU;
-
-	// Sanity check that there is enough space for the string
-	//ASSERT_INTERNAL((ecssMessage.size() + CCSDSPrimaryHeaderSize) <= CCSDSMaxMessageSize, ErrorHandler::StringTooLarge);
-
-	data[CCSDSPrimaryHeaderSize+0] = ECSSPUSVersion << 4U; // Assign the pusVersion = 2
-	data[CCSDSPrimaryHeaderSize+0] |= scTimeRef & 0x0FU;                 // Spacecraft time reference status
-	data[CCSDSPrimaryHeaderSize+1] = serviceType;
-	data[CCSDSPrimaryHeaderSize+2] = messageType;
-	data[CCSDSPrimaryHeaderSize+3] = static_cast<uint8_t>(messageTypeCounter >> 8U);
-	data[CCSDSPrimaryHeaderSize+4] = static_cast<uint8_t>(messageTypeCounter & 0xffU);
-	data[CCSDSPrimaryHeaderSize+5] = destinationId >> 8U; // DestinationID
-	data[CCSDSPrimaryHeaderSize+6] = destinationId;
-	
-	for(size_t i = 0; i < stamp.size(); i++)
-		data[CCSDSPrimaryHeaderSize + 7 + i] = stamp[i];
-
-	Message message = Message(data);
-	
-	message.setMessageReadPosition(data.size());
+	// The payload is appended by the caller, so the report takes a full-size buffer
+	Message message = newReport(ECSSMaxMessageSize);
+	appendReportHeader(message, d_apid, d_counter, packetDataLength, scTimeRef, serviceType,
+			messageType, messageTypeCounter, destinationId, stamp);
 	
 	counter_inc();
 	
@@ -125,14 +186,7 @@ namespace gr {
 			uint8_t messageType, uint16_t messageTypeCounter,
 			uint16_t destinationId, MessageArray& payload) 
     {
-	MessageArray data;
 	etl::vector<uint8_t, ECSSMaxTimeField> stamp = TimeProvider::getInstance()->getCurrentTimeStamp();
-	
-        // Parts of the header
-	uint16_t packetId = apid;
-	packetId |= (1U << 11U);                                              // Secondary header flag
-	packetId |= (0U); // Ignore-MISRA
-	uint16_t packetSequenceControl = packetSequenceCounter | (3U << 14U);
 	uint16_t packetDataLength = stamp.size() + payload.size() - 1;
 	packetDataLength += ECSSSecondaryTMHeaderSize; 
 
@@ -140,49 +194,56 @@ namespace gr {
 		Message empty_message = Message();
 		return empty_message;
 	}
-	
-	data.resize(CCSDSPrimaryHeaderSize + packetDataLength + 1);
 
 	packetDataLength += (d_crc_enable) ? 2 : 0;		
-	// Compile the header
-	data[0] = packetId >> 8U;
-	data[1] = packetId & 0xffU;
-	data[2] = packetSequenceControl >> 8U;
-	data[3] = packetSequenceControl & 0xffU;
-	data[4] = packetDataLength >> 8U;
-	data[5] = packetDataLength & 0xffU;
-
-	// Sanity check that there is enough space for the string
-	//ASSERT_INTERNAL((ecssMessage.size() + CCSDSPrimaryHeaderSize) <= CCSDSMaxMessageSize, ErrorHandler::StringTooLarge);
-
-	data[CCSDSPrimaryHeaderSize+0] = ECSSPUSVersion << 4U; // Assign the pusVersion = 2
-	data[CCSDSPrimaryHeaderSize+0] |= scTimeRef & 0x0FU;                 // Spacecraft time reference status
-	data[CCSDSPrimaryHeaderSize+1] = serviceType;
-	data[CCSDSPrimaryHeaderSize+2] = messageType;
-	data[CCSDSPrimaryHeaderSize+3] = static_cast<uint8_t>(messageTypeCounter >> 8U);
-	data[CCSDSPrimaryHeaderSize+4] = static_cast<uint8_t>(messageTypeCounter & 0xffU);
-	data[CCSDSPrimaryHeaderSize+5] = destinationId >> 8U; // DestinationID
-	data[CCSDSPrimaryHeaderSize+6] = destinationId;
-
-	for(size_t i = 0; i < stamp.size(); i++)
-		data[CCSDSPrimaryHeaderSize + 7 + i] = stamp[i];
-	
-	for(size_t i = 0; i < payload.size(); i++)
-		data[CCSDSPrimaryHeaderSize + ECSSSecondaryTMHeaderSize + stamp.size() + i] = payload[i];
+
+	Message message = newReport(ReportHeaderSize + stamp.size() + payload.size() + ((d_crc_enable) ? 2 : 0));
+	uint16_t crcSeed = appendReportHeader(message, apid, packetSequenceCounter, packetDataLength, scTimeRef,
+			serviceType, messageType, messageTypeCounter, destinationId, stamp);
+	message.appendUint8Array(payload.data(), payload.size());
 		
 	if(d_crc_enable){
-		// Append CRC field
-		uint16_t crcField = CRCHelper::calculateMessageCRC(data);
-		data.push_back(static_cast<uint8_t>(crcField >> 8U));
-		data.push_back(static_cast<uint8_t>(crcField & 0xFF));
+		// Append CRC field, the constant packet ID is already accounted for in the template
+		uint16_t crcField = CRCHelper::calculateCRC(message.getMessageRawData() + 2, message.getMessageSize() - 2, crcSeed);
+		message.appendUint16(crcField);
 	}
 	
-	Message message = Message(data);
-	
-	message.setMessageReadPosition(data.size());
-	
 	return message;
     }
+
+    Message MessageParser::newReport(size_t size)
+    {
+	Message message;
+
+	// Take the buffer from the MessageStorage pool, so that building the report never
+	// reallocates. The buffer goes back to the pool with the message.
+	message.getMessageData().reserve(size);
+
+	return message;
+    }
+
+    uint16_t MessageParser::appendReportHeader(Message& message, uint16_t apid, uint16_t packetSequenceCounter,
+			uint16_t packetDataLength, uint8_t scTimeRef, uint8_t serviceType,
+			uint8_t messageType, uint16_t messageTypeCounter, uint16_t destinationId,
+			const etl::vector<uint8_t, ECSSMaxTimeField>& stamp)
+    {
+	const ReportTemplate& tmpl = reportTemplate(apid, scTimeRef, serviceType, messageType, destinationId);
+
+	// Only the counters and the length change between reports of the same kind
+	uint8_t header[ReportHeaderSize];
+	std::memcpy(header, tmpl.header, ReportHeaderSize);
+	header[2] |= (packetSequenceCounter >> 8U) & 0x3FU;
+	header[3] = packetSequenceCounter & 0xFFU;
+	header[4] = packetDataLength >> 8U;
+	header[5] = packetDataLength & 0xFFU;
+	header[9] = messageTypeCounter >> 8U;
+	header[10] = messageTypeCounter & 0xFFU;
+
+	message.appendUint8Array(header, ReportHeaderSize);
+	message.appendUint8Array(stamp.data(), stamp.size());
+
+	return tmpl.crcSeed;
+    }
     
     void MessageParser::closeMessage(Message& message)
     {
@@ -196,7 +257,7 @@ namespace gr {
 
   	if(d_crc_enable){
 		// Append CRC field
-		uint16_t crcField = CRCHelper::calculateMessageCRC(message.getMessageData());
+		uint16_t crcField = CRCHelper::calculateCRC(message.getMessageRawData(), message.getMessageSize());
 		message.setMessageReadPosition(message.getMessageSize());
 		message.appendUint16(crcField);
 	}  
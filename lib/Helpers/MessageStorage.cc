@@ -0,0 +1,202 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/pus/Helpers/MessageStorage.h>
+#include <algorithm>
+#include <array>
+#include <atomic>
+#include <cstring>
+#include <mutex>
+#include <vector>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // Heap blocks come in power of two sizes, from the first one above the inline buffer
+    const size_t SmallestBlockSize = 64U;
+    const size_t NumberOfSizeClasses = 5U;  // 64, 128, 256, 512 and 1024 bytes
+    // Released blocks kept by each size class for reuse, the rest are returned to the heap.
+    // Reports are built in full-size blocks, so a burst of a few hundred of them on the same
+    // tick is served from the cache once the pool has warmed up.
+    const size_t MaxCachedBlocks = 1024U;
+
+    static_assert(SmallestBlockSize > MessageStorage::InlineCapacity,
+    		"The smallest heap block must be larger than the inline buffer");
+    static_assert((SmallestBlockSize << (NumberOfSizeClasses - 1U)) >= ECSSMaxMessageSize,
+    		"The largest heap block must hold a full message");
+
+    size_t sizeClass(size_t size)
+    {
+	size_t index = 0;
+	while ((SmallestBlockSize << index) < size)
+		index++;
+	return index;
+    }
+
+    class BlockPool
+    {
+     public:
+	uint8_t* allocate(size_t index)
+	{
+	    d_in_use += SmallestBlockSize << index;
+	    {
+		std::lock_guard<std::mutex> lock(d_mutex);
+		auto& blocks = d_free[index];
+		if (!blocks.empty()) {
+			uint8_t* block = blocks.back();
+			blocks.pop_back();
+			return block;
+		}
+	    }
+	    d_heap_allocations++;
+	    return new uint8_t[SmallestBlockSize << index];
+	}
+
+	void release(uint8_t* block, size_t index)
+	{
+	    d_in_use -= SmallestBlockSize << index;
+	    {
+		std::lock_guard<std::mutex> lock(d_mutex);
+		auto& blocks = d_free[index];
+		if (blocks.size() < MaxCachedBlocks) {
+			blocks.push_back(block);
+			return;
+		}
+	    }
+	    delete[] block;
+	}
+
+	size_t inUse() const { return d_in_use; }
+	size_t heapAllocations() const { return d_heap_allocations; }
+
+     private:
+	std::mutex d_mutex;
+	std::array<std::vector<uint8_t*>, NumberOfSizeClasses> d_free;
+	std::atomic<size_t> d_in_use{ 0 };
+	std::atomic<size_t> d_heap_allocations{ 0 };
+    };
+
+    // Never destroyed, so that messages with static storage duration can still release their blocks
+    BlockPool& blockPool()
+    {
+	static BlockPool* pool = new BlockPool();
+	return *pool;
+    }
+
+    } // namespace
+
+    MessageStorage::MessageStorage(const MessageStorage& other)
+    {
+	assign(other.begin(), other.end());
+    }
+
+    MessageStorage::MessageStorage(MessageStorage&& other) noexcept
+    {
+	*this = std::move(other);
+    }
+
+    MessageStorage::~MessageStorage()
+    {
+	if (!isInline())
+		blockPool().release(d_heap, sizeClass(d_capacity));
+    }
+
+    MessageStorage& MessageStorage::operator=(const MessageStorage& other)
+    {
+	if (this != &other)
+		assign(other.begin(), other.end());
+	return *this;
+    }
+
+    MessageStorage& MessageStorage::operator=(MessageStorage&& other) noexcept
+    {
+	if (this == &other)
+		return *this;
+
+	if (other.isInline()) {
+		std::memcpy(data(), other.d_inline, other.d_size);
+		d_size = other.d_size;
+	} else {
+		// Take over the heap block instead of copying it
+		shrink();
+		d_heap = other.d_heap;
+		d_size = other.d_size;
+		d_capacity = other.d_capacity;
+		other.d_capacity = InlineCapacity;
+	}
+	other.d_size = 0;
+	return *this;
+    }
+
+    void MessageStorage::reserve(size_t size)
+    {
+	size = std::min<size_t>(size, ECSSMaxMessageSize);
+	if (size <= d_capacity)
+		return;
+
+	size_t index = sizeClass(size);
+	uint8_t* block = blockPool().allocate(index);
+	std::memcpy(block, data(), d_size);
+	if (!isInline())
+		blockPool().release(d_heap, sizeClass(d_capacity));
+
+	d_heap = block;
+	d_capacity = static_cast<uint16_t>(SmallestBlockSize << index);
+    }
+
+    void MessageStorage::resize(size_t size)
+    {
+	size = std::min<size_t>(size, ECSSMaxMessageSize);
+	if (size > d_capacity)
+		reserve(size);
+	d_size = static_cast<uint16_t>(size);
+    }
+
+    void MessageStorage::assign(const uint8_t* first, const uint8_t* last)
+    {
+	size_t size = std::min<size_t>(last - first, ECSSMaxMessageSize);
+
+	// A range larger than the current buffer can not overlap it
+	if (size > d_capacity)
+		reserve(size);
+
+	std::memmove(data(), first, size);
+	d_size = static_cast<uint16_t>(size);
+
+	// Copies of small packets go back to the inline buffer
+	if (size <= InlineCapacity)
+		shrink();
+    }
+
+    void MessageStorage::shrink()
+    {
+	if (isInline())
+		return;
+
+	uint8_t* block = d_heap;
+	size_t size = std::min<size_t>(d_size, InlineCapacity);
+	std::memcpy(d_inline, block, size);
+	blockPool().release(block, sizeClass(d_capacity));
+
+	d_size = static_cast<uint16_t>(size);
+	d_capacity = InlineCapacity;
+    }
+
+    size_t MessageStorage::heapBytesInUse()
+    {
+	return blockPool().inUse();
+    }
+
+    size_t MessageStorage::heapAllocations()
+    {
+	return blockPool().heapAllocations();
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -0,0 +1,111 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/pus/Helpers/PDUBatch.h>
+
+namespace gr {
+  namespace pus {
+
+    bool PDUBatch::isBatch(const pmt::pmt_t& pdu)
+    {
+	if (!pmt::is_pair(pdu))
+		return false;
+
+	pmt::pmt_t meta = pmt::car(pdu);
+	pmt::pmt_t v_data = pmt::cdr(pdu);
+
+	if (pmt::is_vector(v_data))
+		return true;
+
+	return pmt::is_u8vector(v_data) && pmt::is_dict(meta) && pmt::dict_has_key(meta, PMT_OFFSETS);
+    }
+
+    size_t PDUBatch::forEach(const pmt::pmt_t& pdu, const std::function<void(pmt::pmt_t)>& handler)
+    {
+	if (!isBatch(pdu)) {
+		handler(pdu);
+		return 1;
+	}
+
+	pmt::pmt_t meta = pmt::car(pdu);
+	pmt::pmt_t v_data = pmt::cdr(pdu);
+
+	if (pmt::is_vector(v_data)) {
+		size_t count = pmt::length(v_data);
+		for (size_t i = 0; i < count; i++)
+			handler(pmt::cons(meta, pmt::vector_ref(v_data, i)));
+		return count;
+	}
+
+	return forEachSpan(pdu, [&handler](pmt::pmt_t packetMeta, pmt::pmt_t, const uint8_t* data, size_t size) {
+		handler(pmt::cons(packetMeta, pmt::init_u8vector(size, data)));
+	});
+    }
+
+    size_t PDUBatch::forEachSpan(const pmt::pmt_t& pdu,
+		const std::function<void(pmt::pmt_t meta, pmt::pmt_t v_data, const uint8_t* data, size_t size)>& handler)
+    {
+	if (!pmt::is_pair(pdu))
+		return 0;
+
+	pmt::pmt_t meta = pmt::car(pdu);
+	pmt::pmt_t v_data = pmt::cdr(pdu);
+	size_t size = 0;
+
+	if (pmt::is_vector(v_data)) {
+		size_t handled = 0;
+		for (size_t i = 0; i < pmt::length(v_data); i++) {
+			pmt::pmt_t packet = pmt::vector_ref(v_data, i);
+			if (!pmt::is_u8vector(packet))
+				continue;
+			const uint8_t* data = pmt::u8vector_elements(packet, size);
+			handler(meta, packet, data, size);
+			handled++;
+		}
+		return handled;
+	}
+
+	if (!pmt::is_u8vector(v_data))
+		return 0;
+
+	const uint8_t* blob = pmt::u8vector_elements(v_data, size);
+
+	if (!isBatch(pdu)) {
+		handler(meta, v_data, blob, size);
+		return 1;
+	}
+
+	pmt::pmt_t offsets = pmt::dict_ref(meta, PMT_OFFSETS, pmt::PMT_NIL);
+	if (!pmt::is_u32vector(offsets))
+		return 0;
+
+	size_t count = 0;
+	const uint32_t* starts = pmt::u32vector_elements(offsets, count);
+	pmt::pmt_t packetMeta = pmt::dict_delete(meta, PMT_OFFSETS);
+
+	size_t handled = 0;
+	for (size_t i = 0; i < count; i++) {
+		size_t end = (i + 1 < count) ? starts[i + 1] : size;
+		if (starts[i] > end || end > size)
+			break;
+		handler(packetMeta, pmt::PMT_NIL, blob + starts[i], end - starts[i]);
+		handled++;
+	}
+	return handled;
+    }
+
+    pmt::pmt_t PDUBatch::make(const pmt::pmt_t& meta, const std::vector<pmt::pmt_t>& packets)
+    {
+	pmt::pmt_t v_data = pmt::make_vector(packets.size(), pmt::PMT_NIL);
+	for (size_t i = 0; i < packets.size(); i++)
+		pmt::vector_set(v_data, i, packets[i]);
+
+	return pmt::cons(meta, v_data);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -0,0 +1,52 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/pus/Helpers/PacketHeader.h>
+
+namespace gr {
+  namespace pus {
+
+    void PacketHeader::decode(const uint8_t* data, size_t size)
+    {
+	*this = PacketHeader();
+	decoded = 1;
+
+	if (size < CCSDSPrimaryHeaderSize)
+		return;
+
+	version = data[0] >> 5;
+	packetType = (data[0] >> 4) & 0x01;
+	applicationId = ((data[0] << 8) | data[1]) & 0x07ff;
+	sequenceFlags = data[2] >> 6;
+	sequenceCount = ((data[2] << 8) | data[3]) & 0x3fff;
+	packetDataLength = (data[4] << 8) | data[5];
+
+	if (size < CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize)
+		return;
+
+	pusVersion = data[6] >> 4;
+	ackFlags = data[6] & 0x0f;
+	serviceType = data[7];
+	messageType = data[8];
+	sourceId = (data[9] << 8) | data[10];
+    }
+
+    bool PacketHeader::matches(const uint8_t* data, size_t size) const
+    {
+	if (!decoded || size < CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize)
+		return false;
+
+	return (data[0] & 0xf7) == (((version << 5) | (packetType << 4) | (applicationId >> 8)) & 0xf7) &&
+	       data[1] == (applicationId & 0xff) &&
+	       data[2] == ((sequenceFlags << 6) | (sequenceCount >> 8)) && data[3] == (sequenceCount & 0xff) &&
+	       data[4] == (packetDataLength >> 8) && data[5] == (packetDataLength & 0xff) &&
+	       data[6] == ((pusVersion << 4) | ackFlags) && data[7] == serviceType && data[8] == messageType &&
+	       data[9] == (sourceId >> 8) && data[10] == (sourceId & 0xff);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -14,14 +14,15 @@ namespace gr {
 uint16_t SequenceStore::calculateSequenceCRC() {
 	uint16_t shiftReg = 0xFFFFU;
 	for (auto& activity: sequenceActivities) {
-		shiftReg = CRCHelper::calculateMessageCRC(activity.request.getMessageData(), shiftReg);
+		shiftReg = CRCHelper::calculateCRC(activity.request.getMessageRawData(),
+						activity.request.getMessageSize(), shiftReg);
 		uint32_t delay = activity.requestDelayTime.formatAsBytes();
-		MessageArray delay_vector = {static_cast<uint8_t>((delay >> 24) & 0xFF),
+		uint8_t delay_bytes[4] = {static_cast<uint8_t>((delay >> 24) & 0xFF),
 							static_cast<uint8_t>((delay >> 16) & 0xFF),
 							static_cast<uint8_t>((delay >> 8) & 0xFF),
 							static_cast<uint8_t>(delay & 0xFF)};
 
-		shiftReg = CRCHelper::calculateMessageCRC(delay_vector, shiftReg);
+		shiftReg = CRCHelper::calculateCRC(delay_bytes, sizeof(delay_bytes), shiftReg);
 	}	
 	return shiftReg;
 }
@@ -0,0 +1,93 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/pus/Helpers/TimeSchedule.h>
+
+namespace gr {
+  namespace pus {
+
+    void TimeSchedule::addToIndex(iterator activity) {
+	index.emplace(indexKey(activity->second.requestID), IndexEntry{ activity, d_insertions++ });
+    }
+
+    void TimeSchedule::removeFromIndex(iterator activity) {
+	auto entries = index.equal_range(indexKey(activity->second.requestID));
+	for (auto entry = entries.first; entry != entries.second; ++entry) {
+		if (entry->second.activity == activity) {
+			index.erase(entry);
+			return;
+		}
+	}
+    }
+
+    bool TimeSchedule::insert(ScheduledActivity&& activity) {
+	if (activities.size() >= d_capacity)
+		return false;
+
+	Time::DefaultCUC releaseTime = activity.requestReleaseTime;
+	addToIndex(activities.emplace(releaseTime, std::move(activity)));
+	return true;
+    }
+
+    TimeSchedule::iterator TimeSchedule::find(const RequestID& requestID) {
+	auto entries = index.equal_range(indexKey(requestID));
+	if (entries.first == entries.second)
+		return activities.end();
+
+	// Activities sharing a request ID are ordered by release time, then by insertion
+	const IndexEntry* first = &entries.first->second;
+	for (auto entry = std::next(entries.first); entry != entries.second; ++entry) {
+		const IndexEntry& candidate = entry->second;
+		if ((candidate.activity->first < first->activity->first) ||
+		    ((candidate.activity->first == first->activity->first) && (candidate.insertion < first->insertion)))
+			first = &candidate;
+	}
+	return first->activity;
+    }
+
+    void TimeSchedule::erase(iterator activity) {
+	removeFromIndex(activity);
+	activities.erase(activity);
+    }
+
+    void TimeSchedule::shift(iterator activity, std::chrono::seconds offset) {
+	removeFromIndex(activity);
+	auto node = activities.extract(activity);
+	node.key() += offset;
+	node.mapped().requestReleaseTime += offset;
+	addToIndex(activities.insert(std::move(node)));
+    }
+
+    void TimeSchedule::shiftAll(std::chrono::seconds offset) {
+	Activities shifted;
+	while (!activities.empty()) {
+		auto node = activities.extract(activities.begin());
+		node.key() += offset;
+		node.mapped().requestReleaseTime += offset;
+		shifted.insert(shifted.end(), std::move(node));
+	}
+	activities.swap(shifted);
+
+	// The order does not change, the index is rebuilt in the same order
+	index.clear();
+	for (auto activity = activities.begin(); activity != activities.end(); ++activity)
+		addToIndex(activity);
+    }
+
+    void TimeSchedule::clear() {
+	activities.clear();
+	index.clear();
+    }
+
+    Time::DefaultCUC TimeSchedule::nextReleaseTime() const {
+	if (activities.empty())
+		return Time::DefaultCUC::max();
+	return activities.begin()->first;
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
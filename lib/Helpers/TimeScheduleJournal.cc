@@ -0,0 +1,383 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/pus/Helpers/TimeScheduleJournal.h>
+#include <gnuradio/pus/Helpers/CRCHelper.h>
+#include <algorithm>
+#include <cerrno>
+#include <cstdio>
+#include <cstring>
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    const char JournalMagic[4] = { 'P', 'U', 'S', 'J' };
+    const char SnapshotMagic[4] = { 'P', 'U', 'S', 'S' };
+    const uint16_t FileVersion = 1;
+
+    // Magic, version, reserved and generation of the snapshot
+    const size_t HeaderSize = 12;
+    // Operation and payload length, then the payload and its CRC
+    const size_t RecordHeaderSize = 3;
+    const size_t RecordCRCSize = 2;
+    const size_t RequestIDSize = 6;
+    const size_t InsertHeaderSize = 8 + RequestIDSize;
+
+    template <typename T>
+    void put(std::vector<uint8_t>& buffer, T value) {
+	const uint8_t* bytes = reinterpret_cast<const uint8_t*>(&value);
+	buffer.insert(buffer.end(), bytes, bytes + sizeof(T));
+    }
+
+    template <typename T>
+    T get(const uint8_t* data) {
+	T value;
+	std::memcpy(&value, data, sizeof(T));
+	return value;
+    }
+
+    void putHeader(std::vector<uint8_t>& buffer, const char* magic, uint32_t generation) {
+	buffer.insert(buffer.end(), magic, magic + 4);
+	put<uint16_t>(buffer, FileVersion);
+	put<uint16_t>(buffer, 0);
+	put<uint32_t>(buffer, generation);
+    }
+
+    bool isHeader(const uint8_t* data, size_t size, const char* magic) {
+	return (size >= HeaderSize) && (std::memcmp(data, magic, 4) == 0) &&
+	       (get<uint16_t>(data + 4) == FileVersion);
+    }
+
+    TimeSchedule::RequestID getRequestID(const uint8_t* data) {
+	TimeSchedule::RequestID requestID;
+	requestID.applicationID = get<uint16_t>(data);
+	requestID.sequenceCount = get<uint16_t>(data + 2);
+	requestID.sourceID = get<uint16_t>(data + 4);
+	return requestID;
+    }
+
+    void putRequestID(std::vector<uint8_t>& buffer, const TimeSchedule::RequestID& requestID) {
+	put<uint16_t>(buffer, requestID.applicationID);
+	put<uint16_t>(buffer, requestID.sequenceCount);
+	put<uint16_t>(buffer, requestID.sourceID);
+    }
+
+    bool writeAll(int fd, const uint8_t* data, size_t size) {
+	while (size > 0) {
+		ssize_t written = ::write(fd, data, size);
+		if (written < 0) {
+			if (errno == EINTR)
+				continue;
+			return false;
+		}
+		data += written;
+		size -= static_cast<size_t>(written);
+	}
+	return true;
+    }
+
+    // Read-only mapping of a whole file, released when it goes out of scope
+    class MappedFile {
+    public:
+	MappedFile(int fd, size_t size) : d_size(size) {
+		if (size > 0) {
+			void* data = ::mmap(nullptr, size, PROT_READ, MAP_PRIVATE, fd, 0);
+			if (data != MAP_FAILED) {
+				d_data = static_cast<const uint8_t*>(data);
+				::madvise(data, size, MADV_SEQUENTIAL);
+			}
+		}
+	}
+	~MappedFile() {
+		if (d_data)
+			::munmap(const_cast<uint8_t*>(d_data), d_size);
+	}
+	bool isMapped() const { return d_data != nullptr; }
+	const uint8_t* data() const { return d_data; }
+	size_t size() const { return d_size; }
+
+    private:
+	const uint8_t* d_data = nullptr;
+	size_t d_size;
+    };
+
+    } // namespace
+
+    TimeScheduleJournal::~TimeScheduleJournal() {
+	close();
+    }
+
+    bool TimeScheduleJournal::open(const std::string& path, TimeSchedule& schedule) {
+	close();
+	d_path = path;
+	d_replayed = 0;
+	d_dropped = 0;
+	d_generation = 0;
+	d_snapshot_size = 0;
+	d_journal_size = 0;
+
+	if (!loadSnapshot(schedule))
+		return false;
+	return loadJournal(schedule);
+    }
+
+    void TimeScheduleJournal::close() {
+	if (d_fd < 0)
+		return;
+	flush();
+	::close(d_fd);
+	d_fd = -1;
+    }
+
+    bool TimeScheduleJournal::loadSnapshot(TimeSchedule& schedule) {
+	int fd = ::open((d_path + ".snapshot").c_str(), O_RDONLY | O_CLOEXEC);
+	if (fd < 0)
+		return errno == ENOENT;
+
+	struct stat status;
+	bool loaded = false;
+	if (::fstat(fd, &status) == 0) {
+		MappedFile snapshot(fd, static_cast<size_t>(status.st_size));
+		if (snapshot.isMapped() && isHeader(snapshot.data(), snapshot.size(), SnapshotMagic)) {
+			d_generation = get<uint32_t>(snapshot.data() + 8);
+			d_snapshot_size = snapshot.size();
+			replay(snapshot.data() + HeaderSize, snapshot.size() - HeaderSize, schedule);
+			loaded = true;
+		}
+	}
+	::close(fd);
+	return loaded;
+    }
+
+    bool TimeScheduleJournal::loadJournal(TimeSchedule& schedule) {
+	d_fd = ::open(d_path.c_str(), O_RDWR | O_CREAT | O_CLOEXEC, 0644);
+	if (d_fd < 0)
+		return false;
+
+	struct stat status;
+	if (::fstat(d_fd, &status) != 0) {
+		::close(d_fd);
+		d_fd = -1;
+		return false;
+	}
+
+	size_t valid = 0;
+	{
+		MappedFile journal(d_fd, static_cast<size_t>(status.st_size));
+		if (journal.size() > 0) {
+			// Never overwrite a file that is not a journal
+			if (!journal.isMapped() || (std::memcmp(journal.data(), JournalMagic,
+								std::min(journal.size(), sizeof(JournalMagic))) != 0)) {
+				::close(d_fd);
+				d_fd = -1;
+				return false;
+			}
+			// The journal of an older snapshot is already part of the snapshot
+			if (isHeader(journal.data(), journal.size(), JournalMagic) &&
+			    (get<uint32_t>(journal.data() + 8) == d_generation))
+				valid = HeaderSize + replay(journal.data() + HeaderSize, journal.size() - HeaderSize, schedule);
+		}
+	}
+
+	if (valid == 0)
+		return resetJournal();
+
+	// Drops the records of an interrupted write
+	if ((valid < static_cast<size_t>(status.st_size)) && (::ftruncate(d_fd, static_cast<off_t>(valid)) != 0))
+		return false;
+	::lseek(d_fd, static_cast<off_t>(valid), SEEK_SET);
+	d_journal_size = valid;
+	return true;
+    }
+
+    bool TimeScheduleJournal::resetJournal() {
+	std::vector<uint8_t> header;
+	putHeader(header, JournalMagic, d_generation);
+
+	if ((::ftruncate(d_fd, 0) != 0) || (::lseek(d_fd, 0, SEEK_SET) != 0) ||
+	    !writeAll(d_fd, header.data(), header.size()) || (::fdatasync(d_fd) != 0))
+		return false;
+	d_journal_size = header.size();
+	return true;
+    }
+
+    size_t TimeScheduleJournal::replay(const uint8_t* records, size_t size, TimeSchedule& schedule) {
+	size_t position = 0;
+	while (position + RecordHeaderSize + RecordCRCSize <= size) {
+		const uint8_t* record = records + position;
+		uint8_t operation = record[0];
+		size_t length = get<uint16_t>(record + 1);
+		if (position + RecordHeaderSize + length + RecordCRCSize > size)
+			break;
+		if (CRCHelper::calculateCRC(record, RecordHeaderSize + length) !=
+		    get<uint16_t>(record + RecordHeaderSize + length))
+			break;
+
+		const uint8_t* payload = record + RecordHeaderSize;
+		if ((operation == Insert) && (length >= InsertHeaderSize)) {
+			TimeSchedule::ScheduledActivity activity;
+			activity.requestReleaseTime = Time::DefaultCUC(get<uint64_t>(payload));
+			activity.requestID = getRequestID(payload + 8);
+			activity.request = Message(payload + InsertHeaderSize, length - InsertHeaderSize);
+			if (!schedule.insert(std::move(activity))) {
+				d_dropped++;
+				position += RecordHeaderSize + length + RecordCRCSize;
+				continue;
+			}
+		} else if ((operation == Delete) && (length == RequestIDSize)) {
+			auto activity = schedule.find(getRequestID(payload));
+			if (activity != schedule.end())
+				schedule.erase(activity);
+		} else if ((operation == Shift) && (length == RequestIDSize + 8)) {
+			auto activity = schedule.find(getRequestID(payload));
+			if (activity != schedule.end())
+				schedule.shift(activity, std::chrono::seconds(get<int64_t>(payload + RequestIDSize)));
+		} else if ((operation == ShiftAll) && (length == 8)) {
+			schedule.shiftAll(std::chrono::seconds(get<int64_t>(payload)));
+		} else if ((operation == Reset) && (length == 0)) {
+			schedule.clear();
+		} else if ((operation == Release) && (length == 8)) {
+			schedule.releaseDue(Time::DefaultCUC(get<uint64_t>(payload)),
+					    [](TimeSchedule::ScheduledActivity&) {});
+		} else {
+			break;
+		}
+
+		d_replayed++;
+		position += RecordHeaderSize + length + RecordCRCSize;
+	}
+	return position;
+    }
+
+    void TimeScheduleJournal::beginRecord(std::vector<uint8_t>& buffer, Operation operation) {
+	buffer.push_back(operation);
+	put<uint16_t>(buffer, 0);
+    }
+
+    void TimeScheduleJournal::endRecord(std::vector<uint8_t>& buffer, size_t start) {
+	uint16_t length = static_cast<uint16_t>(buffer.size() - start - RecordHeaderSize);
+	std::memcpy(buffer.data() + start + 1, &length, sizeof(length));
+	put<uint16_t>(buffer, CRCHelper::calculateCRC(buffer.data() + start, buffer.size() - start));
+    }
+
+    void TimeScheduleJournal::appendActivity(std::vector<uint8_t>& buffer,
+					     const TimeSchedule::ScheduledActivity& activity) {
+	size_t start = buffer.size();
+	beginRecord(buffer, Insert);
+	put<uint64_t>(buffer, activity.requestReleaseTime.formatAsBytes());
+	putRequestID(buffer, activity.requestID);
+	const MessageStorage& data = activity.request.getMessageData();
+	buffer.insert(buffer.end(), data.data(), data.data() + data.size());
+	endRecord(buffer, start);
+    }
+
+    void TimeScheduleJournal::recordInsert(const TimeSchedule::ScheduledActivity& activity) {
+	if (isOpen())
+		appendActivity(d_buffer, activity);
+    }
+
+    void TimeScheduleJournal::recordDelete(const TimeSchedule::RequestID& requestID) {
+	if (!isOpen())
+		return;
+	size_t start = d_buffer.size();
+	beginRecord(d_buffer, Delete);
+	putRequestID(d_buffer, requestID);
+	endRecord(d_buffer, start);
+    }
+
+    void TimeScheduleJournal::recordShift(const TimeSchedule::RequestID& requestID, std::chrono::seconds offset) {
+	if (!isOpen())
+		return;
+	size_t start = d_buffer.size();
+	beginRecord(d_buffer, Shift);
+	putRequestID(d_buffer, requestID);
+	put<int64_t>(d_buffer, offset.count());
+	endRecord(d_buffer, start);
+    }
+
+    void TimeScheduleJournal::recordShiftAll(std::chrono::seconds offset) {
+	if (!isOpen())
+		return;
+	size_t start = d_buffer.size();
+	beginRecord(d_buffer, ShiftAll);
+	put<int64_t>(d_buffer, offset.count());
+	endRecord(d_buffer, start);
+    }
+
+    void TimeScheduleJournal::recordReset() {
+	if (!isOpen())
+		return;
+	size_t start = d_buffer.size();
+	beginRecord(d_buffer, Reset);
+	endRecord(d_buffer, start);
+    }
+
+    void TimeScheduleJournal::recordRelease(Time::DefaultCUC currentTime) {
+	if (!isOpen())
+		return;
+	size_t start = d_buffer.size();
+	beginRecord(d_buffer, Release);
+	put<uint64_t>(d_buffer, currentTime.formatAsBytes());
+	endRecord(d_buffer, start);
+    }
+
+    bool TimeScheduleJournal::flush() {
+	if (!isOpen() || d_buffer.empty())
+		return true;
+
+	if (!writeAll(d_fd, d_buffer.data(), d_buffer.size()) || (::fdatasync(d_fd) != 0)) {
+		// Drops what was written, the records are kept for the next flush
+		if (::ftruncate(d_fd, static_cast<off_t>(d_journal_size)) == 0)
+			::lseek(d_fd, static_cast<off_t>(d_journal_size), SEEK_SET);
+		return false;
+	}
+	d_journal_size += d_buffer.size();
+	d_buffer.clear();
+	return true;
+    }
+
+    bool TimeScheduleJournal::compactionDue() const {
+	size_t size = d_journal_size + d_buffer.size();
+	return (size > d_compaction_size) && (size > d_snapshot_size);
+    }
+
+    bool TimeScheduleJournal::compact(const TimeSchedule& schedule) {
+	if (!isOpen())
+		return false;
+
+	std::vector<uint8_t> snapshot;
+	putHeader(snapshot, SnapshotMagic, d_generation + 1);
+	for (auto& activity : schedule)
+		appendActivity(snapshot, activity.second);
+
+	std::string snapshotPath = d_path + ".snapshot";
+	std::string temporaryPath = snapshotPath + ".tmp";
+	int fd = ::open(temporaryPath.c_str(), O_WRONLY | O_CREAT | O_TRUNC | O_CLOEXEC, 0644);
+	if (fd < 0)
+		return false;
+	bool written = writeAll(fd, snapshot.data(), snapshot.size()) && (::fsync(fd) == 0);
+	written = (::close(fd) == 0) && written;
+	if (!written || (std::rename(temporaryPath.c_str(), snapshotPath.c_str()) != 0)) {
+		::unlink(temporaryPath.c_str());
+		return false;
+	}
+
+	// The new snapshot holds the pending records too, the journal of the old one is discarded
+	d_generation++;
+	d_snapshot_size = snapshot.size();
+	d_buffer.clear();
+	return resetJournal();
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
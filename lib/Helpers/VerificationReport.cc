@@ -0,0 +1,60 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/pus/Helpers/VerificationReport.h>
+#include <algorithm>
+#include <array>
+#include <cstring>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // Meta dictionaries are immutable, so one per report type is shared by all the PDUs
+    const pmt::pmt_t& reportMeta(uint8_t messageType)
+    {
+	static const std::array<pmt::pmt_t, 256> prototypes = [] {
+		std::array<pmt::pmt_t, 256> meta;
+		for (size_t i = 0; i < meta.size(); i++)
+			meta[i] = pmt::dict_add(pmt::make_dict(), PMT_REQ, pmt::from_long(i));
+		return meta;
+	}();
+	return prototypes[messageType];
+    }
+
+    } // namespace
+
+    pmt::pmt_t VerificationReport::toPDU(uint8_t messageType, const uint8_t* request, size_t size,
+    				uint16_t errorCode, uint8_t stepId)
+    {
+	uint8_t record[Size] = { 0, 0, 0, 0, static_cast<uint8_t>(errorCode >> 8U),
+				 static_cast<uint8_t>(errorCode & 0xffU), stepId, messageType };
+	std::memcpy(record, request, std::min(sizeof(requestId), size));
+
+	return pmt::cons(reportMeta(messageType), pmt::init_u8vector(Size, record));
+    }
+
+    bool VerificationReport::fromPDU(const pmt::pmt_t& pdu, VerificationReport& report)
+    {
+	if (!pmt::is_pair(pdu) || !pmt::is_u8vector(pmt::cdr(pdu)))
+		return false;
+
+	size_t size = 0;
+	const uint8_t* record = pmt::u8vector_elements(pmt::cdr(pdu), size);
+	if (size != Size)
+		return false;
+
+	std::memcpy(report.requestId, record, sizeof(report.requestId));
+	report.errorCode = (record[4] << 8) | record[5];
+	report.stepId = record[6];
+	report.messageType = record[7];
+	return true;
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
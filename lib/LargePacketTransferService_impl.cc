@@ -39,7 +39,7 @@ namespace gr {
         	counters[i] = 0;
         message_port_register_in(PMT_IN);
         set_msg_handler(PMT_IN,
-                    [this](pmt::pmt_t msg) { this->handle_msg(msg); });
+                    [this](pmt::pmt_t msg) { PDUBatch::forEach(msg, [this](pmt::pmt_t pdu) { this->handle_msg(pdu); }); });
         message_port_register_in(PMT_LARGE);
         set_msg_handler(PMT_LARGE,
                     [this](pmt::pmt_t msg) { this->handle_large_in_msg(msg); });
@@ -56,8 +56,7 @@ namespace gr {
 	       
       	d_time_provider = TimeProvider::getInstance();
     
-    	d_time_provider->addHandler(
-            serviceType,
+    	addTimerHandler(
             std::bind(
                 & LargePacketTransferService_impl::timerTick,
                 this,
@@ -71,6 +70,7 @@ namespace gr {
      */
     LargePacketTransferService_impl::~LargePacketTransferService_impl()
     {
+        removeTimerHandler();
     }
 
     void LargePacketTransferService_impl::timerTick(TimeProvider *p) {
@@ -97,10 +97,10 @@ namespace gr {
 
         // extract data
         if (pmt::is_u8vector(v_data)) {
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-                Message message  = d_message_parser->ParseMessageCommand(in_data);
+                Message message  = d_message_parser->ParseMessageCommand(meta, data, size);
                 if(serviceType == message.getMessageServiceType()){
                     switch (message.getMessageType()) {
                         case FirstUplinkPartMessage:    
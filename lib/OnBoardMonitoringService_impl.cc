@@ -40,7 +40,7 @@ namespace gr {
         	counters[i] = 0;
         message_port_register_in(PMT_IN);
         set_msg_handler(PMT_IN,
-                    [this](pmt::pmt_t msg) { this->handle_msg(msg); });
+                    [this](pmt::pmt_t msg) { PDUBatch::forEach(msg, [this](pmt::pmt_t pdu) { this->handle_msg(pdu); }); });
         message_port_register_out(PMT_OUT);
         message_port_register_out(PMT_VER);
         message_port_register_out(PMT_RID);
@@ -56,8 +56,7 @@ namespace gr {
 
       	d_time_provider = TimeProvider::getInstance();
    
-    	d_time_provider->addHandler(
-            serviceType,
+    	addTimerHandler(
             std::bind(
                 &OnBoardMonitoringService_impl::timerTick,
                 this,
@@ -72,7 +71,7 @@ namespace gr {
      */
     OnBoardMonitoringService_impl::~OnBoardMonitoringService_impl()
     {
-            d_time_provider->removeHandler(serviceType);  
+            removeTimerHandler();  
     }
 
     void OnBoardMonitoringService_impl::timerTick(TimeProvider *p) {
@@ -216,10 +215,10 @@ namespace gr {
 
         // extract data
         if (pmt::is_u8vector(v_data)) {
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-                Message message  = d_message_parser->ParseMessageCommand(in_data);
+                Message message  = d_message_parser->ParseMessageCommand(meta, data, size);
                 if(serviceType == message.getMessageServiceType()){
                     switch (message.getMessageType()) {
                         case EnableParameterMonitoringDefinitions:    
@@ -0,0 +1,249 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/io_signature.h>
+#include <gnuradio/pus/Helpers/CRCHelper.h>
+#include "PacketDeframer_impl.h"
+#include <cstring>
+#include <stdexcept>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // Smallest Space Packet: a primary header and one byte of packet data field
+    const size_t MinPacketSize = CCSDSPrimaryHeaderSize + 1U;
+    const size_t MaxPacketSize = ECSSMaxMessageSize;
+
+    const uint8_t KISSFrameEnd = 0xC0;
+    const uint8_t KISSFrameEscape = 0xDB;
+    const uint8_t KISSTransposedFrameEnd = 0xDC;
+    const uint8_t KISSTransposedFrameEscape = 0xDD;
+
+    const uint8_t HDLCFlag = 0x7E;
+    const uint8_t HDLCEscape = 0x7D;
+
+    inline size_t packetLength(const uint8_t* header)
+    {
+	return ((static_cast<size_t>(header[4]) << 8U) | header[5]) + MinPacketSize;
+    }
+
+    } // namespace
+
+    PacketDeframer::sptr
+    PacketDeframer::make(int framing, uint32_t syncMarker, bool checkCRC)
+    {
+      return gnuradio::make_block_sptr<PacketDeframer_impl>(
+        framing, syncMarker, checkCRC);
+    }
+
+
+    /*
+     * The private constructor
+     */
+    PacketDeframer_impl::PacketDeframer_impl(int framing, uint32_t syncMarker, bool checkCRC)
+      : gr::sync_block("PacketDeframer",
+              gr::io_signature::make(1, 1, sizeof(uint8_t)),
+              gr::io_signature::make(0, 0, 0)),
+        d_framing(framing),
+        d_check_crc(checkCRC),
+        d_delimiter(0),
+        d_escape(0),
+        d_packets(0),
+        d_dropped(0)
+    {
+        if (framing == KISS) {
+        	d_delimiter = KISSFrameEnd;
+        	d_escape = KISSFrameEscape;
+        } else if (framing == HDLC) {
+        	d_delimiter = HDLCFlag;
+        	d_escape = HDLCEscape;
+        } else if (framing != SyncMarker) {
+        	throw std::invalid_argument("PacketDeframer: unknown framing");
+        }
+
+        d_marker[0] = static_cast<uint8_t>(syncMarker >> 24U);
+        d_marker[1] = static_cast<uint8_t>(syncMarker >> 16U);
+        d_marker[2] = static_cast<uint8_t>(syncMarker >> 8U);
+        d_marker[3] = static_cast<uint8_t>(syncMarker);
+
+        // Room for the largest escaped frame. d_buffer still grows when a whole input chunk is
+        // appended behind an incomplete packet, the capacity is kept for the next calls.
+        d_buffer.reserve(2 * (MaxPacketSize + 2));
+        d_frame.reserve(MaxPacketSize + 1);
+
+        this->message_port_register_out(PMT_OUT);
+    }
+
+    /*
+     * Our virtual destructor.
+     */
+    PacketDeframer_impl::~PacketDeframer_impl()
+    {
+    }
+
+    bool PacketDeframer_impl::publishPacket(const uint8_t* data, size_t size)
+    {
+        if (size < MinPacketSize || size > MaxPacketSize || (data[0] & 0xE0U) != 0U ||
+        	packetLength(data) != size) {
+        	d_dropped++;
+        	return false;
+        }
+        if (d_check_crc && CRCHelper::validateCRC(data, size) != 0) {
+        	d_dropped++;
+        	return false;
+        }
+
+        d_packets++;
+        message_port_pub(PMT_OUT, pmt::cons(pmt::make_dict(), pmt::init_u8vector(size, data)));
+        return true;
+    }
+
+    size_t PacketDeframer_impl::processSyncMarker(const uint8_t* data, size_t size)
+    {
+        const size_t markerSize = sizeof(d_marker);
+        size_t pos = 0;
+
+        while (pos < size) {
+        	auto found = static_cast<const uint8_t*>(std::memchr(data + pos, d_marker[0], size - pos));
+        	if (found == nullptr) {
+        		// No marker can start in the remaining bytes
+        		return size;
+        	}
+        	size_t start = found - data;
+
+        	if (size - start < markerSize + CCSDSPrimaryHeaderSize)
+        		return start;
+        	if (std::memcmp(found + 1, d_marker + 1, markerSize - 1) != 0) {
+        		pos = start + 1;
+        		continue;
+        	}
+
+        	const uint8_t* packet = found + markerSize;
+        	size_t length = packetLength(packet);
+        	if ((packet[0] & 0xE0U) != 0U || length > MaxPacketSize) {
+        		d_dropped++;
+        		pos = start + 1;
+        		continue;
+        	}
+        	if (size - start - markerSize < length)
+        		return start;
+
+        	// A marker followed by a bad packet may be a false match: resume right after it
+        	pos = publishPacket(packet, length) ? start + markerSize + length : start + 1;
+        }
+        return pos;
+    }
+
+    bool PacketDeframer_impl::unescapeFrame(const uint8_t* data, size_t size)
+    {
+        const uint8_t* end = data + size;
+        d_frame.clear();
+
+        while (data < end) {
+        	auto escape = static_cast<const uint8_t*>(std::memchr(data, d_escape, end - data));
+        	if (escape == nullptr) {
+        		d_frame.insert(d_frame.end(), data, end);
+        		break;
+        	}
+        	d_frame.insert(d_frame.end(), data, escape);
+        	if (escape + 1 == end)
+        		return false;
+
+        	uint8_t value = escape[1];
+        	if (d_framing == KISS) {
+        		if (value == KISSTransposedFrameEnd)
+        			value = KISSFrameEnd;
+        		else if (value == KISSTransposedFrameEscape)
+        			value = KISSFrameEscape;
+        		else
+        			return false;
+        	} else {
+        		value ^= 0x20U;
+        	}
+        	d_frame.push_back(value);
+        	data = escape + 2;
+        }
+        return true;
+    }
+
+    size_t PacketDeframer_impl::processDelimited(const uint8_t* data, size_t size)
+    {
+        size_t pos = 0;
+
+        while (pos < size) {
+        	auto opening = static_cast<const uint8_t*>(std::memchr(data + pos, d_delimiter, size - pos));
+        	if (opening == nullptr)
+        		return size;
+        	size_t start = opening - data;
+
+        	auto closing = static_cast<const uint8_t*>(std::memchr(opening + 1, d_delimiter, size - start - 1));
+        	if (closing == nullptr) {
+        		// Wait for the rest of the frame, unless it is already too long to hold a packet
+        		if (size - start > 2 * (MaxPacketSize + 1)) {
+        			d_dropped++;
+        			return size;
+        		}
+        		return start;
+        	}
+
+        	const uint8_t* frame = opening + 1;
+        	size_t frameSize = closing - frame;
+        	// The closing delimiter may also open the next frame
+        	pos = closing - data;
+        	if (frameSize == 0)
+        		continue;
+
+        	if (std::memchr(frame, d_escape, frameSize) != nullptr) {
+        		if (!unescapeFrame(frame, frameSize)) {
+        			d_dropped++;
+        			continue;
+        		}
+        		frame = d_frame.data();
+        		frameSize = d_frame.size();
+        	}
+
+        	if (d_framing == KISS) {
+        		// Only data frames carry packets, the command byte is not part of them
+        		if ((frame[0] & 0x0FU) != 0U) {
+        			d_dropped++;
+        			continue;
+        		}
+        		frame++;
+        		frameSize--;
+        	}
+        	publishPacket(frame, frameSize);
+        }
+        return pos;
+    }
+
+    int PacketDeframer_impl::work(int noutput_items,
+	gr_vector_const_void_star& input_items,
+	gr_vector_void_star& output_items)
+    {
+        auto in = static_cast<const uint8_t*>(input_items[0]);
+        size_t size = static_cast<size_t>(noutput_items);
+
+        // Scan the input in place, only the bytes of an incomplete packet are kept for the next call
+        if (d_buffer.empty()) {
+        	size_t consumed = (d_framing == SyncMarker) ? processSyncMarker(in, size)
+        						    : processDelimited(in, size);
+        	d_buffer.assign(in + consumed, in + size);
+        	return noutput_items;
+        }
+
+        d_buffer.insert(d_buffer.end(), in, in + size);
+        size_t consumed = (d_framing == SyncMarker) ? processSyncMarker(d_buffer.data(), d_buffer.size())
+        					    : processDelimited(d_buffer.data(), d_buffer.size());
+        d_buffer.erase(d_buffer.begin(), d_buffer.begin() + consumed);
+
+        return noutput_items;
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
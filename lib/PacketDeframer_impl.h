@@ -0,0 +1,80 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#ifndef INCLUDED_PUS_PACKETDEFRAMER_IMPL_H
+#define INCLUDED_PUS_PACKETDEFRAMER_IMPL_H
+
+#include <gnuradio/pus/PacketDeframer.h>
+#include <gnuradio/pus/Definitions/pmt_constants.h>
+#include <gnuradio/pus/Definitions/ECSS_Definitions.h>
+#include <vector>
+
+namespace gr {
+  namespace pus {
+
+    class PacketDeframer_impl : public PacketDeframer
+    {
+     private:
+      int d_framing;
+      uint8_t d_marker[4];
+      bool d_check_crc;
+
+      uint8_t d_delimiter;
+      uint8_t d_escape;
+
+      // Bytes received but not yet consumed by a complete packet
+      std::vector<uint8_t> d_buffer;
+      // Scratch buffer for the unescaped contents of a KISS/HDLC frame
+      std::vector<uint8_t> d_frame;
+
+      uint64_t d_packets;
+      uint64_t d_dropped;
+
+	/**
+	 * Checks the CCSDS header and the CRC of a candidate packet and publishes it.
+	 *
+	 * @return false when the packet is rejected
+	 */
+      bool publishPacket(const uint8_t* data, size_t size);
+
+	/**
+	 * Scans the buffer for attached sync markers.
+	 *
+	 * @return the number of bytes of the buffer that can be discarded
+	 */
+      size_t processSyncMarker(const uint8_t* data, size_t size);
+
+	/**
+	 * Scans the buffer for KISS or HDLC delimited frames.
+	 *
+	 * @return the number of bytes of the buffer that can be discarded
+	 */
+      size_t processDelimited(const uint8_t* data, size_t size);
+
+	/**
+	 * Removes the byte stuffing of a delimited frame into d_frame.
+	 *
+	 * @return false when the frame holds an invalid escape sequence
+	 */
+      bool unescapeFrame(const uint8_t* data, size_t size);
+
+     public:
+      PacketDeframer_impl(int framing, uint32_t syncMarker, bool checkCRC);
+      ~PacketDeframer_impl();
+
+      uint64_t packetCount() const override { return d_packets; }
+      uint64_t droppedCount() const override { return d_dropped; }
+
+      int work(int noutput_items,
+	       gr_vector_const_void_star& input_items,
+	       gr_vector_void_star& output_items) override;
+    };
+
+  } // namespace pus
+} // namespace gr
+
+#endif /* INCLUDED_PUS_PACKETDEFRAMER_IMPL_H */
@@ -37,7 +37,7 @@ namespace gr {
         	counters[i] = 0;
         message_port_register_in(PMT_IN);
         set_msg_handler(PMT_IN,
-                    [this](pmt::pmt_t msg) { this->handle_msg(msg); });
+                    [this](pmt::pmt_t msg) { PDUBatch::forEach(msg, [this](pmt::pmt_t pdu) { this->handle_msg(pdu); }); });
         message_port_register_out(PMT_OUT);
         
         std::vector<uint8_t> STMessages;
@@ -63,16 +63,26 @@ namespace gr {
             return;
         }
 
+        VerificationReport report;
+
+        // Fixed-size record published by the services: only the request ID of the TC travels
+        if (VerificationReport::fromPDU(pdu, report)){
+                Message request(report.requestId, sizeof(report.requestId));
+                verify(request, report);
+                return;
+        }
+
         pmt::pmt_t meta = pmt::car(pdu);
         pmt::pmt_t v_data = pmt::cdr(pdu);
 
         // extract data
         if (pmt::is_u8vector(v_data) && pmt::dict_has_key(meta, PMT_REQ) ){
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
+                // The request is parsed straight from the PMT buffer and then handed by
+                // reference to the report builders
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-
-        	if(in_data.size() < CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize + ECSSSecondaryTCCRCSize)
+        	if(size < CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize + ECSSSecondaryTCCRCSize)
         		return;
         	
         	if(!pmt::is_integer(pmt::dict_ref(meta, PMT_REQ, pmt::PMT_NIL))){
@@ -81,162 +91,115 @@ namespace gr {
 #endif
 			return;	
 		 }
-                uint16_t report_req = (uint16_t) pmt::to_long(pmt::dict_ref(meta, PMT_REQ, pmt::PMT_NIL));
-                uint16_t error_type = 0;
-                uint8_t step_id = 0;
-                                                
-                Message message = d_message_parser->ParseMessageCommand(in_data);
-                switch (report_req) {
-                        case SuccessfulAcceptanceReport:  
+                report.messageType = (uint8_t) pmt::to_long(pmt::dict_ref(meta, PMT_REQ, pmt::PMT_NIL));
+
+                pmt::pmt_t error_type = pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL);
+                pmt::pmt_t step_id = pmt::dict_ref(meta, PMT_STEP, pmt::PMT_NIL);
+
+                switch (report.messageType) {
+                        case FailedAcceptanceReport:
+                        case FailedStartOfExecution:
+                        case FailedProgressOfExecution:
+                        case FailedCompletionOfExecution:
+                        case FailedRoutingReport:
+                	   if(!pmt::is_integer(error_type)){
 #ifdef _PUS_DEBUG
-                           GR_LOG_WARN(d_logger, "SuccessfulAcceptanceReport");
+            			GR_LOG_WARN(d_logger, "No valid ERROR_TYPE metadata found");
 #endif
-			   successAcceptanceVerification(message);
-			   break;
-                        case FailedAcceptanceReport:  
-                	   if (pmt::dict_has_key(meta, PMT_ERROR_TYPE)){
+				return;	
+			   }
+                	   report.errorCode = (uint16_t)pmt::to_long(error_type);
+                	   break;
+                        default:
+                	   break;
+                }
 
-                	   	if(!pmt::is_integer(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL))){
-#ifdef _PUS_DEBUG
-            				GR_LOG_WARN(d_logger, "No valid ERROR_TYPE metadata found");
-#endif
-					break;	
-				}
+                if(report.messageType == SuccessfulProgressOfExecution || report.messageType == FailedProgressOfExecution){
+               	   if(!pmt::is_integer(step_id)){
 #ifdef _PUS_DEBUG
-				GR_LOG_WARN(d_logger, "FailedAcceptanceReport");
+            		GR_LOG_WARN(d_logger, "No valid STEP_ID metadata found");
 #endif
+			return;	
+		   }
+               	   report.stepId = (uint8_t)pmt::to_long(step_id);
+                }
 
-		     		error_type = (uint16_t)pmt::to_long(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL));
-
-			   	failAcceptanceVerification(message, 
-			   		(ErrorHandler::AcceptanceErrorType)error_type);
-		 	   }
-			   break;
-                        case SuccessfulStartOfExecution:  
-#ifdef _PUS_DEBUG
-                           GR_LOG_WARN(d_logger, "SuccessfulStartOfExecution");
-#endif
-			   successStartExecutionVerification(message);
-			   break;
-			   
-                        case FailedStartOfExecution:  
-                	   if (pmt::dict_has_key(meta, PMT_ERROR_TYPE)){
-                	   	if(!pmt::is_integer(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL))){
-#ifdef _PUS_DEBUG
-            				GR_LOG_WARN(d_logger, "No valid ERROR_TYPE metadata found");
-#endif
-					break;	
-				}
-#ifdef _PUS_DEBUG
-                           	GR_LOG_WARN(d_logger, "FailedStartOfExecution");
-#endif
+                Message message = d_message_parser->ParseMessageCommand(data, size);
+                verify(message, report);
 
-		     		error_type = (uint16_t)pmt::to_long(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL));
+        } else {
+                GR_LOG_WARN(d_logger, "Error: the input data is not a u8vector or the dictionary is incomplete");
+        }
+     }
 
-				failStartExecutionVerification(message, 
-			   		(ErrorHandler::ExecutionStartErrorType)error_type);
-		 	   }
-			   break;
-			   
-                        case SuccessfulProgressOfExecution:  
-			   if (pmt::dict_has_key(meta, PMT_STEP)){
-                	   	if(!pmt::is_integer(pmt::dict_ref(meta, PMT_STEP, pmt::PMT_NIL))){
+    void RequestVerificationService_impl::verify(Message& request, const VerificationReport& report)
+    {
+        switch (report.messageType) {
+                case SuccessfulAcceptanceReport:  
 #ifdef _PUS_DEBUG
-            				GR_LOG_WARN(d_logger, "No valid STEP_ID metadata found");
+                   GR_LOG_WARN(d_logger, "SuccessfulAcceptanceReport");
 #endif
-					break;	
-				}
+		   successAcceptanceVerification(request);
+		   break;
+                case FailedAcceptanceReport:  
 #ifdef _PUS_DEBUG
-                           	GR_LOG_WARN(d_logger, "SuccessfulProgressOfExecution");
+		   GR_LOG_WARN(d_logger, "FailedAcceptanceReport");
 #endif
-
-		     		step_id = (uint8_t)pmt::to_long(pmt::dict_ref(meta, PMT_STEP, pmt::PMT_NIL));
-			   	successProgressExecutionVerification(message, step_id);
-			   }
-			   break;
-                        case FailedProgressOfExecution:  
-
-               	   if (pmt::dict_has_key(meta, PMT_ERROR_TYPE)){
-
-
+		   failAcceptanceVerification(request, (ErrorHandler::AcceptanceErrorType)report.errorCode);
+		   break;
+                case SuccessfulStartOfExecution:  
 #ifdef _PUS_DEBUG
-                           	GR_LOG_WARN(d_logger, "FailedProgressOfExecution");
+                   GR_LOG_WARN(d_logger, "SuccessfulStartOfExecution");
 #endif
-
-
-		     		error_type = (uint16_t)pmt::to_long(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL));
-                 		if (pmt::dict_has_key(meta, PMT_STEP)){
-	                	   	if(!pmt::is_integer(pmt::dict_ref(meta, PMT_STEP, pmt::PMT_NIL))){
+		   successStartExecutionVerification(request);
+		   break;
+                case FailedStartOfExecution:  
 #ifdef _PUS_DEBUG
-	            				GR_LOG_WARN(d_logger, "No valid STEP_ID metadata found");
+                   GR_LOG_WARN(d_logger, "FailedStartOfExecution");
 #endif
-						break;	
-					}                 		
-                 		
-		     			step_id = (uint8_t)pmt::to_long(pmt::dict_ref(meta, PMT_STEP, pmt::PMT_NIL));
-			   		
-			   		failProgressExecutionVerification(message, 
-			   			(ErrorHandler::ExecutionProgressErrorType)error_type, step_id);
-				} 
-		 	   }
-
-			   break;
-                        case SuccessfulCompletionOfExecution:  
+		   failStartExecutionVerification(request, (ErrorHandler::ExecutionStartErrorType)report.errorCode);
+		   break;
+                case SuccessfulProgressOfExecution:  
 #ifdef _PUS_DEBUG
-                           GR_LOG_WARN(d_logger, "SuccessfulCompletionOfExecution");
+                   GR_LOG_WARN(d_logger, "SuccessfulProgressOfExecution");
 #endif
-			   successCompletionExecutionVerification(message);
-			   break;
-                        case FailedCompletionOfExecution:  
-               	   if (pmt::dict_has_key(meta, PMT_ERROR_TYPE)){
-                	   	if(!pmt::is_integer(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL))){
+		   successProgressExecutionVerification(request, report.stepId);
+		   break;
+                case FailedProgressOfExecution:  
 #ifdef _PUS_DEBUG
-            				GR_LOG_WARN(d_logger, "No valid ERROR_TYPE metadata found");
+                   GR_LOG_WARN(d_logger, "FailedProgressOfExecution");
 #endif
-					break;	
-				}
-
+		   failProgressExecutionVerification(request, 
+		   	(ErrorHandler::ExecutionProgressErrorType)report.errorCode, report.stepId);
+		   break;
+                case SuccessfulCompletionOfExecution:  
 #ifdef _PUS_DEBUG
-                           GR_LOG_WARN(d_logger, "FailedCompletionOfExecution");
+                   GR_LOG_WARN(d_logger, "SuccessfulCompletionOfExecution");
 #endif
-
-		     		error_type = (uint16_t)pmt::to_long(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL));
-
-				failCompletionExecutionVerification(message, 
-			   		(ErrorHandler::ExecutionCompletionErrorType)error_type);
-		 	   }
-                    
-			   break;
-                        case FailedRoutingReport:  
-               	   if (pmt::dict_has_key(meta, PMT_ERROR_TYPE)){
-                	   	if(!pmt::is_integer(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL))){
+		   successCompletionExecutionVerification(request);
+		   break;
+                case FailedCompletionOfExecution:  
 #ifdef _PUS_DEBUG
-            				GR_LOG_WARN(d_logger, "No valid ERROR_TYPE metadata found");
+                   GR_LOG_WARN(d_logger, "FailedCompletionOfExecution");
 #endif
-					break;	
-				}
+		   failCompletionExecutionVerification(request, 
+		   	(ErrorHandler::ExecutionCompletionErrorType)report.errorCode);
+		   break;
+                case FailedRoutingReport:  
 #ifdef _PUS_DEBUG
-                           GR_LOG_WARN(d_logger, "FailedRoutingReport");
+                   GR_LOG_WARN(d_logger, "FailedRoutingReport");
 #endif
-
-		     		error_type = (uint16_t)pmt::to_long(pmt::dict_ref(meta, PMT_ERROR_TYPE, pmt::PMT_NIL));
-
-				failRoutingVerification(message, (ErrorHandler::RoutingErrorType)error_type);
-		 	   }               
-			   break;
-                        default:
+		   failRoutingVerification(request, (ErrorHandler::RoutingErrorType)report.errorCode);
+		   break;
+                default:
 #ifdef _PUS_DEBUG
-			    GR_LOG_WARN(d_logger, "Request Verification Service: Wrong serviceSubType");
+		    GR_LOG_WARN(d_logger, "Request Verification Service: Wrong serviceSubType");
 #endif
-			    reportAcceptanceError(message, ErrorHandler::IllegalPacketSubType);
-                 }
-
-        } else {
-                GR_LOG_WARN(d_logger, "Error: the input data is not a u8vector or the dictionary is incomplete");
+		    reportAcceptanceError(request, ErrorHandler::IllegalPacketSubType);
         }
-     }
+    }
 
-    void RequestVerificationService_impl::successAcceptanceVerification(Message request) {
+    void RequestVerificationService_impl::successAcceptanceVerification(const Message& request) {
 	// TM[1,1] successful acceptance verification report
 
         MessageArray payload;
@@ -260,7 +223,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::SuccessfulAcceptanceReport]++;
     }
 
-    void RequestVerificationService_impl::failAcceptanceVerification(Message request,
+    void RequestVerificationService_impl::failAcceptanceVerification(const Message& request,
                                                             ErrorHandler::AcceptanceErrorType errorCode) {
 	// TM[1,2] failed acceptance verification report
         MessageArray payload;
@@ -287,7 +250,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::FailedAcceptanceReport]++;
     }
 
-    void RequestVerificationService_impl::successStartExecutionVerification(Message request) {
+    void RequestVerificationService_impl::successStartExecutionVerification(const Message& request) {
 	// TM[1,3] successful start of execution verification report
         MessageArray payload;
         
@@ -310,7 +273,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::SuccessfulStartOfExecution]++;
     }
 
-    void RequestVerificationService_impl::failStartExecutionVerification(Message request,
+    void RequestVerificationService_impl::failStartExecutionVerification(const Message& request,
                                                                 ErrorHandler::ExecutionStartErrorType errorCode) {
 	// TM[1,4] failed start of execution verification report
         MessageArray payload;
@@ -337,7 +300,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::FailedStartOfExecution]++;
     }
 
-    void RequestVerificationService_impl::successProgressExecutionVerification(Message request, uint8_t stepID) {
+    void RequestVerificationService_impl::successProgressExecutionVerification(const Message& request, uint8_t stepID) {
 	// TM[1,5] successful progress of execution verification report
         MessageArray payload;
         
@@ -362,7 +325,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::SuccessfulProgressOfExecution]++;		
     }
 
-    void RequestVerificationService_impl::failProgressExecutionVerification(Message request,
+    void RequestVerificationService_impl::failProgressExecutionVerification(const Message& request,
                                                                    ErrorHandler::ExecutionProgressErrorType errorCode,
                                                                    uint8_t stepID) {
 	// TM[1,6] failed progress of execution verification report
@@ -392,7 +355,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::FailedProgressOfExecution]++;	
     }
 
-    void RequestVerificationService_impl::successCompletionExecutionVerification(Message request) {
+    void RequestVerificationService_impl::successCompletionExecutionVerification(const Message& request) {
 	// TM[1,7] successful completion of execution verification report
         MessageArray payload;
         
@@ -415,7 +378,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::SuccessfulCompletionOfExecution]++;	
     }
 
-    void RequestVerificationService_impl::failCompletionExecutionVerification(Message request,
+    void RequestVerificationService_impl::failCompletionExecutionVerification(const Message& request,
                                                          ErrorHandler::ExecutionCompletionErrorType errorCode) {
 	// TM[1,8] failed completion of execution verification report
         MessageArray payload;
@@ -441,7 +404,7 @@ namespace gr {
         counters[RequestVerificationService::MessageType::FailedCompletionOfExecution]++;	
     }
 
-    void RequestVerificationService_impl::failRoutingVerification(Message request,
+    void RequestVerificationService_impl::failRoutingVerification(const Message& request,
                                                          ErrorHandler::RoutingErrorType errorCode) {
 	// TM[1,10] failed routing verification report
         MessageArray payload;
@@ -15,6 +15,7 @@
 #include <gnuradio/pus/Definitions/pmt_constants.h>
 #include <gnuradio/pus/Helpers/MessageParser.h>
 #include <gnuradio/pus/Helpers/ErrorHandler.h>
+#include <gnuradio/pus/Helpers/VerificationReport.h>
 #include "etl/vector.h"
 namespace gr {
   namespace pus {
@@ -40,6 +41,13 @@ namespace gr {
 	 */
       void handle_msg(pmt::pmt_t pdu);
 
+	/**
+	 * Generates the TM[1,x] report requested by \p report
+	 *
+	 * @param request The TC being verified. Only its request ID (the first four bytes) is used.
+	 */
+      void verify(Message& request, const VerificationReport& report);
+
 	/**
 	 * TM[1,1] successful acceptance verification report
 	 *
@@ -47,7 +55,7 @@ namespace gr {
 	 * The data is actually some data members of Message that contain the basic info
 	 * of the telecommand packet that accepted successfully
 	 */
-	void successAcceptanceVerification(Message request);
+	void successAcceptanceVerification(const Message& request);
 
 	/**
 	 * TM[1,2] failed acceptance verification report
@@ -57,7 +65,7 @@ namespace gr {
 	 * info of the telecommand packet that failed to be accepted
 	 * @param errorCode The cause of creating this type of report
 	 */
-	void failAcceptanceVerification(Message request, ErrorHandler::AcceptanceErrorType errorCode);
+	void failAcceptanceVerification(const Message& request, ErrorHandler::AcceptanceErrorType errorCode);
 
 	/**
 	 * TM[1,3] successful start of execution verification report
@@ -66,7 +74,7 @@ namespace gr {
 	 * The data is actually some data members of Message that contain the basic info
 	 * of the telecommand packet that its start of execution is successful
 	 */
-	void successStartExecutionVerification(Message request);
+	void successStartExecutionVerification(const Message& request);
 
 	/**
 	 * TM[1,4] failed start of execution verification report
@@ -76,7 +84,7 @@ namespace gr {
 	 * of the telecommand packet that its start of execution has failed
 	 * @param errorCode The cause of creating this type of report
 	 */
-	void failStartExecutionVerification(Message request, ErrorHandler::ExecutionStartErrorType errorCode);
+	void failStartExecutionVerification(const Message& request, ErrorHandler::ExecutionStartErrorType errorCode);
 
 	/**
 	 * TM[1,5] successful progress of execution verification report
@@ -89,7 +97,7 @@ namespace gr {
 	 * @todo Each value,that the stepID is assigned, should be documented.
 	 * @todo error handling for undocumented assigned values to stepID
 	 */
-	void successProgressExecutionVerification(Message request, uint8_t stepID);
+	void successProgressExecutionVerification(const Message& request, uint8_t stepID);
 
 	/**
 	 * TM[1,6] failed progress of execution verification report
@@ -103,7 +111,7 @@ namespace gr {
 	 * @todo Each value,that the stepID is assigned, should be documented.
 	 * @todo error handling for undocumented assigned values to stepID
 	 */
-	void failProgressExecutionVerification(Message request, ErrorHandler::ExecutionProgressErrorType errorCode,
+	void failProgressExecutionVerification(const Message& request, ErrorHandler::ExecutionProgressErrorType errorCode,
 	                                       uint8_t stepID);
 
 	/**
@@ -113,7 +121,7 @@ namespace gr {
 	 * The data is actually data members of Message that contain the basic info of the
 	 * telecommand packet that executed completely and successfully
 	 */
-	void successCompletionExecutionVerification(Message request);
+	void successCompletionExecutionVerification(const Message& request);
 
 	/**
 	 * TM[1,8] failed completion of execution verification report
@@ -123,7 +131,7 @@ namespace gr {
 	 * telecommand packet that failed to be executed completely
 	 * @param errorCode The cause of creating this type of report
 	 */
-	void failCompletionExecutionVerification(Message request,
+	void failCompletionExecutionVerification(const Message& request,
 	                                         ErrorHandler::ExecutionCompletionErrorType errorCode);
 
 	/**
@@ -134,7 +142,7 @@ namespace gr {
 	 * telecommand packet that failed the routing
 	 * @param errorCode The cause of creating this type of report
  	 */
-	void failRoutingVerification(Message request, ErrorHandler::RoutingErrorType errorCode);
+	void failRoutingVerification(const Message& request, ErrorHandler::RoutingErrorType errorCode);
 	      
     };
 
@@ -11,6 +11,7 @@
 
 #include <gnuradio/pus/Service.h>
 #include <gnuradio/pus/RequestVerificationService.h>
+#include <gnuradio/pus/Helpers/VerificationReport.h>
 
 namespace gr {
   namespace pus {
@@ -21,10 +22,8 @@ namespace gr {
 	 */
     void Service::reportSuccessAcceptanceVerification(Message& request){
         if(ACK_FLAGS::SuccessAcceptanceVerification & request.getMessageAckFlags()){
-               pmt::pmt_t meta = pmt::make_dict();
-        	meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::SuccessfulAcceptanceReport));
-        	message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));      
+               message_port_pub(PMT_VER,
+               		VerificationReport::toPDU(RequestVerificationService::MessageType::SuccessfulAcceptanceReport, request));
         }       	
     }  
     
@@ -32,11 +31,8 @@ namespace gr {
 	 * TM[1,2] failed acceptance verification report
 	 */
     void Service::reportAcceptanceError(Message& request, ErrorHandler::AcceptanceErrorType errorCode) {    
-        pmt::pmt_t meta = pmt::make_dict();
-        meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::FailedAcceptanceReport));
-        meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(errorCode));
-        message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));              	
+        message_port_pub(PMT_VER,
+        		VerificationReport::toPDU(RequestVerificationService::MessageType::FailedAcceptanceReport, request, errorCode));
         d_error_handler->reportError(request, errorCode);               
     } 
      
@@ -45,10 +41,8 @@ namespace gr {
 	 */
     void Service::reportSuccessStartExecutionVerification(Message& request){
         if(ACK_FLAGS::SuccessStartExecutionVerification & request.getMessageAckFlags()){
-        	pmt::pmt_t meta = pmt::make_dict();
-                meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::SuccessfulStartOfExecution));
-                message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));     
+        	message_port_pub(PMT_VER,
+        			VerificationReport::toPDU(RequestVerificationService::MessageType::SuccessfulStartOfExecution, request));
          }        	
     }  
     
@@ -56,11 +50,8 @@ namespace gr {
 	 * TM[1,4] failed start of execution verification report
 	 */             
     void Service::reportExecutionStartError(Message& request, ErrorHandler::ExecutionStartErrorType errorCode) {    
-        pmt::pmt_t meta = pmt::make_dict();
-        meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::FailedStartOfExecution));
-        meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(errorCode));
-        message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));                	
+        message_port_pub(PMT_VER,
+        		VerificationReport::toPDU(RequestVerificationService::MessageType::FailedStartOfExecution, request, errorCode));
         d_error_handler->reportError(request, errorCode);               
     } 
 
@@ -69,11 +60,8 @@ namespace gr {
 	 */
     void Service::reportSuccessProgressExecutionVerification(Message& request, uint8_t stepID) {  
         if(ACK_FLAGS::SuccessProgressExecutionVerification & request.getMessageAckFlags()){
-                pmt::pmt_t meta = pmt::make_dict();
-                meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::SuccessfulProgressOfExecution));
-                meta = pmt::dict_add(meta, PMT_STEP, pmt::from_long(stepID));
-                message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));           	
+                message_port_pub(PMT_VER,
+                		VerificationReport::toPDU(RequestVerificationService::MessageType::SuccessfulProgressOfExecution, request, 0, stepID));
         }
     }  
     
@@ -81,12 +69,8 @@ namespace gr {
 	 * TM[1,6] failed progress of execution verification report
 	 */        
     void Service::reportExecutionProgressError(Message& request, ErrorHandler::ExecutionProgressErrorType errorCode, uint8_t stepID) {    
-        pmt::pmt_t meta = pmt::make_dict();
-        meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::FailedProgressOfExecution));
-        meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(errorCode));
-        meta = pmt::dict_add(meta, PMT_STEP, pmt::from_long(stepID));
-        message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));               	
+        message_port_pub(PMT_VER,
+        		VerificationReport::toPDU(RequestVerificationService::MessageType::FailedProgressOfExecution, request, errorCode, stepID));
         d_error_handler->reportError(request, errorCode, stepID);               
     } 
 
@@ -95,10 +79,8 @@ namespace gr {
 	 */
     void Service::reportSuccessCompletionExecutionVerification(Message& request){
         if(ACK_FLAGS::SuccessCompletionExecutionVerification & request.getMessageAckFlags()){
-                pmt::pmt_t meta = pmt::make_dict();
-                meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::SuccessfulCompletionOfExecution));
-                message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));               	
+                message_port_pub(PMT_VER,
+                		VerificationReport::toPDU(RequestVerificationService::MessageType::SuccessfulCompletionOfExecution, request));
         }
     }  
     
@@ -106,11 +88,8 @@ namespace gr {
 	 * TM[1,8] failed completion of execution verification report
 	 */        
     void Service::reportExecutionCompletionError(Message& request, ErrorHandler::ExecutionCompletionErrorType errorCode) {    
-        pmt::pmt_t meta = pmt::make_dict();
-        meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::FailedCompletionOfExecution));
-        meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(errorCode));
-        message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));          	
+        message_port_pub(PMT_VER,
+        		VerificationReport::toPDU(RequestVerificationService::MessageType::FailedCompletionOfExecution, request, errorCode));
         d_error_handler->reportError(request, errorCode);               
     } 
 
@@ -118,13 +97,72 @@ namespace gr {
 	 * TM[1,10] failed routing verification report
  	 */            
     void Service::failRoutingVerification(Message& request, ErrorHandler::RoutingErrorType errorCode) {    
-        pmt::pmt_t meta = pmt::make_dict();
-        meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::MessageType::FailedRoutingReport));
-        meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(errorCode));
-        message_port_pub(PMT_VER, pmt::cons(meta, 
-                		pmt::init_u8vector(request.getMessageData().size(), request.getMessageRawData())));             	
+        message_port_pub(PMT_VER,
+        		VerificationReport::toPDU(RequestVerificationService::MessageType::FailedRoutingReport, request, errorCode));
         d_error_handler->reportError(errorCode);               
     }        
+
+    void Service::addTimerHandler(std::function<void(TimeProvider*)> handler, TimerExecution execution) {
+        if(execution == TimerThread){
+        	TimeProvider::getInstance()->addHandler(serviceType, handler);
+        	return;
+        }
+
+        message_port_register_in(PMT_TICK);
+        set_msg_handler(PMT_TICK,
+                    [this, handler](pmt::pmt_t msg) {
+                    	uint32_t ticks = d_pending_ticks.load();
+                    	for(uint32_t i = 0; i < ticks; i++)
+                    		handler(TimeProvider::getInstance());
+                    	{
+                    		std::lock_guard<std::mutex> lock(d_tick_mutex);
+                    		// Ticks counted while running did not post a message, they are posted here
+                    		if(d_pending_ticks.fetch_sub(ticks) != ticks)
+                    			_post(PMT_TICK, pmt::PMT_T);
+                    	}
+                    	d_ticks_run.notify_all();
+                    });
+
+        TimeProvider::getInstance()->addHandler(serviceType,
+        	[this](TimeProvider* p) {
+        		// Only the first pending tick is posted, the message handler runs all of them
+        		if(d_pending_ticks.fetch_add(1) == 0)
+        			_post(PMT_TICK, pmt::PMT_T);
+        		// The simulated clock must not move on before the block has read the time of the tick
+        		if(p->isSimulatedTime())
+        			waitTicksRun();
+        	});
+    }
+
+    void Service::waitTicksRun() {
+        std::unique_lock<std::mutex> lock(d_tick_mutex);
+        d_ticks_run.wait(lock, [this] { return !d_block_ticking || d_pending_ticks == 0; });
+    }
+
+    void Service::removeTimerHandler() {
+        {
+            std::lock_guard<std::mutex> lock(d_tick_mutex);
+            d_block_ticking = false;
+        }
+        d_ticks_run.notify_all();
+        TimeProvider::getInstance()->removeHandler(serviceType);
+    }
+
+    bool Service::start() {
+        std::lock_guard<std::mutex> lock(d_tick_mutex);
+        d_block_ticking = true;
+        return block::start();
+    }
+
+    bool Service::stop() {
+        {
+            std::lock_guard<std::mutex> lock(d_tick_mutex);
+            d_block_ticking = false;
+        }
+        // The block thread does not run the ticks anymore, the executor must not wait for it
+        d_ticks_run.notify_all();
+        return block::stop();
+    }
   } // namespace pus
 } // namespace gr
 
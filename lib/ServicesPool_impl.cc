@@ -12,6 +12,8 @@
 #include "ServicesPool_impl.h"
 #include <gnuradio/pus/RequestVerificationService.h>
 #include <gnuradio/pus/Helpers/CRCHelper.h>
+#include <gnuradio/pus/Helpers/PDUBatch.h>
+#include <gnuradio/pus/Helpers/VerificationReport.h>
 
 namespace gr {
   namespace pus {
@@ -49,12 +51,15 @@ namespace gr {
 
         if(d_services_list.size() > 1){
             for(uint16_t i = 0; i < d_services_list.size(); i++){
-                message_port_register_out(pmt::intern("out" + std::to_string(i)));
-                d_outputservices.insert({d_services_list[i], i});
+                pmt::pmt_t port = pmt::intern("out" + std::to_string(i));
+                message_port_register_out(port);
+                if(d_services_list[i] < d_routing_table.size() && !d_routing_table[d_services_list[i]])
+                    d_routing_table[d_services_list[i]] = port;
             }
         }else{
-            d_outputservices.clear();
             message_port_register_out(PMT_OUT);
+            if(d_services_list.size() == 1 && d_services_list[0] < d_routing_table.size())
+                d_routing_table[d_services_list[0]] = PMT_OUT;
         }
     }
 
@@ -65,111 +70,101 @@ namespace gr {
     {
     }
 
-    void ServicesPool_impl::handle_msg(pmt::pmt_t pdu)
+    void ServicesPool_impl::publishAcceptanceFailure(const uint8_t* data, size_t size,
+    			ErrorHandler::AcceptanceErrorType errorCode)
     {
-        // make sure PDU data is formed properly
-        if (!(pmt::is_pair(pdu))) {
-#ifdef _PUS_DEBUG
-            GR_LOG_NOTICE(d_logger, "received unexpected PMT (non-pair)");
-#endif
-            return;
+        message_port_pub(PMT_VER,
+        		VerificationReport::toPDU(RequestVerificationService::FailedAcceptanceReport, data, size, errorCode));
+    }
+
+    bool ServicesPool_impl::validatePacket(const uint8_t* data, size_t size, PacketHeader& header)
+    {
+        if(size < (CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize + ECSSSecondaryTCCRCSize)){
+        	d_error_handler->reportInternalError(ErrorHandler::UnacceptablePacket);
+        	return false;
         }
 
-        pmt::pmt_t meta = pmt::car(pdu);
-        pmt::pmt_t v_data = pmt::cdr(pdu);
+        header.decode(data, size);
 
-        // extract data
-        if (pmt::is_u8vector(v_data)) {
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
-                if(inData.size() < (CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize + ECSSSecondaryTCCRCSize)){
-                	d_error_handler->reportInternalError(ErrorHandler::UnacceptablePacket);
-                	return;
-                }
+        if(!d_error_handler->assertInternal(header.version == 0U, ErrorHandler::UnacceptablePacket))
+        	return false;
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-                Message message  = Message(in_data);
+        if(!d_error_handler->assertInternal((data[0] & 0x08) != 0U, ErrorHandler::UnacceptablePacket))
+        	return false;
 
-                if(!d_error_handler->assertInternal(message.getMessageVersion() == 0U, ErrorHandler::UnacceptablePacket))
-                	return;
-       
-                if(!d_error_handler->assertInternal(message.getMessageSecondaryHeaderFlag(), ErrorHandler::UnacceptablePacket))
-                	return;
+        if(!d_error_handler->assertInternal(header.sequenceFlags == 3U, ErrorHandler::UnacceptablePacket))
+        	return false;
 
-                if(!d_error_handler->assertInternal(message.getMessageSequenceFlags() == 3U, ErrorHandler::UnacceptablePacket))
-                	return;
+        if(!d_error_handler->assertInternal(header.packetDataLength == (size - CCSDSPrimaryHeaderSize - 1),
+        				 ErrorHandler::UnacceptablePacket))
+        	return false;
 
-                if(!d_error_handler->assertInternal(message.getMessagePacketDataLength() == (message.getMessageSize() - CCSDSPrimaryHeaderSize - 1),
-                					 ErrorHandler::UnacceptablePacket))
-                	return;
+        uint8_t serviceType = header.serviceType;
+        uint8_t messageType = header.messageType;
 
-                if(!d_error_handler->assertRequest(message.getMessagePUSVersion() == 2U, message, ErrorHandler::UnacceptableMessage)){
+        if(header.pusVersion != ECSSPUSVersion){
+        	d_error_handler->reportError(serviceType, messageType, ErrorHandler::UnacceptableMessage);
 #ifdef _PUS_DEBUG
-                		GR_LOG_WARN(d_logger, "Error: wrong PUS version");
+        	GR_LOG_WARN(d_logger, "Error: wrong PUS version");
 #endif
-                	meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::FailedAcceptanceReport));
-                	meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(ErrorHandler::IllegalAppData));
-                	message_port_pub(PMT_VER, pmt::cons(meta, 
-                				pmt::init_u8vector(inData.size(),
-                							 inData.data())));          	
-                	return;
-                }
-                in_data.pop_back();
-                in_data.pop_back();
-		 uint16_t crcField = CRCHelper::calculateMessageCRC(in_data); 
-		 uint16_t msgCrcField = message.getMessageCRC();
+        	publishAcceptanceFailure(data, size, ErrorHandler::IllegalAppData);
+        	return false;
+        }
+
+        uint16_t crcField = CRCHelper::calculateCRC(data, size - ECSSSecondaryTCCRCSize); 
+        uint16_t msgCrcField = (data[size - 2] << 8) | data[size - 1];
 		 
-                if(msgCrcField != crcField ){
+        if(msgCrcField != crcField ){
 #ifdef _PUS_DEBUG
-                		GR_LOG_WARN(d_logger, "Error: CRC error");
+        	GR_LOG_WARN(d_logger, "Error: CRC error");
 #endif
-                	meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::FailedAcceptanceReport));
-                	meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(ErrorHandler::InvalidChecksum));
-                	message_port_pub(PMT_VER, pmt::cons(meta, 
-                				pmt::init_u8vector(inData.size(),
-                							 inData.data())));          	
-                	return;               
-                }         
-               
-                uint8_t serviceType = message.getMessageServiceType();
-                if(d_services_list.size() > 1){
-std::cout << " serviceType " << (uint16_t)  serviceType << std::endl; 
-                	if(auto search = d_outputservices.find(serviceType); search != d_outputservices.end()){
-                		message_port_pub(pmt::intern("out" + std::to_string(search->second)), pdu);    
-                	}else{
-#ifdef _PUS_DEBUG
-                		GR_LOG_WARN(d_logger, "Error: serviceType not found");
-#endif
-                		meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::FailedAcceptanceReport));
-                		meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(ErrorHandler::IllegalPacketType));
-                		message_port_pub(PMT_VER, pmt::cons(meta, 
-                				pmt::init_u8vector(inData.size(),
-                							 inData.data())));           
-                	}	
-                }else if(d_services_list.size() == 1){
-                	if( d_services_list[0] == serviceType){
-                		message_port_pub(PMT_OUT, pmt::cons(meta, 
-                				pmt::init_u8vector(inData.size(),
-                							 inData.data())));    
-                	}else{
+        	publishAcceptanceFailure(data, size, ErrorHandler::InvalidChecksum);
+        	return false;               
+        }         
+
+        if(!d_routing_table[serviceType]){
 #ifdef _PUS_DEBUG
-                		GR_LOG_WARN(d_logger, "Error: serviceType not found");
+        	GR_LOG_WARN(d_logger, "Error: serviceType not found");
 #endif
-                		meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::FailedAcceptanceReport));
-                		meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(ErrorHandler::IllegalPacketType));
-                		message_port_pub(PMT_VER, pmt::cons(meta, 
-                				pmt::init_u8vector(inData.size(),
-                							 inData.data())));                       		
-                	}
-                }else{
+        	publishAcceptanceFailure(data, size, ErrorHandler::IllegalPacketType);
+        	return false;
+        }
+        return true;
+    }
+
+    void ServicesPool_impl::handle_msg(pmt::pmt_t pdu)
+    {
+        // make sure PDU data is formed properly
+        if (!(pmt::is_pair(pdu))) {
 #ifdef _PUS_DEBUG
-                	GR_LOG_WARN(d_logger, "Error: serviceType empty");
+            GR_LOG_NOTICE(d_logger, "received unexpected PMT (non-pair)");
 #endif
-                	meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(RequestVerificationService::FailedAcceptanceReport));
-                	meta = pmt::dict_add(meta, PMT_ERROR_TYPE, pmt::from_long(ErrorHandler::IllegalPacketType));
-                	message_port_pub(PMT_VER, pmt::cons(meta, 
-                				pmt::init_u8vector(inData.size(),
-                							 inData.data())));       
-		}
+            return;
+        }
+
+        if (PDUBatch::isBatch(pdu)) {
+            handle_batch(pdu);
+            return;
+        }
+
+        pmt::pmt_t meta = pmt::car(pdu);
+        pmt::pmt_t v_data = pmt::cdr(pdu);
+
+        // extract data
+        if (pmt::is_u8vector(v_data)) {
+                // The packet is validated in place on the PMT buffer, and the original
+                // u8vector is forwarded without being copied
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
+
+                // The decoded headers travel with the packet, so that the service does not
+                // decode them again
+                PacketHeader header;
+                if(validatePacket(data, size, header)){
+                	meta = pmt::dict_add(pmt::is_dict(meta) ? meta : pmt::make_dict(),
+                			     PMT_HEADER, MessageParser::headerToPMT(header));
+                	message_port_pub(d_routing_table[header.serviceType], pmt::cons(meta, v_data));
+                }
         } else {
 #ifdef _PUS_DEBUG
                 GR_LOG_WARN(d_logger, "Error: the input data is not a u8vector");
@@ -178,6 +173,31 @@ std::cout << " serviceType " << (uint16_t)  serviceType << std::endl;
         }
      }
 
+    void ServicesPool_impl::handle_batch(pmt::pmt_t pdu)
+    {
+        pmt::pmt_t meta = pmt::car(pdu);
+        if(pmt::is_dict(meta))
+        	meta = pmt::dict_delete(meta, PMT_OFFSETS);
+
+        // Validate every packet in one pass, grouping the accepted ones per service type
+        // The packets of a batch share its metadata, so their decoded headers are not attached
+        PDUBatch::forEachSpan(pdu, [this](pmt::pmt_t, pmt::pmt_t v_data, const uint8_t* data, size_t size) {
+        	PacketHeader header;
+        	if(!validatePacket(data, size, header))
+        		return;
+
+        	uint8_t serviceType = header.serviceType;
+        	if(d_batches[serviceType].empty())
+        		d_batched_services.push_back(serviceType);
+        	d_batches[serviceType].push_back(pmt::is_null(v_data) ? pmt::init_u8vector(size, data) : v_data);
+        });
+
+        for(uint8_t serviceType : d_batched_services){
+        	message_port_pub(d_routing_table[serviceType], PDUBatch::make(meta, d_batches[serviceType]));
+        	d_batches[serviceType].clear();
+        }
+        d_batched_services.clear();
+    }
 
   } /* namespace pus */
 } /* namespace gr */
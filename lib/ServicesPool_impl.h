@@ -16,7 +16,7 @@
 #include <gnuradio/pus/Helpers/MessageParser.h>
 #include <gnuradio/pus/Helpers/ErrorHandler.h>
 #include <etl/vector.h>
-#include <etl/map.h>
+#include <array>
 
 namespace gr {
   namespace pus {
@@ -24,13 +24,51 @@ namespace gr {
     class ServicesPool_impl : public ServicesPool
     {
      private:
-      typedef etl::map<uint16_t, uint16_t, ECSSMaxNumberOfServices> OutputServices;
       typedef etl::vector<uint16_t, ECSSMaxNumberOfServices> ServicesList;
 
-      OutputServices d_outputservices;
+      /**
+       * Output port for each service type, indexed directly by the 8-bit service type.
+       * Entries of services not handled by the pool are left empty.
+       */
+      typedef std::array<pmt::pmt_t, 256> RoutingTable;
+
       ServicesList d_services_list;
+      RoutingTable d_routing_table;
       
       ErrorHandler* d_error_handler;
+
+      /**
+       * Packets of the batch being processed, grouped per service type, and the list of
+       * service types that received at least one packet
+       */
+      std::array<std::vector<pmt::pmt_t>, 256> d_batches;
+      std::vector<uint8_t> d_batched_services;
+
+    /**
+     * @brief Publishes a TM[1,2] request on the verification port for a rejected packet
+     *
+     * @param data pointer to the packet data
+     * @param size size of the packet in bytes
+     * @param errorCode the acceptance error to report
+     */
+      void publishAcceptanceFailure(const uint8_t* data, size_t size, ErrorHandler::AcceptanceErrorType errorCode);
+
+    /**
+     * @brief Validates the header and CRC of a packet in place
+     *
+     * Rejected packets are reported on the verification port.
+     *
+     * @param header set to the decoded headers of the packet
+     * @return true when the packet is valid and a service of the pool handles it
+     */
+      bool validatePacket(const uint8_t* data, size_t size, PacketHeader& header);
+
+    /**
+     * @brief Validates all the packets of a batch PDU and emits one sub-batch per service
+     *
+     * @param pdu the batch PDU
+     */
+      void handle_batch(pmt::pmt_t pdu);
             
      public:
       ServicesPool_impl(std::vector<uint16_t> services_list);
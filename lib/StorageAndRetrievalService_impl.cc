@@ -47,7 +47,7 @@ namespace gr {
         	
         this->message_port_register_in(PMT_IN);
         this->set_msg_handler(PMT_IN,
-                    [this](pmt::pmt_t msg) { this->handle_msg(msg); });
+                    [this](pmt::pmt_t msg) { PDUBatch::forEach(msg, [this](pmt::pmt_t pdu) { this->handle_msg(pdu); }); });
         this->message_port_register_in(PMT_IN_MSG);
         this->set_msg_handler(PMT_IN_MSG,
                     [this](pmt::pmt_t msg) { this->handle_in_msg(msg); });
@@ -103,7 +103,7 @@ namespace gr {
         d_finished = false;
         d_thread = gr::thread::thread([this] { run(); });
 
-    	return block::start();
+    	return Service::start();
     }
 
     bool StorageAndRetrievalService_impl::stop()
@@ -113,7 +113,7 @@ namespace gr {
         d_thread.interrupt();
         d_thread.join();
 
-   	return block::stop();
+   	return Service::stop();
     }        
 
     void StorageAndRetrievalService_impl::run()
@@ -292,10 +292,10 @@ namespace gr {
 
         // extract data
         if (pmt::is_u8vector(v_data)) {
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-                Message message  = d_message_parser->ParseMessageCommand(in_data);
+                Message message  = d_message_parser->ParseMessageCommand(meta, data, size);
 
                 for (auto& stores: packetStores) {
 			if( !stores.second.storageStatus)
@@ -333,10 +333,10 @@ namespace gr {
 
         // extract data
         if (pmt::is_u8vector(v_data)) {
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-                Message message  = d_message_parser->ParseMessageCommand(in_data);
+                Message message  = d_message_parser->ParseMessageCommand(meta, data, size);
                 if(serviceType == message.getMessageServiceType()){
                     switch (message.getMessageType()) {
                         case EnableStorageInPacketStores:    
@@ -9,23 +9,19 @@
  */
  
 #include <gnuradio/pus/Time/TimeGetter.h>
+#include <gnuradio/pus/Time/TimeProvider.h>
 
 
 namespace gr {
   namespace pus {
   
     UTCTimestamp TimeGetter::getCurrentTimeUTC() {
-	time_t timeInSeconds = static_cast<time_t>(time(nullptr));
-	tm* UTCTimeStruct = gmtime(&timeInSeconds);
-	UTCTimestamp currentTime(UTCTimeStruct->tm_year, UTCTimeStruct->tm_mon,
-	                         UTCTimeStruct->tm_mday, UTCTimeStruct->tm_hour,
-	                         UTCTimeStruct->tm_min, UTCTimeStruct->tm_sec);
-	return currentTime;
+	return TimeProvider::getInstance()->getCurrentTimeUTC();
     }
 
     Time::DefaultCUC TimeGetter::getCurrentTimeDefaultCUC() {
-	UTCTimestamp timeUTC = getCurrentTimeUTC();
-	return Time::DefaultCUC(timeUTC);
+	uint32_t ticks = TimeProvider::getInstance()->getCurrentTimeDefaultCUC();
+	return Time::DefaultCUC(static_cast<uint64_t>(ticks));
     }
 
   } // namespace pus
@@ -9,10 +9,168 @@
  */
 
 #include <gnuradio/pus/Time/TimeProvider.h>
+#include <algorithm>
 
 namespace gr {
   namespace pus {
 
+    namespace {
+
+    // Seconds from the Unix epoch to Time::Epoch, leap seconds not accounted
+    int64_t epochUnixSeconds()
+    {
+	return Time::daysFromCivil(Time::Epoch.year, Time::Epoch.month, Time::Epoch.day) * Time::SecondsPerDay;
+    }
+
+    void recordJitter(TimeProvider::TimerStatistics& statistics, int64_t jitterUs)
+    {
+	statistics.ticks++;
+	statistics.lastJitterUs = jitterUs;
+	statistics.totalJitterUs += jitterUs;
+	if (jitterUs > statistics.maxJitterUs)
+		statistics.maxJitterUs = jitterUs;
+    }
+
+    void recordExecution(TimeProvider::TimerStatistics& statistics, int64_t executionUs)
+    {
+	statistics.executions++;
+	statistics.lastExecutionUs = executionUs;
+	statistics.totalExecutionUs += executionUs;
+	if (executionUs > statistics.maxExecutionUs)
+		statistics.maxExecutionUs = executionUs;
+
+	size_t bin = 0;
+	while (bin + 1 < TimeProvider::ExecutionHistogramBins && (executionUs >> (bin + 1)) > 0)
+		bin++;
+	statistics.executionHistogram[bin]++;
+    }
+
+    // Adds the callback statistics of a handler to the totals
+    void mergeStatistics(TimeProvider::TimerStatistics& total, const TimeProvider::TimerStatistics& statistics)
+    {
+	total.ticks += statistics.ticks;
+	total.lastJitterUs = statistics.lastJitterUs;
+	total.totalJitterUs += statistics.totalJitterUs;
+	total.maxJitterUs = std::max(total.maxJitterUs, statistics.maxJitterUs);
+	total.overruns += statistics.overruns;
+	total.executions += statistics.executions;
+	total.lastExecutionUs = statistics.lastExecutionUs;
+	total.totalExecutionUs += statistics.totalExecutionUs;
+	total.maxExecutionUs = std::max(total.maxExecutionUs, statistics.maxExecutionUs);
+	for (size_t i = 0; i < TimeProvider::ExecutionHistogramBins; i++)
+		total.executionHistogram[i] += statistics.executionHistogram[i];
+    }
+
+    } // namespace
+
+    class TimeProvider::HandlerExecutor
+    {
+     public:
+	HandlerExecutor(TimeProvider* provider, std::function<void(TimeProvider*)> callback)
+	  : d_provider(provider), d_callback(callback)
+	{
+		d_thread = gr::thread::thread([this] { run(); });
+	}
+
+	~HandlerExecutor()
+	{
+		stop();
+	}
+
+	/**
+	 * Drops the queued ticks and waits for the running one to finish. The callback is not
+	 * called anymore, even if other references to the executor are still held.
+	 */
+	void stop()
+	{
+		{
+			std::lock_guard<std::mutex> lock(d_mutex);
+			d_finished = true;
+		}
+		d_wakeup.notify_all();
+		d_idle.notify_all();
+
+		std::lock_guard<std::mutex> lock(d_join_mutex);
+		if (d_thread.joinable() && d_thread.get_id() != boost::this_thread::get_id())
+			d_thread.join();
+	}
+
+	/**
+	 * Queues a tick, \p jitterUs after its deadline. Ticks are never dropped, a callback
+	 * slower than its period runs them back to back.
+	 */
+	void post(int64_t jitterUs)
+	{
+		{
+			std::lock_guard<std::mutex> lock(d_mutex);
+			recordJitter(d_statistics, jitterUs);
+			if (d_running || d_pending)
+				d_statistics.overruns++;
+			d_pending++;
+		}
+		d_wakeup.notify_one();
+	}
+
+	/**
+	 * Waits until the queued ticks have run
+	 */
+	void waitIdle()
+	{
+		std::unique_lock<std::mutex> lock(d_mutex);
+		d_idle.wait(lock, [this] { return d_finished || (!d_pending && !d_running); });
+	}
+
+	TimerStatistics statistics()
+	{
+		std::lock_guard<std::mutex> lock(d_mutex);
+		return d_statistics;
+	}
+
+	void resetStatistics()
+	{
+		std::lock_guard<std::mutex> lock(d_mutex);
+		d_statistics = TimerStatistics();
+	}
+
+     private:
+	TimeProvider* d_provider;
+	std::function<void(TimeProvider*)> d_callback;
+	std::mutex d_mutex;
+	// Serializes the joins of stop(), from removeHandler() and from the destructor
+	std::mutex d_join_mutex;
+	std::condition_variable d_wakeup;
+	std::condition_variable d_idle;
+	uint64_t d_pending = 0;
+	bool d_running = false;
+	bool d_finished = false;
+	TimerStatistics d_statistics;
+	gr::thread::thread d_thread;
+
+	void run()
+	{
+		std::unique_lock<std::mutex> lock(d_mutex);
+		while (true) {
+			d_wakeup.wait(lock, [this] { return d_finished || d_pending; });
+			if (d_finished)
+				return;
+
+			d_pending--;
+			d_running = true;
+			lock.unlock();
+
+			Clock::time_point start = Clock::now();
+			d_callback(d_provider);
+			int64_t executionUs = std::chrono::duration_cast<std::chrono::microseconds>(Clock::now() - start).count();
+
+			lock.lock();
+			d_running = false;
+			recordExecution(d_statistics, executionUs);
+			if (!d_pending)
+				d_idle.notify_all();
+		}
+	}
+    };
+
     TimeProvider* TimeProvider::inst_timeprovider = NULL;
     TimeProviderDestroyer TimeProvider::inst_timeproviderdestroyer;
     
@@ -20,6 +178,8 @@ namespace gr {
     	d_mode(CUC_LVL1) 
     {
     	d_resolution = d_newresolution = 1000;
+    	d_epoch_unix_seconds = epochUnixSeconds();
+    	publishCurrentTime();
     	start();
     }
 
@@ -38,7 +198,7 @@ namespace gr {
     }
 
     UTCTimestamp TimeProvider::getCurrentTimeUTC() {
-	time_t timeInSeconds = static_cast<time_t>(time(nullptr));
+	time_t timeInSeconds = static_cast<time_t>(currentUnixSeconds());
 	
 	tm* UTCTimeStruct = std::gmtime(&timeInSeconds);
 
@@ -70,12 +230,42 @@ namespace gr {
 		    Time::Epoch.day = epoch_day;
 		}
 	}
+	d_epoch_unix_seconds = epochUnixSeconds();
+	publishCurrentTime();
         return true;
     }
 
-    uint32_t  TimeProvider::getCurrentTimeDefaultCUC() {
-	UTCTimestamp timeUTC = getCurrentTimeUTC();
-	return Time::DefaultCUC(timeUTC).formatAsBytes();
+    uint32_t TimeProvider::toDefaultCUC(time_t unixSeconds) {
+	return static_cast<uint32_t>(static_cast<int64_t>(unixSeconds) - epochUnixSeconds());
+    }
+
+    void TimeProvider::publishCurrentTime() {
+	int64_t seconds = currentUnixSeconds() - d_epoch_unix_seconds.load(std::memory_order_relaxed);
+	d_cuc.store(static_cast<uint32_t>(seconds), std::memory_order_relaxed);
+    }
+
+    int64_t TimeProvider::currentUnixSeconds() const {
+	if (!d_simulated)
+		return static_cast<int64_t>(time(nullptr));
+
+	int64_t ms = d_simulated_ms.load();
+	return ms >= 0 ? ms / 1000 : -((999 - ms) / 1000);
+    }
+
+    TimeProvider::Clock::time_point TimeProvider::now() const {
+	if (!d_simulated)
+		return Clock::now();
+	return Clock::time_point(std::chrono::duration_cast<Clock::duration>(std::chrono::milliseconds(d_simulated_ms.load())));
+    }
+
+    // Moment of the next second, when the published time changes
+    TimeProvider::Clock::time_point TimeProvider::nextSecond(Clock::time_point now) const {
+	Clock::duration sinceEpoch = d_simulated ? now.time_since_epoch()
+						 : std::chrono::duration_cast<Clock::duration>(std::chrono::system_clock::now().time_since_epoch());
+	Clock::duration intoSecond = sinceEpoch % std::chrono::seconds(1);
+	if (intoSecond < Clock::duration::zero())
+		intoSecond += std::chrono::seconds(1);
+	return now + (std::chrono::seconds(1) - intoSecond);
     }
 
     etl::vector<uint8_t, ECSSMaxTimeField> TimeProvider::getCurrentTimeStamp() {
@@ -84,7 +274,7 @@ namespace gr {
         if(d_p_field)
 		stamp.push_back(Time::buildShortCUCHeader<4,0>()) ;
 
-	uint32_t ticks = TimeProvider::getInstance()->getCurrentTimeDefaultCUC();
+	uint32_t ticks = getCurrentTimeDefaultCUC();
 	stamp.push_back((ticks >> 24) & 0xffU);
 	stamp.push_back((ticks >> 16) & 0xffU);
 	stamp.push_back((ticks >> 8) & 0xffU);
@@ -105,51 +295,217 @@ namespace gr {
     bool TimeProvider::stop()
     {
         // Shut down the thread
-        d_finished = true;
-        d_thread.interrupt();
+        {
+            std::lock_guard<std::mutex> lock(d_mutex);
+            d_finished = true;
+        }
+        d_wakeup.notify_all();
         d_thread.join();
 
         return true;
     }        
 
-    void TimeProvider::run()
+    long TimeProvider::handlerPeriodMs(const TimerHandler& handler) const
     {
-	auto start = std::chrono::high_resolution_clock::now().time_since_epoch();
-	auto waitMilliseconds = 1000 - std::chrono::duration_cast<std::chrono::milliseconds>(start).count() % 1000;
+        long period = handler.periodMs ? handler.periodMs : d_resolution;
+        return period > 0 ? period : 1;
+    }
 
-	boost::this_thread::sleep(
-            		boost::posix_time::milliseconds(static_cast<long>(waitMilliseconds)));
+    TimeProvider::Clock::time_point TimeProvider::firstDeadline(const TimerHandler& handler, Clock::time_point now) const
+    {
+        // Handlers with the same period and phase tick together, whenever they were added
+        Clock::time_point deadline = d_origin + std::chrono::milliseconds(handler.phaseMs);
+        if (now <= deadline)
+            return deadline;
 
-        start = std::chrono::high_resolution_clock::now().time_since_epoch();	
+        auto period = std::chrono::milliseconds(handlerPeriodMs(handler));
+        auto periods = (now - deadline + period - Clock::duration(1)) / period;
+        return deadline + periods * period;
+    }
+
+    void TimeProvider::reschedule()
+    {
+        d_rescheduled = true;
+        d_wakeup.notify_all();
+    }
+
+    void TimeProvider::restartDeadlines()
+    {
+        // Handlers tick on whole seconds, as the published time does
+        d_origin = nextSecond(now());
+        for (auto& entry : handlers)
+            entry.second.deadline = firstDeadline(entry.second, d_origin);
+    }
+
+    void TimeProvider::dispatchTicks(Clock::time_point now, std::vector<std::shared_ptr<HandlerExecutor>>* ticked)
+    {
+        if (d_newresolution != d_resolution)
+            d_resolution = d_newresolution;
+
+        // The ticks are handed to the executors of the handlers, so the timer thread never
+        // waits for a callback. Missed deadlines are all posted, so that no tick is lost.
+        for (auto& entry : handlers) {
+            TimerHandler& handler = entry.second;
+            if (ticked && handler.deadline <= now)
+                ticked->push_back(handler.executor);
+            while (handler.deadline <= now) {
+                handler.executor->post(std::chrono::duration_cast<std::chrono::microseconds>(now - handler.deadline).count());
+                handler.deadline += std::chrono::milliseconds(handlerPeriodMs(handler));
+            }
+        }
+    }
+
+    void TimeProvider::run()
+    {
+        std::unique_lock<std::mutex> lock(d_mutex);
+
+        restartDeadlines();
 
         while (!d_finished) {
-            auto finish = std::chrono::high_resolution_clock::now().time_since_epoch();
-             auto diff = std::chrono::duration_cast<std::chrono::milliseconds>(finish - start).count();
-
-            if( diff >= d_resolution)
-            {
-            	start += std::chrono::milliseconds(d_resolution);
-            
-            	for (auto const& entry : handlers) {
-                	entry.second(this);
-            	}
-            	if (d_newresolution != d_resolution)
-            		d_resolution = d_newresolution;
+            d_rescheduled = false;
+            if (d_simulated) {
+                // The simulated clock is driven by advanceTime()
+                d_wakeup.wait(lock, [this] { return d_finished || d_rescheduled; });
+                continue;
+            }
+
+            // Sleep until the earliest deadline, or until the published time changes
+            Clock::time_point wakeup = nextSecond(Clock::now());
+            for (auto const& entry : handlers) {
+                if (entry.second.deadline < wakeup)
+                    wakeup = entry.second.deadline;
+            }
+
+            d_wakeup.wait_until(lock, wakeup, [this] { return d_finished || d_rescheduled; });
+            if (d_finished)
+                break;
+            if (d_simulated)
+                continue;
+
+            d_statistics.wakeups++;
+            publishCurrentTime();
 
+            dispatchTicks(Clock::now());
+        }
+    }
+
+    void TimeProvider::setSimulatedTime(int64_t unixMs)
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        d_simulated_ms = unixMs;
+        d_simulated = true;
+        restartDeadlines();
+        publishCurrentTime();
+        reschedule();
+    }
+
+    void TimeProvider::setRealTime()
+    {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        if (!d_simulated)
+            return;
+        d_simulated = false;
+        restartDeadlines();
+        publishCurrentTime();
+        reschedule();
+    }
+
+    bool TimeProvider::advanceTime(int64_t milliseconds)
+    {
+        std::unique_lock<std::mutex> lock(d_mutex);
+        if (!d_simulated || milliseconds < 0)
+            return false;
+
+        std::vector<std::shared_ptr<HandlerExecutor>> ticked;
+        int64_t target = d_simulated_ms + milliseconds;
+        while (d_simulated) {
+            // Step to the earliest deadline, or to the target time
+            Clock::time_point step = Clock::time_point(std::chrono::duration_cast<Clock::duration>(std::chrono::milliseconds(target)));
+            for (auto const& entry : handlers) {
+                if (entry.second.deadline < step)
+                    step = entry.second.deadline;
             }
-            boost::this_thread::sleep(
-            		boost::posix_time::milliseconds(static_cast<long>(1)));
+            int64_t stepMs = std::chrono::duration_cast<std::chrono::milliseconds>(step.time_since_epoch()).count();
+            d_simulated_ms = std::max(stepMs, d_simulated_ms.load());
+            d_statistics.wakeups++;
+            publishCurrentTime();
+
+            dispatchTicks(now(), &ticked);
+
+            // The callbacks may add or remove handlers, so they run out of the lock
+            lock.unlock();
+            for (auto& executor : ticked)
+                executor->waitIdle();
+            ticked.clear();
+            lock.lock();
+
+            if (d_simulated_ms >= target)
+                break;
         }
+        return true;
     }
 
-    //add handler to list --> works fine
     void TimeProvider::addHandler(uint16_t serviceType, std::function<void(TimeProvider*)> handler) {
-        handlers[serviceType] = handler;
+        addHandler(serviceType, handler, 0);
+    }
+
+    void TimeProvider::addHandler(uint16_t serviceType, std::function<void(TimeProvider*)> handler, long periodMs,
+    				   long phaseMs) {
+        // A replaced executor is stopped, and its thread joined, out of the lock
+        std::shared_ptr<HandlerExecutor> previous;
+        {
+            std::lock_guard<std::mutex> lock(d_mutex);
+            TimerHandler& entry = handlers[serviceType];
+            previous = entry.executor;
+            entry.executor = std::make_shared<HandlerExecutor>(this, handler);
+            entry.periodMs = periodMs;
+            entry.phaseMs = phaseMs;
+            entry.deadline = firstDeadline(entry, now());
+            reschedule();
+        }
+        if (previous)
+            previous->stop();
     }
 
     void TimeProvider::removeHandler(uint16_t serviceType) {
-        handlers.erase(serviceType);
+        // Once this returns the callback is not running, and will not be called again
+        std::shared_ptr<HandlerExecutor> executor;
+        {
+            std::lock_guard<std::mutex> lock(d_mutex);
+            auto entry = handlers.find(serviceType);
+            if (entry == handlers.end())
+                return;
+            executor = entry->second.executor;
+            handlers.erase(entry);
+        }
+        // advanceTime() may still hold the executor, so it is stopped here rather than when the
+        // last reference goes away
+        executor->stop();
     }  
+
+    TimeProvider::TimerStatistics TimeProvider::getTimerStatistics() {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        TimerStatistics total;
+        total.wakeups = d_statistics.wakeups;
+        for (auto& entry : handlers)
+            mergeStatistics(total, entry.second.executor->statistics());
+        return total;
+    }
+
+    TimeProvider::TimerStatistics TimeProvider::getTimerStatistics(uint16_t serviceType) {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        auto entry = handlers.find(serviceType);
+        if (entry == handlers.end())
+            return TimerStatistics();
+        return entry->second.executor->statistics();
+    }
+
+    void TimeProvider::resetTimerStatistics() {
+        std::lock_guard<std::mutex> lock(d_mutex);
+        d_statistics = TimerStatistics();
+        for (auto& entry : handlers)
+            entry.second.executor->resetStatistics();
+    }
     
     uint16_t TimeProvider::getTimeSize()
     {
@@ -15,20 +15,21 @@ namespace gr {
   namespace pus {
 
     TimeBasedSchedulingService::sptr
-    TimeBasedSchedulingService::make()
+    TimeBasedSchedulingService::make(uint32_t capacity, const std::string& journal_file)
     {
       return gnuradio::make_block_sptr<TimeBasedSchedulingService_impl>(
-        );
+        capacity, journal_file);
     }
 
 
     /*
      * The private constructor
      */
-    TimeBasedSchedulingService_impl::TimeBasedSchedulingService_impl()
+    TimeBasedSchedulingService_impl::TimeBasedSchedulingService_impl(uint32_t capacity, const std::string& journal_file)
       : gr::block("TimeBasedSchedulingService",
               gr::io_signature::make(0, 0, 0),
-              gr::io_signature::make(0, 0, 0))
+              gr::io_signature::make(0, 0, 0)),
+        scheduledActivities(capacity)
     {
         d_message_parser = MessageParser::getInstance();
         d_error_handler = ErrorHandler::getInstance();
@@ -37,7 +38,7 @@ namespace gr {
         	counters[i] = 0;
         message_port_register_in(PMT_IN);
         set_msg_handler(PMT_IN,
-                    [this](pmt::pmt_t msg) { this->handle_msg(msg); });
+                    [this](pmt::pmt_t msg) { PDUBatch::forEach(msg, [this](pmt::pmt_t pdu) { this->handle_msg(pdu); }); });
         message_port_register_out(PMT_OUT);
         message_port_register_out(PMT_VER);
         message_port_register_out(PMT_REL);
@@ -49,11 +50,15 @@ namespace gr {
         	
 	AllMessageTypes::MessagesOfService[ServiceType] = STMessages;
 
+	if (!journal_file.empty() && !scheduleJournal.open(journal_file, scheduledActivities))
+		GR_LOG_WARN(d_logger, "Error: the schedule journal " + journal_file + " cannot be opened");
+	if (scheduleJournal.dropped() > 0)
+		GR_LOG_WARN(d_logger, "Error: " + std::to_string(scheduleJournal.dropped()) +
+				      " activities of the schedule journal do not fit in the schedule");
 
     	d_time_provider = TimeProvider::getInstance();
     
-    	d_time_provider->addHandler(
-            serviceType,
+    	addTimerHandler(
             std::bind(
                 &TimeBasedSchedulingService_impl::timerTick,
                 this,
@@ -67,13 +72,25 @@ namespace gr {
      */
     TimeBasedSchedulingService_impl::~TimeBasedSchedulingService_impl()
     {
-            d_time_provider->removeHandler(serviceType);  
+            removeTimerHandler();  
+            scheduleJournal.close();
+    }
+
+    bool TimeBasedSchedulingService_impl::stop()
+    {
+        scheduleJournal.flush();
+        return Service::stop();
     }
 
     void TimeBasedSchedulingService_impl::timerTick(TimeProvider *p) {
         // Gets called when new data arrives 
-       executeScheduledActivity(Time::DefaultCUC(d_time_provider->getCurrentTimeUTC()));
-        
+       executeScheduledActivity(Time::DefaultCUC(static_cast<uint64_t>(p->getCurrentTimeDefaultCUC())));
+
+       // The changes of the last tick reach the disk together
+       if (!scheduleJournal.flush())
+            GR_LOG_WARN(d_logger, "Error: the schedule journal cannot be written");
+       else if (scheduleJournal.compactionDue() && !scheduleJournal.compact(scheduledActivities))
+            GR_LOG_WARN(d_logger, "Error: the schedule snapshot cannot be written");
     }
     
     void TimeBasedSchedulingService_impl::handle_msg(pmt::pmt_t pdu)
@@ -89,10 +106,10 @@ namespace gr {
 
         // extract data
         if (pmt::is_u8vector(v_data)) {
-                std::vector<uint8_t> inData = pmt::u8vector_elements(v_data);
+                size_t size = 0;
+                const uint8_t* data = pmt::u8vector_elements(v_data, size);
 
-                MessageArray in_data(inData.data(), inData.data() + inData.size());                
-                Message message  = d_message_parser->ParseMessageCommand(in_data);
+                Message message  = d_message_parser->ParseMessageCommand(meta, data, size);
                 if(serviceType == message.getMessageServiceType()){
                     switch (message.getMessageType()) {
                         case EnableTimeBasedScheduleExecutionFunction:    
@@ -181,22 +198,20 @@ namespace gr {
      }
    
     Time::DefaultCUC TimeBasedSchedulingService_impl::executeScheduledActivity(Time::DefaultCUC currentTime) {
-	if (currentTime >= scheduledActivities.front().requestReleaseTime && !scheduledActivities.empty()) {
-		if (scheduledActivities.front().requestID.applicationID == ApplicationId) {
+	// All the activities due are released in the same tick, in release time order
+	size_t released = scheduledActivities.releaseDue(currentTime, [this](ScheduledActivity& activity) {
+		if (activity.requestID.applicationID == ApplicationId) {
 		      if(executionFunctionStatus){
               		 message_port_pub(PMT_REL, pmt::cons(pmt::PMT_NIL, 
-                			pmt::init_u8vector(scheduledActivities.front().request.getMessageData().size(),
-                			scheduledActivities.front().request.getMessageRawData())));
+                			pmt::init_u8vector(activity.request.getMessageData().size(),
+                			activity.request.getMessageRawData())));
                       }
 		}
-		scheduledActivities.pop_front();
-	}
+	});
+	if (released > 0)
+		scheduleJournal.recordRelease(currentTime);
 
-	if (!scheduledActivities.empty()) {
-		return scheduledActivities.front().requestReleaseTime;
-	} else {
-		return Time::DefaultCUC::max();
-	}
+	return scheduledActivities.nextReleaseTime();
     }
 
     void TimeBasedSchedulingService_impl::enableScheduleExecution(Message& request) {
@@ -255,6 +270,7 @@ namespace gr {
 	
 	executionFunctionStatus = false;
 	scheduledActivities.clear();
+	scheduleJournal.recordReset();
 	// todo: Add resetting for sub-schedules and groups, if defined
 
 	reportSuccessStartExecutionVerification(request);
@@ -333,10 +349,10 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 			newActivity.requestID.applicationID = receivedTCPacket.getMessageApplicationId();
 			newActivity.requestID.sequenceCount = receivedTCPacket.getMessagePacketSequenceCount();
 
-			scheduledActivities.push_back(newActivity);
+			scheduleJournal.recordInsert(newActivity);
+			scheduledActivities.insert(std::move(newActivity));
 		}
 	}
-	sortActivitiesReleaseTime(scheduledActivities);
 	notifyNewActivityAddition();
 
 	if(not bFaultStartExecution)
@@ -362,22 +378,17 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 	
 	Time::DefaultCUC current_time = TimeGetter::getCurrentTimeDefaultCUC();
 
-	const auto releaseTimes =
-	    etl::minmax_element(scheduledActivities.begin(), scheduledActivities.end(),
-	                        [](ScheduledActivity const& leftSide, ScheduledActivity const& rightSide) {
-		                        return leftSide.requestReleaseTime < rightSide.requestReleaseTime;
-	                        });
 	// todo: Define what the time format is going to be
 	int32_t relativeTime = request.readSint32();
 
 	Time::RelativeTime relativeOffset = relativeTime;
-	if ((releaseTimes.first->requestReleaseTime + std::chrono::seconds(relativeOffset)) < (current_time + ECSSTimeMarginForActivation)) {
+	if (!scheduledActivities.empty() &&
+	    (scheduledActivities.nextReleaseTime() + std::chrono::seconds(relativeOffset)) < (current_time + ECSSTimeMarginForActivation)) {
 		reportExecutionStartError(request, ErrorHandler::SubServiceExecutionStartError);
 		return;
 	}
-	for (auto& activity: scheduledActivities) {
-		activity.requestReleaseTime += std::chrono::seconds(relativeOffset);
-	}
+	scheduledActivities.shiftAll(std::chrono::seconds(relativeOffset));
+	scheduleJournal.recordShiftAll(std::chrono::seconds(relativeOffset));
 	reportSuccessStartExecutionVerification(request);
 			
 	reportSuccessCompletionExecutionVerification(request);  
@@ -420,25 +431,22 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 		receivedRequestID.sourceID = request.readUint16();
 		receivedRequestID.applicationID = request.readUint16();
 		receivedRequestID.sequenceCount = request.readUint16();
-		auto requestIDMatch = etl::find_if_not(scheduledActivities.begin(), scheduledActivities.end(),
-		                                       [&receivedRequestID](ScheduledActivity const& currentElement) {
-			                                       return receivedRequestID != currentElement.requestID;
-		                                       });
+		auto requestIDMatch = scheduledActivities.find(receivedRequestID);
 
 		if (requestIDMatch != scheduledActivities.end()) {
-			if ((requestIDMatch->requestReleaseTime + relativeOffset) <
+			if ((requestIDMatch->second.requestReleaseTime + relativeOffset) <
 			    (current_time + ECSSTimeMarginForActivation)) {
 				reportExecutionStartError(request, ErrorHandler::InstructionExecutionStartError);
 				bFaultStartExecution = true;
 			} else {
-				requestIDMatch->requestReleaseTime += relativeOffset;
+				scheduledActivities.shift(requestIDMatch, relativeOffset);
+				scheduleJournal.recordShift(receivedRequestID, relativeOffset);
 			}
 		} else {
 			reportExecutionStartError(request, ErrorHandler::InstructionExecutionStartError);
 			bFaultStartExecution = true;
 		}
 	}
-	sortActivitiesReleaseTime(scheduledActivities);
 	
 	if(not bFaultStartExecution)
 		reportSuccessStartExecutionVerification(request);
@@ -479,13 +487,11 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 		receivedRequestID.sequenceCount = request.readUint16();
 
 
-		const auto requestIDMatch = etl::find_if_not(scheduledActivities.begin(), scheduledActivities.end(),
-		                                             [&receivedRequestID](ScheduledActivity const& currentElement) {
-			                                             return receivedRequestID != currentElement.requestID;
-		                                             });
+		const auto requestIDMatch = scheduledActivities.find(receivedRequestID);
 
 		if (requestIDMatch != scheduledActivities.end()) {
 			scheduledActivities.erase(requestIDMatch);
+			scheduleJournal.recordDelete(receivedRequestID);
 		} else {
 			reportExecutionStartError(request, ErrorHandler::InstructionExecutionStartError);
 			bFaultStartExecution = true;
@@ -511,7 +517,12 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 	} 
 	reportSuccessAcceptanceVerification(request);
 
-	timeBasedScheduleDetailReport(scheduledActivities);
+	ActivityList allActivities;
+	allActivities.reserve(scheduledActivities.size());
+	for (auto& activity: scheduledActivities)
+		allActivities.push_back(&activity.second);
+
+	timeBasedScheduleDetailReport(allActivities);
 
 	reportSuccessStartExecutionVerification(request);
 
@@ -519,7 +530,7 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 	
     }
 
-    void TimeBasedSchedulingService_impl::timeBasedScheduleDetailReport(etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities>& listOfActivities) {
+    void TimeBasedSchedulingService_impl::timeBasedScheduleDetailReport(const ActivityList& listOfActivities) {
 	// todo: append sub-schedule and group ID if they are defined
         Message report = d_message_parser->CreateEmptyMessageReport(0, serviceType, 
 			TimeBasedSchedulingService::MessageType::TimeBasedScheduleReportById, 
@@ -527,11 +538,12 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 
 	report.appendUint16(static_cast<uint16_t>(listOfActivities.size()));
 
-	for (auto& activity: listOfActivities) {
+	for (auto activity: listOfActivities) {
 		// todo: append sub-schedule and group ID if they are defined
 
-		report.appendData(activity.requestReleaseTime);
-		report.appendUint8Array(activity.request.getMessageData());
+		Time::DefaultCUC releaseTime = activity->requestReleaseTime;
+		report.appendData(releaseTime);
+		report.appendUint8Array(activity->request.getMessageData());
 	}
 	d_message_parser->closeMessage(report);
 			
@@ -566,7 +578,7 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 
 	reportSuccessAcceptanceVerification(request);	
 			
-	etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities> matchedActivities;
+	ActivityList matchedActivities;
 
 	bool bFaultStartExecution = false;
 	while (iterationCount-- != 0) {
@@ -575,13 +587,10 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 		receivedRequestID.applicationID = request.readUint16();
 		receivedRequestID.sequenceCount = request.readUint16();
 		 
-		const auto requestIDMatch = etl::find_if_not(scheduledActivities.begin(), scheduledActivities.end(),
-		                                             [&receivedRequestID](ScheduledActivity const& currentElement) {
-			                                             return receivedRequestID != currentElement.requestID;
-		                                             });
+		const auto requestIDMatch = scheduledActivities.find(receivedRequestID);
 
 		if (requestIDMatch != scheduledActivities.end()) {
-			matchedActivities.push_back(*requestIDMatch);
+			matchedActivities.push_back(&requestIDMatch->second);
 
 		} else {
 			reportExecutionStartError(request, ErrorHandler::InstructionExecutionStartError);
@@ -612,7 +621,12 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 	} 
 	reportSuccessAcceptanceVerification(request);
 
-	timeBasedScheduleSummaryReport(scheduledActivities);
+	ActivityList allActivities;
+	allActivities.reserve(scheduledActivities.size());
+	for (auto& activity: scheduledActivities)
+		allActivities.push_back(&activity.second);
+
+	timeBasedScheduleSummaryReport(allActivities);
 
 	reportSuccessStartExecutionVerification(request);
 
@@ -626,7 +640,7 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 		return;
 	}
 	
-	etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities> matchedActivities;
+	ActivityList matchedActivities;
  	
  	uint16_t tcSize = request.getMessageSize() - (CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize + ECSSSecondaryTCCRCSize);
  	
@@ -653,13 +667,10 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 		receivedRequestID.applicationID = request.readUint16();
 		receivedRequestID.sequenceCount = request.readUint16();
 
-		auto requestIDMatch = etl::find_if_not(scheduledActivities.begin(), scheduledActivities.end(),
-		                                       [&receivedRequestID](ScheduledActivity const& currentElement) {
-			                                       return receivedRequestID != currentElement.requestID;
-		                                       });
+		auto requestIDMatch = scheduledActivities.find(receivedRequestID);
 
 		if (requestIDMatch != scheduledActivities.end()) {
-			matchedActivities.push_back(*requestIDMatch);
+			matchedActivities.push_back(&requestIDMatch->second);
 		} else {
 			reportExecutionStartError(request, ErrorHandler::InstructionExecutionStartError);
 			bFaultStartExecution = true;	
@@ -675,18 +686,19 @@ std::cout << "Sch time " << time << ", now: " << TimeProvider::getInstance()->ge
 	reportSuccessCompletionExecutionVerification(request);	
     }
 
-    void TimeBasedSchedulingService_impl::timeBasedScheduleSummaryReport(etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities>& listOfActivities) {
+    void TimeBasedSchedulingService_impl::timeBasedScheduleSummaryReport(const ActivityList& listOfActivities) {
         Message report = d_message_parser->CreateEmptyMessageReport(0, serviceType, 
 			TimeBasedSchedulingService::MessageType::TimeBasedScheduledSummaryReport, 
 			counters[TimeBasedSchedulingService::MessageType::TimeBasedScheduledSummaryReport], 0);
 
 	report.appendUint16(static_cast<uint16_t>(listOfActivities.size()));
-	for (auto& match: listOfActivities) {
+	for (auto match: listOfActivities) {
 		// todo: append sub-schedule and group ID if they are defined
-		report.appendData(match.requestReleaseTime);
-		report.appendUint16(match.requestID.sourceID);
-		report.appendUint16(match.requestID.applicationID);
-		report.appendUint16(match.requestID.sequenceCount);
+		Time::DefaultCUC releaseTime = match->requestReleaseTime;
+		report.appendData(releaseTime);
+		report.appendUint16(match->requestID.sourceID);
+		report.appendUint16(match->requestID.applicationID);
+		report.appendUint16(match->requestID.sequenceCount);
 	}
 	d_message_parser->closeMessage(report);
 			
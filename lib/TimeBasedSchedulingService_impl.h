@@ -16,8 +16,10 @@
 #include <gnuradio/pus/Helpers/MessageParser.h>
 #include <gnuradio/pus/Helpers/ErrorHandler.h>
 #include <gnuradio/pus/Time/TimeProvider.h>
-#include "etl/list.h"
-#include "etl/vector.h"
+#include <gnuradio/pus/Helpers/TimeSchedule.h>
+#include <gnuradio/pus/Helpers/TimeScheduleJournal.h>
+#include <algorithm>
+#include <vector>
 /**
  * @def GROUPS_ENABLED
  * @brief Indicates whether scheduling groups are enabled
@@ -56,45 +58,26 @@ namespace gr {
 	 */
 	bool executionFunctionStatus = false;
 
-	/**
-	 * @brief Request identifier of the received packet
-	 *
-	 * @details The request identifier consists of the application process ID, the packet
-	 * sequence count and the source ID, all defined in the ECSS standard.
-	 */
-	struct RequestID {
-		uint16_t applicationID = 0; ///< Application process ID
-		uint16_t sequenceCount = 0; ///< Packet sequence count
-		uint16_t sourceID = 0;       ///< Packet source ID
-
-		bool operator!=(const RequestID& rightSide) const {
-			return (sequenceCount != rightSide.sequenceCount) or (applicationID != rightSide.applicationID) or
-			       (sourceID != rightSide.sourceID);
-		}
-	};
+	typedef TimeSchedule::RequestID RequestID;
+	typedef TimeSchedule::ScheduledActivity ScheduledActivity;
+	// Activities of a report, ordered by their release time
+	typedef std::vector<const ScheduledActivity*> ActivityList;
 
 	/**
-	 * @brief Instances of activities to run in the schedule
-	 *
-	 * @details All scheduled activities must contain the request they exist for, their release
-	 * time and the corresponding request identifier.
+	 * @brief Hold the scheduled activities
 	 *
-	 * @todo If we decide to use sub-schedules, the ID of that has to be defined
-	 * @todo If groups are used, then the group ID has to be defined here
+	 * @details The scheduled activities are ordered by their release time, as the standard
+	 * requests.
 	 */
-	struct ScheduledActivity {
-		Message request;                         ///< Hold the received command request
-		RequestID requestID;                     ///< Request ID, characteristic of the definition
-		Time::DefaultCUC requestReleaseTime{0}; ///< Keep the command release time
-	};
+	TimeSchedule scheduledActivities;
 
 	/**
-	 * @brief Hold the scheduled activities
+	 * @brief Journal of the changes of the schedule, written on each timer tick
 	 *
-	 * @details The scheduled activities in this list are ordered by their release time, as the
-	 * standard requests.
+	 * @details Not opened when no journal file is given, then the schedule is lost on a
+	 * restart.
 	 */
-	etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities> scheduledActivities;
+	TimeScheduleJournal scheduleJournal;
 
 	/**
 	 * @brief Sort the activities by their release time
@@ -103,10 +86,10 @@ namespace gr {
 	 * response. Also it is better to have the activities sorted.
 	 */
 	inline static void
-	sortActivitiesReleaseTime(etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities>& schedActivities) {
-		schedActivities.sort([](ScheduledActivity const& leftSide, ScheduledActivity const& rightSide) {
-			// cppcheck-suppress
-			return leftSide.requestReleaseTime < rightSide.requestReleaseTime;
+	sortActivitiesReleaseTime(ActivityList& schedActivities) {
+		std::stable_sort(schedActivities.begin(), schedActivities.end(),
+				 [](const ScheduledActivity* leftSide, const ScheduledActivity* rightSide) {
+			return leftSide->requestReleaseTime < rightSide->requestReleaseTime;
 		});
 	}
 
@@ -117,14 +100,17 @@ namespace gr {
 	void notifyNewActivityAddition() {};
 
      public:
-      TimeBasedSchedulingService_impl();
+      TimeBasedSchedulingService_impl(uint32_t capacity, const std::string& journal_file);
       ~TimeBasedSchedulingService_impl();
 
+      bool stop() override;
+
 
       void timerTick(TimeProvider *p) ;
 
 	/**
-	 * This function executes the next activity and removes it from the list.
+	 * This function executes all the activities due at currentTime, in release time order, and
+	 * removes them from the schedule.
 	 * @return the requestReleaseTime of next activity to be executed after this time
 	 */
 	Time::DefaultCUC executeScheduledActivity(Time::DefaultCUC currentTime);
@@ -211,7 +197,7 @@ namespace gr {
 	 * on the provided list. Generates a TM[11,10] response.
 	 * @param listOfActivities Provide the list of activities that need to be reported on
 	 */
-	void timeBasedScheduleDetailReport(etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities>& listOfActivities);
+	void timeBasedScheduleDetailReport(const ActivityList& listOfActivities);
 
 	/**
 	 * @brief TC[11,9] detail-report activities identified by request identifier
@@ -247,7 +233,7 @@ namespace gr {
 	 * on the provided list. Generates a TM[11,13] response.
 	 * @param listOfActivities Provide the list of activities that need to be reported on
 	 */
-	void timeBasedScheduleSummaryReport(etl::list<ScheduledActivity, ECSSMaxNumberOfTimeSchedActivities>& listOfActivities);
+	void timeBasedScheduleSummaryReport(const ActivityList& listOfActivities);
 
 	/**
 	 * @brief TC[11,5] delete time-based scheduled activities identified by a request identifier
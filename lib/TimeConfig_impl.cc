@@ -10,6 +10,7 @@
 
 #include <gnuradio/io_signature.h>
 #include "TimeConfig_impl.h"
+#include <gnuradio/pus/Definitions/pmt_constants.h>
 
 namespace gr {
   namespace pus {
@@ -35,6 +36,10 @@ namespace gr {
     	if(!d_time_provider->config(resolution, mode, p_field, epoch_year, --epoch_month, epoch_day)){
     	   GR_LOG_ERROR(this->d_logger, "Invalid Epoch date, usign default one");
     	}
+
+        message_port_register_in(PMT_CLOCK);
+        set_msg_handler(PMT_CLOCK,
+                    [this](pmt::pmt_t msg) { this->handle_clock_msg(msg); });
     	//d_time_provider->start();
     }
 
@@ -69,5 +74,54 @@ namespace gr {
     {
     	return d_time_provider->getCurrentTimeDefaultCUC();
     }   
+
+    void TimeConfig_impl::setSimulatedTime(int64_t unixMs)
+    {
+    	d_time_provider->setSimulatedTime(unixMs);
+    }
+
+    bool TimeConfig_impl::advanceTime(int64_t milliseconds)
+    {
+    	return d_time_provider->advanceTime(milliseconds);
+    }
+
+    void TimeConfig_impl::setRealTime()
+    {
+    	d_time_provider->setRealTime();
+    }
+
+    bool TimeConfig_impl::isSimulatedTime()
+    {
+    	return d_time_provider->isSimulatedTime();
+    }
+
+    void TimeConfig_impl::handle_clock_msg(pmt::pmt_t msg)
+    {
+    	if(!pmt::is_pair(msg) || !pmt::is_symbol(pmt::car(msg))){
+            GR_LOG_WARN(d_logger, "Error: the clock command is not a (command . value) pair");
+            return;
+    	}
+
+    	pmt::pmt_t command = pmt::car(msg);
+    	if(pmt::eq(command, PMT_REAL_TIME)){
+    	    setRealTime();
+    	    return;
+    	}
+
+    	if(!pmt::is_integer(pmt::cdr(msg))){
+            GR_LOG_WARN(d_logger, "Error: the clock command value is not an integer");
+            return;
+    	}
+
+    	int64_t value = pmt::to_long(pmt::cdr(msg));
+    	if(pmt::eq(command, PMT_TIME)){
+    	    setSimulatedTime(value);
+    	}else if(pmt::eq(command, PMT_ADVANCE)){
+    	    if(!advanceTime(value))
+                GR_LOG_WARN(d_logger, "Error: the time can only be advanced with simulated time");
+    	}else{
+            GR_LOG_WARN(d_logger, "Error: unknown clock command");
+    	}
+    }
   } /* namespace pus */
 } /* namespace gr */
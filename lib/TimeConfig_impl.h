@@ -33,6 +33,16 @@ namespace gr {
       UTCTimestamp getCurrentTimeUTC() override; 
 
       uint32_t  getCurrentTimeDefaultCUC() override;
+
+      void setSimulatedTime(int64_t unixMs) override;
+
+      bool advanceTime(int64_t milliseconds) override;
+
+      void setRealTime() override;
+
+      bool isSimulatedTime() override;
+
+      void handle_clock_msg(pmt::pmt_t msg);
     };
 
   } // namespace pus
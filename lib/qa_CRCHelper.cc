@@ -0,0 +1,128 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include <gnuradio/pus/Helpers/CRCHelper.h>
+#include <boost/test/unit_test.hpp>
+#include <chrono>
+#include <iostream>
+#include <random>
+#include <vector>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // Bit-at-a-time reference implementation, as originally shipped in CRCHelper
+    uint16_t referenceCRC(const uint8_t* data, size_t length, uint16_t shiftReg = 0xFFFFU)
+    {
+	for (size_t i = 0; i < length; i++) {
+		shiftReg ^= (data[i] << 8U);
+		for (int j = 0; j < 8; j++) {
+			if ((shiftReg & 0x8000U) != 0U) {
+				shiftReg = ((shiftReg << 1U) ^ 0x1021U);
+			} else {
+				shiftReg <<= 1U;
+			}
+		}
+	}
+	return shiftReg;
+    }
+
+    std::vector<uint8_t> randomBytes(size_t size)
+    {
+	std::mt19937 generator(0x5053);
+	std::uniform_int_distribution<int> distribution(0, 255);
+	std::vector<uint8_t> data(size);
+	for (auto& b : data)
+		b = static_cast<uint8_t>(distribution(generator));
+	return data;
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_CRCHelper_check_value)
+    {
+	const uint8_t check[] = { '1', '2', '3', '4', '5', '6', '7', '8', '9' };
+
+	BOOST_CHECK_EQUAL(CRCHelper::calculateCRC(check, sizeof(check)), 0x29B1);
+	BOOST_CHECK_EQUAL(CRCHelper::calculateCRC(check, 0), CRCHelper::CRCInitialValue);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_CRCHelper_bit_identical)
+    {
+	std::vector<uint8_t> data = randomBytes(ECSSMaxMessageSize + 16);
+
+	for (size_t offset = 0; offset < 8; offset++) {
+		for (size_t length = 0; length + offset <= data.size(); length += 7) {
+			BOOST_REQUIRE_EQUAL(CRCHelper::calculateCRC(data.data() + offset, length),
+					    referenceCRC(data.data() + offset, length));
+		}
+	}
+
+	MessageArray message(data.begin(), data.begin() + ECSSMaxMessageSize);
+	BOOST_CHECK_EQUAL(CRCHelper::calculateMessageCRC(message),
+			  referenceCRC(message.data(), message.size()));
+	BOOST_CHECK_EQUAL(CRCHelper::calculateMessageCRC(message, 0x1234U),
+			  referenceCRC(message.data(), message.size(), 0x1234U));
+    }
+
+    BOOST_AUTO_TEST_CASE(test_CRCHelper_seed_chaining)
+    {
+	std::vector<uint8_t> data = randomBytes(300);
+
+	for (size_t split = 0; split <= data.size(); split += 13) {
+		uint16_t shiftReg = CRCHelper::calculateCRC(data.data(), split);
+		shiftReg = CRCHelper::calculateCRC(data.data() + split, data.size() - split, shiftReg);
+		BOOST_REQUIRE_EQUAL(shiftReg, referenceCRC(data.data(), data.size()));
+	}
+    }
+
+    BOOST_AUTO_TEST_CASE(test_CRCHelper_validate)
+    {
+	std::vector<uint8_t> data = randomBytes(64);
+	uint16_t crcField = CRCHelper::calculateCRC(data.data(), data.size());
+	data.push_back(static_cast<uint8_t>(crcField >> 8U));
+	data.push_back(static_cast<uint8_t>(crcField & 0xFF));
+
+	BOOST_CHECK_EQUAL(CRCHelper::validateCRC(data.data(), data.size()), 0);
+
+	data[10] ^= 0x01;
+	BOOST_CHECK_NE(CRCHelper::validateCRC(data.data(), data.size()), 0);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_CRCHelper_throughput)
+    {
+	// 1 kB TM stream: compare the table engine against the bit-at-a-time reference
+	const size_t iterations = 20000;
+	std::vector<uint8_t> data = randomBytes(ECSSMaxMessageSize);
+	volatile uint16_t sink = 0;
+
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++)
+		sink = sink ^ referenceCRC(data.data(), data.size());
+	auto reference = std::chrono::steady_clock::now() - start;
+
+	start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++)
+		sink = sink ^ CRCHelper::calculateCRC(data.data(), data.size());
+	auto table = std::chrono::steady_clock::now() - start;
+
+	double megabytes = static_cast<double>(iterations * data.size()) / 1e6;
+	double referenceSeconds = std::chrono::duration<double>(reference).count();
+	double tableSeconds = std::chrono::duration<double>(table).count();
+
+	std::cout << "CRC16 bitwise: " << megabytes / referenceSeconds << " MB/s, "
+		  << "slice-by-8: " << megabytes / tableSeconds << " MB/s, "
+		  << "speedup: " << referenceSeconds / tableSeconds << "x" << std::endl;
+
+	BOOST_CHECK(tableSeconds < referenceSeconds);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -0,0 +1,272 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include <gnuradio/pus/Helpers/Message.h>
+#include <boost/test/unit_test.hpp>
+#include <chrono>
+#include <deque>
+#include <iostream>
+#include <string>
+#include <utility>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // TC[17,1] without CRC
+    const uint8_t testTC[] = { 0x18, 0x03, 0xc0, 0x00, 0x00, 0x06, 0x20, 0x11, 0x01, 0x00, 0x00, 0x00, 0x00 };
+
+    MessageArray makeArray(size_t size)
+    {
+	MessageArray data;
+	for (size_t i = 0; i < size; i++)
+		data.push_back(static_cast<uint8_t>(i * 7));
+	return data;
+    }
+
+    // Per-byte copies, as the bulk read and append paths used to do them
+    void legacyAppend(Message& message, const uint8_t* data, size_t size)
+    {
+	for (size_t i = 0; i < size; i++)
+		message.appendUint8(data[i]);
+    }
+
+    void legacyRead(Message& message, uint8_t* data, size_t size)
+    {
+	for (size_t i = 0; i < size; i++)
+		data[i] = message.readUint8();
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_Message_inline_and_heap_storage)
+    {
+	size_t heapBytes = MessageStorage::heapBytesInUse();
+
+	Message small(testTC, sizeof(testTC));
+	BOOST_CHECK_EQUAL(small.getMessageSize(), sizeof(testTC));
+	BOOST_CHECK_EQUAL(small.getMessageServiceType(), 17);
+	BOOST_CHECK_EQUAL(MessageStorage::heapBytesInUse(), heapBytes);
+
+	MessageArray data = makeArray(ECSSMaxMessageSize);
+	Message large(data);
+	BOOST_CHECK_EQUAL(large.getMessageSize(), ECSSMaxMessageSize);
+	BOOST_CHECK(std::equal(data.begin(), data.end(), large.getMessageRawData()));
+	BOOST_CHECK_EQUAL(MessageStorage::heapBytesInUse(), heapBytes + ECSSMaxMessageSize);
+
+	// Writes past the maximum message size are dropped, as with the fixed-size array
+	large.setMessageReadPosition(ECSSMaxMessageSize);
+	large.appendUint8(0xAA);
+	BOOST_CHECK_EQUAL(large.getMessageSize(), ECSSMaxMessageSize);
+
+	// Storing a small packet in a large message gives the heap block back
+	large.setMessageData(testTC, sizeof(testTC));
+	BOOST_CHECK_EQUAL(MessageStorage::heapBytesInUse(), heapBytes);
+	BOOST_CHECK_EQUAL(large.getMessageServiceType(), 17);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_Message_append_and_read)
+    {
+	Message message;
+	for (uint16_t i = 0; i < 300; i++)
+		message.appendUint16(i);
+	message.appendUint64(0x0102030405060708ULL);
+	message.appendDouble(3.5);
+
+	BOOST_REQUIRE_EQUAL(message.getMessageSize(), 300 * 2 + 8 + 8);
+
+	message.setMessageReadPosition(0);
+	for (uint16_t i = 0; i < 300; i++)
+		BOOST_REQUIRE_EQUAL(message.readUint16(), i);
+	BOOST_CHECK_EQUAL(message.readUint64(), 0x0102030405060708ULL);
+	BOOST_CHECK_EQUAL(message.readDouble(), 3.5);
+
+	// Overwriting in place keeps the size
+	message.setMessageReadPosition(0);
+	message.appendUint16(0xBEEF);
+	BOOST_CHECK_EQUAL(message.getMessageSize(), 300 * 2 + 8 + 8);
+	message.setMessageReadPosition(0);
+	BOOST_CHECK_EQUAL(message.readUint16(), 0xBEEF);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_Message_bulk_append_and_read)
+    {
+	MessageArray data = makeArray(300);
+	Message message;
+	message.appendUint16(0x1234);
+	message.appendUint8Array(data);
+	BOOST_REQUIRE_EQUAL(message.getMessageSize(), 302);
+
+	// Appending from the middle overwrites the existing bytes and then extends the message
+	message.setMessageReadPosition(296);
+	message.appendUint32(0xA1A2A3A4);
+	message.appendUint32(0xB1B2B3B4);
+	BOOST_CHECK_EQUAL(message.getMessageSize(), 304);
+	BOOST_CHECK_EQUAL(message.getMessageReadPosition(), 304);
+
+	message.setMessageReadPosition(2);
+	uint8_t array[300];
+	BOOST_REQUIRE(message.readArray(array, 294));
+	BOOST_CHECK(std::equal(data.begin(), data.begin() + 294, array));
+	BOOST_CHECK_EQUAL(message.readUint32(), 0xA1A2A3A4);
+	BOOST_CHECK_EQUAL(message.readUint32(), 0xB1B2B3B4);
+	BOOST_CHECK(!message.readArray(array, 1));
+	BOOST_CHECK_EQUAL(message.getMessageReadPosition(), 304);
+
+	message.setMessageReadPosition(2);
+	MessageArray read = message.readMessageArray(100);
+	BOOST_CHECK(std::equal(data.begin(), data.begin() + 100, read.begin()));
+	BOOST_CHECK_EQUAL(message.getMessageReadPosition(), 102);
+
+	// Bytes past the maximum message size are dropped
+	MessageArray full = makeArray(ECSSMaxMessageSize);
+	message.setMessageReadPosition(304);
+	message.appendUint8Array(full);
+	BOOST_CHECK_EQUAL(message.getMessageSize(), ECSSMaxMessageSize);
+	BOOST_CHECK_EQUAL(message.getMessageRawData()[ECSSMaxMessageSize - 1], full[ECSSMaxMessageSize - 305]);
+	BOOST_CHECK_EQUAL(message.getMessageReadPosition(), ECSSMaxMessageSize);
+
+	// Appending bytes of the message itself, while it moves from the inline buffer to the heap
+	MessageArray small = makeArray(40);
+	Message self(small.data(), small.size());
+	self.setMessageReadPosition(self.getMessageSize());
+	self.appendUint8Array(self.getMessageRawData(), self.getMessageSize());
+	BOOST_REQUIRE_EQUAL(self.getMessageSize(), 80);
+	BOOST_CHECK(std::equal(small.begin(), small.end(), self.getMessageRawData()));
+	BOOST_CHECK(std::equal(small.begin(), small.end(), self.getMessageRawData() + 40));
+    }
+
+    BOOST_AUTO_TEST_CASE(test_Message_strings)
+    {
+	Message message;
+	std::string id("store");
+	message.appendString(id, 16);
+	message.appendUint8(0x55);
+	BOOST_REQUIRE_EQUAL(message.getMessageSize(), 17);
+	BOOST_CHECK_EQUAL(message.getMessageRawData()[15], 0);
+
+	std::string read;
+	message.setMessageReadPosition(0);
+	BOOST_CHECK(message.readString(read, 16));
+	BOOST_CHECK_EQUAL(read, id);
+	BOOST_CHECK_EQUAL(message.readUint8(), 0x55);
+
+	// A string that fills the whole field has no terminating zero
+	message.setMessageReadPosition(0);
+	std::string fieldSized("0123456789ABCDEF");
+	message.appendString(fieldSized, 16);
+	message.setMessageReadPosition(0);
+	BOOST_CHECK(message.readString(read, 16));
+	BOOST_CHECK_EQUAL(read, fieldSized);
+	BOOST_CHECK_EQUAL(message.getMessageReadPosition(), 16);
+
+	Message octets;
+	octets.appendOctetString(etl::string<16>("file.bin"));
+	octets.setMessageReadPosition(0);
+	BOOST_CHECK(octets.readString(read));
+	BOOST_CHECK_EQUAL(read, "file.bin");
+    }
+
+    BOOST_AUTO_TEST_CASE(test_Message_bulk_throughput)
+    {
+	// Memory dump (ST06), housekeeping (ST03) and large packet (ST13) payload sizes
+	const size_t sizes[] = { 256, ECSSMaxMessageSize };
+	const size_t iterations = 20000;
+
+	for (size_t size : sizes) {
+		MessageArray data = makeArray(size);
+		uint8_t array[ECSSMaxMessageSize];
+		Message message;
+
+		auto start = std::chrono::steady_clock::now();
+		for (size_t i = 0; i < iterations; i++) {
+			message.setMessageReadPosition(0);
+			legacyAppend(message, data.data(), size);
+			message.setMessageReadPosition(0);
+			legacyRead(message, array, size);
+		}
+		double before = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+		start = std::chrono::steady_clock::now();
+		for (size_t i = 0; i < iterations; i++) {
+			message.setMessageReadPosition(0);
+			message.appendUint8Array(data.data(), size);
+			message.setMessageReadPosition(0);
+			message.readArray(array, size);
+		}
+		double after = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+		BOOST_CHECK(std::equal(data.begin(), data.end(), array));
+		std::cout << size << "-byte append and read: per byte " << before * 1e9 / iterations << " ns, "
+			  << "bulk " << after * 1e9 / iterations << " ns" << std::endl;
+	}
+    }
+
+    BOOST_AUTO_TEST_CASE(test_Message_copy_and_move)
+    {
+	MessageArray data = makeArray(200);
+	Message original(data);
+
+	Message copy = original;
+	BOOST_CHECK(copy.getMessageRawData() != original.getMessageRawData());
+	BOOST_CHECK(std::equal(data.begin(), data.end(), copy.getMessageRawData()));
+
+	const uint8_t* block = copy.getMessageRawData();
+	Message moved = std::move(copy);
+	BOOST_CHECK_EQUAL(moved.getMessageRawData(), block);
+	BOOST_CHECK_EQUAL(moved.getMessageSize(), 200);
+	BOOST_CHECK_EQUAL(copy.getMessageSize(), 0);
+
+	Message small(testTC, sizeof(testTC));
+	moved = small;
+	BOOST_CHECK_EQUAL(moved.getMessageSize(), sizeof(testTC));
+	BOOST_CHECK(std::equal(testTC, testTC + sizeof(testTC), moved.getMessageRawData()));
+    }
+
+    BOOST_AUTO_TEST_CASE(test_Message_packet_store_footprint)
+    {
+	// Same layout as PacketStore::storedTelemetryPackets
+	const size_t packets = 10000;
+	const size_t fixedSize = sizeof(MessageArray) + sizeof(uint16_t);
+	size_t heapBytes = MessageStorage::heapBytesInUse();
+
+	std::deque<std::pair<uint32_t, Message>> store;
+	for (size_t i = 0; i < packets; i++)
+		store.emplace_back(i, Message(testTC, sizeof(testTC)));
+
+	size_t used = packets * sizeof(Message) + MessageStorage::heapBytesInUse() - heapBytes;
+	std::cout << "Store of " << packets << " TCs: fixed-size messages " << packets * fixedSize
+		  << " bytes, compact messages " << used << " bytes" << std::endl;
+	BOOST_CHECK(used * 10 <= packets * fixedSize);
+
+	// Copies only move the bytes of the packet
+	const size_t iterations = 200000;
+	MessageArray array(testTC, testTC + sizeof(testTC));
+	volatile size_t sink = 0;
+
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++) {
+		MessageArray copy = array;
+		sink = sink + copy.size();
+	}
+	double before = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++) {
+		Message copy = store.front().second;
+		sink = sink + copy.getMessageSize();
+	}
+	double after = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	std::cout << "13-byte TC copy: fixed-size array " << before * 1e9 / iterations << " ns, "
+		  << "compact message " << after * 1e9 / iterations << " ns" << std::endl;
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
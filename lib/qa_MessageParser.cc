@@ -0,0 +1,247 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include <gnuradio/pus/Helpers/MessageParser.h>
+#include <boost/test/unit_test.hpp>
+#include <chrono>
+#include <iostream>
+#include <vector>
+
+namespace gr {
+  namespace pus {
+
+    BOOST_AUTO_TEST_CASE(test_MessageParser_report_layout)
+    {
+	MessageParser* parser = MessageParser::getInstance();
+	parser->config(0x19, true);
+
+	MessageArray payload;
+	for (uint8_t i = 0; i < 20; i++)
+		payload.push_back(i);
+
+	Message report = parser->CreateMessageReport(0x19, 5, 0x01, 3, 25, 7, 0x1234, payload);
+	size_t stampSize = TimeProvider::getInstance()->getCurrentTimeStamp().size();
+	size_t size = CCSDSPrimaryHeaderSize + ECSSSecondaryTMHeaderSize + stampSize + payload.size() + 2;
+	const uint8_t* data = report.getMessageRawData();
+
+	BOOST_REQUIRE_EQUAL(report.getMessageSize(), size);
+	BOOST_CHECK_EQUAL(report.getMessageReadPosition(), size);
+	BOOST_CHECK_EQUAL(report.getMessageApplicationId(), 0x19);
+	BOOST_CHECK(report.getMessageSecondaryHeaderFlag());
+	BOOST_CHECK_EQUAL(report.getMessagePacketSequenceCount(), 5);
+	BOOST_CHECK_EQUAL(report.getMessageSequenceFlags(), 3);
+	BOOST_CHECK_EQUAL(report.getMessagePacketDataLength(), size - CCSDSPrimaryHeaderSize - 1);
+	BOOST_CHECK_EQUAL(data[6], (ECSSPUSVersion << 4U) | 0x01);
+	BOOST_CHECK_EQUAL(report.getMessageServiceType(), 3);
+	BOOST_CHECK_EQUAL(report.getMessageType(), 25);
+	BOOST_CHECK_EQUAL(report.getMessageTypeCounter(), 7);
+	BOOST_CHECK_EQUAL(report.getMessageDestinationId(), 0x1234);
+	BOOST_CHECK(std::equal(payload.begin(), payload.end(),
+			       data + CCSDSPrimaryHeaderSize + ECSSSecondaryTMHeaderSize + stampSize));
+	BOOST_CHECK_EQUAL(CRCHelper::validateCRC(data, size), 0);
+
+	Message empty = parser->CreateEmptyMessageReport(0x01, 3, 25, 7, 0x1234);
+	BOOST_CHECK_EQUAL(empty.getMessageSize(), CCSDSPrimaryHeaderSize + ECSSSecondaryTMHeaderSize + stampSize);
+	BOOST_CHECK_EQUAL(empty.getMessageReadPosition(), empty.getMessageSize());
+	BOOST_CHECK_EQUAL(empty.getMessageServiceType(), 3);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_MessageParser_report_buffer_size)
+    {
+	MessageParser* parser = MessageParser::getInstance();
+	parser->config(0x19, true);
+	size_t heapBytes = MessageStorage::heapBytesInUse();
+
+	// A report with its payload only takes the room it needs
+	MessageArray payload;
+	for (uint8_t i = 0; i < 20; i++)
+		payload.push_back(i);
+	Message small = parser->CreateMessageReport(0x19, 5, 0x01, 3, 25, 7, 0x1234, payload);
+	BOOST_CHECK_EQUAL(MessageStorage::heapBytesInUse(), heapBytes);
+
+	for (uint8_t i = 0; i < 200; i++)
+		payload.push_back(i);
+	Message large = parser->CreateMessageReport(0x19, 6, 0x01, 3, 25, 7, 0x1234, payload);
+	BOOST_CHECK(MessageStorage::heapBytesInUse() >= heapBytes + large.getMessageSize());
+	BOOST_CHECK(MessageStorage::heapBytesInUse() < heapBytes + ECSSMaxMessageSize);
+
+	// An empty report is filled by the caller, it takes a full-size buffer
+	size_t reportBytes = MessageStorage::heapBytesInUse();
+	Message empty = parser->CreateEmptyMessageReport(0x01, 3, 25, 7, 0x1234);
+	BOOST_CHECK_EQUAL(MessageStorage::heapBytesInUse(), reportBytes + ECSSMaxMessageSize);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_MessageParser_header_metadata)
+    {
+	MessageParser* parser = MessageParser::getInstance();
+	std::vector<uint8_t> packet = { 0x18, 0x19, 0xc0, 0x2a, 0x00, 0x06, 0x2f, 0x11, 0x01, 0x12, 0x34 };
+	uint16_t crcField = CRCHelper::calculateCRC(packet.data(), packet.size());
+	packet.push_back(static_cast<uint8_t>(crcField >> 8U));
+	packet.push_back(static_cast<uint8_t>(crcField & 0xFF));
+
+	PacketHeader header;
+	header.decode(packet.data(), packet.size());
+	BOOST_CHECK_EQUAL(header.applicationId, 0x19);
+	BOOST_CHECK_EQUAL(header.packetType, Message::TC);
+	BOOST_CHECK_EQUAL(header.sequenceFlags, 3);
+	BOOST_CHECK_EQUAL(header.sequenceCount, 0x2a);
+	BOOST_CHECK_EQUAL(header.packetDataLength, packet.size() - CCSDSPrimaryHeaderSize - 1);
+	BOOST_CHECK_EQUAL(header.pusVersion, ECSSPUSVersion);
+	BOOST_CHECK_EQUAL(header.ackFlags, 0x0f);
+	BOOST_CHECK_EQUAL(header.serviceType, 17);
+	BOOST_CHECK_EQUAL(header.messageType, 1);
+	BOOST_CHECK_EQUAL(header.sourceId, 0x1234);
+
+	pmt::pmt_t meta = pmt::dict_add(pmt::make_dict(), PMT_HEADER, MessageParser::headerToPMT(header));
+	PacketHeader received;
+	BOOST_REQUIRE(MessageParser::headerFromPMT(meta, received));
+	BOOST_CHECK_EQUAL(received.applicationId, header.applicationId);
+	BOOST_CHECK_EQUAL(received.sourceId, header.sourceId);
+	BOOST_CHECK(!MessageParser::headerFromPMT(pmt::make_dict(), received));
+	BOOST_CHECK(!MessageParser::headerFromPMT(pmt::PMT_NIL, received));
+
+	Message message = parser->ParseMessageCommand(meta, packet.data(), packet.size());
+	BOOST_CHECK_EQUAL(message.getMessageReadPosition(), CCSDSPrimaryHeaderSize + ECSSSecondaryTCHeaderSize);
+	BOOST_CHECK_EQUAL(message.getMessageHeader().sequenceCount, 0x2a);
+	BOOST_CHECK(parser->assertTC(message, 17, 1));
+	BOOST_CHECK(!parser->assertTC(message, 17, 2));
+
+	// Metadata that does not match the packet is ignored
+	packet[7] = 20;
+	Message other = parser->ParseMessageCommand(meta, packet.data(), packet.size() - 1);
+	BOOST_CHECK(parser->assertTC(other, 20, 1));
+
+	// Even when the lengths agree, the getters and assertTC() read the packet bytes
+	Message foreign = parser->ParseMessageCommand(meta, packet.data(), packet.size());
+	BOOST_CHECK(parser->assertTC(foreign, 20, 1));
+	BOOST_CHECK_EQUAL(foreign.getMessageServiceType(), 20);
+	packet[7] = 17;
+	packet[1] = 0x1a;
+	foreign = parser->ParseMessageCommand(meta, packet.data(), packet.size());
+	BOOST_CHECK_EQUAL(foreign.getMessageApplicationId(), 0x1a);
+	BOOST_CHECK_EQUAL(foreign.getMessageHeader().applicationId, 0x1a);
+	packet[1] = 0x19;
+
+	// Changing the header bytes drops the decoded copy
+	message.getMessageRawData()[8] = 2;
+	BOOST_CHECK(parser->assertTC(message, 17, 2));
+    }
+
+    BOOST_AUTO_TEST_CASE(test_MessageParser_service_ingress_throughput)
+    {
+	// One TC per service type of a 20-service flowgraph, as forwarded by ServicesPool
+	const size_t iterations = 20000;
+	const uint8_t services[] = { 1, 3, 4, 5, 6, 8, 9, 11, 12, 13, 14, 15, 17, 18, 19, 20, 21, 22, 23, 24 };
+	MessageParser* parser = MessageParser::getInstance();
+
+	std::vector<pmt::pmt_t> plain;
+	std::vector<pmt::pmt_t> decoded;
+	for (uint8_t service : services) {
+		std::vector<uint8_t> packet = { 0x18, 0x19, 0xc0, 0x00, 0x00, 0x0a, 0x2f, service, 0x01, 0x00, 0x00,
+						0x00, 0x01, 0x02, 0x03 };
+		uint16_t crcField = CRCHelper::calculateCRC(packet.data(), packet.size());
+		packet.push_back(static_cast<uint8_t>(crcField >> 8U));
+		packet.push_back(static_cast<uint8_t>(crcField & 0xFF));
+
+		PacketHeader header;
+		header.decode(packet.data(), packet.size());
+		pmt::pmt_t v_data = pmt::init_u8vector(packet.size(), packet);
+		plain.push_back(pmt::cons(pmt::make_dict(), v_data));
+		decoded.push_back(pmt::cons(pmt::dict_add(pmt::make_dict(), PMT_HEADER, MessageParser::headerToPMT(header)),
+					    v_data));
+	}
+
+	size_t accepted = 0;
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++) {
+		for (size_t j = 0; j < plain.size(); j++) {
+			// Copy into a MessageArray and decode the header again, as the services used to
+			std::vector<uint8_t> inData = pmt::u8vector_elements(pmt::cdr(plain[j]));
+			MessageArray in_data(inData.data(), inData.data() + inData.size());
+			Message message = parser->ParseMessageCommand(in_data);
+			accepted += (services[j] == message.getMessageServiceType()) &&
+				    parser->assertTC(message, services[j], 1);
+		}
+	}
+	double before = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++) {
+		for (size_t j = 0; j < decoded.size(); j++) {
+			size_t size = 0;
+			const uint8_t* data = pmt::u8vector_elements(pmt::cdr(decoded[j]), size);
+			Message message = parser->ParseMessageCommand(pmt::car(decoded[j]), data, size);
+			accepted += (services[j] == message.getMessageServiceType()) &&
+				    parser->assertTC(message, services[j], 1);
+		}
+	}
+	double after = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	size_t packets = iterations * plain.size();
+	BOOST_CHECK_EQUAL(accepted, 2 * packets);
+	std::cout << "Service ingress per TC: copy and decode " << before * 1e9 / packets << " ns, "
+		  << "decoded header metadata " << after * 1e9 / packets << " ns" << std::endl;
+    }
+
+    BOOST_AUTO_TEST_CASE(test_MessageParser_periodic_report_throughput)
+    {
+	// HK parameter reports of a few structures, built over and over
+	const size_t iterations = 200000;
+	MessageParser* parser = MessageParser::getInstance();
+	parser->config(0x19, true);
+
+	MessageArray payload;
+	for (uint8_t i = 0; i < 32; i++)
+		payload.push_back(i);
+
+	size_t bytes = 0;
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++) {
+		Message report = parser->CreateMessageReport(0x19, static_cast<uint16_t>(i & 0x3FFF), 0, 3, 25,
+							     static_cast<uint16_t>(i), static_cast<uint16_t>(i % 4), payload);
+		bytes += report.getMessageSize();
+	}
+	double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	BOOST_CHECK(bytes > 0);
+	std::cout << "MessageParser: " << elapsed * 1e9 / iterations << " ns per periodic report" << std::endl;
+    }
+
+    BOOST_AUTO_TEST_CASE(test_MessageParser_steady_state_reports)
+    {
+	// A few hundred HK reports built on the same tick and released once published
+	const size_t reports = 500;
+	MessageParser* parser = MessageParser::getInstance();
+	parser->config(0x19, true);
+	std::vector<Message> tick;
+	tick.reserve(reports);
+
+	auto buildTick = [&]() {
+		for (size_t i = 0; i < reports; i++) {
+			tick.push_back(parser->CreateEmptyMessageReport(0, 3, 25, 0, 0));
+			for (uint16_t j = 0; j < 100; j++)
+				tick.back().appendUint32(j);
+			parser->closeMessage(tick.back());
+		}
+		tick.clear();
+	};
+
+	buildTick();
+	size_t allocations = MessageStorage::heapAllocations();
+
+	auto start = std::chrono::steady_clock::now();
+	for (int i = 0; i < 10; i++)
+		buildTick();
+	double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	std::cout << "MessageParser: " << reports * 10 / elapsed << " reports/s" << std::endl;
+	BOOST_CHECK_EQUAL(MessageStorage::heapAllocations(), allocations);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -0,0 +1,109 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include "RequestVerificationService_impl.h"
+#include <gnuradio/pus/Helpers/CRCHelper.h>
+#include <gnuradio/pus/Helpers/VerificationReport.h>
+#include <algorithm>
+#include <boost/test/unit_test.hpp>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // TC[17,1] with all the acknowledgement flags set and CRC
+    std::vector<uint8_t> makeTestTC()
+    {
+	std::vector<uint8_t> packet = { 0x18, 0x03, 0xc0, 0x00, 0x00, 0x06, 0x2f, 0x11, 0x01, 0x00, 0x00 };
+	uint16_t crcField = CRCHelper::calculateCRC(packet.data(), packet.size());
+	packet.push_back(static_cast<uint8_t>(crcField >> 8U));
+	packet.push_back(static_cast<uint8_t>(crcField & 0xFF));
+	return packet;
+    }
+
+    // Verification request as published by Service on its ver port
+    pmt::pmt_t makeVerificationPDU(const std::vector<uint8_t>& packet, RequestVerificationService::MessageType report)
+    {
+	pmt::pmt_t meta = pmt::make_dict();
+	meta = pmt::dict_add(meta, PMT_REQ, pmt::from_long(report));
+	return pmt::cons(meta, pmt::init_u8vector(packet.size(), packet));
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_RequestVerificationService_no_message_copies)
+    {
+	auto service = std::dynamic_pointer_cast<RequestVerificationService_impl>(RequestVerificationService::make());
+	BOOST_REQUIRE(service);
+
+	std::vector<uint8_t> packet = makeTestTC();
+	pmt::pmt_t acceptance = makeVerificationPDU(packet, RequestVerificationService::SuccessfulAcceptanceReport);
+	pmt::pmt_t start = makeVerificationPDU(packet, RequestVerificationService::SuccessfulStartOfExecution);
+	pmt::pmt_t completion = makeVerificationPDU(packet, RequestVerificationService::SuccessfulCompletionOfExecution);
+
+	// One TC going through acceptance, start and completion reporting
+	size_t copies = Message::copyCount();
+	service->handle_msg(acceptance);
+	service->handle_msg(start);
+	service->handle_msg(completion);
+	BOOST_CHECK_EQUAL(Message::copyCount() - copies, 0);
+
+	// The report builders only read the request
+	const Message request(packet.data(), packet.size());
+	copies = Message::copyCount();
+	service->successAcceptanceVerification(request);
+	service->successStartExecutionVerification(request);
+	service->successProgressExecutionVerification(request, 1);
+	service->successCompletionExecutionVerification(request);
+	service->failCompletionExecutionVerification(request, ErrorHandler::UnknownExecutionCompletionError);
+	BOOST_CHECK_EQUAL(Message::copyCount() - copies, 0);
+
+	// Copies are still counted
+	Message copy = request;
+	BOOST_CHECK_EQUAL(Message::copyCount() - copies, 1);
+	BOOST_CHECK_EQUAL(copy.getMessageSize(), packet.size());
+    }
+
+    BOOST_AUTO_TEST_CASE(test_VerificationReport_compact_request)
+    {
+	std::vector<uint8_t> packet = makeTestTC();
+	const Message request(packet.data(), packet.size());
+
+	pmt::pmt_t progress = VerificationReport::toPDU(RequestVerificationService::FailedProgressOfExecution, request,
+							ErrorHandler::UnknownExecutionProgressError, 3);
+	pmt::pmt_t other = VerificationReport::toPDU(RequestVerificationService::FailedProgressOfExecution,
+						     request, 0x1234, 4);
+
+	// Only the request ID is sent, and the meta dictionary is shared by the reports of a type
+	BOOST_CHECK_EQUAL(pmt::length(pmt::cdr(progress)), VerificationReport::Size);
+	BOOST_CHECK(pmt::eq(pmt::car(progress), pmt::car(other)));
+	BOOST_CHECK_EQUAL(pmt::to_long(pmt::dict_ref(pmt::car(progress), PMT_REQ, pmt::PMT_NIL)),
+			  RequestVerificationService::FailedProgressOfExecution);
+
+	VerificationReport report;
+	BOOST_REQUIRE(VerificationReport::fromPDU(other, report));
+	BOOST_CHECK(std::equal(report.requestId, report.requestId + 4, packet.begin()));
+	BOOST_CHECK_EQUAL(report.errorCode, 0x1234);
+	BOOST_CHECK_EQUAL(report.stepId, 4);
+	BOOST_CHECK_EQUAL(report.messageType, RequestVerificationService::FailedProgressOfExecution);
+
+	// A whole TC is not a compact report
+	BOOST_CHECK(!VerificationReport::fromPDU(
+		makeVerificationPDU(packet, RequestVerificationService::SuccessfulAcceptanceReport), report));
+
+	auto service = std::dynamic_pointer_cast<RequestVerificationService_impl>(RequestVerificationService::make());
+	BOOST_REQUIRE(service);
+	size_t copies = Message::copyCount();
+	service->handle_msg(VerificationReport::toPDU(RequestVerificationService::SuccessfulAcceptanceReport, request));
+	service->handle_msg(progress);
+	BOOST_CHECK_EQUAL(Message::copyCount() - copies, 0);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
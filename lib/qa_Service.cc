@@ -0,0 +1,182 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include <gnuradio/pus/Service.h>
+#include <gnuradio/pus/TimeBasedSchedulingService.h>
+#include <gnuradio/io_signature.h>
+#include <boost/test/unit_test.hpp>
+#include <atomic>
+#include <chrono>
+#include <thread>
+#include <vector>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // Service type not used by any service of the module
+    const uint8_t TestServiceType = 0xf1;
+
+    class TimerTestService : public Service
+    {
+     public:
+      std::atomic<int> ticks{ 0 };
+      std::thread::id tickThread;
+
+      TimerTestService(TimerExecution execution)
+        : gr::block("TimerTestService",
+                gr::io_signature::make(0, 0, 0),
+                gr::io_signature::make(0, 0, 0))
+      {
+        serviceType = TestServiceType;
+        addTimerHandler([this](TimeProvider* p) {
+        	tickThread = std::this_thread::get_id();
+        	ticks++;
+        }, execution);
+      }
+
+      ~TimerTestService()
+      {
+        removeTimerHandler();
+      }
+
+      void stopTimer()
+      {
+        removeTimerHandler();
+      }
+
+      // Handles the queued tick messages, as the block thread does
+      size_t handleTicks()
+      {
+        size_t messages = 0;
+        for (; nmsgs(PMT_TICK) > 0; messages++)
+        	dispatch_msg(PMT_TICK, delete_head_nowait(PMT_TICK));
+        return messages;
+      }
+    };
+
+    // Keeps the messages posted to its input port
+    class MessageSink : public gr::block
+    {
+     public:
+      MessageSink()
+        : gr::block("MessageSink",
+                gr::io_signature::make(0, 0, 0),
+                gr::io_signature::make(0, 0, 0))
+      {
+        message_port_register_in(PMT_IN);
+      }
+    };
+
+    void appendUint32(std::vector<uint8_t>& packet, uint32_t value)
+    {
+      for (int shift = 24; shift >= 0; shift -= 8)
+        packet.push_back(static_cast<uint8_t>(value >> shift));
+    }
+
+    pmt::pmt_t toPDU(const std::vector<uint8_t>& packet)
+    {
+      return pmt::cons(pmt::PMT_NIL, pmt::init_u8vector(packet.size(), packet.data()));
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_Service_block_thread_ticks)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	BOOST_REQUIRE(provider->config(0.02, TimeProvider::CUC_LVL1, false, 0, 0, 0));
+
+	auto service = std::make_shared<TimerTestService>(Service::BlockThread);
+	for (int i = 0; i < 300 && provider->getTimerStatistics(TestServiceType).ticks < 10; i++)
+		std::this_thread::sleep_for(std::chrono::milliseconds(10));
+	uint64_t ticks = provider->getTimerStatistics(TestServiceType).ticks;
+	service->stopTimer();
+
+	// Nothing ran on the timer thread, and a single message holds all the pending ticks
+	BOOST_CHECK(ticks >= 10);
+	BOOST_CHECK_EQUAL(service->ticks, 0);
+	BOOST_CHECK_EQUAL(service->handleTicks(), 1);
+	BOOST_CHECK(service->ticks >= static_cast<int>(ticks));
+	BOOST_CHECK(service->tickThread == std::this_thread::get_id());
+
+	auto timerService = std::make_shared<TimerTestService>(Service::TimerThread);
+	while (timerService->ticks == 0)
+		std::this_thread::sleep_for(std::chrono::milliseconds(1));
+	timerService->stopTimer();
+
+	BOOST_CHECK_EQUAL(timerService->handleTicks(), 0);
+	BOOST_CHECK(timerService->tickThread != std::this_thread::get_id());
+
+	BOOST_REQUIRE(provider->config(1.0, TimeProvider::CUC_LVL1, false, 0, 0, 0));
+    }
+
+    BOOST_AUTO_TEST_CASE(test_Service_simulated_clock)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	BOOST_REQUIRE(provider->config(1.0, TimeProvider::CUC_LVL1, false, 0, 0, 0));
+	MessageParser::getInstance()->config(ApplicationId, false);
+	// 2023-01-01T00:00:00Z
+	provider->setSimulatedTime(1672531200000LL);
+	uint32_t now = provider->getCurrentTimeDefaultCUC();
+
+	auto service = TimeBasedSchedulingService::make();
+	auto sink = std::make_shared<MessageSink>();
+	service->message_port_sub(PMT_REL, pmt::cons(sink->alias_pmt(), PMT_IN));
+
+	// TC[11,1] enables the schedule, TC[11,4] inserts three TCs released 70, 80 and 90 s later
+	std::vector<uint8_t> enable = { 0x18, 0x03, 0xc0, 0x00, 0x00, 0x06, 0x20, 0x0b, 0x01, 0x00, 0x00, 0xff, 0xff };
+	std::vector<uint8_t> insert = { 0x18, 0x03, 0xc0, 0x01, 0x00, 0x00, 0x20, 0x0b, 0x04, 0x00, 0x00, 0x00, 0x03 };
+	for (uint8_t i = 0; i < 3; i++) {
+		appendUint32(insert, now + 70 + 10 * i);
+		std::vector<uint8_t> tc = { static_cast<uint8_t>(0x18 | ((ApplicationId >> 8) & 0x07)),
+					    static_cast<uint8_t>(ApplicationId & 0xff), 0xc0, i, 0x00, 0x06,
+					    0x2f, 0x11, 0x01, 0x00, 0x00, 0xff, 0xff };
+		insert.insert(insert.end(), tc.begin(), tc.end());
+	}
+	insert.push_back(0xff);
+	insert.push_back(0xff);
+	insert[4] = static_cast<uint8_t>((insert.size() - 7) >> 8);
+	insert[5] = static_cast<uint8_t>(insert.size() - 7);
+
+	service->dispatch_msg(PMT_IN, toPDU(enable));
+	service->dispatch_msg(PMT_IN, toPDU(insert));
+	service->start();
+
+	// Runs the tick messages as the block thread does, a bit late as a busy block would
+	std::atomic<bool> finished{ false };
+	std::vector<uint32_t> releaseTimes;
+	std::thread blockThread([&]() {
+		while (!finished) {
+			if (service->nmsgs(PMT_TICK) == 0) {
+				std::this_thread::sleep_for(std::chrono::microseconds(100));
+				continue;
+			}
+			std::this_thread::sleep_for(std::chrono::milliseconds(1));
+			uint32_t tickTime = provider->getCurrentTimeDefaultCUC();
+			size_t released = sink->nmsgs(PMT_IN);
+			service->dispatch_msg(PMT_TICK, service->delete_head_nowait(PMT_TICK));
+			for (size_t i = released; i < sink->nmsgs(PMT_IN); i++)
+				releaseTimes.push_back(tickTime);
+		}
+	});
+
+	BOOST_CHECK(provider->advanceTime(100 * 1000));
+	finished = true;
+	blockThread.join();
+	service->stop();
+
+	// Each TC is released by the tick of its release time, the clock waited for the block
+	BOOST_CHECK((releaseTimes == std::vector<uint32_t>{ now + 70, now + 80, now + 90 }));
+	BOOST_CHECK_EQUAL(provider->getCurrentTimeDefaultCUC(), now + 100);
+
+	provider->setRealTime();
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -0,0 +1,95 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include "ServicesPool_impl.h"
+#include <gnuradio/pus/Helpers/CRCHelper.h>
+#include <boost/test/unit_test.hpp>
+#include <chrono>
+#include <iostream>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // TC[serviceType,1] with CRC, as used by the ServicesPool QA
+    pmt::pmt_t makeTestPDU(uint8_t serviceType = 17)
+    {
+	std::vector<uint8_t> packet = { 0x18, 0x03, 0xc0, 0x00, 0x00, 0x06, 0x20, serviceType, 0x01, 0x00, 0x00 };
+	uint16_t crcField = CRCHelper::calculateCRC(packet.data(), packet.size());
+	packet.push_back(static_cast<uint8_t>(crcField >> 8U));
+	packet.push_back(static_cast<uint8_t>(crcField & 0xFF));
+
+	return pmt::cons(pmt::make_dict(), pmt::init_u8vector(packet.size(), packet));
+    }
+
+    // The copy-based ingress path that ServicesPool used before reading the PMT buffer in place
+    bool legacyIngress(pmt::pmt_t pdu, pmt::pmt_t& out)
+    {
+	std::vector<uint8_t> inData = pmt::u8vector_elements(pmt::cdr(pdu));
+	MessageArray in_data(inData.data(), inData.data() + inData.size());
+	Message message = Message(in_data);
+	uint16_t msgCrcField = message.getMessageCRC();
+
+	in_data.pop_back();
+	in_data.pop_back();
+	if (msgCrcField != CRCHelper::calculateMessageCRC(in_data))
+		return false;
+
+	out = pmt::cons(pmt::car(pdu), pmt::init_u8vector(inData.size(), inData.data()));
+	return true;
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_ServicesPool_ingress_throughput)
+    {
+	const size_t iterations = 200000;
+	pmt::pmt_t pdu = makeTestPDU();
+	pmt::pmt_t out = pmt::PMT_NIL;
+
+	auto pool = std::dynamic_pointer_cast<ServicesPool_impl>(ServicesPool::make({ 17 }));
+	BOOST_REQUIRE(pool);
+
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++)
+		BOOST_REQUIRE(legacyIngress(pdu, out));
+	double before = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++)
+		pool->handle_msg(pdu);
+	double after = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	std::cout << "ServicesPool ingress: copy path " << iterations / before << " pkt/s, "
+		  << "zero-copy path " << iterations / after << " pkt/s" << std::endl;
+    }
+
+    BOOST_AUTO_TEST_CASE(test_ServicesPool_routing_throughput)
+    {
+	const size_t iterations = 20000;
+	std::vector<uint16_t> services = { 1, 3, 4, 5, 6, 8, 9, 11, 12, 13, 14, 15, 17, 18, 19, 20, 21, 22, 23, 24, 25 };
+	std::vector<pmt::pmt_t> pdus;
+	for (auto service : services)
+		pdus.push_back(makeTestPDU(static_cast<uint8_t>(service)));
+
+	auto pool = std::dynamic_pointer_cast<ServicesPool_impl>(ServicesPool::make(services));
+	BOOST_REQUIRE(pool);
+
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++)
+		for (auto& pdu : pdus)
+			pool->handle_msg(pdu);
+	double elapsed = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+	std::cout << "ServicesPool routing over " << services.size() << " services: "
+		  << iterations * pdus.size() / elapsed << " pkt/s" << std::endl;
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
@@ -0,0 +1,316 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include <gnuradio/pus/Time/TimeProvider.h>
+#include <gnuradio/pus/Time/TimeGetter.h>
+#include <boost/test/unit_test.hpp>
+#include <chrono>
+#include <ctime>
+#include <iostream>
+#include <thread>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    // Year by year conversion, as originally done by the TimeStamp constructor
+    int64_t referenceDaysFromCivil(int year, int month, int day)
+    {
+	int64_t days = 0;
+	for (int y = 1970; y < year; ++y)
+		days += Time::isLeapYear(y) ? 366 : 365;
+	for (int y = year; y < 1970; ++y)
+		days -= Time::isLeapYear(y) ? 366 : 365;
+	for (int m = 1; m < month; ++m) {
+		days += Time::DaysOfMonth[m - 1];
+		if ((m == 2) && Time::isLeapYear(year))
+			days++;
+	}
+	return days + day - 1;
+    }
+
+    UTCTimestamp toUTCTimestamp(time_t unixSeconds)
+    {
+	tm* UTCTimeStruct = std::gmtime(&unixSeconds);
+	return UTCTimestamp(UTCTimeStruct->tm_year, UTCTimeStruct->tm_mon,
+	                    UTCTimeStruct->tm_mday, UTCTimeStruct->tm_hour,
+	                    UTCTimeStruct->tm_min, UTCTimeStruct->tm_sec);
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_Time_days_from_civil)
+    {
+	for (int year = 1900; year <= 2200; year++) {
+		for (int month = 1; month <= Time::MonthsPerYear; month++) {
+			int days = Time::DaysOfMonth[month - 1] + (((month == 2) && Time::isLeapYear(year)) ? 1 : 0);
+			for (int day = 1; day <= days; day++) {
+				BOOST_REQUIRE_EQUAL(Time::daysFromCivil(year, month, day),
+						    referenceDaysFromCivil(year, month, day));
+			}
+		}
+	}
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeProvider_cached_timestamp)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	BOOST_REQUIRE(provider->config(1.0, TimeProvider::CUC_LVL1, false, 0, 0, 0));
+
+	// The on-demand conversion agrees with the UTC path
+	for (time_t seconds = 0; seconds < 4000000000; seconds += 86399 * 7 + 3601) {
+		BOOST_REQUIRE_EQUAL(TimeProvider::toDefaultCUC(seconds),
+				    Time::DefaultCUC(toUTCTimestamp(seconds)).formatAsBytes());
+	}
+
+	// The published value follows the wall clock
+	time_t before = time(nullptr);
+	uint32_t ticks = provider->getCurrentTimeDefaultCUC();
+	time_t after = time(nullptr);
+	BOOST_CHECK(ticks + 1 >= TimeProvider::toDefaultCUC(before));
+	BOOST_CHECK(ticks <= TimeProvider::toDefaultCUC(after));
+	BOOST_CHECK(TimeGetter::getCurrentTimeDefaultCUC().formatAsBytes() + 1 >= ticks);
+
+	etl::vector<uint8_t, ECSSMaxTimeField> stamp = provider->getCurrentTimeStamp();
+	BOOST_REQUIRE_EQUAL(stamp.size(), TIME_SIZE);
+	uint32_t stampTicks = (stamp[0] << 24) | (stamp[1] << 16) | (stamp[2] << 8) | stamp[3];
+	BOOST_CHECK(stampTicks + 1 >= ticks);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeProvider_timestamp_throughput)
+    {
+	// Time-stamping a report: UTC conversion against the published value
+	const size_t iterations = 200000;
+	TimeProvider* provider = TimeProvider::getInstance();
+	volatile uint32_t sink = 0;
+
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++)
+		sink = sink ^ Time::DefaultCUC(provider->getCurrentTimeUTC()).formatAsBytes();
+	auto converted = std::chrono::steady_clock::now() - start;
+
+	start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < iterations; i++)
+		sink = sink ^ provider->getCurrentTimeDefaultCUC();
+	auto published = std::chrono::steady_clock::now() - start;
+
+	double convertedNs = std::chrono::duration<double, std::nano>(converted).count() / iterations;
+	double publishedNs = std::chrono::duration<double, std::nano>(published).count() / iterations;
+
+	std::cout << "CUC timestamp: UTC conversion " << convertedNs << " ns, "
+		  << "published " << publishedNs << " ns" << std::endl;
+
+	BOOST_CHECK(publishedNs < convertedNs);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeProvider_deadline_scheduler)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	BOOST_REQUIRE(provider->config(1.0, TimeProvider::CUC_LVL1, false, 0, 0, 0));
+	// 2023-01-01T00:00:00Z, the handlers start on the next whole second
+	provider->setSimulatedTime(1672531200000);
+
+	std::atomic<int> fast{ 0 }, slow{ 0 };
+	provider->addHandler(0xfff0, [&fast](TimeProvider*) { fast++; }, 20);
+	provider->addHandler(0xfff1, [&slow](TimeProvider*) { slow++; }, 100, 30);
+
+	BOOST_REQUIRE(provider->advanceTime(1000));
+	BOOST_CHECK_EQUAL(fast, 1);
+	BOOST_CHECK_EQUAL(slow, 0);
+
+	// The slow handler ticks 30 ms into the second
+	BOOST_REQUIRE(provider->advanceTime(29));
+	BOOST_CHECK_EQUAL(slow, 0);
+	BOOST_REQUIRE(provider->advanceTime(1));
+	BOOST_CHECK_EQUAL(slow, 1);
+
+	provider->resetTimerStatistics();
+	int fastStart = fast, slowStart = slow;
+	BOOST_REQUIRE(provider->advanceTime(1000));
+	TimeProvider::TimerStatistics total = provider->getTimerStatistics();
+	TimeProvider::TimerStatistics fastStatistics = provider->getTimerStatistics(0xfff0);
+	TimeProvider::TimerStatistics slowStatistics = provider->getTimerStatistics(0xfff1);
+	provider->removeHandler(0xfff0);
+	provider->removeHandler(0xfff1);
+	provider->setRealTime();
+
+	// Each handler runs at its own period, and the clock only steps to their deadlines
+	BOOST_CHECK_EQUAL(fast - fastStart, 50);
+	BOOST_CHECK_EQUAL(slow - slowStart, 10);
+	BOOST_CHECK_EQUAL(fastStatistics.ticks, 50);
+	BOOST_CHECK_EQUAL(slowStatistics.ticks, 10);
+	BOOST_CHECK_EQUAL(total.ticks, 60);
+	BOOST_CHECK_EQUAL(total.wakeups, 60);
+	BOOST_CHECK_EQUAL(total.maxJitterUs, 0);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeProvider_deadline_scheduler_realtime)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	std::atomic<int> fast{ 0 }, slow{ 0 };
+
+	provider->addHandler(0xfff0, [&fast](TimeProvider*) { fast++; }, 20);
+	provider->addHandler(0xfff1, [&slow](TimeProvider*) { slow++; }, 100, 30);
+
+	// Handlers start on the first whole second after the timer thread
+	while (slow == 0)
+		std::this_thread::sleep_for(std::chrono::milliseconds(1));
+	provider->resetTimerStatistics();
+
+	std::this_thread::sleep_for(std::chrono::milliseconds(1000));
+	TimeProvider::TimerStatistics total = provider->getTimerStatistics();
+	TimeProvider::TimerStatistics fastStatistics = provider->getTimerStatistics(0xfff0);
+	TimeProvider::TimerStatistics slowStatistics = provider->getTimerStatistics(0xfff1);
+	provider->removeHandler(0xfff0);
+	provider->removeHandler(0xfff1);
+
+	std::cout << "TimeProvider: " << total.wakeups << " wakeups, " << total.ticks << " ticks, jitter mean "
+		  << total.meanJitterUs() << " us, max " << total.maxJitterUs << " us" << std::endl;
+
+	// A loaded host wakes the timer thread late, but the missed deadlines are all posted
+	BOOST_CHECK(fastStatistics.ticks >= 45);
+	BOOST_CHECK(slowStatistics.ticks >= 9);
+	BOOST_CHECK(total.ticks >= fastStatistics.ticks + slowStatistics.ticks);
+	BOOST_CHECK(total.maxJitterUs >= total.meanJitterUs());
+
+	// Removed handlers are no longer called
+	int stopped = fast;
+	std::this_thread::sleep_for(std::chrono::milliseconds(100));
+	BOOST_CHECK_EQUAL(fast, stopped);
+	BOOST_CHECK_EQUAL(provider->getTimerStatistics(0xfff0).ticks, 0);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeProvider_handler_overruns)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	std::atomic<int> fast{ 0 }, slow{ 0 };
+
+	// A callback three times slower than its period does not delay the others
+	provider->addHandler(0xfff2, [&slow](TimeProvider*) {
+		std::this_thread::sleep_for(std::chrono::milliseconds(60));
+		slow++;
+	}, 20);
+	provider->addHandler(0xfff3, [&fast](TimeProvider*) { fast++; }, 10);
+
+	while (fast == 0)
+		std::this_thread::sleep_for(std::chrono::milliseconds(1));
+	provider->resetTimerStatistics();
+	int fastStart = fast;
+
+	std::this_thread::sleep_for(std::chrono::milliseconds(500));
+	TimeProvider::TimerStatistics slowStatistics = provider->getTimerStatistics(0xfff2);
+	TimeProvider::TimerStatistics fastStatistics = provider->getTimerStatistics(0xfff3);
+	TimeProvider::TimerStatistics total = provider->getTimerStatistics();
+	int fastTicks = fast - fastStart;
+	provider->removeHandler(0xfff2);
+	provider->removeHandler(0xfff3);
+
+	std::cout << "Slow handler: " << slowStatistics.ticks << " ticks, " << slowStatistics.executions
+		  << " executions, " << slowStatistics.overruns << " overruns, mean "
+		  << slowStatistics.meanExecutionUs() << " us" << std::endl;
+
+	BOOST_CHECK(fastTicks >= 45);
+	BOOST_CHECK(fastStatistics.executions >= 45);
+	BOOST_CHECK_EQUAL(fastStatistics.overruns, 0);
+
+	// The slow callback keeps all its ticks, and each tick posted while it runs is an overrun
+	BOOST_CHECK(slowStatistics.ticks >= 22);
+	BOOST_CHECK(slowStatistics.executions <= 9);
+	BOOST_CHECK(slowStatistics.overruns + 1 >= slowStatistics.ticks);
+	BOOST_CHECK(slowStatistics.meanExecutionUs() >= 60000);
+
+	// 60 ms falls in [2^15, 2^16) us, a late wakeup in the next bin
+	uint64_t histogram = 0;
+	for (uint64_t count : slowStatistics.executionHistogram)
+		histogram += count;
+	BOOST_CHECK_EQUAL(histogram, slowStatistics.executions);
+	BOOST_CHECK_EQUAL(slowStatistics.executionHistogram[15] + slowStatistics.executionHistogram[16],
+			  slowStatistics.executions);
+
+	BOOST_CHECK_EQUAL(total.overruns, slowStatistics.overruns + fastStatistics.overruns);
+	BOOST_CHECK_EQUAL(total.executions, slowStatistics.executions + fastStatistics.executions);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeProvider_simulated_clock)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	BOOST_REQUIRE(provider->config(1.0, TimeProvider::CUC_LVL1, false, 0, 0, 0));
+	BOOST_CHECK(!provider->advanceTime(1000));
+
+	// 2023-01-01T00:00:00Z
+	const int64_t startMs = 1672531200000;
+	provider->setSimulatedTime(startMs);
+	BOOST_CHECK(provider->isSimulatedTime());
+	uint32_t startCUC = provider->getCurrentTimeDefaultCUC();
+	BOOST_CHECK_EQUAL(startCUC, TimeProvider::toDefaultCUC(startMs / 1000));
+	BOOST_CHECK_EQUAL(provider->getCurrentTimeUTC().hour, 0);
+
+	std::atomic<uint32_t> seconds{ 0 }, minutes{ 0 }, lateTicks{ 0 };
+	provider->addHandler(0xfff4, [&](TimeProvider* p) {
+		// Each tick reads the time it was due at
+		if (p->getCurrentTimeDefaultCUC() != startCUC + seconds + 1)
+			lateTicks++;
+		seconds++;
+	});
+	provider->addHandler(0xfff5, [&minutes](TimeProvider*) { minutes++; }, 60000);
+
+	// A day of ticks runs as fast as the callbacks do
+	auto start = std::chrono::steady_clock::now();
+	BOOST_REQUIRE(provider->advanceTime(24 * 3600 * 1000));
+	long elapsedMs = std::chrono::duration_cast<std::chrono::milliseconds>(std::chrono::steady_clock::now() - start).count();
+	uint32_t endCUC = provider->getCurrentTimeDefaultCUC();
+	provider->removeHandler(0xfff4);
+	provider->removeHandler(0xfff5);
+
+	std::cout << "Simulated day: " << elapsedMs << " ms" << std::endl;
+
+	BOOST_CHECK_EQUAL(seconds, 24 * 3600);
+	BOOST_CHECK_EQUAL(minutes, 24 * 60);
+	BOOST_CHECK_EQUAL(lateTicks, 0);
+	BOOST_CHECK_EQUAL(endCUC, startCUC + 24 * 3600);
+	BOOST_CHECK(elapsedMs < 60000);
+
+	provider->setRealTime();
+	BOOST_CHECK(!provider->isSimulatedTime());
+	BOOST_CHECK(std::abs(static_cast<int64_t>(provider->getCurrentTimeDefaultCUC()) -
+			     static_cast<int64_t>(TimeProvider::toDefaultCUC(time(nullptr)))) <= 1);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeProvider_remove_during_advance)
+    {
+	TimeProvider* provider = TimeProvider::getInstance();
+	BOOST_REQUIRE(provider->config(1.0, TimeProvider::CUC_LVL1, false, 0, 0, 0));
+	provider->setSimulatedTime(1672531200000);
+
+	std::atomic<bool> running{ false };
+	std::atomic<int> calls{ 0 };
+	provider->addHandler(0xfff6, [&](TimeProvider*) {
+		running = true;
+		calls++;
+		std::this_thread::sleep_for(std::chrono::milliseconds(2));
+		running = false;
+	});
+
+	std::thread advance([provider] { provider->advanceTime(3600 * 1000); });
+	std::this_thread::sleep_for(std::chrono::milliseconds(50));
+
+	// advanceTime() holds the executor while it waits, the callback is stopped anyway
+	provider->removeHandler(0xfff6);
+	bool runningAfterRemove = running;
+	int callsAfterRemove = calls;
+	advance.join();
+
+	BOOST_CHECK(callsAfterRemove > 0);
+	BOOST_CHECK(!runningAfterRemove);
+	BOOST_CHECK_EQUAL(calls, callsAfterRemove);
+	provider->setRealTime();
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
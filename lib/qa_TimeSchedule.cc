@@ -0,0 +1,217 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include <gnuradio/pus/Helpers/TimeSchedule.h>
+#include <boost/test/unit_test.hpp>
+#include <algorithm>
+#include <chrono>
+#include <iostream>
+#include <random>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    const size_t ScheduleSize = 10000;
+
+    TimeSchedule::ScheduledActivity makeActivity(uint32_t releaseTime, uint16_t sequenceCount)
+    {
+	TimeSchedule::ScheduledActivity activity;
+	activity.requestID.applicationID = 0x19;
+	activity.requestID.sequenceCount = sequenceCount;
+	activity.requestReleaseTime = Time::DefaultCUC(static_cast<uint64_t>(releaseTime));
+	return activity;
+    }
+
+    bool isOrdered(const TimeSchedule& schedule)
+    {
+	const TimeSchedule::ScheduledActivity* previous = nullptr;
+	for (auto& activity : schedule) {
+		if (!(activity.first == activity.second.requestReleaseTime))
+			return false;
+		if (previous && activity.second.requestReleaseTime < previous->requestReleaseTime)
+			return false;
+		previous = &activity.second;
+	}
+	return true;
+    }
+
+    double elapsedUs(std::chrono::steady_clock::time_point start)
+    {
+	return std::chrono::duration<double, std::micro>(std::chrono::steady_clock::now() - start).count();
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_TimeSchedule_order)
+    {
+	TimeSchedule schedule(4);
+
+	BOOST_CHECK(schedule.insert(makeActivity(300, 1)));
+	BOOST_CHECK(schedule.insert(makeActivity(100, 2)));
+	BOOST_CHECK(schedule.insert(makeActivity(300, 3)));
+	BOOST_CHECK(schedule.insert(makeActivity(200, 4)));
+	BOOST_CHECK(!schedule.insert(makeActivity(50, 5)));
+	BOOST_CHECK_EQUAL(schedule.available(), 0);
+	BOOST_CHECK(schedule.nextReleaseTime() == Time::DefaultCUC(static_cast<uint64_t>(100)));
+
+	// Activities with the same release time keep their insertion order
+	std::vector<uint16_t> released;
+	auto release = [&released](TimeSchedule::ScheduledActivity& activity) {
+		released.push_back(activity.requestID.sequenceCount);
+	};
+	BOOST_CHECK_EQUAL(schedule.releaseDue(Time::DefaultCUC(static_cast<uint64_t>(99)), release), 0);
+	BOOST_CHECK_EQUAL(schedule.releaseDue(Time::DefaultCUC(static_cast<uint64_t>(300)), release), 4);
+	BOOST_CHECK((released == std::vector<uint16_t>{ 2, 4, 1, 3 }));
+	BOOST_CHECK(schedule.empty());
+	BOOST_CHECK(schedule.nextReleaseTime() == Time::DefaultCUC::max());
+
+	schedule.insert(makeActivity(300, 1));
+	schedule.insert(makeActivity(100, 2));
+	TimeSchedule::RequestID requestID = makeActivity(0, 2).requestID;
+	schedule.shift(schedule.find(requestID), std::chrono::seconds(500));
+	BOOST_CHECK_EQUAL(schedule.begin()->second.requestID.sequenceCount, 1);
+	BOOST_CHECK(schedule.find(requestID)->second.requestReleaseTime == Time::DefaultCUC(static_cast<uint64_t>(600)));
+
+	schedule.shiftAll(std::chrono::seconds(-100));
+	BOOST_CHECK(schedule.nextReleaseTime() == Time::DefaultCUC(static_cast<uint64_t>(200)));
+	BOOST_CHECK(isOrdered(schedule));
+
+	schedule.erase(schedule.find(requestID));
+	BOOST_CHECK(schedule.find(requestID) == schedule.end());
+	BOOST_CHECK_EQUAL(schedule.size(), 1);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeSchedule_benchmark)
+    {
+	std::mt19937 rng(0x5053);
+	std::uniform_int_distribution<uint32_t> releaseTimes(1000, 1000 + 24 * 3600);
+	TimeSchedule schedule(ScheduleSize);
+
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < ScheduleSize; i++)
+		BOOST_REQUIRE(schedule.insert(makeActivity(releaseTimes(rng), static_cast<uint16_t>(i))));
+	double insertUs = elapsedUs(start);
+	BOOST_CHECK(!schedule.insert(makeActivity(0, 0)));
+	BOOST_CHECK(isOrdered(schedule));
+
+	// Each shift moves the earliest activity past the others
+	start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < ScheduleSize; i++) {
+		auto first = schedule.find(schedule.begin()->second.requestID);
+		schedule.shift(first, std::chrono::seconds(24 * 3600));
+	}
+	double shiftUs = elapsedUs(start);
+
+	start = std::chrono::steady_clock::now();
+	schedule.shiftAll(std::chrono::seconds(-24 * 3600));
+	double shiftAllUs = elapsedUs(start);
+	BOOST_CHECK(isOrdered(schedule));
+	BOOST_CHECK_EQUAL(schedule.size(), ScheduleSize);
+
+	// Half a day is due in a single tick, released in order
+	size_t released = 0;
+	bool inOrder = true;
+	Time::DefaultCUC previous(static_cast<uint64_t>(0));
+	start = std::chrono::steady_clock::now();
+	schedule.releaseDue(Time::DefaultCUC(static_cast<uint64_t>(1000 + 12 * 3600)),
+			    [&](TimeSchedule::ScheduledActivity& activity) {
+		inOrder = inOrder && !(activity.requestReleaseTime < previous);
+		previous = activity.requestReleaseTime;
+		released++;
+	});
+	double releaseUs = elapsedUs(start);
+
+	std::cout << "TimeSchedule, " << ScheduleSize << " activities: insert " << insertUs / ScheduleSize
+		  << " us, shift " << shiftUs / ScheduleSize << " us, shift all " << shiftAllUs
+		  << " us, release " << released << " due activities " << releaseUs << " us" << std::endl;
+
+	BOOST_CHECK(inOrder);
+	BOOST_CHECK(released > ScheduleSize / 3);
+	BOOST_CHECK(released < 2 * ScheduleSize / 3);
+	BOOST_CHECK_EQUAL(schedule.size() + released, ScheduleSize);
+	BOOST_CHECK(!(schedule.nextReleaseTime() < previous));
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeSchedule_request_index)
+    {
+	TimeSchedule schedule(8);
+
+	// Duplicated request IDs are found in release order, as a scan of the schedule would
+	schedule.insert(makeActivity(500, 7));
+	schedule.insert(makeActivity(200, 7));
+	schedule.insert(makeActivity(200, 8));
+	schedule.insert(makeActivity(300, 7));
+	TimeSchedule::RequestID requestID = makeActivity(0, 7).requestID;
+
+	BOOST_CHECK(schedule.find(requestID)->second.requestReleaseTime == Time::DefaultCUC(static_cast<uint64_t>(200)));
+	schedule.shift(schedule.find(requestID), std::chrono::seconds(100));
+	BOOST_CHECK(schedule.find(requestID)->second.requestReleaseTime == Time::DefaultCUC(static_cast<uint64_t>(300)));
+	schedule.erase(schedule.find(requestID));
+	schedule.shiftAll(std::chrono::seconds(10));
+	BOOST_CHECK(schedule.find(requestID)->second.requestReleaseTime == Time::DefaultCUC(static_cast<uint64_t>(310)));
+
+	schedule.releaseDue(Time::DefaultCUC(static_cast<uint64_t>(310)), [](TimeSchedule::ScheduledActivity&) {});
+	BOOST_CHECK(schedule.find(makeActivity(0, 8).requestID) == schedule.end());
+	BOOST_CHECK(schedule.find(requestID)->second.requestReleaseTime == Time::DefaultCUC(static_cast<uint64_t>(510)));
+
+	// Other request ID fields
+	TimeSchedule::ScheduledActivity activity = makeActivity(400, 7);
+	activity.requestID.sourceID = 3;
+	schedule.insert(std::move(activity));
+	TimeSchedule::RequestID otherSource = requestID;
+	otherSource.sourceID = 3;
+	BOOST_CHECK(schedule.find(otherSource)->second.requestReleaseTime == Time::DefaultCUC(static_cast<uint64_t>(400)));
+	schedule.clear();
+	BOOST_CHECK(schedule.find(otherSource) == schedule.end());
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeSchedule_bulk_requests_by_id)
+    {
+	std::mt19937 rng(0x5053);
+	std::uniform_int_distribution<uint32_t> releaseTimes(1000, 1000 + 24 * 3600);
+	TimeSchedule schedule(ScheduleSize);
+	for (size_t i = 0; i < ScheduleSize; i++)
+		schedule.insert(makeActivity(releaseTimes(rng), static_cast<uint16_t>(i)));
+
+	std::vector<TimeSchedule::RequestID> requestIDs;
+	for (size_t i = 0; i < ScheduleSize; i++)
+		requestIDs.push_back(makeActivity(0, static_cast<uint16_t>(i)).requestID);
+	std::shuffle(requestIDs.begin(), requestIDs.end(), rng);
+
+	// TC[11,9], TC[11,7] and TC[11,5] over the whole schedule
+	size_t found = 0;
+	auto start = std::chrono::steady_clock::now();
+	for (auto& requestID : requestIDs)
+		found += (schedule.find(requestID) != schedule.end()) ? 1 : 0;
+	double findUs = elapsedUs(start);
+
+	start = std::chrono::steady_clock::now();
+	for (auto& requestID : requestIDs)
+		schedule.shift(schedule.find(requestID), std::chrono::seconds(60));
+	double shiftUs = elapsedUs(start);
+	BOOST_CHECK(isOrdered(schedule));
+
+	start = std::chrono::steady_clock::now();
+	for (auto& requestID : requestIDs)
+		schedule.erase(schedule.find(requestID));
+	double deleteUs = elapsedUs(start);
+
+	std::cout << "TimeSchedule, " << ScheduleSize << " requests by ID: find " << findUs / ScheduleSize
+		  << " us, shift " << shiftUs / ScheduleSize << " us, delete " << deleteUs / ScheduleSize
+		  << " us" << std::endl;
+
+	BOOST_CHECK_EQUAL(found, ScheduleSize);
+	BOOST_CHECK(schedule.empty());
+	// A scan of the schedule per ID would take tens of milliseconds
+	BOOST_CHECK(findUs < 20000);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
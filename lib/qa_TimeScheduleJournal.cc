@@ -0,0 +1,263 @@
+/* -*- c++ -*- */
+/*
+ * Copyright 2023 Gustavo Gonzalez.
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ */
+
+#include <gnuradio/attributes.h>
+#include <gnuradio/pus/Helpers/TimeScheduleJournal.h>
+#include <boost/test/unit_test.hpp>
+#include <algorithm>
+#include <chrono>
+#include <cstdio>
+#include <filesystem>
+#include <iostream>
+#include <random>
+
+namespace gr {
+  namespace pus {
+
+    namespace {
+
+    const size_t ScheduleSize = 10000;
+
+    // Journal in a new temporary directory, removed with it
+    struct JournalFiles {
+	std::filesystem::path directory;
+	std::string path;
+
+	JournalFiles() {
+		directory = std::filesystem::temp_directory_path() /
+			    ("qa_TimeScheduleJournal_" + std::to_string(std::random_device()()));
+		std::filesystem::create_directories(directory);
+		path = (directory / "schedule.journal").string();
+	}
+
+	~JournalFiles() {
+		std::filesystem::remove_all(directory);
+	}
+    };
+
+    TimeSchedule::ScheduledActivity makeActivity(uint32_t releaseTime, uint16_t sequenceCount)
+    {
+	TimeSchedule::ScheduledActivity activity;
+	activity.requestID.applicationID = 0x19;
+	activity.requestID.sequenceCount = sequenceCount;
+	activity.requestReleaseTime = Time::DefaultCUC(static_cast<uint64_t>(releaseTime));
+	const uint8_t data[] = { 0x18, 0x19, 0xc0, static_cast<uint8_t>(sequenceCount), 0x00, 0x01, 0x21,
+				 0x11, 0x01 };
+	activity.request = Message(data, sizeof(data));
+	return activity;
+    }
+
+    // Inserts the activity in the schedule and in the journal, as the ST[11] service does
+    void insert(TimeSchedule& schedule, TimeScheduleJournal& journal, TimeSchedule::ScheduledActivity activity)
+    {
+	journal.recordInsert(activity);
+	schedule.insert(std::move(activity));
+    }
+
+    bool isEqual(const TimeSchedule& left, const TimeSchedule& right)
+    {
+	if (left.size() != right.size())
+		return false;
+	for (auto l = left.begin(), r = right.begin(); l != left.end(); ++l, ++r) {
+		if (!(l->first == r->first) || (l->second.requestID != r->second.requestID) ||
+		    (l->second.request.getMessageData().size() != r->second.request.getMessageData().size()) ||
+		    !std::equal(l->second.request.getMessageRawData(),
+				l->second.request.getMessageRawData() + l->second.request.getMessageData().size(),
+				r->second.request.getMessageRawData()))
+			return false;
+	}
+	return true;
+    }
+
+    } // namespace
+
+    BOOST_AUTO_TEST_CASE(test_TimeScheduleJournal_replay)
+    {
+	JournalFiles files;
+	TimeSchedule schedule(8);
+	{
+		TimeScheduleJournal journal;
+		BOOST_REQUIRE(journal.open(files.path, schedule));
+		BOOST_CHECK(schedule.empty());
+
+		insert(schedule, journal, makeActivity(500, 1));
+		insert(schedule, journal, makeActivity(200, 2));
+		insert(schedule, journal, makeActivity(300, 3));
+		insert(schedule, journal, makeActivity(300, 2));
+
+		// Nothing reaches the file until the journal is flushed
+		size_t journalSize = journal.journalSize();
+		BOOST_CHECK_EQUAL(std::filesystem::file_size(files.path), journalSize);
+		BOOST_CHECK(journal.pending() > 0);
+		BOOST_CHECK(journal.flush());
+		BOOST_CHECK_EQUAL(journal.pending(), 0);
+		BOOST_CHECK(std::filesystem::file_size(files.path) > journalSize);
+
+		TimeSchedule::RequestID requestID = makeActivity(0, 2).requestID;
+		schedule.shift(schedule.find(requestID), std::chrono::seconds(400));
+		journal.recordShift(requestID, std::chrono::seconds(400));
+		schedule.erase(schedule.find(requestID));
+		journal.recordDelete(requestID);
+		schedule.shiftAll(std::chrono::seconds(-50));
+		journal.recordShiftAll(std::chrono::seconds(-50));
+		schedule.releaseDue(Time::DefaultCUC(static_cast<uint64_t>(250)), [](TimeSchedule::ScheduledActivity&) {});
+		journal.recordRelease(Time::DefaultCUC(static_cast<uint64_t>(250)));
+		insert(schedule, journal, makeActivity(1000, 4));
+	}
+
+	// Closing the journal flushed the last records
+	TimeSchedule reloaded(8);
+	TimeScheduleJournal journal;
+	BOOST_REQUIRE(journal.open(files.path, reloaded));
+	BOOST_CHECK_EQUAL(journal.replayed(), 9);
+	BOOST_CHECK(isEqual(schedule, reloaded));
+	BOOST_CHECK_EQUAL(reloaded.size(), 3);
+	BOOST_CHECK(reloaded.find(makeActivity(0, 2).requestID)->second.requestReleaseTime ==
+		    Time::DefaultCUC(static_cast<uint64_t>(550)));
+
+	reloaded.clear();
+	journal.recordReset();
+	journal.close();
+	TimeSchedule empty(8);
+	BOOST_REQUIRE(journal.open(files.path, empty));
+	BOOST_CHECK(empty.empty());
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeScheduleJournal_recovery)
+    {
+	JournalFiles files;
+	TimeSchedule schedule(8);
+	{
+		TimeScheduleJournal journal;
+		BOOST_REQUIRE(journal.open(files.path, schedule));
+		insert(schedule, journal, makeActivity(100, 1));
+		insert(schedule, journal, makeActivity(200, 2));
+	}
+
+	// A write interrupted in the middle of the last record
+	std::filesystem::resize_file(files.path, std::filesystem::file_size(files.path) - 3);
+	TimeSchedule reloaded(8);
+	TimeScheduleJournal journal;
+	BOOST_REQUIRE(journal.open(files.path, reloaded));
+	BOOST_CHECK_EQUAL(reloaded.size(), 1);
+	insert(reloaded, journal, makeActivity(300, 3));
+	journal.close();
+
+	TimeSchedule recovered(8);
+	BOOST_REQUIRE(journal.open(files.path, recovered));
+	BOOST_CHECK(isEqual(reloaded, recovered));
+	BOOST_CHECK_EQUAL(journal.dropped(), 0);
+	journal.close();
+
+	// A smaller schedule keeps what fits, the rest is reported
+	TimeSchedule smaller(1);
+	BOOST_REQUIRE(journal.open(files.path, smaller));
+	BOOST_CHECK_EQUAL(smaller.size(), 1);
+	BOOST_CHECK_EQUAL(journal.dropped(), 1);
+	BOOST_CHECK_EQUAL(journal.replayed(), 1);
+	journal.close();
+
+	// A file that is not a journal is not overwritten
+	std::string other = (files.directory / "other").string();
+	{
+		std::FILE* file = std::fopen(other.c_str(), "w");
+		std::fputs("not a journal", file);
+		std::fclose(file);
+	}
+	TimeSchedule unused(8);
+	BOOST_CHECK(!journal.open(other, unused));
+	BOOST_CHECK_EQUAL(std::filesystem::file_size(other), 13);
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeScheduleJournal_compaction)
+    {
+	JournalFiles files;
+	TimeSchedule schedule(8);
+	TimeScheduleJournal journal(256);
+	BOOST_REQUIRE(journal.open(files.path, schedule));
+
+	// The same activities shifted again and again
+	for (uint16_t i = 0; i < 4; i++)
+		insert(schedule, journal, makeActivity(1000, i));
+	for (int i = 0; !journal.compactionDue(); i++) {
+		TimeSchedule::RequestID requestID = makeActivity(0, i % 4).requestID;
+		schedule.shift(schedule.find(requestID), std::chrono::seconds(1));
+		journal.recordShift(requestID, std::chrono::seconds(1));
+	}
+	BOOST_REQUIRE(journal.flush());
+	size_t journalSize = journal.journalSize();
+	BOOST_REQUIRE(journal.compact(schedule));
+	BOOST_CHECK(journal.journalSize() < journalSize);
+	BOOST_CHECK(!journal.compactionDue());
+	BOOST_CHECK(std::filesystem::exists(files.path + ".snapshot"));
+
+	insert(schedule, journal, makeActivity(5000, 9));
+	std::filesystem::copy_file(files.path, files.path + ".old");
+	journal.close();
+
+	TimeSchedule reloaded(8);
+	BOOST_REQUIRE(journal.open(files.path, reloaded));
+	BOOST_CHECK_EQUAL(journal.replayed(), 5);
+	BOOST_CHECK(isEqual(schedule, reloaded));
+	journal.close();
+
+	// The journal of the previous snapshot, left by a crash during the compaction, is not replayed
+	std::filesystem::path journalPath(files.path);
+	{
+		TimeSchedule compacted(8);
+		BOOST_REQUIRE(journal.open(files.path, compacted));
+		BOOST_REQUIRE(journal.compact(compacted));
+		journal.close();
+	}
+	std::filesystem::copy_file(files.path + ".old", journalPath, std::filesystem::copy_options::overwrite_existing);
+	TimeSchedule recovered(8);
+	BOOST_REQUIRE(journal.open(files.path, recovered));
+	BOOST_CHECK(isEqual(schedule, recovered));
+    }
+
+    BOOST_AUTO_TEST_CASE(test_TimeScheduleJournal_reload_benchmark)
+    {
+	JournalFiles files;
+	std::mt19937 rng(0x5053);
+	std::uniform_int_distribution<uint32_t> releaseTimes(1000, 1000 + 24 * 3600);
+	TimeSchedule schedule(ScheduleSize);
+	TimeScheduleJournal journal;
+	BOOST_REQUIRE(journal.open(files.path, schedule));
+
+	auto start = std::chrono::steady_clock::now();
+	for (size_t i = 0; i < ScheduleSize; i++)
+		insert(schedule, journal, makeActivity(releaseTimes(rng), static_cast<uint16_t>(i)));
+	double recordUs = std::chrono::duration<double, std::micro>(std::chrono::steady_clock::now() - start).count();
+
+	start = std::chrono::steady_clock::now();
+	BOOST_REQUIRE(journal.flush());
+	double flushMs = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+	journal.close();
+
+	TimeSchedule fromJournal(ScheduleSize);
+	start = std::chrono::steady_clock::now();
+	BOOST_REQUIRE(journal.open(files.path, fromJournal));
+	double journalMs = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+	BOOST_REQUIRE(journal.compact(fromJournal));
+	journal.close();
+
+	TimeSchedule fromSnapshot(ScheduleSize);
+	start = std::chrono::steady_clock::now();
+	BOOST_REQUIRE(journal.open(files.path, fromSnapshot));
+	double snapshotMs = std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+
+	std::cout << "TimeScheduleJournal, " << ScheduleSize << " activities: record " << recordUs / ScheduleSize
+		  << " us, flush " << flushMs << " ms, reload journal " << journalMs << " ms, reload snapshot "
+		  << snapshotMs << " ms" << std::endl;
+
+	BOOST_CHECK(isEqual(schedule, fromJournal));
+	BOOST_CHECK(isEqual(schedule, fromSnapshot));
+	BOOST_CHECK(snapshotMs < 500);
+    }
+
+  } /* namespace pus */
+} /* namespace gr */
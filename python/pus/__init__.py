@@ -21,4 +21,5 @@ except ModuleNotFoundError:
 
 # import any pure python here
 from .serial_transceiver import serial_transceiver
+from . import codec
 #
@@ -0,0 +1,68 @@
+/*
+ * Copyright 2023 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+/***********************************************************************************/
+/* This file is automatically generated using bindtool and can be manually edited  */
+/* The following lines can be configured to regenerate this file during cmake      */
+/* If manual edits are made, the following tags should be modified accordingly.    */
+/* BINDTOOL_GEN_AUTOMATIC(0)                                                       */
+/* BINDTOOL_USE_PYGCCXML(0)                                                        */
+/* BINDTOOL_HEADER_FILE(APIDDemux.h)                                        */
+/* BINDTOOL_HEADER_FILE_HASH(d4e60ed0c6b728a3ab8c9048ce95a6fb)                     */
+/***********************************************************************************/
+
+#include <pybind11/complex.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/pus/APIDDemux.h>
+// pydoc.h is automatically generated in the build directory
+#include <APIDDemux_pydoc.h>
+
+void bind_APIDDemux(py::module& m)
+{
+
+    using APIDDemux    = gr::pus::APIDDemux;
+
+
+    py::class_<APIDDemux, gr::block, gr::basic_block,
+        std::shared_ptr<APIDDemux>>(m, "APIDDemux", D(APIDDemux))
+
+        .def(py::init(&APIDDemux::make),
+           py::arg("apid_list"),
+           D(APIDDemux,make)
+        )
+
+        .def("getStatistics",&APIDDemux::getStatistics,
+           py::arg("apid"),
+           D(APIDDemux,getStatistics)
+        )
+
+        .def("resetStatistics",&APIDDemux::resetStatistics,
+           D(APIDDemux,resetStatistics)
+        )
+
+
+
+        ;
+
+
+
+
+}
+
+
+
+
+
+
+
+
@@ -0,0 +1,94 @@
+/*
+ * Copyright 2023 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+/***********************************************************************************/
+/* This file is automatically generated using bindtool and can be manually edited  */
+/* The following lines can be configured to regenerate this file during cmake      */
+/* If manual edits are made, the following tags should be modified accordingly.    */
+/* BINDTOOL_GEN_AUTOMATIC(0)                                                       */
+/* BINDTOOL_USE_PYGCCXML(0)                                                        */
+/* BINDTOOL_HEADER_FILE(Helpers/CRCHelper.h)                                        */
+/* BINDTOOL_HEADER_FILE_HASH(be74742c095cfac18605d81b74d8ddcf)                     */
+/***********************************************************************************/
+
+#include <pybind11/complex.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/pus/Helpers/CRCHelper.h>
+#include "buffer_span.h"
+// pydoc.h is automatically generated in the build directory
+#include <CRCHelper_pydoc.h>
+
+void bind_CRCHelper(py::module& m)
+{
+
+    using CRCHelper    = gr::pus::CRCHelper;
+    using buffer_span  = gr::pus::python::buffer_span;
+    using index_array  = py::array_t<int64_t, py::array::c_style | py::array::forcecast>;
+
+
+    py::class_<CRCHelper>(m, "CRCHelper", D(CRCHelper))
+
+        .def_readonly_static("CRCInitialValue", &CRCHelper::CRCInitialValue)
+
+        .def_readonly_static("CRCPolynomial", &CRCHelper::CRCPolynomial)
+
+        .def_static("calculateCRC",
+           [](const py::buffer& data, uint16_t shiftReg) {
+               buffer_span span(data);
+               py::gil_scoped_release release;
+               return CRCHelper::calculateCRC(span.data, span.size, shiftReg);
+           },
+           py::arg("data"),
+           py::arg("shiftReg") = CRCHelper::CRCInitialValue,
+           D(CRCHelper,calculateCRC)
+        )
+
+        .def_static("validateCRC",
+           [](const py::buffer& data) {
+               buffer_span span(data);
+               py::gil_scoped_release release;
+               return CRCHelper::validateCRC(span.data, span.size);
+           },
+           py::arg("data"),
+           D(CRCHelper,validateCRC)
+        )
+
+        .def_static("calculateCRCBatch",
+           [](const py::buffer& data, const index_array& offsets, const index_array& lengths) {
+               buffer_span span(data);
+               gr::pus::python::check_ranges(span, offsets, lengths);
+
+               py::array_t<uint16_t> crcs(offsets.size());
+               uint16_t* crc = crcs.mutable_data();
+               const int64_t* offset = offsets.data();
+               const int64_t* length = lengths.data();
+               {
+                   py::gil_scoped_release release;
+                   for (py::ssize_t i = 0; i < offsets.size(); i++)
+                       crc[i] = CRCHelper::calculateCRC(span.data + offset[i], length[i]);
+               }
+               return crcs;
+           },
+           py::arg("data"),
+           py::arg("offsets"),
+           py::arg("lengths"),
+           D(CRCHelper,calculateCRCBatch)
+        )
+
+        ;
+
+
+
+
+}
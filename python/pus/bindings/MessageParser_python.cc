@@ -0,0 +1,220 @@
+/*
+ * Copyright 2023 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+/***********************************************************************************/
+/* This file is automatically generated using bindtool and can be manually edited  */
+/* The following lines can be configured to regenerate this file during cmake      */
+/* If manual edits are made, the following tags should be modified accordingly.    */
+/* BINDTOOL_GEN_AUTOMATIC(0)                                                       */
+/* BINDTOOL_USE_PYGCCXML(0)                                                        */
+/* BINDTOOL_HEADER_FILE(Helpers/MessageParser.h)                                        */
+/* BINDTOOL_HEADER_FILE_HASH(29ff70de8cd49d1b135a56d1845a9b28)                     */
+/***********************************************************************************/
+
+#include <pybind11/complex.h>
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/pus/Helpers/MessageParser.h>
+#include "buffer_span.h"
+#include <vector>
+// pydoc.h is automatically generated in the build directory
+#include <MessageParser_pydoc.h>
+
+namespace {
+
+gr::pus::MessageArray toMessageArray(const gr::pus::python::buffer_span& span)
+{
+    if (span.size > ECSSMaxMessageSize)
+        throw py::value_error("payload larger than ECSSMaxMessageSize");
+    return gr::pus::MessageArray(span.data, span.data + span.size);
+}
+
+py::list toList(std::vector<gr::pus::Message>& messages)
+{
+    py::list list(messages.size());
+    for (size_t i = 0; i < messages.size(); i++)
+        list[i] = py::cast(std::move(messages[i]));
+    return list;
+}
+
+} // namespace
+
+void bind_MessageParser(py::module& m)
+{
+
+    using MessageParser = gr::pus::MessageParser;
+    using Message       = gr::pus::Message;
+    using MessageArray  = gr::pus::MessageArray;
+    using buffer_span   = gr::pus::python::buffer_span;
+    using index_array   = py::array_t<int64_t, py::array::c_style | py::array::forcecast>;
+
+
+    // Singleton, owned by the library
+    py::class_<MessageParser, std::unique_ptr<MessageParser, py::nodelete>>(m, "MessageParser", D(MessageParser))
+
+        .def_static("getInstance",&MessageParser::getInstance,
+           py::return_value_policy::reference,
+           D(MessageParser,getInstance)
+        )
+
+        .def("config",&MessageParser::config,
+           py::arg("apid"),
+           py::arg("crc_enable"),
+           D(MessageParser,config)
+        )
+
+        .def("getApplicationId",&MessageParser::getApplicationId,
+           D(MessageParser,getApplicationId)
+        )
+
+        .def("ParseMessageCommand",
+           [](MessageParser& parser, const py::buffer& data) {
+               buffer_span span(data);
+               return parser.ParseMessageCommand(span.data, span.size);
+           },
+           py::arg("data"),
+           D(MessageParser,ParseMessageCommand)
+        )
+
+        .def("ParseMessageCommands",
+           [](MessageParser& parser, const py::buffer& data, const index_array& offsets, const index_array& lengths) {
+               buffer_span span(data);
+               gr::pus::python::check_ranges(span, offsets, lengths);
+
+               std::vector<Message> messages;
+               const int64_t* offset = offsets.data();
+               const int64_t* length = lengths.data();
+               {
+                   py::gil_scoped_release release;
+                   messages.reserve(offsets.size());
+                   for (py::ssize_t i = 0; i < offsets.size(); i++)
+                       messages.push_back(parser.ParseMessageCommand(span.data + offset[i], length[i]));
+               }
+               return toList(messages);
+           },
+           py::arg("data"),
+           py::arg("offsets"),
+           py::arg("lengths"),
+           D(MessageParser,ParseMessageCommands)
+        )
+
+        .def("CreateMessageReport",
+           [](MessageParser& parser, uint8_t scTimeRef, uint8_t serviceType, uint8_t messageType,
+              uint16_t messageTypeCounter, uint16_t destinationId, const py::buffer& payload) {
+               MessageArray array = toMessageArray(buffer_span(payload));
+               return parser.CreateMessageReport(scTimeRef, serviceType, messageType, messageTypeCounter,
+                                                 destinationId, array);
+           },
+           py::arg("scTimeRef"),
+           py::arg("serviceType"),
+           py::arg("messageType"),
+           py::arg("messageTypeCounter"),
+           py::arg("destinationId"),
+           py::arg("payload"),
+           D(MessageParser,CreateMessageReport,0)
+        )
+
+        .def("CreateMessageReport",
+           [](MessageParser& parser, uint16_t apid, uint16_t packetSequenceCounter, uint8_t scTimeRef,
+              uint8_t serviceType, uint8_t messageType, uint16_t messageTypeCounter, uint16_t destinationId,
+              const py::buffer& payload) {
+               MessageArray array = toMessageArray(buffer_span(payload));
+               return parser.CreateMessageReport(apid, packetSequenceCounter, scTimeRef, serviceType,
+                                                 messageType, messageTypeCounter, destinationId, array);
+           },
+           py::arg("apid"),
+           py::arg("packetSequenceCounter"),
+           py::arg("scTimeRef"),
+           py::arg("serviceType"),
+           py::arg("messageType"),
+           py::arg("messageTypeCounter"),
+           py::arg("destinationId"),
+           py::arg("payload"),
+           D(MessageParser,CreateMessageReport,1)
+        )
+
+        .def("CreateMessageReports",
+           [](MessageParser& parser, uint16_t apid, uint16_t firstSequenceCounter, uint8_t scTimeRef,
+              uint8_t serviceType, uint8_t messageType, uint16_t firstMessageTypeCounter,
+              uint16_t destinationId, const py::buffer& payloads, const index_array& offsets,
+              const index_array& lengths) {
+               buffer_span span(payloads);
+               gr::pus::python::check_ranges(span, offsets, lengths);
+
+               std::vector<Message> messages;
+               const int64_t* offset = offsets.data();
+               const int64_t* length = lengths.data();
+               for (py::ssize_t i = 0; i < offsets.size(); i++) {
+                   if (length[i] > ECSSMaxMessageSize)
+                       throw py::value_error("payload larger than ECSSMaxMessageSize");
+               }
+               {
+                   py::gil_scoped_release release;
+                   messages.reserve(offsets.size());
+                   for (py::ssize_t i = 0; i < offsets.size(); i++) {
+                       MessageArray array(span.data + offset[i], span.data + offset[i] + length[i]);
+                       messages.push_back(parser.CreateMessageReport(apid, (firstSequenceCounter + i) & 0x3FFFU,
+                                                                     scTimeRef, serviceType, messageType,
+                                                                     static_cast<uint16_t>(firstMessageTypeCounter + i),
+                                                                     destinationId, array));
+                   }
+               }
+               return toList(messages);
+           },
+           py::arg("apid"),
+           py::arg("firstSequenceCounter"),
+           py::arg("scTimeRef"),
+           py::arg("serviceType"),
+           py::arg("messageType"),
+           py::arg("firstMessageTypeCounter"),
+           py::arg("destinationId"),
+           py::arg("payloads"),
+           py::arg("offsets"),
+           py::arg("lengths"),
+           D(MessageParser,CreateMessageReports)
+        )
+
+        .def("CreateEmptyMessageReport",&MessageParser::CreateEmptyMessageReport,
+           py::arg("scTimeRef"),
+           py::arg("serviceType"),
+           py::arg("messageType"),
+           py::arg("messageTypeCounter"),
+           py::arg("destinationId"),
+           D(MessageParser,CreateEmptyMessageReport)
+        )
+
+        .def("closeMessage",&MessageParser::closeMessage,
+           py::arg("message"),
+           D(MessageParser,closeMessage)
+        )
+
+        .def("assertTC",&MessageParser::assertTC,
+           py::arg("request"),
+           py::arg("expectedServiceType"),
+           py::arg("expectedMessageType"),
+           D(MessageParser,assertTC)
+        )
+
+        .def("assertTM",&MessageParser::assertTM,
+           py::arg("request"),
+           py::arg("expectedServiceType"),
+           py::arg("expectedMessageType"),
+           D(MessageParser,assertTM)
+        )
+
+        ;
+
+
+
+
+}
@@ -0,0 +1,249 @@
+/*
+ * Copyright 2023 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+/***********************************************************************************/
+/* This file is automatically generated using bindtool and can be manually edited  */
+/* The following lines can be configured to regenerate this file during cmake      */
+/* If manual edits are made, the following tags should be modified accordingly.    */
+/* BINDTOOL_GEN_AUTOMATIC(0)                                                       */
+/* BINDTOOL_USE_PYGCCXML(0)                                                        */
+/* BINDTOOL_HEADER_FILE(Helpers/Message.h)                                        */
+/* BINDTOOL_HEADER_FILE_HASH(af4e489a50ab6e71247358d2741218f7)                     */
+/***********************************************************************************/
+
+#include <pybind11/complex.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/pus/Helpers/Message.h>
+#include "buffer_span.h"
+// pydoc.h is automatically generated in the build directory
+#include <Message_pydoc.h>
+
+void bind_Message(py::module& m)
+{
+
+    using Message      = gr::pus::Message;
+    using buffer_span  = gr::pus::python::buffer_span;
+
+
+    py::class_<Message, std::shared_ptr<Message>> message(m, "Message", py::buffer_protocol(), D(Message));
+
+    py::enum_<Message::PacketType>(message, "PacketType")
+        .value("TM", Message::TM)
+        .value("TC", Message::TC)
+        .export_values()
+        ;
+
+    message
+
+        .def(py::init<>(),
+           D(Message,Message,0)
+        )
+
+        .def(py::init([](const py::buffer& data) {
+               buffer_span span(data);
+               return Message(span.data, span.size);
+           }),
+           py::arg("data"),
+           D(Message,Message,1)
+        )
+
+        // The packet bytes, without copying them. The view is read-only, the packet is
+        // changed through the setters so the decoded header stays up to date. Appending to
+        // the message may move its storage, so views taken before an append must not be
+        // used after it.
+        .def_buffer([](const Message& message) -> py::buffer_info {
+               return py::buffer_info(const_cast<uint8_t*>(message.getMessageRawData()), 1,
+                                      py::format_descriptor<uint8_t>::format(), 1,
+                                      { static_cast<py::ssize_t>(message.getMessageSize()) }, { 1 },
+                                      /* readonly */ true);
+           })
+
+        .def("__len__",&Message::getMessageSize)
+
+        .def("__bytes__",
+           [](const Message& message) {
+               return py::bytes(reinterpret_cast<const char*>(message.getMessageRawData()),
+                                message.getMessageSize());
+           }
+        )
+
+        .def("setMessageData",
+           [](Message& message, const py::buffer& data) {
+               buffer_span span(data);
+               message.setMessageData(span.data, span.size);
+           },
+           py::arg("data"),
+           D(Message,setMessageData)
+        )
+
+        .def("getMessageSize",&Message::getMessageSize,
+           D(Message,getMessageSize)
+        )
+
+        .def("getMessageReadPosition",&Message::getMessageReadPosition,
+           D(Message,getMessageReadPosition)
+        )
+
+        .def("setMessageReadPosition",&Message::setMessageReadPosition,
+           py::arg("position"),
+           D(Message,setMessageReadPosition)
+        )
+
+        .def("getMessageVersion",&Message::getMessageVersion,
+           D(Message,getMessageVersion)
+        )
+
+        .def("getMessagePacketType",&Message::getMessagePacketType,
+           D(Message,getMessagePacketType)
+        )
+
+        .def("getMessageSecondaryHeaderFlag",&Message::getMessageSecondaryHeaderFlag,
+           D(Message,getMessageSecondaryHeaderFlag)
+        )
+
+        .def("getMessageApplicationId",&Message::getMessageApplicationId,
+           D(Message,getMessageApplicationId)
+        )
+
+        .def("getMessageSequenceFlags",&Message::getMessageSequenceFlags,
+           D(Message,getMessageSequenceFlags)
+        )
+
+        .def("getMessagePacketSequenceCount",&Message::getMessagePacketSequenceCount,
+           D(Message,getMessagePacketSequenceCount)
+        )
+
+        .def("getMessagePacketDataLength",&Message::getMessagePacketDataLength,
+           D(Message,getMessagePacketDataLength)
+        )
+
+        .def("getMessagePUSVersion",&Message::getMessagePUSVersion,
+           D(Message,getMessagePUSVersion)
+        )
+
+        .def("getMessageSCTimeRef",&Message::getMessageSCTimeRef,
+           D(Message,getMessageSCTimeRef)
+        )
+
+        .def("getMessageAckFlags",&Message::getMessageAckFlags,
+           D(Message,getMessageAckFlags)
+        )
+
+        .def("getMessageServiceType",&Message::getMessageServiceType,
+           D(Message,getMessageServiceType)
+        )
+
+        .def("setMessageServiceType",&Message::setMessageServiceType,
+           py::arg("serviceType"),
+           D(Message,setMessageServiceType)
+        )
+
+        .def("getMessageType",&Message::getMessageType,
+           D(Message,getMessageType)
+        )
+
+        .def("setMessageType",&Message::setMessageType,
+           py::arg("messageType"),
+           D(Message,setMessageType)
+        )
+
+        .def("getMessageTypeCounter",&Message::getMessageTypeCounter,
+           D(Message,getMessageTypeCounter)
+        )
+
+        .def("getMessageDestinationId",&Message::getMessageDestinationId,
+           D(Message,getMessageDestinationId)
+        )
+
+        .def("getMessageSourceId",&Message::getMessageSourceId,
+           D(Message,getMessageSourceId)
+        )
+
+        .def("getMessageCRC",&Message::getMessageCRC,
+           D(Message,getMessageCRC)
+        )
+
+        .def("assertTC",&Message::assertTC,
+           py::arg("expectedServiceType"),
+           py::arg("expectedMessageType"),
+           D(Message,assertTC)
+        )
+
+        .def("assertTM",&Message::assertTM,
+           py::arg("expectedServiceType"),
+           py::arg("expectedMessageType"),
+           D(Message,assertTM)
+        )
+
+        .def("readArray",
+           [](Message& message, uint16_t size) {
+               if (message.getMessageReadPosition() + size > message.getMessageSize())
+                   throw py::index_error("read past the end of the message");
+               py::bytes array(reinterpret_cast<const char*>(message.getMessageRawData()) +
+                               message.getMessageReadPosition(), size);
+               message.setMessageReadPosition(message.getMessageReadPosition() + size);
+               return array;
+           },
+           py::arg("size"),
+           D(Message,readArray)
+        )
+
+        .def("readBoolean",&Message::readBoolean,D(Message,readBoolean))
+        .def("readEnum8",&Message::readEnum8,D(Message,readEnum8))
+        .def("readEnum16",&Message::readEnum16,D(Message,readEnum16))
+        .def("readEnum32",&Message::readEnum32,D(Message,readEnum32))
+        .def("readUint8",&Message::readUint8,D(Message,readUint8))
+        .def("readUint16",&Message::readUint16,D(Message,readUint16))
+        .def("readUint32",&Message::readUint32,D(Message,readUint32))
+        .def("readUint64",&Message::readUint64,D(Message,readUint64))
+        .def("readSint8",&Message::readSint8,D(Message,readSint8))
+        .def("readSint16",&Message::readSint16,D(Message,readSint16))
+        .def("readSint32",&Message::readSint32,D(Message,readSint32))
+        .def("readSint64",&Message::readSint64,D(Message,readSint64))
+        .def("readFloat",&Message::readFloat,D(Message,readFloat))
+        .def("readDouble",&Message::readDouble,D(Message,readDouble))
+
+        .def("appendUint8Array",
+           [](Message& message, const py::buffer& data) {
+               buffer_span span(data);
+               message.appendUint8Array(span.data, span.size);
+           },
+           py::arg("data"),
+           D(Message,appendUint8Array)
+        )
+
+        .def("appendBoolean",&Message::appendBoolean,py::arg("value"),D(Message,appendBoolean))
+        .def("appendEnum8",&Message::appendEnum8,py::arg("value"),D(Message,appendEnum8))
+        .def("appendEnum16",&Message::appendEnum16,py::arg("value"),D(Message,appendEnum16))
+        .def("appendEnum32",&Message::appendEnum32,py::arg("value"),D(Message,appendEnum32))
+        .def("appendUint8",&Message::appendUint8,py::arg("value"),D(Message,appendUint8))
+        .def("appendUint16",&Message::appendUint16,py::arg("value"),D(Message,appendUint16))
+        .def("appendUint32",&Message::appendUint32,py::arg("value"),D(Message,appendUint32))
+        .def("appendUint64",&Message::appendUint64,py::arg("value"),D(Message,appendUint64))
+        .def("appendSint8",&Message::appendSint8,py::arg("value"),D(Message,appendSint8))
+        .def("appendSint16",&Message::appendSint16,py::arg("value"),D(Message,appendSint16))
+        .def("appendSint32",&Message::appendSint32,py::arg("value"),D(Message,appendSint32))
+        .def("appendSint64",&Message::appendSint64,py::arg("value"),D(Message,appendSint64))
+        .def("appendFloat",&Message::appendFloat,py::arg("value"),D(Message,appendFloat))
+        .def("appendDouble",&Message::appendDouble,py::arg("value"),D(Message,appendDouble))
+
+        .def_static("copyCount",&Message::copyCount,
+           D(Message,copyCount)
+        )
+
+        ;
+
+
+
+
+}
@@ -0,0 +1,74 @@
+/*
+ * Copyright 2023 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+/***********************************************************************************/
+/* This file is automatically generated using bindtool and can be manually edited  */
+/* The following lines can be configured to regenerate this file during cmake      */
+/* If manual edits are made, the following tags should be modified accordingly.    */
+/* BINDTOOL_GEN_AUTOMATIC(0)                                                       */
+/* BINDTOOL_USE_PYGCCXML(0)                                                        */
+/* BINDTOOL_HEADER_FILE(PacketDeframer.h)                                              */
+/* BINDTOOL_HEADER_FILE_HASH(7bb5fbf01d73dfe40ebd6a43e8a9ffc0)                     */
+/***********************************************************************************/
+
+#include <pybind11/complex.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+namespace py = pybind11;
+
+#include <gnuradio/pus/PacketDeframer.h>
+// pydoc.h is automatically generated in the build directory
+#include <PacketDeframer_pydoc.h>
+
+void bind_PacketDeframer(py::module& m)
+{
+
+    using PacketDeframer    = gr::pus::PacketDeframer;
+
+
+    py::class_<PacketDeframer, gr::sync_block, gr::block, gr::basic_block,
+        std::shared_ptr<PacketDeframer>> PacketDeframer_class(m, "PacketDeframer", D(PacketDeframer));
+
+    py::enum_<PacketDeframer::Framing>(PacketDeframer_class, "Framing")
+        .value("SyncMarker", PacketDeframer::SyncMarker)
+        .value("KISS", PacketDeframer::KISS)
+        .value("HDLC", PacketDeframer::HDLC)
+        .export_values();
+
+    PacketDeframer_class
+        .def(py::init(&PacketDeframer::make),
+           py::arg("framing") = 0,
+           py::arg("syncMarker") = 0x1ACFFC1DU,
+           py::arg("checkCRC") = true,
+           D(PacketDeframer,make)
+        )
+
+        .def("packetCount",&PacketDeframer::packetCount,
+           D(PacketDeframer,packetCount)
+        )
+
+        .def("droppedCount",&PacketDeframer::droppedCount,
+           D(PacketDeframer,droppedCount)
+        )
+
+        ;
+
+
+
+
+}
+
+
+
+
+
+
+
+
@@ -37,6 +37,8 @@ void bind_TimeBasedSchedulingService(py::module& m)
         std::shared_ptr<TimeBasedSchedulingService>>(m, "TimeBasedSchedulingService", D(TimeBasedSchedulingService))
 
         .def(py::init(&TimeBasedSchedulingService::make),
+           py::arg("capacity") = 10,
+           py::arg("journal_file") = "",
            D(TimeBasedSchedulingService,make)
         )
         
@@ -51,6 +51,15 @@ void bind_TimeConfig(py::module& m)
         .def("getCurrentTimeUTC", &TimeConfig::getCurrentTimeUTC, D(TimeConfig, getCurrentTimeUTC))    
 
         .def("getCurrentTimeDefaultCUC", &TimeConfig::getCurrentTimeDefaultCUC, D(TimeConfig, getCurrentTimeDefaultCUC))            
+
+        .def("setSimulatedTime", &TimeConfig::setSimulatedTime, py::arg("unixMs"), D(TimeConfig, setSimulatedTime))
+
+        .def("advanceTime", &TimeConfig::advanceTime, py::arg("milliseconds"),
+           py::call_guard<py::gil_scoped_release>(), D(TimeConfig, advanceTime))
+
+        .def("setRealTime", &TimeConfig::setRealTime, D(TimeConfig, setRealTime))
+
+        .def("isSimulatedTime", &TimeConfig::isSimulatedTime, D(TimeConfig, isSimulatedTime))
         ;
 
 
@@ -0,0 +1,64 @@
+/*
+ * Copyright 2023 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+
+#ifndef INCLUDED_PUS_PYTHON_BUFFER_SPAN_H
+#define INCLUDED_PUS_PYTHON_BUFFER_SPAN_H
+
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <cstdint>
+
+namespace gr {
+namespace pus {
+namespace python {
+
+namespace py = pybind11;
+
+/**
+ * Byte view of an object supporting the buffer protocol (bytes, bytearray, memoryview,
+ * NumPy uint8 arrays...). The buffer is not copied, and stays valid while the view exists.
+ */
+struct buffer_span {
+    py::buffer_info info;
+    const uint8_t* data;
+    size_t size;
+
+    explicit buffer_span(const py::buffer& buffer) : info(buffer.request())
+    {
+        if (info.itemsize != 1 || info.ndim > 1 || (info.ndim == 1 && info.strides[0] != 1))
+            throw py::value_error("expected a contiguous buffer of bytes");
+        data = static_cast<const uint8_t*>(info.ptr);
+        size = static_cast<size_t>(info.size);
+    }
+};
+
+/**
+ * Offsets and lengths of the packets of a batch, checked against the size of the buffer
+ */
+inline void check_ranges(const buffer_span& span,
+                         const py::array_t<int64_t, py::array::c_style | py::array::forcecast>& offsets,
+                         const py::array_t<int64_t, py::array::c_style | py::array::forcecast>& lengths)
+{
+    if (offsets.ndim() != 1 || lengths.ndim() != 1 || offsets.size() != lengths.size())
+        throw py::value_error("offsets and lengths must be 1-D arrays of the same size");
+
+    auto offset = offsets.unchecked<1>();
+    auto length = lengths.unchecked<1>();
+    for (py::ssize_t i = 0; i < offsets.size(); i++) {
+        if (offset(i) < 0 || length(i) < 0 ||
+            static_cast<size_t>(offset(i) + length(i)) > span.size)
+            throw py::index_error("packet range out of the buffer");
+    }
+}
+
+} // namespace python
+} // namespace pus
+} // namespace gr
+
+#endif /* INCLUDED_PUS_PYTHON_BUFFER_SPAN_H */
@@ -0,0 +1,55 @@
+/*
+ * Copyright 2024 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+#include "pydoc_macros.h"
+#define D(...) DOC(gr, pus, __VA_ARGS__)
+/*
+  This file contains placeholders for docstrings for the Python bindings.
+  Do not edit! These were automatically extracted during the binding process
+  and will be overwritten during the build process
+ */
+
+
+
+ static const char *__doc_gr_pus_MessageParser = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_getInstance = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_config = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_getApplicationId = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_ParseMessageCommand = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_ParseMessageCommands = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_CreateMessageReport_0 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_CreateMessageReport_1 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_CreateMessageReports = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_CreateEmptyMessageReport = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_closeMessage = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_assertTC = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_MessageParser_assertTM = R"doc()doc";
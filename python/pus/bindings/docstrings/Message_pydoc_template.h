@@ -0,0 +1,190 @@
+/*
+ * Copyright 2024 Free Software Foundation, Inc.
+ *
+ * This file is part of GNU Radio
+ *
+ * SPDX-License-Identifier: GPL-3.0-or-later
+ *
+ */
+#include "pydoc_macros.h"
+#define D(...) DOC(gr, pus, __VA_ARGS__)
+/*
+  This file contains placeholders for docstrings for the Python bindings.
+  Do not edit! These were automatically extracted during the binding process
+  and will be overwritten during the build process
+ */
+
+
+
+ static const char *__doc_gr_pus_Message = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_Message_0 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_Message_1 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_setMessageData = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageSize = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageReadPosition = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_setMessageReadPosition = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageVersion = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessagePacketType = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageSecondaryHeaderFlag = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageApplicationId = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageSequenceFlags = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessagePacketSequenceCount = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessagePacketDataLength = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessagePUSVersion = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageSCTimeRef = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageAckFlags = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageServiceType = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_setMessageServiceType = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageType = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_setMessageType = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageTypeCounter = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageDestinationId = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageSourceId = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_getMessageCRC = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_assertTC = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_assertTM = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readArray = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readBoolean = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readEnum8 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readEnum16 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readEnum32 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readUint8 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readUint16 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readUint32 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readUint64 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readSint8 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readSint16 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readSint32 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readSint64 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readFloat = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_readDouble = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendUint8Array = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendBoolean = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendEnum8 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendEnum16 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendEnum32 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendUint8 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendUint16 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendUint32 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendUint64 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendSint8 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendSint16 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendSint32 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendSint64 = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendFloat = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_appendDouble = R"doc()doc";
+
+
+ static const char *__doc_gr_pus_Message_copyCount = R"doc()doc";
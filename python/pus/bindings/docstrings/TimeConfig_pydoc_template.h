@@ -28,6 +28,18 @@
  static const char* __doc_gr_pus_TimeConfig_getCurrentTimeUTC = R"doc()doc";  
 
   
- static const char* __doc_gr_pus_TimeConfig_getCurrentTimeDefaultCUC = R"doc()doc";     
+ static const char* __doc_gr_pus_TimeConfig_getCurrentTimeDefaultCUC = R"doc()doc";
+
+
+ static const char* __doc_gr_pus_TimeConfig_setSimulatedTime = R"doc()doc";
+
+
+ static const char* __doc_gr_pus_TimeConfig_advanceTime = R"doc()doc";
+
+
+ static const char* __doc_gr_pus_TimeConfig_setRealTime = R"doc()doc";
+
+
+ static const char* __doc_gr_pus_TimeConfig_isSimulatedTime = R"doc()doc";     
 
   
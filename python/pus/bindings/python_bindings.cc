@@ -46,6 +46,11 @@ namespace py = pybind11;
     void bind_RequestSequencingService(py::module& m);
     void bind_FileManagementService(py::module& m);
     void bind_pdu_vector_source(py::module& m);
+    void bind_PacketDeframer(py::module& m);
+    void bind_APIDDemux(py::module& m);
+    void bind_Message(py::module& m);
+    void bind_MessageParser(py::module& m);
+    void bind_CRCHelper(py::module& m);
 // ) END BINDING_FUNCTION_PROTOTYPES
 
 
@@ -99,5 +104,10 @@ PYBIND11_MODULE(pus_python, m)
     bind_RequestSequencingService(m);
     bind_FileManagementService(m);
     bind_pdu_vector_source(m);
+    bind_PacketDeframer(m);
+    bind_APIDDemux(m);
+    bind_Message(m);
+    bind_MessageParser(m);
+    bind_CRCHelper(m);
     // ) END BINDING_FUNCTION_CALLS
 }
\ No newline at end of file
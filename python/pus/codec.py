@@ -0,0 +1,414 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2023 Gustavo Gonzalez.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+"""
+Batch encoder and decoder of PUS Space Packets.
+
+Packets are described by NumPy structured arrays, one row per packet, and are encoded to or
+decoded from a single flat uint8 buffer. Headers are packed and unpacked column-wise, and the
+CRC of all the packets is computed at once with a table lookup, so the cost per packet is a
+handful of vector operations instead of a Python loop per byte.
+
+The layouts follow the C++ Message and MessageParser:
+
+  - Primary header (6 bytes): version, type, secondary header flag, APID, sequence flags,
+    sequence count and packet data length.
+  - TC secondary header (5 bytes): PUS version, acknowledgement flags, service type, message
+    type and source ID.
+  - TM secondary header (7 bytes): PUS version, spacecraft time reference status, service type,
+    message type, message type counter and destination ID, followed by the time stamp.
+  - Optional CRC-16/CCITT (2 bytes) over the whole packet.
+
+This module only depends on NumPy, so ground tools can use it without GNU Radio.
+"""
+
+import numpy
+
+CCSDS_PRIMARY_HEADER_SIZE = 6
+ECSS_SECONDARY_TC_HEADER_SIZE = 5
+ECSS_SECONDARY_TM_HEADER_SIZE = 7
+ECSS_CRC_SIZE = 2
+ECSS_PUS_VERSION = 2
+TIME_SIZE = 4
+
+PACKET_TYPE_TM = 0
+PACKET_TYPE_TC = 1
+
+CRC_INITIAL_VALUE = 0xFFFF
+CRC_POLYNOMIAL = 0x1021
+
+# Columns of a decoded packet, and the header fields to fill in before encoding one.
+# offset/length locate the packet in the buffer, payload_offset/payload_length its user data.
+TC_DTYPE = numpy.dtype([
+    ('apid', numpy.uint16),
+    ('sequence_flags', numpy.uint8),
+    ('sequence_count', numpy.uint16),
+    ('pus_version', numpy.uint8),
+    ('ack_flags', numpy.uint8),
+    ('service_type', numpy.uint8),
+    ('message_type', numpy.uint8),
+    ('source_id', numpy.uint16),
+    ('offset', numpy.int64),
+    ('length', numpy.int64),
+    ('payload_offset', numpy.int64),
+    ('payload_length', numpy.int64),
+    ('crc_valid', numpy.bool_),
+])
+
+TM_DTYPE = numpy.dtype([
+    ('apid', numpy.uint16),
+    ('sequence_flags', numpy.uint8),
+    ('sequence_count', numpy.uint16),
+    ('pus_version', numpy.uint8),
+    ('sc_time_ref', numpy.uint8),
+    ('service_type', numpy.uint8),
+    ('message_type', numpy.uint8),
+    ('message_type_counter', numpy.uint16),
+    ('destination_id', numpy.uint16),
+    ('time', numpy.uint64),
+    ('offset', numpy.int64),
+    ('length', numpy.int64),
+    ('payload_offset', numpy.int64),
+    ('payload_length', numpy.int64),
+    ('crc_valid', numpy.bool_),
+])
+
+
+def _crc_tables():
+    """
+    Builds the byte-wise table, and the table that advances the CRC by a big endian halfword
+    """
+    crc = numpy.arange(256, dtype=numpy.uint32) << 8
+    for _ in range(8):
+        crc = numpy.where(crc & 0x8000, (crc << 1) ^ CRC_POLYNOMIAL, crc << 1) & 0xFFFF
+    byte_table = crc.astype(numpy.uint16)
+
+    # With a 16-bit register, a whole halfword shifts the register out:
+    # crc' = table16[crc ^ word], and table16[h << 8 | l] = (table[h] << 8) ^ table[table[h] >> 8 ^ l]
+    high = byte_table.astype(numpy.uint32)[:, None]
+    low = numpy.arange(256, dtype=numpy.uint32)[None, :]
+    word_table = ((high << 8) & 0xFF00) ^ byte_table[(high >> 8) ^ low]
+    return byte_table, word_table.reshape(-1).astype(numpy.uint16)
+
+
+CRC_TABLE, CRC_WORD_TABLE = _crc_tables()
+
+
+def _as_buffer(data):
+    """
+    Returns a uint8 view of a bytes-like object or array, without copying it
+    """
+    if isinstance(data, numpy.ndarray):
+        return data.reshape(-1).view(numpy.uint8)
+    return numpy.frombuffer(data, dtype=numpy.uint8)
+
+
+def crc16(data, crc=CRC_INITIAL_VALUE):
+    """
+    Returns the CRC-16/CCITT of a bytes-like object, as computed by CRCHelper::calculateCRC().
+    A previous result can be passed as crc to continue the computation over more data.
+    """
+    buffer = _as_buffer(data)
+    even = buffer.size & ~1
+    words = (buffer[0:even:2].astype(numpy.uint16) << 8) | buffer[1:even:2]
+    for word in words.tolist():
+        crc = int(CRC_WORD_TABLE[crc ^ word])
+    if even != buffer.size:
+        crc = ((crc << 8) & 0xFFFF) ^ int(CRC_TABLE[(crc >> 8) ^ int(buffer[-1])])
+    return crc
+
+
+def crc16_batch(data, offsets, lengths):
+    """
+    Returns the CRC-16/CCITT of every range [offsets[i], offsets[i] + lengths[i]) of data.
+
+    The packets are processed together, one halfword of each per step. They are sorted longest
+    first, so that the packets still being processed are always a prefix of the batch.
+    """
+    buffer = _as_buffer(data)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64).reshape(-1)
+    lengths = numpy.asarray(lengths, dtype=numpy.int64).reshape(-1)
+
+    order = numpy.argsort(-lengths, kind='stable')
+    position = offsets[order]
+    sorted_lengths = lengths[order]
+    crc = numpy.full(order.size, CRC_INITIAL_VALUE, dtype=numpy.uint16)
+
+    words = sorted_lengths // 2
+    steps = int(words[0]) if words.size else 0
+    if steps:
+        # Big endian halfword starting at every byte of the buffer
+        halfwords = (buffer[:-1].astype(numpy.uint16) << 8) | buffer[1:]
+        # Number of packets with at least 2 * (step + 1) bytes, for every step
+        active = numpy.searchsorted(-words, -numpy.arange(1, steps + 1), side='right').tolist()
+        for count in active:
+            crc[:count] = CRC_WORD_TABLE[crc[:count] ^ halfwords[position[:count]]]
+            position[:count] += 2
+
+    odd = numpy.nonzero(sorted_lengths & 1)[0]
+    if odd.size:
+        last = buffer[position[odd]]
+        register = crc[odd]
+        crc[odd] = ((register << 8) & 0xFFFF) ^ CRC_TABLE[(register >> 8) ^ last]
+
+    result = numpy.empty_like(crc)
+    result[order] = crc
+    return result
+
+
+def split(data):
+    """
+    Returns the offset and the length of every complete packet in data.
+
+    Packets are cut using the packet data length field. As in the serial transceiver deframer,
+    bytes that can not start a packet (wrong packet version) are skipped one at a time, and a
+    truncated packet at the end of data is left out.
+    """
+    buffer = data.tobytes() if isinstance(data, numpy.ndarray) else bytes(data)
+    size = len(buffer)
+    offsets = []
+    lengths = []
+    position = 0
+    while position + CCSDS_PRIMARY_HEADER_SIZE <= size:
+        if buffer[position] & 0xe0:
+            position += 1
+            continue
+        length = ((buffer[position + 4] << 8) | buffer[position + 5]) + CCSDS_PRIMARY_HEADER_SIZE + 1
+        if position + length > size:
+            break
+        offsets.append(position)
+        lengths.append(length)
+        position += length
+
+    return numpy.array(offsets, dtype=numpy.int64), numpy.array(lengths, dtype=numpy.int64)
+
+
+def _gather(buffer, offsets, size):
+    """
+    Returns the first size bytes of every packet as a (packets, size) array
+    """
+    return buffer[offsets[:, None] + numpy.arange(size)]
+
+
+def _decode_primary(packets, header, offsets, lengths):
+    packets['apid'] = ((header[:, 0].astype(numpy.uint16) << 8) | header[:, 1]) & 0x07FF
+    packets['sequence_flags'] = header[:, 2] >> 6
+    packets['sequence_count'] = ((header[:, 2].astype(numpy.uint16) << 8) | header[:, 3]) & 0x3FFF
+    packets['pus_version'] = header[:, 6] >> 4
+    packets['service_type'] = header[:, 7]
+    packets['message_type'] = header[:, 8]
+    packets['offset'] = offsets
+    packets['length'] = lengths
+
+
+def _check_crc(packets, buffer, crc):
+    if crc:
+        # The CRC of a packet followed by its own CRC field is zero
+        packets['crc_valid'] = crc16_batch(buffer, packets['offset'], packets['length']) == 0
+        packets['payload_length'] -= ECSS_CRC_SIZE
+    else:
+        packets['crc_valid'] = True
+
+
+def decode_tc(data, crc=True):
+    """
+    Decodes every TC in data into a TC_DTYPE array.
+
+    Packets shorter than the primary and TC secondary headers (and the CRC, if crc is set) are
+    left out.
+    """
+    buffer = _as_buffer(data)
+    offsets, lengths = split(buffer)
+    header_size = CCSDS_PRIMARY_HEADER_SIZE + ECSS_SECONDARY_TC_HEADER_SIZE
+    keep = lengths >= header_size + (ECSS_CRC_SIZE if crc else 0)
+    offsets, lengths = offsets[keep], lengths[keep]
+
+    packets = numpy.zeros(offsets.size, dtype=TC_DTYPE)
+    header = _gather(buffer, offsets, header_size)
+    _decode_primary(packets, header, offsets, lengths)
+    packets['ack_flags'] = header[:, 6] & 0x0F
+    packets['source_id'] = (header[:, 9].astype(numpy.uint16) << 8) | header[:, 10]
+    packets['payload_offset'] = offsets + header_size
+    packets['payload_length'] = lengths - header_size
+    _check_crc(packets, buffer, crc)
+    return packets
+
+
+def decode_tm(data, crc=True, time_size=TIME_SIZE):
+    """
+    Decodes every TM in data into a TM_DTYPE array.
+
+    The time stamp is read as a big endian integer of time_size bytes (up to 8), as appended by
+    TimeProvider::getCurrentTimeStamp(). Packets shorter than the headers, the time stamp and
+    the CRC, if crc is set, are left out.
+    """
+    if not 0 <= time_size <= 8:
+        raise ValueError("time_size must be between 0 and 8 bytes")
+    buffer = _as_buffer(data)
+    offsets, lengths = split(buffer)
+    header_size = CCSDS_PRIMARY_HEADER_SIZE + ECSS_SECONDARY_TM_HEADER_SIZE + time_size
+    keep = lengths >= header_size + (ECSS_CRC_SIZE if crc else 0)
+    offsets, lengths = offsets[keep], lengths[keep]
+
+    packets = numpy.zeros(offsets.size, dtype=TM_DTYPE)
+    header = _gather(buffer, offsets, header_size)
+    _decode_primary(packets, header, offsets, lengths)
+    packets['sc_time_ref'] = header[:, 6] & 0x0F
+    packets['message_type_counter'] = (header[:, 9].astype(numpy.uint16) << 8) | header[:, 10]
+    packets['destination_id'] = (header[:, 11].astype(numpy.uint16) << 8) | header[:, 12]
+    time = numpy.zeros(offsets.size, dtype=numpy.uint64)
+    for i in range(CCSDS_PRIMARY_HEADER_SIZE + ECSS_SECONDARY_TM_HEADER_SIZE, header_size):
+        time = (time << numpy.uint64(8)) | header[:, i]
+    packets['time'] = time
+    packets['payload_offset'] = offsets + header_size
+    packets['payload_length'] = lengths - header_size
+    _check_crc(packets, buffer, crc)
+    return packets
+
+
+def payloads(data, packets):
+    """
+    Returns the payload of every decoded packet as a view of data
+    """
+    buffer = _as_buffer(data)
+    return [buffer[start:start + size]
+            for start, size in zip(packets['payload_offset'].tolist(), packets['payload_length'].tolist())]
+
+
+def _payload_lengths(payloads, count):
+    if isinstance(payloads, numpy.ndarray) and payloads.ndim == 2:
+        return numpy.full(count, payloads.shape[1], dtype=numpy.int64), payloads.reshape(-1).view(numpy.uint8)
+    lengths = numpy.fromiter(map(len, payloads), dtype=numpy.int64, count=count)
+    return lengths, numpy.frombuffer(b''.join(payloads), dtype=numpy.uint8)
+
+
+def _encode(packets, payloads, packet_type, secondary_size, crc):
+    """
+    Lays out the packets in a new buffer, with their payloads in place. Returns the buffer, the
+    position of every packet, and their headers with the primary header and the service and
+    message types filled in, for the caller to complete.
+    """
+    count = packets.size
+    if payloads is None:
+        payloads = numpy.zeros((count, 0), dtype=numpy.uint8)
+    if len(payloads) != count:
+        raise ValueError("one payload is needed for every packet")
+    payload_lengths, flat = _payload_lengths(payloads, count)
+
+    header_size = CCSDS_PRIMARY_HEADER_SIZE + secondary_size
+    lengths = header_size + payload_lengths + (ECSS_CRC_SIZE if crc else 0)
+    offsets = numpy.zeros(count, dtype=numpy.int64)
+    numpy.cumsum(lengths[:-1], out=offsets[1:])
+    buffer = numpy.zeros(int(lengths.sum()), dtype=numpy.uint8)
+
+    # Every payload byte goes to the payload start of its packet, plus its index in the payload
+    first = numpy.zeros(count, dtype=numpy.int64)
+    numpy.cumsum(payload_lengths[:-1], out=first[1:])
+    buffer[numpy.repeat(offsets + header_size - first, payload_lengths) + numpy.arange(flat.size)] = flat
+
+    packet_id = (packet_type << 12) | (1 << 11) | (packets['apid'].astype(numpy.uint16) & 0x07FF)
+    sequence = (packets['sequence_flags'].astype(numpy.uint16) << 14) | \
+        (packets['sequence_count'].astype(numpy.uint16) & 0x3FFF)
+    data_length = lengths - CCSDS_PRIMARY_HEADER_SIZE - 1
+
+    header = numpy.zeros((count, header_size), dtype=numpy.uint8)
+    header[:, 0] = packet_id >> 8
+    header[:, 1] = packet_id & 0xFF
+    header[:, 2] = sequence >> 8
+    header[:, 3] = sequence & 0xFF
+    header[:, 4] = data_length >> 8
+    header[:, 5] = data_length & 0xFF
+    header[:, 7] = packets['service_type']
+    header[:, 8] = packets['message_type']
+    return buffer, offsets, lengths, header
+
+
+def _finish(packets, buffer, offsets, lengths, header, crc):
+    """
+    Writes the headers into the buffer, appends the CRC of every packet, and records the
+    position of every packet in packets
+    """
+    header_size = header.shape[1]
+    buffer[offsets[:, None] + numpy.arange(header_size)] = header
+    if crc:
+        body = lengths - ECSS_CRC_SIZE
+        crcs = crc16_batch(buffer, offsets, body)
+        buffer[offsets + body] = crcs >> 8
+        buffer[offsets + body + 1] = crcs & 0xFF
+
+    if packets.flags.writeable:
+        packets['offset'] = offsets
+        packets['length'] = lengths
+        packets['payload_offset'] = offsets + header_size
+        packets['payload_length'] = lengths - header_size - (ECSS_CRC_SIZE if crc else 0)
+        packets['crc_valid'] = True
+    return buffer
+
+
+def encode_tc(packets, payloads=None, crc=True):
+    """
+    Encodes the TCs described by a TC_DTYPE array into a single uint8 buffer.
+
+    payloads holds the application data of every packet, either as a sequence of bytes-like
+    objects or as a (packets, size) uint8 array. The packet data length is computed from the
+    payloads, and the offset/length/payload columns of packets are filled in.
+    """
+    packets = numpy.asarray(packets)
+    buffer, offsets, lengths, header = _encode(packets, payloads, PACKET_TYPE_TC,
+                                               ECSS_SECONDARY_TC_HEADER_SIZE, crc)
+    source_id = packets['source_id'].astype(numpy.uint16)
+    header[:, 6] = (packets['pus_version'] << 4) | (packets['ack_flags'] & 0x0F)
+    header[:, 9] = source_id >> 8
+    header[:, 10] = source_id & 0xFF
+    return _finish(packets, buffer, offsets, lengths, header, crc)
+
+
+def encode_tm(packets, payloads=None, crc=True, time_size=TIME_SIZE):
+    """
+    Encodes the TMs described by a TM_DTYPE array into a single uint8 buffer.
+
+    The time column is written as a big endian integer of time_size bytes (up to 8). payloads is
+    handled as in encode_tc().
+    """
+    if not 0 <= time_size <= 8:
+        raise ValueError("time_size must be between 0 and 8 bytes")
+    packets = numpy.asarray(packets)
+    buffer, offsets, lengths, header = _encode(packets, payloads, PACKET_TYPE_TM,
+                                               ECSS_SECONDARY_TM_HEADER_SIZE + time_size, crc)
+    counter = packets['message_type_counter'].astype(numpy.uint16)
+    destination = packets['destination_id'].astype(numpy.uint16)
+    header[:, 6] = (packets['pus_version'] << 4) | (packets['sc_time_ref'] & 0x0F)
+    header[:, 9] = counter >> 8
+    header[:, 10] = counter & 0xFF
+    header[:, 11] = destination >> 8
+    header[:, 12] = destination & 0xFF
+    time = packets['time'].astype(numpy.uint64)
+    for i in range(time_size):
+        shift = numpy.uint64(8 * (time_size - 1 - i))
+        header[:, CCSDS_PRIMARY_HEADER_SIZE + ECSS_SECONDARY_TM_HEADER_SIZE + i] = (time >> shift) & numpy.uint64(0xFF)
+    return _finish(packets, buffer, offsets, lengths, header, crc)
+
+
+def new_tc(count):
+    """
+    Returns a TC_DTYPE array for count packets, with the PUS version set and unsegmented packets
+    """
+    packets = numpy.zeros(count, dtype=TC_DTYPE)
+    packets['sequence_flags'] = 3
+    packets['pus_version'] = ECSS_PUS_VERSION
+    return packets
+
+
+def new_tm(count):
+    """
+    Returns a TM_DTYPE array for count packets, with the PUS version set and unsegmented packets
+    """
+    packets = numpy.zeros(count, dtype=TM_DTYPE)
+    packets['sequence_flags'] = 3
+    packets['pus_version'] = ECSS_PUS_VERSION
+    return packets
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2023 Gustavo Gonzalez.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+try:
+    from gnuradio import pus
+except ImportError:
+    import os
+    import sys
+    dirname, filename = os.path.split(os.path.abspath(__file__))
+    sys.path.append(os.path.join(dirname, "bindings"))
+    from gnuradio import pus
+import numpy
+import pmt
+import time
+
+class qa_APIDDemux(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tb = gr.top_block()
+
+    def tearDown(self):
+        self.tb = None
+
+    def test_001_route_per_apid(self):
+        apids = (0x17, 0x42, 0x7ff)
+        demux = pus.APIDDemux(apids)
+        debugs = [blocks.message_debug() for apid in apids]
+        other = blocks.message_debug()
+        for i in range(0, len(apids)):
+            self.tb.msg_connect((demux, 'out' + str(i)), (debugs[i], 'store'))
+        self.tb.msg_connect((demux, 'other'), (other, 'store'))
+
+        self.tb.start()
+        for counter in range(0, 5):
+            for apid in apids + (0x100,):
+                demux.to_basic_block()._post(pmt.intern('in'), makePDU(apid, counter))
+        time.sleep(.1)
+        self.tb.stop()
+        self.tb.wait()
+
+        for i in range(0, len(apids)):
+            self.assertTrue(debugs[i].num_messages() == 5)
+            for j in range(0, 5):
+                data = pmt.u8vector_elements(pmt.cdr(debugs[i].get_message(j)))
+                self.assertTrue((((data[0] << 8) | data[1]) & 0x7ff) == apids[i])
+        self.assertTrue(other.num_messages() == 5)
+
+    def test_002_single_apid(self):
+        demux = pus.APIDDemux((0x17,))
+        d1 = blocks.message_debug()
+        self.tb.msg_connect((demux, 'out'), (d1, 'store'))
+
+        self.tb.start()
+        demux.to_basic_block()._post(pmt.intern('in'), makePDU(0x17, 0))
+        demux.to_basic_block()._post(pmt.intern('in'), makePDU(0x18, 0))
+        time.sleep(.1)
+        self.tb.stop()
+        self.tb.wait()
+
+        self.assertTrue(d1.num_messages() == 1)
+
+    def test_003_sequence_gaps_and_duplicates(self):
+        demux = pus.APIDDemux((0x17, 0x42))
+        d1 = blocks.message_debug()
+        self.tb.msg_connect((demux, 'out0'), (d1, 'store'))
+
+        self.tb.start()
+        # 0x17: 0 1 2 5 6 6 7 (gap of 2, one duplicate), 0x42 wraps around 16383 -> 0
+        for counter in (0, 1, 2, 5, 6, 6, 7):
+            demux.to_basic_block()._post(pmt.intern('in'), makePDU(0x17, counter))
+        for counter in (16382, 16383, 0, 1):
+            demux.to_basic_block()._post(pmt.intern('in'), makePDU(0x42, counter))
+        time.sleep(.1)
+        self.tb.stop()
+        self.tb.wait()
+
+        stats = demux.getStatistics(0x17)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('packets'), pmt.PMT_NIL)) == 7)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('bytes'), pmt.PMT_NIL)) == 7 * 13)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('lost'), pmt.PMT_NIL)) == 2)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('gaps'), pmt.PMT_NIL)) == 1)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('duplicates'), pmt.PMT_NIL)) == 1)
+        self.assertTrue(pmt.to_long(pmt.dict_ref(stats, pmt.intern('last_sequence_count'), pmt.PMT_NIL)) == 7)
+
+        stats = demux.getStatistics(0x42)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('lost'), pmt.PMT_NIL)) == 0)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('duplicates'), pmt.PMT_NIL)) == 0)
+
+        demux.resetStatistics()
+        stats = demux.getStatistics(0x17)
+        self.assertTrue(pmt.to_uint64(pmt.dict_ref(stats, pmt.intern('packets'), pmt.PMT_NIL)) == 0)
+
+def makePDU(apid, counter):
+    packet = numpy.array([0x18 | ((apid >> 8) & 0x07), apid & 0xff, 0xc0 | ((counter >> 8) & 0x3f), counter & 0xff,
+                          0x00, 0x06, 0x20, 0x11, 0x01, 0x00, 0x00, 0x00, 0x00], dtype=numpy.uint8)
+    return pmt.cons(pmt.make_dict(), pmt.init_u8vector(packet.size, packet))
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_APIDDemux, "qa_APIDDemux.xml")
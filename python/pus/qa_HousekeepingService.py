@@ -1964,19 +1964,25 @@ class qa_HousekeepingService(gr_unittest.TestCase):
         packet_disable = appendCRC(packet_disable)
         in_pdu_disable = pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet_disable.size, packet_disable))
                 
+        # The services tick on the simulated clock, from the next whole second on
+        timeConfig.setSimulatedTime(1672531200000)
+        self.addCleanup(timeConfig.setRealTime)
         self.tb.start()
         housekeepingService.to_basic_block()._post(pmt.intern("in"), in_pdu_disable) 
         housekeepingService.to_basic_block()._post(pmt.intern("in"), in_pdu_enable) 
-        time.sleep(1.1)
+        # The super commutated parameters are sampled every 12 ticks, 1.1 s, 2.3 s... after the first tick
+        advanceTime(timeConfig, 2)
         setParameter_9.setParameterValue(535.75)
         setParameter_17.setParameterValue(5432)                
-        time.sleep(1.1)
+        advanceTime(timeConfig, 1.2)
         setParameter_9.setParameterValue(2054.1)
         setParameter_17.setParameterValue(100)    
-        time.sleep(1.1)  
+        advanceTime(timeConfig, 1.2)  
         setParameter_9.setParameterValue(876.0)
         setParameter_17.setParameterValue(65421)   
-        time.sleep(11)       
+        # Reports on the 50th and the 100th tick
+        advanceTime(timeConfig, 7)       
+        time.sleep(.5)
         self.tb.stop()
         self.tb.wait()
         
@@ -2076,137 +2082,46 @@ def checkPayload(expectedPayload, message, crcEnabled):
     return numpy.array_equal(payload, expectedPayload)
     
        
-def checkSuccessAcceptanceVerification(message, sentMessage):
+def checkVerificationRequest(message, sentMessage, req, error = 0, step = 0):
+    # Verification request sent on the ver port: request ID, error code, step ID and report type
     responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 1:
+    if responseVerification.size != 8:
         return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
+    if (not numpy.array_equal(responseVerification[0:4], sentMessage[0:4])):
         return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True           
-
-def checkFailedAcceptanceVerification(message, sentMessage, error):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-   
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_error = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
+    report_req = pmt.to_long(pmt.dict_ref(pmt.car(message), pmt.intern("req"), pmt.PMT_NIL))
+    report_error = (int(responseVerification[4]) << 8) | int(responseVerification[5])
 
-    if report_req != 2:
+    if report_req != req or responseVerification[7] != req:
         return False
     if report_error != error:
         return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True      
-    
-def checkSuccessStartExecutionVerification(message, sentMessage):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
-
-    if (not numpy.array_equal(responseVerification, sentMessage)):
+    if responseVerification[6] != step:
         return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 3:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True  
+    return True
 
-def checkFailedStartExecutionVerification(message, sentMessage, error):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
+def checkSuccessAcceptanceVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 1)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-   
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_error = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
+def checkFailedAcceptanceVerification(message, sentMessage, error):
+    return checkVerificationRequest(message, sentMessage, 2, error)
 
-    if report_req != 4:
-        return False
-    if report_error != error:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True      
-    
-def checkSuccessProgressExecutionVerification(message, sentMessage, step):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
+def checkSuccessStartExecutionVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 3)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_step = pmt.to_long(pmt.dict_ref(meta, pmt.intern("step_id"), pmt.PMT_NIL))
-    
-    if report_req != 5:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if report_step != step:
-        return False         
-    return True  
+def checkFailedStartExecutionVerification(message, sentMessage, error):
+    return checkVerificationRequest(message, sentMessage, 4, error)
 
+def checkSuccessProgressExecutionVerification(message, sentMessage, step):
+    return checkVerificationRequest(message, sentMessage, 5, step = step)
 
 def checkFailedProgressExecutionVerification(message, sentMessage, error, step):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
+    return checkVerificationRequest(message, sentMessage, 6, error, step)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-   
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_error = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
-    report_step = pmt.to_long(pmt.dict_ref(meta, pmt.intern("step_id"), pmt.PMT_NIL))
-
-    if report_req != 6:
-        return False
-    if report_error != error:
-        return False
-    if report_step != step:
-        return False        
-    return True      
-    
 def checkSuccessSuccessCompletionExecutionVerification(message, sentMessage):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
-
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 7:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True       
+    return checkVerificationRequest(message, sentMessage, 7)
 
 def checkCRC(message):
     crcTail = int.from_bytes(message[-2:], byteorder='big', signed=False)
@@ -2214,6 +2129,11 @@ def checkCRC(message):
                        
     return getCRC(message) == crcTail  
 
+def advanceTime(timeConfig, seconds):
+    # The flowgraph handles the posted messages first, then the services tick on the simulated clock
+    time.sleep(.1)
+    timeConfig.advanceTime(round(seconds * 1000))
+
 def appendCRC(message):
     crc : numpy.uint16 = getCRC(message)
     bytes_val = bytearray(int(crc).to_bytes(2, "big", signed = False))
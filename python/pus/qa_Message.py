@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2023 Gustavo Gonzalez.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+from gnuradio import gr, gr_unittest
+try:
+    from gnuradio import pus
+    from gnuradio.pus import codec
+except ImportError:
+    import os
+    import sys
+    dirname, filename = os.path.split(os.path.abspath(__file__))
+    sys.path.append(os.path.join(dirname, "bindings"))
+    from gnuradio import pus
+    from gnuradio.pus import codec
+import numpy
+import threading
+
+class qa_Message(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.rng = numpy.random.default_rng(0x5053)
+        pus.MessageParser.getInstance().config(0x19, True)
+
+    def test_001_message_buffer_protocol(self):
+        packet = numpy.array([0x18, 0x03, 0xc0, 0x00, 0x00, 0x06, 0x2f, 0x11, 0x01, 0x00, 0x00], dtype=numpy.uint8)
+        message = pus.Message(packet)
+
+        self.assertEqual(len(message), packet.size)
+        self.assertEqual(message.getMessagePacketType(), pus.Message.TC)
+        self.assertEqual(message.getMessageApplicationId(), 0x03)
+        self.assertEqual(message.getMessageAckFlags(), 0x0f)
+        self.assertTrue(message.assertTC(17, 1))
+        self.assertEqual(bytes(message), packet.tobytes())
+
+        # The view shares the message storage
+        view = numpy.frombuffer(message, dtype=numpy.uint8)
+        self.assertTrue(numpy.array_equal(view, packet))
+        message.setMessageServiceType(3)
+        self.assertEqual(int(view[7]), 3)
+        message.setMessageType(25)
+        self.assertEqual(int(view[8]), 25)
+
+        # Writes go through the setters
+        self.assertTrue(memoryview(message).readonly)
+        with self.assertRaises(TypeError):
+            memoryview(message)[8] = 1
+        with self.assertRaises(ValueError):
+            view[8] = 1
+
+    def test_002_message_read_append(self):
+        message = pus.Message()
+        message.appendUint16(0x1234)
+        message.appendSint32(-5)
+        message.appendDouble(2.5)
+        message.appendUint8Array(b'\x01\x02\x03')
+
+        message.setMessageReadPosition(0)
+        self.assertEqual(message.readUint16(), 0x1234)
+        self.assertEqual(message.readSint32(), -5)
+        self.assertEqual(message.readDouble(), 2.5)
+        self.assertEqual(message.readArray(3), b'\x01\x02\x03')
+        with self.assertRaises(IndexError):
+            message.readArray(1)
+
+    def test_003_crc(self):
+        self.assertEqual(pus.CRCHelper.calculateCRC(b'123456789'), 0x29b1)
+
+        data = self.rng.integers(0, 256, 1 << 20, dtype=numpy.uint8)
+        self.assertEqual(pus.CRCHelper.calculateCRC(data),
+                         pus.CRCHelper.calculateCRC(data[1000:], pus.CRCHelper.calculateCRC(data[:1000])))
+        self.assertEqual(pus.CRCHelper.calculateCRC(data[:4096]), codec.crc16(data[:4096]))
+
+        offsets = numpy.arange(0, 1 << 20, 1024)
+        lengths = self.rng.integers(0, 1024, offsets.size)
+        crcs = pus.CRCHelper.calculateCRCBatch(data, offsets, lengths)
+        self.assertTrue(numpy.array_equal(crcs, codec.crc16_batch(data, offsets, lengths)))
+
+        with self.assertRaises(IndexError):
+            pus.CRCHelper.calculateCRCBatch(data, [len(data) - 1], [2])
+
+        # The GIL is released while the CRC is computed, so threads run in parallel
+        results = [None] * 4
+        def work(i):
+            results[i] = pus.CRCHelper.calculateCRCBatch(data, offsets, lengths)
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(0, 4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for result in results:
+            self.assertTrue(numpy.array_equal(result, crcs))
+
+    def test_004_parser_batch(self):
+        packets = codec.new_tc(100)
+        packets['apid'] = 0x19
+        packets['service_type'] = 17
+        packets['message_type'] = 1
+        packets['sequence_count'] = numpy.arange(100)
+        payloads = [self.rng.integers(0, 256, size, dtype=numpy.uint8) for size in self.rng.integers(0, 200, 100)]
+        stream = codec.encode_tc(packets, payloads)
+
+        parser = pus.MessageParser.getInstance()
+        messages = parser.ParseMessageCommands(stream, packets['offset'], packets['length'])
+        self.assertEqual(len(messages), 100)
+        for i, message in enumerate(messages):
+            self.assertTrue(parser.assertTC(message, 17, 1))
+            self.assertEqual(message.getMessagePacketSequenceCount(), i)
+            self.assertTrue(numpy.array_equal(numpy.frombuffer(message, dtype=numpy.uint8),
+                                              stream[packets['offset'][i]:packets['offset'][i] + packets['length'][i]]))
+
+        # Reports built by the C++ encoder decode with the Python codec
+        data = self.rng.integers(0, 256, 4000, dtype=numpy.uint8)
+        offsets = numpy.arange(0, 4000, 40)
+        lengths = numpy.full(offsets.size, 40)
+        reports = parser.CreateMessageReports(0x19, 10, 0, 3, 25, 7, 0, data, offsets, lengths)
+        decoded = codec.decode_tm(b''.join(bytes(report) for report in reports))
+        self.assertEqual(decoded.size, offsets.size)
+        self.assertTrue(decoded['crc_valid'].all())
+        self.assertTrue(numpy.array_equal(decoded['sequence_count'], 10 + numpy.arange(offsets.size)))
+        self.assertTrue(numpy.array_equal(decoded['message_type_counter'], 7 + numpy.arange(offsets.size)))
+        self.assertTrue((decoded['service_type'] == 3).all())
+        self.assertTrue((decoded['payload_length'] == 40).all())
+
+        report = parser.CreateMessageReport(0, 17, 2, 0, 0, b'')
+        self.assertTrue(report.assertTM(17, 2))
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_Message, "qa_Message.xml")
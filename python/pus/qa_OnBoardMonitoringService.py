@@ -2023,211 +2023,214 @@ class qa_OnBoardMonitoringService(gr_unittest.TestCase):
         packet_trans = appendCRC(packet_trans)
         in_pdu_trans = pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet_trans.size, packet_trans))
                 
+        # The services tick on the simulated clock, from the next whole second on
+        timeConfig.setSimulatedTime(1672531200000)
+        self.addCleanup(timeConfig.setRealTime)
         self.tb.start()
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_trans) 
         setParameter_1.setParameterValue(10)
-        time.sleep(10)
+        advanceTime(timeConfig, 10)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_5.setParameterValue(15.0)
         setParameter_34.setParameterValue(-3)        
-        time.sleep(10)
+        advanceTime(timeConfig, 10)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_noAck) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_34.setParameterValue(16)     
-        time.sleep(10)
+        advanceTime(timeConfig, 10)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_noAck) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_34.setParameterValue(-11) 
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_en) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_1.setParameterValue(30) 
-        time.sleep(25)
+        advanceTime(timeConfig, 25)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_noAck) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_1.setParameterValue(10) 
         setParameter_34.setParameterValue(0) 
-        time.sleep(25)
+        advanceTime(timeConfig, 25)
         setParameter_1.setParameterValue(11) 
         setParameter_34.setParameterValue(-20) 
-        time.sleep(3)        
+        advanceTime(timeConfig, 3)        
         setParameter_34.setParameterValue(40) 
-        time.sleep(3)   
+        advanceTime(timeConfig, 3)   
         setParameter_1.setParameterValue(10) 
         setParameter_34.setParameterValue(0) 
-        time.sleep(25)
+        advanceTime(timeConfig, 25)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_noAck) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_5.setParameterValue(-35.0)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*2)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*3)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*4)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*5)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*6)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*7)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*8)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*9)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*10)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*11)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*12)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*13)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*14)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*15)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*16)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*17)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*18)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*19)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         setParameter_5.setParameterValue(-35.0*20)                                                                        
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_noAck) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         increase = -35.0*20 + 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 20
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 28
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 20
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 28
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 20
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 28
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 20
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 28
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 20
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 28
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6                                               
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 20
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 28
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 20
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 28
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6        
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_noAck) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 10
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 14
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 10
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 14
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 18
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 18
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 18
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 14
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 10
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 18
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6                                               
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 10
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 14
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 10
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 18
         setParameter_5.setParameterValue(increase)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         increase += 6        
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_noAck) 
         time.sleep(.5)
@@ -2391,45 +2394,48 @@ class qa_OnBoardMonitoringService(gr_unittest.TestCase):
         packet_trans_out = appendCRC(packet_trans_out)
         in_pdu_trans_out = pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet_trans_out.size, packet_trans_out))
         
+        # The services tick on the simulated clock, from the next whole second on
+        timeConfig.setSimulatedTime(1672531200000)
+        self.addCleanup(timeConfig.setRealTime)
         self.tb.start()
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_trans_out) 
         setParameter_1.setParameterValue(10)
-        time.sleep(1)
+        advanceTime(timeConfig, 1)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_en) 
         setParameter_1.setParameterValue(16)
         setParameter_5.setParameterValue(-40.0)
         setParameter_34.setParameterValue(-11)        
-        time.sleep(12)
+        advanceTime(timeConfig, 12)
         setParameter_5.setParameterValue(20.0)
         setParameter_34.setParameterValue(16)        
-        time.sleep(12)
+        advanceTime(timeConfig, 12)
         setParameter_1.setParameterValue(10)
         setParameter_5.setParameterValue(-40.0)
         setParameter_34.setParameterValue(-11)        
-        time.sleep(12)
+        advanceTime(timeConfig, 12)
         setParameter_1.setParameterValue(0)
         setParameter_5.setParameterValue(20.0)
         setParameter_34.setParameterValue(16)  
-        time.sleep(12)
+        advanceTime(timeConfig, 12)
         setParameter_1.setParameterValue(10)
         setParameter_5.setParameterValue(-40.0)
         setParameter_34.setParameterValue(-11)        
-        time.sleep(12)
+        advanceTime(timeConfig, 12)
         setParameter_1.setParameterValue(0)
         setParameter_5.setParameterValue(20.0)
         setParameter_34.setParameterValue(16)  
-        time.sleep(12)
+        advanceTime(timeConfig, 12)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu_trans) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_1.setParameterValue(10)
-        time.sleep(17)
+        advanceTime(timeConfig, 17)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu) 
-        time.sleep(.5)
+        advanceTime(timeConfig, .5)
         setParameter_5.setParameterValue(0.0)
         setParameter_34.setParameterValue(0) 
-        time.sleep(17)
+        advanceTime(timeConfig, 17)
         onBoardMonitoringService.to_basic_block()._post(pmt.intern("in"), in_pdu) 
         time.sleep(.5)
         self.tb.stop()
@@ -2638,137 +2644,46 @@ def checkPayload(expectedPayload, message, crcEnabled):
     return numpy.array_equal(payload, expectedPayload)
     
        
-def checkSuccessAcceptanceVerification(message, sentMessage):
+def checkVerificationRequest(message, sentMessage, req, error = 0, step = 0):
+    # Verification request sent on the ver port: request ID, error code, step ID and report type
     responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
+    if responseVerification.size != 8:
         return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 1:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
+    if (not numpy.array_equal(responseVerification[0:4], sentMessage[0:4])):
         return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True           
-
-def checkFailedAcceptanceVerification(message, sentMessage, error):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-   
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_error = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
+    report_req = pmt.to_long(pmt.dict_ref(pmt.car(message), pmt.intern("req"), pmt.PMT_NIL))
+    report_error = (int(responseVerification[4]) << 8) | int(responseVerification[5])
 
-    if report_req != 2:
+    if report_req != req or responseVerification[7] != req:
         return False
     if report_error != error:
         return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True      
-    
-def checkSuccessStartExecutionVerification(message, sentMessage):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
-
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 3:
+    if responseVerification[6] != step:
         return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True  
+    return True
 
-def checkFailedStartExecutionVerification(message, sentMessage, error):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
+def checkSuccessAcceptanceVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 1)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-   
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_error = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
+def checkFailedAcceptanceVerification(message, sentMessage, error):
+    return checkVerificationRequest(message, sentMessage, 2, error)
 
-    if report_req != 4:
-        return False
-    if report_error != error:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True      
-    
-def checkSuccessProgressExecutionVerification(message, sentMessage, step):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
+def checkSuccessStartExecutionVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 3)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_step = pmt.to_long(pmt.dict_ref(meta, pmt.intern("step_id"), pmt.PMT_NIL))
-    
-    if report_req != 5:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if report_step != step:
-        return False         
-    return True  
+def checkFailedStartExecutionVerification(message, sentMessage, error):
+    return checkVerificationRequest(message, sentMessage, 4, error)
 
+def checkSuccessProgressExecutionVerification(message, sentMessage, step):
+    return checkVerificationRequest(message, sentMessage, 5, step = step)
 
 def checkFailedProgressExecutionVerification(message, sentMessage, error, step):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
-
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-   
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_error = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
-    report_step = pmt.to_long(pmt.dict_ref(meta, pmt.intern("step_id"), pmt.PMT_NIL))
+    return checkVerificationRequest(message, sentMessage, 6, error, step)
 
-    if report_req != 6:
-        return False
-    if report_error != error:
-        return False
-    if report_step != step:
-        return False        
-    return True      
-    
 def checkSuccessSuccessCompletionExecutionVerification(message, sentMessage):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
-
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 7:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True       
+    return checkVerificationRequest(message, sentMessage, 7)
 
 def checkCRC(message):
     crcTail = int.from_bytes(message[-2:], byteorder='big', signed=False)
@@ -2776,6 +2691,11 @@ def checkCRC(message):
                        
     return getCRC(message) == crcTail  
 
+def advanceTime(timeConfig, seconds):
+    # The flowgraph handles the posted messages first, then the services tick on the simulated clock
+    time.sleep(.1)
+    timeConfig.advanceTime(round(seconds * 1000))
+
 def appendCRC(message):
     crc : numpy.uint16 = getCRC(message)
     bytes_val = bytearray(int(crc).to_bytes(2, "big", signed = False))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2023 Gustavo Gonzalez.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+try:
+    from gnuradio import pus
+except ImportError:
+    import os
+    import sys
+    dirname, filename = os.path.split(os.path.abspath(__file__))
+    sys.path.append(os.path.join(dirname, "bindings"))
+    from gnuradio import pus
+import numpy
+import pmt
+import time
+
+SYNC_MARKER = numpy.array([0x1a, 0xcf, 0xfc, 0x1d], dtype=numpy.uint8)
+
+class qa_PacketDeframer(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tb = gr.top_block()
+        self.rng = numpy.random.default_rng(0x5053)
+
+    def tearDown(self):
+        self.tb = None
+
+    def run_deframer(self, deframer, stream):
+        src = blocks.vector_source_b(stream.tolist(), False)
+        d1 = blocks.message_debug()
+        self.tb.connect(src, deframer)
+        self.tb.msg_connect((deframer, 'out'), (d1, 'store'))
+        self.tb.run()
+        return [numpy.array(pmt.u8vector_elements(pmt.cdr(d1.get_message(i))), dtype=numpy.uint8)
+                for i in range(0, d1.num_messages())]
+
+    def noise(self, size):
+        return self.rng.integers(0, 256, size, dtype=numpy.uint8)
+
+    def test_001_sync_marker(self):
+        packets = [makePacket(0x11, i, 17 * i) for i in range(0, 20)]
+        stream = numpy.concatenate([numpy.concatenate([self.noise(i), SYNC_MARKER, packets[i]])
+                                    for i in range(0, len(packets))])
+
+        deframer = pus.PacketDeframer(pus.PacketDeframer.SyncMarker, 0x1ACFFC1D, True)
+        received = self.run_deframer(deframer, stream)
+
+        self.assertTrue(len(received) == len(packets))
+        for i in range(0, len(packets)):
+            self.assertTrue(numpy.array_equal(received[i], packets[i]))
+        self.assertTrue(deframer.packetCount() == len(packets))
+
+    def test_002_sync_marker_bad_crc(self):
+        good = makePacket(0x11, 1, 10)
+        bad = makePacket(0x11, 2, 10)
+        bad[12] ^= 0x01
+        stream = numpy.concatenate([SYNC_MARKER, bad, SYNC_MARKER, good])
+
+        deframer = pus.PacketDeframer(pus.PacketDeframer.SyncMarker, 0x1ACFFC1D, True)
+        received = self.run_deframer(deframer, stream)
+
+        self.assertTrue(len(received) == 1)
+        self.assertTrue(numpy.array_equal(received[0], good))
+        self.assertTrue(deframer.droppedCount() == 1)
+
+    def test_003_kiss(self):
+        # Payloads include 0xC0 and 0xDB so that the escape sequences are exercised
+        packets = [makePacket(0x11, i, 0xc0 + 3 * i) for i in range(0, 10)]
+        stream = numpy.concatenate([kissFrame(packet) for packet in packets])
+
+        deframer = pus.PacketDeframer(pus.PacketDeframer.KISS)
+        received = self.run_deframer(deframer, stream)
+
+        self.assertTrue(len(received) == len(packets))
+        for i in range(0, len(packets)):
+            self.assertTrue(numpy.array_equal(received[i], packets[i]))
+
+    def test_004_hdlc(self):
+        packets = [makePacket(0x11, i, 0x7e + 5 * i) for i in range(0, 10)]
+        stream = numpy.concatenate([hdlcFrame(packet) for packet in packets])
+
+        deframer = pus.PacketDeframer(pus.PacketDeframer.HDLC)
+        received = self.run_deframer(deframer, stream)
+
+        self.assertTrue(len(received) == len(packets))
+        for i in range(0, len(packets)):
+            self.assertTrue(numpy.array_equal(received[i], packets[i]))
+
+    def test_005_throughput(self):
+        frame = numpy.concatenate([SYNC_MARKER, makePacket(0x11, 0, 200)])
+        packets = 20000
+        stream = numpy.tile(frame, packets)
+
+        deframer = pus.PacketDeframer()
+        src = blocks.vector_source_b(stream.tolist(), False)
+        self.tb.connect(src, deframer)
+        start = time.monotonic()
+        self.tb.run()
+        elapsed = time.monotonic() - start
+
+        print("PacketDeframer: %d packets, %.1f MB/s" % (deframer.packetCount(), stream.size / elapsed / 1e6))
+        self.assertTrue(deframer.packetCount() == packets)
+
+def kissFrame(packet):
+    escaped = []
+    for b in packet.tolist():
+        if b == 0xc0:
+            escaped += [0xdb, 0xdc]
+        elif b == 0xdb:
+            escaped += [0xdb, 0xdd]
+        else:
+            escaped.append(b)
+    return numpy.array([0xc0, 0x00] + escaped + [0xc0], dtype=numpy.uint8)
+
+def hdlcFrame(packet):
+    escaped = []
+    for b in packet.tolist():
+        if b == 0x7e or b == 0x7d:
+            escaped += [0x7d, b ^ 0x20]
+        else:
+            escaped.append(b)
+    return numpy.array([0x7e] + escaped + [0x7e], dtype=numpy.uint8)
+
+def makePacket(serviceType, counter, payloadSize):
+    dataLength = 5 + payloadSize + 2 - 1
+    packet = numpy.array([0x18, 0x03, 0xc0 | ((counter >> 8) & 0x3f), counter & 0xff, dataLength >> 8, dataLength & 0xff,
+                          0x20, serviceType, 0x01, 0x00, 0x00], dtype=numpy.uint8)
+    payload = numpy.arange(payloadSize, dtype=numpy.uint8)
+    return appendCRC(numpy.concatenate([packet, payload]))
+
+def appendCRC(message):
+    crc : numpy.uint16 = getCRC(message)
+    bytes_val = bytearray(int(crc).to_bytes(2, "big", signed = False))
+    crcArray = numpy.frombuffer(bytes_val, dtype=numpy.uint8)
+    message = numpy.append(message, crcArray)
+    return message
+
+def getCRC(message):
+    crc = 0xFFFF
+    polynomial = 0x1021
+
+    for i in range(0,len(message)):
+        crc ^= int(message[i]) << 8
+
+        for j in range(0,8):
+            if (crc & 0x8000) > 0:
+                crc = (crc << 1) ^ polynomial
+            else:
+                crc = crc << 1
+    return (crc & 0xffff)
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_PacketDeframer, "qa_PacketDeframer.xml")
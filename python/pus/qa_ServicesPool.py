@@ -249,6 +249,69 @@ class qa_ServicesPool(gr_unittest.TestCase):
 
     def test_017_ServicePool_Service_ST20_verify_forward_message(self):
         self.assertTrue(self.forward_verification(self.testData[16]))
+
+    def test_018_ServicePool_batch_forward_message(self):
+        testData = self.testData[0]
+        servicePool = pus.ServicesPool(self.servicesList)
+
+        d1 = []
+        for i in range(0,len(self.servicesList)):
+            d1.insert(i, blocks.message_debug())
+            self.tb.msg_connect((servicePool, 'out' + str(i)), (d1[i], 'store'))
+
+        d2 = blocks.message_debug()
+        messageConfig =  pus.MessageConfig(testData.apid, testData.crcEnabled)
+
+        self.tb.msg_connect((servicePool, 'ver'), (d2, 'store'))
+
+        packets = []
+        for serviceType in (0x11, 0x03, 0x11, 0x31):
+            packet = numpy.array([0x18, 0x03, 0xc0, 0x00, 0x00, 0x06, 0x20, serviceType, 0x01, 0x00, 0x00], dtype=numpy.uint8)
+            packets.append(appendCRC(packet))
+        packetCRCError = numpy.array(packets[0])
+        packetCRCError[-1] ^= 0xff
+        packets.append(packetCRCError)
+
+        # Vector format: one u8vector per packet
+        batch = pmt.make_vector(len(packets), pmt.PMT_NIL)
+        for i in range(0, len(packets)):
+            pmt.vector_set(batch, i, pmt.init_u8vector(packets[i].size, packets[i]))
+        in_pdu_vector = pmt.cons(pmt.make_dict(), batch)
+
+        # Blob format: concatenated packets and their start offsets
+        blob = numpy.concatenate(packets)
+        offsets = numpy.cumsum([0] + [packet.size for packet in packets[:-1]]).astype(numpy.uint32)
+        meta = pmt.dict_add(pmt.make_dict(), pmt.intern("offsets"), pmt.init_u32vector(offsets.size, offsets))
+        in_pdu_blob = pmt.cons(meta, pmt.init_u8vector(blob.size, blob))
+
+        self.tb.start()
+        servicePool.to_basic_block()._post(pmt.intern("in"), in_pdu_vector)
+        servicePool.to_basic_block()._post(pmt.intern("in"), in_pdu_blob)
+        time.sleep(.5)
+        self.tb.stop()
+        self.tb.wait()
+
+        for i in range(0,len(self.servicesList)):
+            if self.servicesList[i] == 0x11:
+                expected = [packets[0], packets[2]]
+            elif self.servicesList[i] == 0x03:
+                expected = [packets[1]]
+            else:
+                self.assertTrue(d1[i].num_messages() == 0)
+                continue
+            self.assertTrue(d1[i].num_messages() == 2)
+            for j in range(0, 2):
+                subBatch = pmt.cdr(d1[i].get_message(j))
+                self.assertTrue(pmt.is_vector(subBatch))
+                self.assertTrue(pmt.length(subBatch) == len(expected))
+                for k in range(0, len(expected)):
+                    response = numpy.array(pmt.u8vector_elements(pmt.vector_ref(subBatch, k)), dtype=numpy.uint8)
+                    self.assertTrue(numpy.array_equal(response, expected[k]))
+
+        self.assertTrue(d2.num_messages() == 4)
+        for j in range(0, 2):
+            self.assertTrue(checkFailedAcceptanceVerification(d2.get_message(2 * j), packets[3], 3))
+            self.assertTrue(checkFailedAcceptanceVerification(d2.get_message(2 * j + 1), packets[4], 2))
                            
     def forward_verification(self, testData):
         servicePool = pus.ServicesPool(self.servicesList)
@@ -289,25 +352,29 @@ class qa_ServicesPool(gr_unittest.TestCase):
                 return False         
         return True
         
-def checkFailedAcceptanceVerification(message, sentMessage, error):
+def checkVerificationRequest(message, sentMessage, req, error = 0, step = 0):
+    # Verification request sent on the ver port: request ID, error code, step ID and report type
     responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
+    if responseVerification.size != 8:
+        return False
+    if (not numpy.array_equal(responseVerification[0:4], sentMessage[0:4])):
         return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    error_type = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
 
-    if report_req != 2:
+    report_req = pmt.to_long(pmt.dict_ref(pmt.car(message), pmt.intern("req"), pmt.PMT_NIL))
+    report_error = (int(responseVerification[4]) << 8) | int(responseVerification[5])
+
+    if report_req != req or responseVerification[7] != req:
         return False
-    if error_type != error:
+    if report_error != error:
         return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True   
-    
+    if responseVerification[6] != step:
+        return False
+    return True
+
+def checkFailedAcceptanceVerification(message, sentMessage, error):
+    return checkVerificationRequest(message, sentMessage, 2, error)
+
 def checkCRC(message):
     crcTail = int.from_bytes(message[-2:], byteorder='big', signed=False)
     message = message[0:-2]
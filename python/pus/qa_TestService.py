@@ -338,6 +338,35 @@ class qa_TestService(gr_unittest.TestCase):
 
         self.assertTrue(checkResults(testData.counter, d1, 3, d2, testData, packet))
 
+    def test_012_S17_01and02_batch_pdu(self):
+        testData = self.testData[0]
+        testService = pus.TestService()
+        d1 = blocks.message_debug()
+        d2 = blocks.message_debug()
+        messageConfig =  pus.MessageConfig(testData.apid, testData.crcEnabled)
+        
+        self.tb.msg_connect((testService, 'out'), (d1, 'store'))
+        self.tb.msg_connect((testService, 'ver'), (d2, 'store'))
+
+        # Testing a batch of three TC(17,1) in a single PDU
+        packet = numpy.array([0x18, 0x03, 0xc0, 0x00, 0x00, 0x06, 0x20 | testData.ackFlags, testData.messageType, testData.messageSubTypeTx, 0x00, 0x00], dtype=numpy.uint8)
+        
+        packet = appendCRC(packet)
+        batch = pmt.make_vector(3, pmt.init_u8vector(packet.size, packet))
+        in_pdu = pmt.cons(pmt.PMT_NIL, batch)
+        self.tb.start()
+        testService.to_basic_block()._post(pmt.intern("in"), in_pdu) 
+        time.sleep(.5)
+        self.tb.stop()
+        self.tb.wait()
+
+        self.assertTrue(d1.num_messages() == 3)
+        self.assertTrue(d2.num_messages() == 0)
+        for i in range (0, 3):
+            response =  numpy.array(pmt.u8vector_elements(pmt.cdr(d1.get_message(i))), dtype=numpy.uint8)
+            self.assertTrue(checkSecondaryHeader(testData.messageType, testData.messageSubTypeRx, i, response))
+            self.assertTrue(checkCRC(response))
+
 def checkResults(numd1, d1, numd2, d2, testData, packet):
             	
     if d1.num_messages() != numd1:
@@ -383,99 +412,40 @@ def checkSecondaryHeader(serviceType, messageSubType, counter, message):
     expectedSecondaryHeader = numpy.array([0x20, serviceType, messageSubType, counterArray[0], counterArray[1], 0x00, 0x00], dtype=numpy.uint8)
     return numpy.array_equal(secondaryHeader, expectedSecondaryHeader)
 
-def checkSuccessAcceptanceVerification(message, sentMessage):
+def checkVerificationRequest(message, sentMessage, req, error = 0, step = 0):
+    # Verification request sent on the ver port: request ID, error code, step ID and report type
     responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 1:
+    if responseVerification.size != 8:
         return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
+    if (not numpy.array_equal(responseVerification[0:4], sentMessage[0:4])):
         return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True           
 
-def checkFailedAcceptanceVerification(message, sentMessage, error):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
- 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-  
-    meta = pmt.car(message)
-   
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-    report_error = pmt.to_long(pmt.dict_ref(meta, pmt.intern("error_type"), pmt.PMT_NIL))
+    report_req = pmt.to_long(pmt.dict_ref(pmt.car(message), pmt.intern("req"), pmt.PMT_NIL))
+    report_error = (int(responseVerification[4]) << 8) | int(responseVerification[5])
 
-    if report_req != 2:
+    if report_req != req or responseVerification[7] != req:
         return False
-
     if report_error != error:
         return False
-   
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-   
-    return True 
-
-def checkSuccessStartExecutionVerification(message, sentMessage):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
-
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
-
-    if report_req != 3:
+    if responseVerification[6] != step:
         return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True  
-    
-def checkSuccessProgressExecutionVerification(message, sentMessage):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
+    return True
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
+def checkSuccessAcceptanceVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 1)
 
-    if report_req != 5:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True  
+def checkFailedAcceptanceVerification(message, sentMessage, error):
+    return checkVerificationRequest(message, sentMessage, 2, error)
 
-def checkSuccessSuccessCompletionExecutionVerification(message, sentMessage):
-    responseVerification =  numpy.array(pmt.u8vector_elements(pmt.cdr(message)), dtype=numpy.uint8)
+def checkSuccessStartExecutionVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 3)
 
-    if (not numpy.array_equal(responseVerification, sentMessage)):
-        return False
-        
-    meta = pmt.car(message)
-        
-    report_req = pmt.to_long(pmt.dict_ref(meta, pmt.intern("req"), pmt.PMT_NIL))
+def checkSuccessProgressExecutionVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 5)
 
-    if report_req != 7:
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("error_type")):
-        return False
-    if pmt.dict_has_key(meta, pmt.intern("step_id")):
-        return False        
-    return True  
+def checkSuccessSuccessCompletionExecutionVerification(message, sentMessage):
+    return checkVerificationRequest(message, sentMessage, 7)
 
 def checkCRC(message):
     crcTail = int.from_bytes(message[-2:], byteorder='big', signed=False)
@@ -56,5 +56,32 @@ class qa_TimeConfig(gr_unittest.TestCase):
  
         self.assertTrue(True)
 
+    def test_002_timeConfig_simulated_time(self):
+        timeConfig = pus.TimeConfig(1.0, 1, False, 1986, 1, 6)
+        self.assertFalse(timeConfig.advanceTime(1000))
+
+        # 2023-01-01T00:00:00Z, CUC level 1 counts from 1958
+        start = 1672531200
+        timeConfig.setSimulatedTime(start * 1000)
+        self.assertTrue(timeConfig.isSimulatedTime())
+        self.assertEqual(timeConfig.getCurrentTimeDefaultCUC(), start + 378691200)
+
+        # A day goes by without waiting for it
+        begin = time.time()
+        self.assertTrue(timeConfig.advanceTime(24 * 3600 * 1000))
+        self.assertLess(time.time() - begin, 30)
+        self.assertEqual(timeConfig.getCurrentTimeDefaultCUC(), start + 378691200 + 24 * 3600)
+
+        # Back to the wall clock from the clock port
+        strobe = blocks.message_strobe(pmt.cons(pmt.intern("real_time"), pmt.PMT_T), 100)
+        self.tb.msg_connect((strobe, 'strobe'), (timeConfig, 'clock'))
+        self.tb.start()
+        time.sleep(.5)
+        self.tb.stop()
+        self.tb.wait()
+
+        self.assertFalse(timeConfig.isSimulatedTime())
+        self.assertAlmostEqual(timeConfig.getCurrentTimeDefaultCUC(), int(time.time()) + 378691200, delta = 1)
+
 if __name__ == '__main__':
     gr_unittest.run(qa_TimeConfig, "qa_TimeConfig.xml" )
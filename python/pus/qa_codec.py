@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2023 Gustavo Gonzalez.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+try:
+    from gnuradio import pus
+    from gnuradio.pus import codec
+except ImportError:
+    import os
+    import sys
+    dirname, filename = os.path.split(os.path.abspath(__file__))
+    sys.path.append(os.path.join(dirname, "bindings"))
+    from gnuradio import pus
+    from gnuradio.pus import codec
+import numpy
+import pmt
+import time
+
+class qa_codec(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tb = gr.top_block()
+        self.rng = numpy.random.default_rng(0x5053)
+
+    def tearDown(self):
+        self.tb = None
+
+    def test_001_crc(self):
+        self.assertEqual(codec.crc16(b'123456789'), 0x29b1)
+        self.assertEqual(codec.crc16(b''), codec.CRC_INITIAL_VALUE)
+
+        data = self.rng.integers(0, 256, 4096, dtype=numpy.uint8)
+        offsets = self.rng.integers(0, 3000, 300)
+        lengths = self.rng.integers(0, 1000, 300)
+        crcs = codec.crc16_batch(data, offsets, lengths)
+        for i in range(0, 300):
+            expected = getCRC(data[offsets[i]:offsets[i] + lengths[i]])
+            self.assertEqual(codec.crc16(data[offsets[i]:offsets[i] + lengths[i]]), expected)
+            self.assertEqual(int(crcs[i]), expected)
+
+        # Chained computation
+        self.assertEqual(codec.crc16(data[1000:], codec.crc16(data[:1000])), getCRC(data))
+
+    def test_002_encode_tc_as_handwritten(self):
+        packets = codec.new_tc(3)
+        packets['apid'] = 0x03
+        packets['sequence_count'] = [1, 25, 3]
+        packets['service_type'] = [0x11, 0x03, 0x11]
+        packets['message_type'] = 0x01
+        payloads = [b'', numpy.arange(200, dtype=numpy.uint8), b'']
+
+        stream = codec.encode_tc(packets, payloads)
+        expected = numpy.concatenate([makePacket(0x11, 1, 0), makePacket(0x03, 25, 200), makePacket(0x11, 3, 0)])
+        self.assertTrue(numpy.array_equal(stream, expected))
+        self.assertTrue(numpy.array_equal(packets['offset'], [0, 13, 226]))
+        self.assertTrue(numpy.array_equal(packets['payload_length'], [0, 200, 0]))
+
+    def test_003_decode_tc_resync(self):
+        packets = [makePacket(0x11, 1, 0), makePacket(0x03, 25, 200), makePacket(0x11, 3, 0)]
+        stream = numpy.concatenate([numpy.array([0xff, 0xe0], dtype=numpy.uint8)] + packets +
+                                   [packets[0][:5]])
+        stream[2 + 13 + 11 + 7] ^= 0x01
+
+        decoded = codec.decode_tc(stream)
+        self.assertEqual(decoded.size, 3)
+        self.assertTrue(numpy.array_equal(decoded['offset'], [2, 15, 228]))
+        self.assertTrue(numpy.array_equal(decoded['service_type'], [0x11, 0x03, 0x11]))
+        self.assertTrue(numpy.array_equal(decoded['sequence_count'], [1, 25, 3]))
+        self.assertTrue(numpy.array_equal(decoded['crc_valid'], [True, False, True]))
+        self.assertTrue(numpy.array_equal(decoded['apid'], [0x03, 0x03, 0x03]))
+        self.assertTrue(numpy.array_equal(decoded['sequence_flags'], [3, 3, 3]))
+
+        payload = codec.payloads(stream, decoded)[1]
+        self.assertEqual(payload.size, 200)
+        self.assertEqual(int(payload[6]), 6)
+        self.assertEqual(int(payload[7]), 6)
+
+    def test_004_tm_round_trip(self):
+        count = 20000
+        packets = codec.new_tm(count)
+        packets['apid'] = self.rng.integers(0, 2048, count)
+        packets['sequence_count'] = numpy.arange(count) & 0x3fff
+        packets['sc_time_ref'] = self.rng.integers(0, 16, count)
+        packets['service_type'] = self.rng.integers(1, 24, count)
+        packets['message_type'] = self.rng.integers(1, 30, count)
+        packets['message_type_counter'] = numpy.arange(count)
+        packets['destination_id'] = self.rng.integers(0, 65536, count)
+        packets['time'] = 2000000000 + numpy.arange(count)
+        payloads = [self.rng.integers(0, 256, size, dtype=numpy.uint8)
+                    for size in self.rng.integers(0, 300, count)]
+
+        stream = codec.encode_tm(packets, payloads)
+        start = time.perf_counter()
+        decoded = codec.decode_tm(stream)
+        elapsed = time.perf_counter() - start
+        print("Decoded", decoded.size, "TM (", stream.size, "bytes ) in", elapsed * 1000, "ms")
+
+        self.assertTrue(decoded['crc_valid'].all())
+        for column in codec.TM_DTYPE.names:
+            self.assertTrue(numpy.array_equal(decoded[column], packets[column]), column)
+        for i, payload in enumerate(codec.payloads(stream, decoded[:100])):
+            self.assertTrue(numpy.array_equal(payload, payloads[i]))
+
+        # Without CRC and with a P-field sized time stamp
+        stream = codec.encode_tm(packets[:10], payloads[:10], crc=False, time_size=5)
+        decoded = codec.decode_tm(stream, crc=False, time_size=5)
+        self.assertTrue(numpy.array_equal(decoded['time'], packets['time'][:10]))
+        self.assertTrue(numpy.array_equal(decoded['payload_length'], [p.size for p in payloads[:10]]))
+
+    def test_005_decode_service_report(self):
+        testService = pus.TestService()
+        d1 = blocks.message_debug()
+        messageConfig = pus.MessageConfig(0x19, True)
+        self.tb.msg_connect((testService, 'out'), (d1, 'store'))
+
+        packets = codec.new_tc(1)
+        packets['apid'] = 0x19
+        packets['service_type'] = 0x11
+        packets['message_type'] = 0x01
+        request = codec.encode_tc(packets)
+
+        self.tb.start()
+        testService.to_basic_block()._post(pmt.intern("in"), pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(request.size, request)))
+        time.sleep(.5)
+        self.tb.stop()
+        self.tb.wait()
+
+        self.assertTrue(d1.num_messages() == 1)
+        report = numpy.array(pmt.u8vector_elements(pmt.cdr(d1.get_message(0))), dtype=numpy.uint8)
+        decoded = codec.decode_tm(report)
+        self.assertEqual(decoded.size, 1)
+        self.assertTrue(decoded['crc_valid'][0])
+        self.assertEqual(decoded['apid'][0], 0x19)
+        self.assertEqual(decoded['service_type'][0], 0x11)
+        self.assertEqual(decoded['message_type'][0], 0x02)
+        self.assertEqual(decoded['payload_length'][0], 0)
+
+def makePacket(serviceType, counter, payloadSize):
+    dataLength = 5 + payloadSize + 2 - 1
+    packet = numpy.array([0x18, 0x03, 0xc0 | ((counter >> 8) & 0x3f), counter & 0xff, dataLength >> 8, dataLength & 0xff,
+                          0x20, serviceType, 0x01, 0x00, 0x00], dtype=numpy.uint8)
+    payload = numpy.arange(payloadSize, dtype=numpy.uint8)
+    return appendCRC(numpy.concatenate([packet, payload]))
+
+def appendCRC(message):
+    crc : numpy.uint16 = getCRC(message)
+    bytes_val = bytearray(int(crc).to_bytes(2, "big", signed = False))
+    crcArray = numpy.frombuffer(bytes_val, dtype=numpy.uint8)
+    message = numpy.append(message, crcArray)
+    return message
+
+def getCRC(message):
+    crc = 0xFFFF
+    polynomial = 0x1021
+
+    for i in range(0,len(message)):
+        crc ^= int(message[i]) << 8
+
+        for j in range(0,8):
+            if (crc & 0x8000) > 0:
+                crc = (crc << 1) ^ polynomial
+            else:
+                crc = crc << 1
+    return (crc & 0xffff)
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_codec, "qa_codec.xml")
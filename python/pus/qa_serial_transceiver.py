@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2023 Gustavo Gonzalez.
+#
+# SPDX-License-Identifier: GPL-3.0-or-later
+#
+
+from gnuradio import gr, gr_unittest
+from gnuradio import blocks
+try:
+    from gnuradio import pus
+    from gnuradio.pus.serial_transceiver import space_packet_deframer
+except ImportError:
+    import os
+    import sys
+    dirname, filename = os.path.split(os.path.abspath(__file__))
+    sys.path.append(os.path.join(dirname, "bindings"))
+    from gnuradio import pus
+    from gnuradio.pus.serial_transceiver import space_packet_deframer
+import numpy
+import pmt
+import time
+import os
+import tty
+import threading
+
+class qa_serial_transceiver(gr_unittest.TestCase):
+
+    def setUp(self):
+        self.tb = gr.top_block()
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+
+    def tearDown(self):
+        self.tb = None
+        os.close(self.master)
+        os.close(self.slave)
+
+    def test_001_deframer_split_and_resync(self):
+        packets = [makePacket(0x11, 1, 0), makePacket(0x03, 25, 200), makePacket(0x11, 3, 0)]
+        stream = numpy.concatenate([numpy.array([0xff, 0xe0], dtype=numpy.uint8)] + packets)
+
+        deframer = space_packet_deframer(256)
+        received = []
+        # Feed the stream in small chunks so that packets straddle reads and the buffer wraps
+        start = 0
+        while start < stream.size:
+            free = deframer.writable()
+            chunk = stream[start:start + min(7, len(free))]
+            free[:chunk.size] = chunk.tobytes()
+            deframer.commit(chunk.size)
+            start += chunk.size
+            for packet in deframer.packets():
+                received.append(numpy.array(packet))
+
+        self.assertTrue(len(received) == len(packets))
+        for i in range(0, len(packets)):
+            self.assertTrue(numpy.array_equal(received[i], packets[i]))
+        self.assertTrue(deframer.dropped == 2)
+
+    def test_002_rx_one_pdu_per_packet(self):
+        transceiver = pus.serial_transceiver(self.port, 921600, 8, 'N', 1, 2048)
+        d1 = blocks.message_debug()
+        self.tb.msg_connect((transceiver, 'out'), (d1, 'store'))
+
+        packets = [makePacket(0x11, i, 8 * i) for i in range(0, 50)]
+        stream = numpy.concatenate(packets).tobytes()
+
+        self.tb.start()
+        # Write in chunks unrelated to the packet boundaries
+        for start in range(0, len(stream), 61):
+            os.write(self.master, stream[start:start + 61])
+        time.sleep(.5)
+        self.tb.stop()
+        self.tb.wait()
+        transceiver.stop()
+
+        self.assertTrue(d1.num_messages() == len(packets))
+        for i in range(0, len(packets)):
+            response = numpy.array(pmt.u8vector_elements(pmt.cdr(d1.get_message(i))), dtype=numpy.uint8)
+            self.assertTrue(numpy.array_equal(response, packets[i]))
+
+    def test_003_tx_coalesced_loopback_throughput(self):
+        transceiver = pus.serial_transceiver(self.port, 921600, 8, 'N', 1, 2048, tx_policy='block')
+        packets = [makePacket(0x11, i & 0x3fff, 1000) for i in range(0, 2000)]
+        expected = numpy.concatenate(packets).tobytes()
+
+        received = bytearray()
+        def reader():
+            while len(received) < len(expected):
+                received.extend(os.read(self.master, 65536))
+        thread = threading.Thread(target=reader)
+        thread.start()
+
+        transceiver.tx_statistics()
+        start = time.monotonic()
+        for packet in packets:
+            transceiver.handle_msg(pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet.size, packet)))
+        handled = time.monotonic() - start
+        thread.join(10)
+        elapsed = time.monotonic() - start
+        while transceiver.tx_queue_size() > 0 and time.monotonic() - start < 10:
+            time.sleep(.01)
+        time.sleep(.1)
+        statistics = transceiver.tx_statistics()
+        transceiver.stop()
+
+        print("TX: queued %d PDUs in %.3f s, wrote %d bytes in %.3f s (%.0f B/s)" %
+              (len(packets), handled, statistics['bytes'], elapsed, statistics['bytes_per_second']))
+        self.assertTrue(bytes(received) == expected)
+        self.assertTrue(statistics['packets'] == len(packets))
+        self.assertTrue(statistics['bytes'] == len(expected))
+        self.assertTrue(statistics['dropped'] == 0)
+
+    def test_004_tx_drop_policy_does_not_block(self):
+        transceiver = pus.serial_transceiver(self.port, 921600, 8, 'N', 1, 2048, tx_queue_depth=4, tx_policy='drop')
+        packet = makePacket(0x11, 0, 1000)
+        pdu = pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet.size, packet))
+
+        # Nobody reads the other end of the pty, so the writer eventually stalls on a full line
+        start = time.monotonic()
+        for i in range(0, 2000):
+            transceiver.handle_msg(pdu)
+        handled = time.monotonic() - start
+        statistics = transceiver.tx_statistics()
+
+        self.assertTrue(handled < 1.0)
+        self.assertTrue(statistics['dropped'] > 0)
+        self.assertTrue(transceiver.tx_queue_size() <= 4)
+
+        # Drain the line so that the writer thread can finish its last write
+        transceiver.event.set()
+        os.set_blocking(self.master, False)
+        while transceiver.tx_thread.is_alive():
+            try:
+                os.read(self.master, 65536)
+            except BlockingIOError:
+                time.sleep(.01)
+        transceiver.stop()
+
+    def test_005_tx_block_policy_returns_on_stop(self):
+        transceiver = pus.serial_transceiver(self.port, 921600, 8, 'N', 1, 2048, tx_queue_depth=4, tx_policy='block',
+                                             tx_timeout=0.05)
+        packet = makePacket(0x11, 0, 1000)
+        pdu = pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet.size, packet))
+
+        # Nobody reads the other end of the pty, so the handler ends up waiting for room in the queue
+        def handler():
+            for i in range(0, 2000):
+                transceiver.handle_msg(pdu)
+        thread = threading.Thread(target=handler)
+        thread.start()
+        time.sleep(.5)
+        self.assertTrue(thread.is_alive())
+
+        # The waiting handler gives up once the block is stopping
+        transceiver.event.set()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertTrue(transceiver.tx_statistics()['dropped'] > 0)
+
+        os.set_blocking(self.master, False)
+        while transceiver.tx_thread.is_alive():
+            try:
+                os.read(self.master, 65536)
+            except BlockingIOError:
+                time.sleep(.01)
+        transceiver.stop()
+
+    def test_006_tx_stop_writes_queued_packets(self):
+        transceiver = pus.serial_transceiver(self.port, 921600, 8, 'N', 1, 2048, tx_queue_depth=64, tx_policy='drop',
+                                             tx_timeout=0.5)
+        packet = makePacket(0x11, 0, 1000)
+        pdu = pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet.size, packet))
+
+        # Nobody reads the other end of the pty, so the queue is full when the block stops
+        for i in range(0, 2000):
+            transceiver.handle_msg(pdu)
+        self.assertTrue(transceiver.tx_queue_size() == 64)
+        transceiver.event.set()
+
+        received = bytearray()
+        done = threading.Event()
+        def reader():
+            os.set_blocking(self.master, False)
+            while not done.is_set():
+                try:
+                    received.extend(os.read(self.master, 65536))
+                except BlockingIOError:
+                    time.sleep(.01)
+        thread = threading.Thread(target=reader)
+        thread.start()
+        transceiver.stop()
+        time.sleep(.1)
+        done.set()
+        thread.join()
+        statistics = transceiver.tx_statistics()
+
+        # Every handled packet is either written or counted as dropped
+        self.assertTrue(transceiver.tx_queue_size() == 0)
+        self.assertTrue(statistics['packets'] + statistics['dropped'] == 2000)
+        self.assertTrue(statistics['packets'] >= 64)
+        self.assertTrue(len(received) == statistics['packets'] * packet.size)
+
+def makePacket(serviceType, counter, payloadSize):
+    dataLength = 5 + payloadSize + 2 - 1
+    packet = numpy.array([0x18, 0x03, 0xc0 | ((counter >> 8) & 0x3f), counter & 0xff, dataLength >> 8, dataLength & 0xff,
+                          0x20, serviceType, 0x01, 0x00, 0x00], dtype=numpy.uint8)
+    payload = numpy.arange(payloadSize, dtype=numpy.uint8)
+    return appendCRC(numpy.concatenate([packet, payload]))
+
+def appendCRC(message):
+    crc : numpy.uint16 = getCRC(message)
+    bytes_val = bytearray(int(crc).to_bytes(2, "big", signed = False))
+    crcArray = numpy.frombuffer(bytes_val, dtype=numpy.uint8)
+    message = numpy.append(message, crcArray)
+    return message
+
+def getCRC(message):
+    crc = 0xFFFF
+    polynomial = 0x1021
+
+    for i in range(0,len(message)):
+        crc ^= int(message[i]) << 8
+
+        for j in range(0,8):
+            if (crc & 0x8000) > 0:
+                crc = (crc << 1) ^ polynomial
+            else:
+                crc = crc << 1
+    return (crc & 0xffff)
+
+if __name__ == '__main__':
+    gr_unittest.run(qa_serial_transceiver, "qa_serial_transceiver.xml")
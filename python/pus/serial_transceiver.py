@@ -12,54 +12,233 @@ from gnuradio import gr
 import serial
 from threading import Thread
 from threading import Event
+from threading import Lock
+import queue
+import time
 import pmt
 
+CCSDS_PRIMARY_HEADER_SIZE = 6
+
+class space_packet_deframer():
+    """
+    Reassembles CCSDS Space Packets from a byte stream.
+
+    The bytes are written straight into a preallocated receive buffer, and each packet is cut
+    using the packet data length field of its primary header. Bytes that can not start a packet
+    (wrong packet version, or a length larger than the buffer) are dropped one at a time until
+    the stream is in sync again.
+    """
+    def __init__(self, depth):
+        self.buffer = bytearray(max(depth, CCSDS_PRIMARY_HEADER_SIZE + 1))
+        self.view = memoryview(self.buffer)
+        self.head = 0
+        self.tail = 0
+        self.dropped = 0
+
+    def writable(self):
+        """
+        Returns the free part of the buffer, moving the pending bytes to its start if needed
+        """
+        if self.tail == len(self.buffer) and self.head > 0:
+            pending = self.tail - self.head
+            self.buffer[0:pending] = self.view[self.head:self.tail]
+            self.head = 0
+            self.tail = pending
+        return self.view[self.tail:]
+
+    def commit(self, size):
+        """
+        Marks size bytes written into the writable() area as received
+        """
+        self.tail += size
+
+    def packets(self):
+        """
+        Yields every complete packet in the buffer as a numpy view, without copying it
+        """
+        while self.tail - self.head >= CCSDS_PRIMARY_HEADER_SIZE:
+            header = self.view[self.head:self.head + CCSDS_PRIMARY_HEADER_SIZE]
+            length = ((header[4] << 8) | header[5]) + CCSDS_PRIMARY_HEADER_SIZE + 1
+
+            if (header[0] & 0xe0) != 0 or length > len(self.buffer):
+                self.head += 1
+                self.dropped += 1
+                continue
+            if self.tail - self.head < length:
+                break
+
+            packet = numpy.frombuffer(self.buffer, dtype=numpy.uint8, count=length, offset=self.head)
+            self.head += length
+            yield packet
+
+        if self.head == self.tail:
+            self.head = self.tail = 0
+
 class serial_transceiver(gr.basic_block):
     """
-    docstring for block serial_transceiver
+    Serial port transceiver for Space Packets.
+
+    Received bytes are reassembled into complete packets using the primary header data length,
+    and published as one PDU per packet.
+
+    PDUs received on the input port are queued and written to the serial port by a writer
+    thread, so a slow UART never stalls the message handler. Queued packets are coalesced into
+    a single write. When the queue holds tx_queue_depth packets, new packets are dropped
+    (tx_policy 'drop') or the message handler waits for room (tx_policy 'block'). A waiting
+    handler and the writer thread check every tx_timeout seconds whether the block is stopping,
+    the packets that could not be queued before the stop are counted as dropped. The packets
+    still queued at the stop are written, the ones the serial port does not take within
+    tx_timeout are counted as dropped too.
     """
-    def __init__(self, serial_port,serial_baud, serial_data_bits, serial_parity, serial_stop_bits, depth):
+    def __init__(self, serial_port,serial_baud, serial_data_bits, serial_parity, serial_stop_bits, depth, rx_timeout=0.1,
+                 tx_queue_depth=256, tx_policy='drop', tx_timeout=0.1):
         gr.basic_block.__init__(self,
             name="serial_transceiver",
             in_sig=[],
             out_sig=[])
+        if tx_policy not in ('drop', 'block'):
+            raise ValueError("tx_policy must be 'drop' or 'block'")
         self.instrument_id = 0
         self.depth = depth
         self.message_port_register_in(pmt.intern('in'))
         self.set_msg_handler(pmt.intern('in'), self.handle_msg)
 
         self.message_port_register_out(pmt.intern('out'))
+        # Reads block until data arrives or rx_timeout elapses, so the receiver is idle without traffic
         self.serial_port = serial.Serial(port=serial_port, baudrate=serial_baud, bytesize=serial_data_bits,
-                         parity = 'N', stopbits=serial_stop_bits, timeout=0)
-        self.thread = Thread(target=self.uart_handler_rx, args=(self.serial_port, self.instrument_id))
+                         parity = 'N', stopbits=serial_stop_bits, timeout=rx_timeout)
+        self.deframer = space_packet_deframer(depth)
+
+        self.rx_timeout = rx_timeout
+        self.tx_policy = tx_policy
+        self.tx_timeout = tx_timeout
+        self.tx_queue = queue.Queue(maxsize=tx_queue_depth)
+        self.tx_lock = Lock()
+        self.tx_packets = 0
+        self.tx_bytes = 0
+        self.tx_dropped = 0
+        self.tx_last_bytes = 0
+        self.tx_last_time = time.monotonic()
+
         self.event = Event()
-        self.thread.start()   
+        self.thread = Thread(target=self.uart_handler_rx, args=(self.serial_port, self.instrument_id))
+        self.thread.start()
+        self.tx_thread = Thread(target=self.uart_handler_tx, args=(self.serial_port,))
+        self.tx_thread.start()
 
     def stop(self):
         self.event.set()
         self.thread.join()
+        self.tx_thread.join()
+        # Packets queued by a handler after the writer thread finished
+        with self.tx_lock:
+            while True:
+                try:
+                    self.tx_queue.get_nowait()
+                except queue.Empty:
+                    break
+                self.tx_dropped += 1
         return super().stop()
 
     def uart_handler_rx(self, serial_port, instrument_id):
-        b_data_in = numpy.empty(0, dtype=numpy.uint8)
-        b_processing_status = False 
-        
+        deframer = self.deframer
+        port_out = pmt.intern('out')
+
+        while not self.event.is_set():
+            free = deframer.writable()
+            # Read everything already buffered by the driver, or block for the next byte
+            size = min(max(serial_port.in_waiting, 1), len(free))
+            received = serial_port.readinto(free[:size])
+            if not received:
+                continue
+            deframer.commit(received)
+
+            for packet in deframer.packets():
+                self.message_port_pub(port_out, pmt.cons(pmt.PMT_NIL, pmt.init_u8vector(packet.size, packet)))
+
+    def uart_handler_tx(self, serial_port):
+        buffer = bytearray()
+
+        while not self.event.is_set():
+            try:
+                packet = self.tx_queue.get(timeout=self.tx_timeout)
+            except queue.Empty:
+                continue
+
+            # Coalesce everything queued so far into a single write
+            buffer += packet
+            packets = 1
+            while True:
+                try:
+                    buffer += self.tx_queue.get_nowait()
+                    packets += 1
+                except queue.Empty:
+                    break
+
+            serial_port.write(buffer)
+            with self.tx_lock:
+                self.tx_packets += packets
+                self.tx_bytes += len(buffer)
+            buffer.clear()
+
+        # Write what is still queued, without waiting more than tx_timeout for the port
+        packets = 0
         while True:
-            if self.event.is_set():
+            try:
+                buffer += self.tx_queue.get_nowait()
+                packets += 1
+            except queue.Empty:
                 break
-            while serial_port.inWaiting() > 0:
-                for b in serial_port.read():
-                    b_data_in = numpy.insert(b_data_in, b_data_in.size, b)
-            if len(b_data_in) > 1:   
-                packet = pmt.cons(pmt.PMT_NIL,pmt.init_u8vector(b_data_in.size, b_data_in))
-                self.message_port_pub(pmt.intern('out'), packet)
-                b_data_in = numpy.empty(0, dtype=numpy.uint8)
-                                        
+        if packets == 0:
+            return
+        serial_port.write_timeout = self.tx_timeout
+        try:
+            serial_port.write(buffer)
+            with self.tx_lock:
+                self.tx_packets += packets
+                self.tx_bytes += len(buffer)
+        except serial.SerialTimeoutException:
+            with self.tx_lock:
+                self.tx_dropped += packets
+
     def handle_msg(self, msg_pmt):
         msg = pmt.cdr(msg_pmt)
         if not pmt.is_u8vector(msg):
             print("[ERROR] Received invalid message type. Expected u8vector")
             return
-        tele_command = numpy.array(pmt.u8vector_elements(msg), dtype=numpy.uint8)
-        self.serial_port.write(numpy.frombuffer(tele_command, dtype=numpy.uint8))
+        tele_command = bytes(pmt.u8vector_elements(msg))
+
+        if self.tx_policy == 'block':
+            while not self.event.is_set():
+                try:
+                    self.tx_queue.put(tele_command, timeout=self.tx_timeout)
+                    return
+                except queue.Full:
+                    continue
+        else:
+            try:
+                self.tx_queue.put_nowait(tele_command)
+                return
+            except queue.Full:
+                pass
+        with self.tx_lock:
+            self.tx_dropped += 1
+
+    def tx_queue_size(self):
+        """
+        Returns the number of packets waiting to be written to the serial port
+        """
+        return self.tx_queue.qsize()
 
+    def tx_statistics(self):
+        """
+        Returns the TX counters, and the bytes per second written since the previous call
+        """
+        now = time.monotonic()
+        with self.tx_lock:
+            elapsed = now - self.tx_last_time
+            rate = (self.tx_bytes - self.tx_last_bytes) / elapsed if elapsed > 0 else 0.0
+            self.tx_last_bytes = self.tx_bytes
+            self.tx_last_time = now
+            return {'queue_depth': self.tx_queue.qsize(), 'packets': self.tx_packets, 'bytes': self.tx_bytes,
+                    'dropped': self.tx_dropped, 'bytes_per_second': rate}